@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark `lattice batch` against the equivalent shell loop of CLI calls.
+
+Each run applies the same operations to a fresh project: for every task,
+a create, a status change, an assignment and a comment. Modes:
+
+  loop     — one `lattice <op>` process per operation, as a shell script would
+  batch    — every operation piped into a single `lattice batch`
+  atomic   — the same, with `lattice batch --atomic`
+
+Usage:
+    python scripts/bench_batch.py
+    python scripts/bench_batch.py --tasks 200 --dir /var/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lattice.core.ids import generate_task_id
+
+_LATTICE = [sys.executable, "-c", "from lattice.client import main; main()"]
+
+
+def _operations(tasks: int) -> list[dict]:
+    ops: list[dict] = []
+    for i in range(tasks):
+        task_id = generate_task_id()
+        ops += [
+            {"op": "create", "title": f"Bench {i}", "id": task_id},
+            {"op": "status", "task": task_id, "status": "in_planning"},
+            {"op": "assign", "task": task_id, "assignee": "agent:bench"},
+            {"op": "comment", "task": task_id, "text": f"bench comment {i}"},
+        ]
+    return ops
+
+
+def _argv(op: dict) -> list[str]:
+    """The `lattice` command line equivalent to one batch operation."""
+    if op["op"] == "create":
+        return ["create", op["title"], "--id", op["id"]]
+    if op["op"] == "status":
+        return ["status", op["task"], op["status"]]
+    if op["op"] == "assign":
+        return ["assign", op["task"], op["assignee"]]
+    return ["comment", op["task"], op["text"]]
+
+
+def _setup(base: Path, env: dict) -> Path:
+    base.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="lattice-bench-", dir=base))
+    subprocess.run(
+        [
+            *_LATTICE,
+            "init",
+            "--path",
+            str(root),
+            "--actor",
+            "human:bench",
+            "--project-code",
+            "BN",
+            "--no-setup-claude",
+            "--no-setup-agents",
+        ],
+        stdin=subprocess.DEVNULL,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    return root
+
+
+def run(base: Path, mode: str, ops: list[dict]) -> float:
+    """Return operations/sec for *mode* under *base*."""
+    env = {**os.environ, "LATTICE_NO_DAEMON": "1", "LATTICE_NO_UPDATE_CHECK": "1"}
+    root = _setup(base, env)
+    env["LATTICE_ROOT"] = str(root)
+    actor = ["--actor", "human:bench"]
+
+    start = time.perf_counter()
+    if mode == "loop":
+        for op in ops:
+            subprocess.run(
+                [*_LATTICE, *_argv(op), *actor, "--quiet"],
+                env=env,
+                check=True,
+                capture_output=True,
+            )
+    else:
+        flags = ["--atomic"] if mode == "atomic" else []
+        subprocess.run(
+            [*_LATTICE, "batch", *actor, "--quiet", *flags],
+            input="".join(json.dumps(op) + "\n" for op in ops),
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    elapsed = time.perf_counter() - start
+
+    shutil.rmtree(root, ignore_errors=True)
+    return len(ops) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=Path(tempfile.gettempdir()))
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks (4 operations each)")
+    args = parser.parse_args()
+
+    ops = _operations(args.tasks)
+    print(f"{'mode':<8} {'ops':>6} {'ops/s':>10}")
+    for mode in ("loop", "batch", "atomic"):
+        rate = run(args.dir, mode, ops)
+        print(f"{mode:<8} {len(ops):>6} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
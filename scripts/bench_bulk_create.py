@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark bulk task creation: the per-task create path vs write_new_tasks.
+
+Creates N tasks in a fresh project (with a project code, so short IDs are
+allocated) and reports tasks/sec. Modes:
+
+  per-task — what `create`, `_seed_demo` and `import-github-project` did per
+             task: allocate_short_id + write_task_event + scaffold_plan
+  bulk     — `lattice create --from-file`: reserve_short_ids once, one
+             write_new_tasks call, then the plans (end to end, in a subprocess)
+
+Usage:
+    python scripts/bench_bulk_create.py
+    python scripts/bench_bulk_create.py --tasks 10000 --dir /var/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.ids import generate_task_id
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.operations import scaffold_plan, write_task_event
+from lattice.storage.short_ids import allocate_short_id
+
+_LATTICE = [sys.executable, "-c", "from lattice.client import main; main()"]
+
+
+def _setup(base: Path) -> tuple[Path, dict]:
+    base.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="lattice-bench-", dir=base))
+    ensure_lattice_dirs(root)
+    config = dict(default_config())
+    config["project_code"] = "BULK"
+    atomic_write(root / ".lattice" / "config.json", serialize_config(config))
+    return root, config
+
+
+def _per_task(ld: Path, config: dict, tasks: int) -> None:
+    for i in range(tasks):
+        task_id = generate_task_id()
+        short_id, _ = allocate_short_id(ld, "BULK", task_ulid=task_id)
+        data = {
+            "title": f"Bench {i}",
+            "status": "backlog",
+            "type": "task",
+            "priority": "medium",
+            "short_id": short_id,
+        }
+        event = create_event(type="task_created", task_id=task_id, actor="human:bench", data=data)
+        snapshot = apply_event_to_snapshot(None, event)
+        write_task_event(ld, task_id, [event], snapshot, config)
+        scaffold_plan(ld, task_id, data["title"], short_id, None)
+
+
+def _bulk(root: Path, tasks: int) -> None:
+    lines = "".join(json.dumps({"title": f"Bench {i}"}) + "\n" for i in range(tasks))
+    subprocess.run(
+        [*_LATTICE, "create", "--from-file", "-", "--actor", "human:bench", "--quiet"],
+        input=lines,
+        env={
+            **os.environ,
+            "LATTICE_ROOT": str(root),
+            "LATTICE_NO_DAEMON": "1",
+            "LATTICE_NO_UPDATE_CHECK": "1",
+        },
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def run(base: Path, mode: str, tasks: int) -> float:
+    """Return seconds to create *tasks* tasks with *mode* under *base*."""
+    root, config = _setup(base)
+    start = time.perf_counter()
+    if mode == "per-task":
+        _per_task(root / ".lattice", config, tasks)
+    else:
+        _bulk(root, tasks)
+    elapsed = time.perf_counter() - start
+    created = len(list((root / ".lattice" / "tasks").glob("*.json")))
+    assert created == tasks, f"{mode}: created {created} of {tasks}"
+    shutil.rmtree(root, ignore_errors=True)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=Path(tempfile.gettempdir()))
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks to create per mode")
+    args = parser.parse_args()
+
+    print(f"{'mode':<9} {'tasks':>6} {'seconds':>8} {'tasks/s':>9}")
+    for mode in ("per-task", "bulk"):
+        elapsed = run(args.dir, mode, args.tasks)
+        print(f"{mode:<9} {args.tasks:>6} {elapsed:>8.2f} {args.tasks / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
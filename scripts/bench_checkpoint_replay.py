@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark task rebuild with and without event-log checkpoints.
+
+Writes one task with N events (default 50,000 field updates), then times:
+
+  full        — replay from task_created (no checkpoints on disk)
+  checkpoint  — replay after appending a few events, resuming from the
+                latest checkpoint written by the previous run
+
+Usage:
+    python scripts/bench_checkpoint_replay.py
+    python scripts/bench_checkpoint_replay.py --events 10000 --tail 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from lattice.core.events import create_event, serialize_event
+from lattice.core.ids import generate_task_id
+from lattice.storage.checkpoints import checkpoint_path, replay_task_log
+
+
+def _update(task_id: str, i: int) -> dict:
+    return create_event(
+        type="field_updated",
+        task_id=task_id,
+        actor="human:bench",
+        data={"field": "title", "from": None, "to": f"Bench {i}"},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000, help="Events in the log")
+    parser.add_argument("--tail", type=int, default=10, help="Events appended after checkpointing")
+    parser.add_argument("--dir", type=Path, default=None, help="Directory to benchmark in")
+    args = parser.parse_args()
+
+    if args.dir is not None:
+        args.dir.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="lattice-bench-", dir=args.dir))
+    try:
+        ld = root / ".lattice"
+        ld.mkdir()
+        task_id = generate_task_id()
+        log = root / f"{task_id}.jsonl"
+        created = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:bench",
+            data={"title": "Bench", "status": "backlog", "priority": "medium", "type": "task"},
+        )
+        lines = [serialize_event(created)]
+        lines.extend(serialize_event(_update(task_id, i)) for i in range(1, args.events))
+        log.write_text("".join(lines))
+
+        start = time.perf_counter()
+        full = replay_task_log(ld, task_id, log)
+        full_s = time.perf_counter() - start
+
+        with log.open("a") as fh:
+            fh.write("".join(serialize_event(_update(task_id, -i)) for i in range(args.tail)))
+
+        start = time.perf_counter()
+        resumed = replay_task_log(ld, task_id, log)
+        resumed_s = time.perf_counter() - start
+
+        assert resumed["title"] == f"Bench {-(args.tail - 1)}" and full["id"] == task_id
+        size_mb = log.stat().st_size / 1e6
+        ckpt_kb = checkpoint_path(ld, task_id).stat().st_size / 1e3
+        print(f"log: {args.events} events, {size_mb:.1f} MB; checkpoints: {ckpt_kb:.0f} KB")
+        print(f"full replay:            {full_s * 1000:8.1f} ms")
+        print(f"from checkpoint (+{args.tail}): {resumed_s * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Load-test the dashboard server with concurrent keep-alive clients.
+
+Starts a dashboard server in-process against an existing project (or a
+generated one), then runs N clients, each on one persistent HTTP/1.1
+connection, cycling through the dashboard's read endpoints. A fraction of
+requests can be status-change POSTs to exercise serialized writes.
+
+Reports throughput and p50/p99 latency per endpoint and overall.
+
+Usage:
+    python scripts/bench_dashboard_load.py
+    python scripts/bench_dashboard_load.py --clients 50 --requests 40 --tasks 1000
+    python scripts/bench_dashboard_load.py --lattice-dir path/to/.lattice --writes 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event, serialize_event
+from lattice.core.ids import generate_task_id
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.dashboard.server import create_server
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+
+READ_PATHS = ["/api/tasks", "/api/stats", "/api/activity", "/api/graph", "/api/config"]
+
+
+def _populate(root: Path, n_tasks: int) -> Path:
+    ensure_lattice_dirs(root)
+    ld = root / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    for i in range(n_tasks):
+        task_id = generate_task_id()
+        event = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:bench",
+            data={"title": f"Task {i}", "status": "backlog", "priority": "medium", "type": "task"},
+        )
+        snapshot = apply_event_to_snapshot(None, event)
+        atomic_write(ld / "tasks" / f"{task_id}.json", serialize_snapshot(snapshot))
+        (ld / "events" / f"{task_id}.jsonl").write_text(serialize_event(event))
+    return ld
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _client(
+    port: int,
+    n_requests: int,
+    write_ratio: float,
+    task_ids: list[str],
+    seed: int,
+    latencies: dict[str, list[float]],
+    errors: list[str],
+    lock: threading.Lock,
+) -> None:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    local: dict[str, list[float]] = defaultdict(list)
+    try:
+        for i in range(n_requests):
+            if task_ids and rng.random() < write_ratio:
+                label = "POST status"
+                body = json.dumps(
+                    {
+                        "status": rng.choice(["backlog", "planned"]),
+                        "actor": "human:bench",
+                        "force": True,
+                        "reason": "load test",
+                    }
+                )
+                start = time.perf_counter()
+                conn.request(
+                    "POST",
+                    f"/api/tasks/{rng.choice(task_ids)}/status",
+                    body=body,
+                    headers={"Content-Type": "application/json"},
+                )
+            else:
+                label = READ_PATHS[(seed + i) % len(READ_PATHS)]
+                start = time.perf_counter()
+                conn.request("GET", label)
+            resp = conn.getresponse()
+            resp.read()
+            local[label].append(time.perf_counter() - start)
+            if resp.status >= 500:
+                errors.append(f"{label}: HTTP {resp.status}")
+    except (OSError, http.client.HTTPException) as exc:
+        errors.append(f"client {seed}: {exc!r}")
+    finally:
+        conn.close()
+    with lock:
+        for label, samples in local.items():
+            latencies[label].extend(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per client")
+    parser.add_argument("--tasks", type=int, default=500, help="Tasks in a generated project")
+    parser.add_argument("--writes", type=float, default=0.0, help="Fraction of POST requests")
+    parser.add_argument("--lattice-dir", type=Path, default=None, help="Existing .lattice/")
+    args = parser.parse_args()
+
+    root: Path | None = None
+    if args.lattice_dir is not None:
+        ld = args.lattice_dir
+    else:
+        root = Path(tempfile.mkdtemp(prefix="lattice-bench-"))
+        ld = _populate(root, args.tasks)
+    server = create_server(ld, "127.0.0.1", 0)
+    serve = threading.Thread(target=server.serve_forever, daemon=True)
+    serve.start()
+    try:
+        port = server.server_address[1]
+        task_ids = sorted(p.stem for p in (ld / "tasks").glob("task_*.json"))[:50]
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: list[str] = []
+        lock = threading.Lock()
+        clients = [
+            threading.Thread(
+                target=_client,
+                args=(port, args.requests, args.writes, task_ids, n, latencies, errors, lock),
+            )
+            for n in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for t in clients:
+            t.start()
+        for t in clients:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        total = [s for samples in latencies.values() for s in samples]
+        print(
+            f"{args.clients} clients x {args.requests} requests: {len(total)} responses "
+            f"in {elapsed:.2f}s ({len(total) / elapsed:.0f} req/s), {len(errors)} errors"
+        )
+        print(f"{'endpoint':<16} {'count':>6} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+        for label in sorted(latencies) + ["all"]:
+            samples = total if label == "all" else latencies[label]
+            if not samples:
+                continue
+            print(
+                f"{label:<16} {len(samples):>6} {_percentile(samples, 50) * 1000:>9.1f} "
+                f"{_percentile(samples, 99) * 1000:>9.1f} {statistics.mean(samples) * 1000:>9.1f}"
+            )
+        for err in errors[:10]:
+            print(f"error: {err}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        if root is not None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Benchmark event-append throughput: per-event fsync vs batched.
+
+Each write call appends a burst of events (default 3, like `next --claim`)
+plus the snapshot, across distinct tasks. Modes:
+
+  before   — the old write path: one jsonl_append (fsync + dir fsync) per event
+  batched  — write_task_event: one os.write + one fsync per call
+
+Usage:
+    python scripts/bench_event_append.py --dir /dev/shm --dir /var/tmp
+    python scripts/bench_event_append.py --dir /var/tmp --threads 8 --calls 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event, serialize_event
+from lattice.core.ids import generate_task_id
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage.fs import (
+    _fsync_directory,
+    atomic_write,
+    ensure_lattice_dirs,
+)
+from lattice.storage.locks import multi_lock
+from lattice.storage.operations import write_task_event
+
+
+def _legacy_jsonl_append(path: Path, line: str) -> None:
+    """The pre-batching append: existence check, append, fsync, dir fsync."""
+    needs_separator = False
+    if path.exists() and path.stat().st_size > 0:
+        with open(path, "rb") as fh:
+            fh.seek(-1, 2)
+            needs_separator = fh.read(1) != b"\n"
+    with open(path, "a", encoding="utf-8") as fh:
+        if needs_separator:
+            fh.write("\n")
+        fh.write(line)
+        fh.flush()
+        os.fsync(fh.fileno())
+    _fsync_directory(path.parent)
+
+
+def _legacy_write(ld: Path, task_id: str, events: list[dict], snapshot: dict) -> None:
+    lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}"])
+    with multi_lock(ld / "locks", lock_keys):
+        event_path = ld / "events" / f"{task_id}.jsonl"
+        for event in events:
+            _legacy_jsonl_append(event_path, serialize_event(event))
+        atomic_write(ld / "tasks" / f"{task_id}.json", serialize_snapshot(snapshot))
+
+
+def _setup(base: Path, tasks: int) -> tuple[Path, list[tuple[str, dict]]]:
+    base.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix="lattice-bench-", dir=base))
+    ensure_lattice_dirs(root)
+    ld = root / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    seeded: list[tuple[str, dict]] = []
+    for i in range(tasks):
+        task_id = generate_task_id()
+        event = create_event(
+            type="task_created",
+            task_id=task_id,
+            actor="human:bench",
+            data={
+                "title": f"Bench {i}",
+                "status": "backlog",
+                "priority": "medium",
+                "type": "task",
+            },
+        )
+        snapshot = apply_event_to_snapshot(None, event)
+        write_task_event(ld, task_id, [event], snapshot)
+        seeded.append((task_id, snapshot))
+    return root, seeded
+
+
+def _burst(task_id: str, snapshot: dict, size: int) -> tuple[list[dict], dict]:
+    events = []
+    for n in range(size):
+        event = create_event(
+            type="comment_added",
+            task_id=task_id,
+            actor="human:bench",
+            data={"body": f"bench comment {n}"},
+        )
+        events.append(event)
+        snapshot = apply_event_to_snapshot(snapshot, event)
+    return events, snapshot
+
+
+def run(base: Path, mode: str, calls: int, burst: int, threads: int) -> float:
+    """Return events/sec for *mode* under *base*."""
+    root, seeded = _setup(base, max(threads, 1) * 4)
+    ld = root / ".lattice"
+
+    # Each task is only ever written by one worker, mirroring per-task locks.
+    lanes: list[list[tuple]] = [[] for _ in range(threads)]
+    for i in range(calls):
+        slot = i % len(seeded)
+        task_id, snapshot = seeded[slot]
+        lanes[slot % threads].append((task_id, *_burst(task_id, snapshot, burst)))
+
+    write = _legacy_write if mode == "before" else write_task_event
+
+    barrier = threading.Barrier(threads)
+
+    def _lane(lane: list[tuple]) -> None:
+        barrier.wait()
+        for task_id, events, snapshot in lane:
+            write(ld, task_id, events, snapshot)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(_lane, lanes))
+    elapsed = time.perf_counter() - start
+
+    shutil.rmtree(root, ignore_errors=True)
+    return calls * burst / elapsed
+
+
+def _fs_type(path: Path) -> str:
+    try:
+        best = ("", "?")
+        for line in Path("/proc/mounts").read_text().splitlines():
+            _dev, mount, fstype, *_ = line.split()
+            if str(path.resolve()).startswith(mount) and len(mount) > len(best[0]):
+                best = (mount, fstype)
+        return best[1]
+    except OSError:
+        return "?"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", action="append", type=Path, help="Directory to benchmark in")
+    parser.add_argument("--calls", type=int, default=300, help="Write calls per mode")
+    parser.add_argument("--burst", type=int, default=3, help="Events per write call")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent writers")
+    args = parser.parse_args()
+
+    dirs = args.dir or [Path(tempfile.gettempdir())]
+    print(f"{'dir':<16} {'fs':<6} {'threads':>7} {'mode':<8} {'events/s':>10}")
+    for base in dirs:
+        for threads in sorted({1, args.threads}):
+            for mode in ("before", "batched"):
+                rate = run(base, mode, args.calls, args.burst, threads)
+                print(f"{str(base):<16} {_fs_type(base):<6} {threads:>7} {mode:<8} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 """Lattice: file-based, agent-native task tracker with an event-sourced core."""
 
-from importlib.metadata import version as _version
 
-__version__ = _version("lattice-tracker")
+def __getattr__(name: str) -> str:
+    # Resolved on first use: importlib.metadata is too slow to load on every CLI start.
+    if name == "__version__":
+        from importlib.metadata import version
+
+        return version("lattice-tracker")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
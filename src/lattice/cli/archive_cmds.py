@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import shutil
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -21,11 +20,9 @@ from lattice.cli.helpers import (
     validate_actor_format_or_exit,
 )
 from lattice.cli.main import cli
-from lattice.core.events import create_event, serialize_event
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
-from lattice.storage.hooks import execute_hooks
-from lattice.storage.locks import multi_lock
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.operations import write_task_archive, write_task_unarchive
 
 
 def _parse_task_ids(raw_ids: tuple[str, ...]) -> list[str]:
@@ -75,47 +72,7 @@ def _archive_one(
 
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-    locks_dir = lattice_dir / "locks"
-    lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
-
-    with multi_lock(locks_dir, lock_keys):
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        atomic_write(
-            lattice_dir / "archive" / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        if snapshot_path.exists():
-            snapshot_path.unlink()
-
-        shutil.move(
-            str(event_path),
-            str(lattice_dir / "archive" / "events" / f"{task_id}.jsonl"),
-        )
-
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-        if notes_path.exists():
-            shutil.move(
-                str(notes_path),
-                str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
-            )
-
-        plans_path = lattice_dir / "plans" / f"{task_id}.md"
-        if plans_path.exists():
-            archive_plans_dir = lattice_dir / "archive" / "plans"
-            archive_plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(plans_path),
-                str(archive_plans_dir / f"{task_id}.md"),
-            )
-
-    execute_hooks(config, lattice_dir, task_id, event)
+    write_task_archive(lattice_dir, task_id, event, updated_snapshot, config)
     return event
 
 
@@ -296,12 +253,13 @@ def _archive_stale(
             click.echo("No stale done tasks found.")
         return
 
+    from lattice.storage.snapshot_store import SnapshotStore
+
+    with SnapshotStore(lattice_dir) as store:
+        snapshots = store.load_all()
+
     candidates: list[str] = []
-    for task_file in sorted(tasks_dir.glob("*.json")):
-        try:
-            snap = json.loads(task_file.read_text())
-        except (json.JSONDecodeError, OSError):
-            continue
+    for snap in snapshots:
         if snap.get("status") != "done":
             continue
         # Use done_at if available, fall back to updated_at
@@ -418,45 +376,7 @@ def _unarchive_one(
 
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-    locks_dir = lattice_dir / "locks"
-    lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
-
-    with multi_lock(locks_dir, lock_keys):
-        archive_event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-        jsonl_append(archive_event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        shutil.move(
-            str(archive_event_path),
-            str(lattice_dir / "events" / f"{task_id}.jsonl"),
-        )
-
-        atomic_write(
-            lattice_dir / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        archive_snapshot_path.unlink()
-
-        archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-        if archive_notes_path.exists():
-            shutil.move(
-                str(archive_notes_path),
-                str(lattice_dir / "notes" / f"{task_id}.md"),
-            )
-
-        archive_plans_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
-        if archive_plans_path.exists():
-            plans_dir = lattice_dir / "plans"
-            plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(archive_plans_path),
-                str(plans_dir / f"{task_id}.md"),
-            )
-
-    execute_hooks(config, lattice_dir, task_id, event)
+    write_task_unarchive(lattice_dir, task_id, event, updated_snapshot, config)
     return event
 
 
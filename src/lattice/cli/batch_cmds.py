@@ -0,0 +1,679 @@
+"""``lattice batch``: apply many task operations from NDJSON in one process."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+
+import click
+
+from lattice.cli.helpers import (
+    TaskOpError,
+    json_error_obj,
+    load_project_config,
+    lookup_task_id,
+    output_error,
+    provenance_options,
+    read_snapshot,
+    require_actor,
+    require_root,
+    validate_actor_format_or_exit,
+)
+from lattice.cli.main import cli
+from lattice.cli.task_ops import (
+    append_plan_reset_section,
+    assignment_event,
+    check_create_retry,
+    comment_event,
+    create_task_data,
+    relationship_event,
+    resets_plan,
+    status_change_event,
+    update_events,
+)
+from lattice.core.events import create_event
+from lattice.core.ids import generate_task_id, validate_actor, validate_id
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.hooks import execute_hooks
+from lattice.storage.locks import LockTimeout, multi_lock
+from lattice.storage.operations import (
+    scaffold_plan,
+    write_new_tasks,
+    write_task_archive,
+    write_task_event,
+)
+from lattice.storage.readers import read_task_events
+from lattice.storage.short_ids import allocate_short_id
+
+# Keys every operation may carry, besides its own fields.
+_COMMON_KEYS = frozenset({"op", "actor", "reason", "on_behalf_of", "triggered_by"})
+
+# Operation name -> (required keys, optional keys)
+_OP_KEYS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "create": (
+        ("title",),
+        (
+            "type",
+            "priority",
+            "urgency",
+            "complexity",
+            "status",
+            "description",
+            "tags",
+            "assigned_to",
+            "id",
+        ),
+    ),
+    "update": (("task", "fields"), ()),
+    "status": (("task", "status"), ("force",)),
+    "assign": (("task", "assignee"), ()),
+    "comment": (("task", "text"), ("reply_to", "role")),
+    "link": (("task", "type", "target"), ("note",)),
+    "archive": (("task",), ()),
+}
+
+# Operations whose events go to the lifecycle log (and so take its lock).
+_LIFECYCLE_OPS = frozenset({"create", "archive"})
+
+
+@dataclass
+class _Op:
+    """One parsed input line."""
+
+    line: int
+    name: str
+    spec: dict
+    task_id: str = ""
+    targets: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Change:
+    """A validated operation, ready to write."""
+
+    op: _Op
+    events: list[dict]
+    snapshot: dict | None  # post-event snapshot; for no-ops, the unchanged one
+    message: str | None = None  # set for no-ops ("No changes", ...)
+    plan_reset: bool = False
+
+
+class _State:
+    """Tasks as the batch will have left them, including changes not yet written.
+
+    Lets later operations in an ``--atomic`` batch validate against earlier
+    ones (create a task, then move it; comment, then reply).
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        self._snapshots: dict[str, dict | None] = {}
+        self._events: dict[str, list[dict]] = {}
+        self._archived: set[str] = set()
+
+    def snapshot(self, task_id: str) -> dict | None:
+        """The active snapshot of *task_id*, or None if missing or archived."""
+        if task_id not in self._snapshots:
+            self._snapshots[task_id] = read_snapshot(self.lattice_dir, task_id)
+        return self._snapshots[task_id]
+
+    def events(self, task_id: str) -> list[dict]:
+        return read_task_events(self.lattice_dir, task_id) + self._events.get(task_id, [])
+
+    def is_archived(self, task_id: str) -> bool:
+        return (
+            task_id in self._archived
+            or (self.lattice_dir / "archive" / "tasks" / f"{task_id}.json").exists()
+        )
+
+    def record(self, change: _Change) -> None:
+        task_id = change.op.task_id
+        if change.op.name == "archive":
+            self._snapshots[task_id] = None
+            self._archived.add(task_id)
+        else:
+            self._snapshots[task_id] = change.snapshot
+        self._events.setdefault(task_id, []).extend(change.events)
+
+
+# ---------------------------------------------------------------------------
+# lattice batch
+# ---------------------------------------------------------------------------
+
+
+@cli.command()
+@click.argument("source", type=click.File("r", encoding="utf-8"), default="-")
+@click.option(
+    "--atomic",
+    is_flag=True,
+    help=(
+        "Validate every operation before writing any; write none if one is invalid. "
+        "A write that fails partway keeps the operations already written."
+    ),
+)
+@click.option("--quiet", is_flag=True, help="Print only the results of failed operations.")
+@provenance_options
+def batch(
+    source: IO[str],
+    atomic: bool,
+    quiet: bool,
+    model: str | None,
+    session: str | None,
+    triggered_by: str | None,
+    on_behalf_of: str | None,
+    provenance_reason: str | None,
+) -> None:
+    """Apply task operations read as NDJSON from SOURCE (default: stdin).
+
+    One JSON object per line, with "op" set to create, update, status,
+    assign, comment, link or archive, and the command's arguments as keys:
+
+    \b
+      {"op": "create", "title": "Fix login", "priority": "high", "tags": ["auth"]}
+      {"op": "update", "task": "LAT-7", "fields": {"description": "..."}}
+      {"op": "status", "task": "LAT-7", "status": "in_planning"}
+      {"op": "assign", "task": "LAT-7", "assignee": "agent:claude"}
+      {"op": "comment", "task": "LAT-7", "text": "Done", "role": "review"}
+      {"op": "link", "task": "LAT-7", "type": "blocks", "target": "LAT-9"}
+      {"op": "archive", "task": "LAT-7"}
+
+    Any line may also set "actor", "reason", "on_behalf_of" and
+    "triggered_by", overriding the command-line options. Prints one JSON
+    result per input line, in order, and exits 1 if any operation failed.
+    Without --atomic, each operation is applied as soon as it is read,
+    holding only its own task's locks, and a failure does not stop the rest.
+    With --atomic, the locks of every task in the batch are held while all
+    operations are validated and then written; if any is invalid nothing is
+    written. Only validation is all-or-nothing: if a write itself fails (a
+    full disk, say), the operations written before it stay written, are
+    reported as usual, and the rest are reported as NOT_APPLIED.
+    --quiet prints only failures. Output is always NDJSON, so there is no
+    --json option.
+    """
+    lattice_dir = require_root(False)
+    config = load_project_config(lattice_dir)
+    actor = require_actor(False, optional=True)
+    if on_behalf_of is not None:
+        validate_actor_format_or_exit(on_behalf_of, False)
+
+    defaults = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
+    }
+    run = _run_atomic if atomic else _run_streaming
+    try:
+        ok = run(lattice_dir, config, defaults, _read_lines(source), quiet)
+    except LockTimeout as e:
+        output_error(f"Timed out waiting for task locks: {e}", "LOCK_TIMEOUT", False)
+    if not ok:
+        raise SystemExit(1)
+
+
+def _read_lines(source: IO[str]) -> Iterator[tuple[int, str]]:
+    for number, raw in enumerate(source, start=1):
+        if raw.strip():
+            yield number, raw
+
+
+def _emit(
+    line: int,
+    name: str | None,
+    quiet: bool,
+    *,
+    data: object = None,
+    error: dict | None = None,
+) -> None:
+    if quiet and error is None:
+        return
+    result: dict = {"line": line, "ok": error is None, "op": name}
+    if error is None:
+        result["data"] = data
+    else:
+        result["error"] = error
+    click.echo(json.dumps(result, sort_keys=True))
+
+
+def _emit_change(change: _Change, quiet: bool) -> None:
+    if change.message is not None:
+        data: object = {"message": change.message}
+    elif change.op.name == "archive":
+        data = change.events[0]
+    else:
+        data = change.snapshot
+    _emit(change.op.line, change.op.name, quiet, data=data)
+
+
+def _run_streaming(
+    lattice_dir: Path,
+    config: dict,
+    defaults: dict,
+    lines: Iterable[tuple[int, str]],
+    quiet: bool,
+) -> bool:
+    """Apply each operation as it is read, each under its own task's locks."""
+    ok = True
+    for line, raw in lines:
+        name = None
+        try:
+            op = _parse(line, raw)
+            name = op.name
+            _validate(op)
+            _resolve(lattice_dir, op)
+            with multi_lock(lattice_dir / "locks", _lock_keys([op])):
+                change = _plan(lattice_dir, config, defaults, _State(lattice_dir), op)
+                _write(lattice_dir, config, change)
+        except TaskOpError as e:
+            ok = False
+            _emit(line, name, quiet, error=e.error)
+            continue
+        except LockTimeout as e:
+            ok = False
+            _emit(line, name, quiet, error=json_error_obj("LOCK_TIMEOUT", str(e)))
+            continue
+        except OSError as e:
+            ok = False
+            _emit(line, name, quiet, error=json_error_obj("WRITE_ERROR", str(e)))
+            continue
+        _fire_hooks(lattice_dir, config, change)
+        _emit_change(change, quiet)
+    return ok
+
+
+def _run_atomic(
+    lattice_dir: Path,
+    config: dict,
+    defaults: dict,
+    lines: Iterable[tuple[int, str]],
+    quiet: bool,
+) -> bool:
+    """Validate all operations under all their locks, then write them all (or none)."""
+    ops: list[_Op] = []
+    errors: dict[int, dict] = {}
+    names: dict[int, str | None] = {}
+    numbers: list[int] = []
+    for line, raw in lines:
+        numbers.append(line)
+        names[line] = None
+        try:
+            op = _parse(line, raw)
+            names[line] = op.name
+            _validate(op)
+            _resolve(lattice_dir, op)
+            ops.append(op)
+        except TaskOpError as e:
+            errors[line] = e.error
+
+    changes: list[_Change] = []
+    written: list[_Change] = []
+    failed: dict | None = None
+    if not errors:
+        with multi_lock(lattice_dir / "locks", _lock_keys(ops)):
+            state = _State(lattice_dir)
+            for op in ops:
+                try:
+                    change = _plan(lattice_dir, config, defaults, state, op)
+                except TaskOpError as e:
+                    errors[op.line] = e.error
+                    continue
+                state.record(change)
+                changes.append(change)
+
+            if not errors:
+                for change in changes:
+                    try:
+                        _write(lattice_dir, config, change)
+                    except OSError as e:
+                        failed = json_error_obj("WRITE_ERROR", str(e))
+                        errors[change.op.line] = failed
+                        break
+                    written.append(change)
+
+    for change in written:
+        _fire_hooks(lattice_dir, config, change)
+    skipped = None
+    if failed is not None:
+        skipped = json_error_obj("NOT_APPLIED", "Not written: an earlier write failed.")
+    elif errors:
+        skipped = json_error_obj(
+            "NOT_APPLIED", f"Nothing was written: line {min(errors)} failed validation."
+        )
+    done = {change.op.line: change for change in written}
+    for line in numbers:
+        if line in done:
+            _emit_change(done[line], quiet)
+        else:
+            _emit(line, names[line], quiet, error=errors.get(line, skipped))
+    return not errors
+
+
+# ---------------------------------------------------------------------------
+# Parsing and task resolution
+# ---------------------------------------------------------------------------
+
+
+def _parse(line: int, raw: str, *, only: str | None = None) -> _Op:
+    """Parse one input line and its op name; :func:`_validate` checks the rest.
+
+    With *only*, "op" defaults to it and no other op is accepted.
+    """
+    try:
+        spec = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise TaskOpError(f"Invalid JSON: {e}.", "INVALID_JSON") from None
+    if not isinstance(spec, dict):
+        raise TaskOpError("Each line must be a JSON object.", "INVALID_JSON")
+    if only is not None:
+        spec.setdefault("op", only)
+        if spec["op"] != only:
+            raise TaskOpError(f"Only {only} operations are accepted here.", "VALIDATION_ERROR")
+    name = spec.get("op")
+    if name not in _OP_KEYS:
+        valid = ", ".join(_OP_KEYS)
+        raise TaskOpError(f"Unknown op: {name!r}. Valid ops: {valid}.", "VALIDATION_ERROR")
+    return _Op(line=line, name=name, spec=spec)
+
+
+def _validate(op: _Op) -> None:
+    """Check *op*'s fields: the required ones are present, all are known and well-typed."""
+    name, spec = op.name, op.spec
+    required, optional = _OP_KEYS[name]
+    missing = [key for key in required if spec.get(key) is None]
+    if missing:
+        raise TaskOpError(
+            f"Missing field(s) for {name}: {', '.join(missing)}.", "VALIDATION_ERROR"
+        )
+    unknown = sorted(set(spec) - _COMMON_KEYS - set(required) - set(optional))
+    if unknown:
+        raise TaskOpError(
+            f"Unknown field(s) for {name}: {', '.join(unknown)}.", "VALIDATION_ERROR"
+        )
+    for key, value in spec.items():
+        if key in ("fields", "force", "tags"):
+            continue
+        if value is not None and not isinstance(value, str):
+            raise TaskOpError(f"Field '{key}' must be a string.", "VALIDATION_ERROR")
+    if "force" in spec and not isinstance(spec["force"], bool):
+        raise TaskOpError("Field 'force' must be true or false.", "VALIDATION_ERROR")
+    actor = spec.get("actor")
+    if actor is not None and not validate_actor(actor):
+        raise TaskOpError(
+            f"Invalid actor format: '{actor}'. "
+            "Expected prefix:identifier (e.g., human:atin, agent:claude).",
+            "INVALID_ACTOR",
+        )
+
+
+def _resolve(lattice_dir: Path, op: _Op) -> None:
+    """Fill in the task IDs *op* touches (generating one for a create)."""
+    if op.name == "create":
+        task_id = op.spec.get("id")
+        if task_id is not None and not validate_id(task_id, "task"):
+            raise TaskOpError(f"Invalid task ID format: '{task_id}'.", "INVALID_ID")
+        op.task_id = task_id or generate_task_id()
+        return
+    op.task_id = lookup_task_id(lattice_dir, op.spec["task"])
+    if op.name == "link":
+        op.targets = [lookup_task_id(lattice_dir, op.spec["target"])]
+
+
+def _lock_keys(ops: list[_Op]) -> list[str]:
+    """The lock keys ``write_task_event`` / ``write_task_archive`` take for *ops*."""
+    keys: set[str] = set()
+    for op in ops:
+        keys.update((f"events_{op.task_id}", f"tasks_{op.task_id}"))
+        if op.name in _LIFECYCLE_OPS:
+            keys.add("events__lifecycle")
+    return sorted(keys)
+
+
+# ---------------------------------------------------------------------------
+# Planning: validate an operation and build its events (no writes)
+# ---------------------------------------------------------------------------
+
+
+def _plan(lattice_dir: Path, config: dict, defaults: dict, state: _State, op: _Op) -> _Change:
+    spec = op.spec
+    meta = {
+        "actor": spec.get("actor") or defaults["actor"],
+        "model": defaults["model"],
+        "session": defaults["session"],
+        "triggered_by": spec.get("triggered_by") or defaults["triggered_by"],
+        "on_behalf_of": spec.get("on_behalf_of") or defaults["on_behalf_of"],
+        "reason": spec.get("reason") or defaults["reason"],
+    }
+    if meta["on_behalf_of"] is not None and not validate_actor(meta["on_behalf_of"]):
+        raise TaskOpError(
+            f"Invalid actor format: '{meta['on_behalf_of']}'. "
+            "Expected prefix:identifier (e.g., human:atin, agent:claude).",
+            "INVALID_ACTOR",
+        )
+    if meta["actor"] is None:
+        raise TaskOpError(
+            'No actor: set "actor" on the line or pass --actor or --name.', "MISSING_ACTOR"
+        )
+    if op.name == "create":
+        return _plan_create(config, state, op, meta)
+
+    snapshot = state.snapshot(op.task_id)
+    if snapshot is None:
+        if op.name == "archive" and state.is_archived(op.task_id):
+            raise TaskOpError(f"Task {op.task_id} is already archived.", "CONFLICT")
+        raise TaskOpError(f"Task {op.task_id} not found.", "NOT_FOUND")
+    planner = {
+        "update": _plan_update,
+        "status": _plan_status,
+        "assign": _plan_assign,
+        "comment": _plan_comment,
+        "link": _plan_link,
+        "archive": _plan_archive,
+    }[op.name]
+    return planner(lattice_dir, config, state, op, snapshot, meta)
+
+
+def _plan_create(config: dict, state: _State, op: _Op, meta: dict) -> _Change:
+    data = create_task_data(config, op.spec)
+    existing = state.snapshot(op.task_id)
+    if existing is not None:
+        # Idempotent retry with a caller-supplied ID, as `lattice create --id`
+        check_create_retry(op.task_id, existing, data)
+        return _Change(op, [], existing)
+
+    event = create_event(type="task_created", task_id=op.task_id, data=data, **meta)
+    return _Change(op, [event], apply_event_to_snapshot(None, event))
+
+
+def _plan_update(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    fields = op.spec["fields"]
+    if not isinstance(fields, dict) or not fields:
+        raise TaskOpError(
+            "'fields' must be a non-empty object of field: value.", "VALIDATION_ERROR"
+        )
+    events = update_events(config, op.task_id, snapshot, list(fields.items()), meta)
+    if not events:
+        return _Change(op, [], snapshot, message="No changes")
+    updated = snapshot
+    for event in events:
+        updated = apply_event_to_snapshot(updated, event)
+    return _Change(op, events, updated)
+
+
+def _plan_status(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    event = status_change_event(
+        lattice_dir,
+        config,
+        op.task_id,
+        snapshot,
+        op.spec["status"],
+        meta,
+        force=bool(op.spec.get("force")),
+        load_events=lambda: state.events(op.task_id),
+    )
+    if event is None:
+        return _Change(op, [], snapshot, message=f"Already at status {snapshot['status']}")
+    updated = apply_event_to_snapshot(snapshot, event)
+    return _Change(op, [event], updated, plan_reset=resets_plan(config, event))
+
+
+def _plan_assign(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    event, target = assignment_event(op.task_id, snapshot, op.spec["assignee"], meta)
+    if event is None:
+        label = "Already unassigned" if target is None else f"Already assigned to {target}"
+        return _Change(op, [], snapshot, message=label)
+    return _Change(op, [event], apply_event_to_snapshot(snapshot, event))
+
+
+def _plan_comment(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    event = comment_event(
+        lattice_dir,
+        config,
+        op.task_id,
+        op.spec["text"],
+        meta,
+        reply_to=op.spec.get("reply_to"),
+        role=op.spec.get("role"),
+        load_events=lambda: state.events(op.task_id),
+    )
+    return _Change(op, [event], apply_event_to_snapshot(snapshot, event))
+
+
+def _plan_link(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    (target,) = op.targets
+    event = relationship_event(
+        op.task_id,
+        snapshot,
+        op.spec["type"],
+        target,
+        state.snapshot(target) is not None,
+        meta,
+        note=op.spec.get("note"),
+    )
+    return _Change(op, [event], apply_event_to_snapshot(snapshot, event))
+
+
+def _plan_archive(
+    lattice_dir: Path, config: dict, state: _State, op: _Op, snapshot: dict, meta: dict
+) -> _Change:
+    event = create_event(type="task_archived", task_id=op.task_id, data={}, **meta)
+    return _Change(op, [event], apply_event_to_snapshot(snapshot, event))
+
+
+# ---------------------------------------------------------------------------
+# Writing (the caller holds the task locks)
+# ---------------------------------------------------------------------------
+
+
+def _write(lattice_dir: Path, config: dict, change: _Change) -> None:
+    """Persist *change* through the canonical write paths.
+
+    Hooks are left to :func:`_fire_hooks`, after the locks are released,
+    since a hook may itself run ``lattice``.
+    """
+    op, events = change.op, change.events
+    if not events:
+        return
+    task_id = op.task_id
+    if op.name == "create":
+        event = events[0]
+        project_code = config.get("project_code")
+        short_id = None
+        if project_code:
+            subproject_code = config.get("subproject_code")
+            prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
+            short_id, _idx = allocate_short_id(lattice_dir, prefix, task_ulid=task_id)
+            event["data"]["short_id"] = short_id
+        change.snapshot = apply_event_to_snapshot(None, event)
+        write_task_event(lattice_dir, task_id, events, change.snapshot, _caller_holds_lock=True)
+        data = event["data"]
+        scaffold_plan(lattice_dir, task_id, data["title"], short_id, data.get("description"))
+        return
+
+    # Re-apply onto what is on disk now: an earlier create in this batch may
+    # have gained its short ID since the events were planned.
+    snapshot = apply_event_to_snapshot(read_snapshot(lattice_dir, task_id), events[0])
+    for event in events[1:]:
+        snapshot = apply_event_to_snapshot(snapshot, event)
+    change.snapshot = snapshot
+    if op.name == "archive":
+        write_task_archive(lattice_dir, task_id, events[0], snapshot, _caller_holds_lock=True)
+        return
+    write_task_event(lattice_dir, task_id, events, snapshot, _caller_holds_lock=True)
+    if change.plan_reset:
+        actor = events[0]["actor"]
+        append_plan_reset_section(lattice_dir, task_id, actor, events[0].get("ts"))
+
+
+def _fire_hooks(lattice_dir: Path, config: dict, change: _Change) -> None:
+    for event in change.events:
+        execute_hooks(config, lattice_dir, change.op.task_id, event)
+
+
+# ---------------------------------------------------------------------------
+# Bulk create (lattice create --from-file)
+# ---------------------------------------------------------------------------
+
+
+def _plan_creates(
+    lattice_dir: Path, config: dict, defaults: dict, lines: Iterable[tuple[int, str]]
+) -> tuple[list[_Change], dict[int, dict]]:
+    """Validate every line as a create; return the changes and the errors by line."""
+    state = _State(lattice_dir)
+    changes: list[_Change] = []
+    errors: dict[int, dict] = {}
+    for line, raw in lines:
+        try:
+            op = _parse(line, raw, only="create")
+            _validate(op)
+            _resolve(lattice_dir, op)
+            change = _plan(lattice_dir, config, defaults, state, op)
+        except TaskOpError as e:
+            errors[line] = e.error
+            continue
+        state.record(change)
+        changes.append(change)
+    return changes, errors
+
+
+def _write_creates(lattice_dir: Path, config: dict, changes: list[_Change]) -> None:
+    """Write the new tasks in *changes* with one bulk write, reserving their short IDs.
+
+    Creates that matched an existing task (idempotent retries) carry no
+    events and are left alone.
+    """
+    new = [change for change in changes if change.events]
+    prefix = None
+    project_code = config.get("project_code")
+    if project_code:
+        subproject_code = config.get("subproject_code")
+        prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
+    write_new_tasks(
+        lattice_dir,
+        [(c.op.task_id, c.events, c.snapshot) for c in new if c.snapshot is not None],
+        config,
+        short_id_prefix=prefix,
+    )
+    for change in new:
+        data = change.events[0]["data"]
+        scaffold_plan(
+            lattice_dir,
+            change.op.task_id,
+            data["title"],
+            data.get("short_id"),
+            data.get("description"),
+        )
@@ -0,0 +1,185 @@
+"""``lattice daemon`` commands: start, stop and inspect the warm command server."""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from lattice.cli.helpers import output_error, output_result, require_root
+from lattice.cli.main import cli
+
+_START_TIMEOUT = 10.0  # seconds to wait for a detached daemon to accept connections
+_STOP_TIMEOUT = 10.0
+
+
+# ---------------------------------------------------------------------------
+# Daemon command group
+# ---------------------------------------------------------------------------
+
+
+@cli.group()
+def daemon() -> None:
+    """Keep a warm process that runs this project's commands faster (opt-in).
+
+    While a daemon is running, ``lattice`` hands each command to it over a
+    Unix socket instead of starting up from scratch. Output and exit codes
+    are the same either way; with no daemon, commands simply run in-process.
+    Set LATTICE_NO_DAEMON=1 to bypass a running daemon.
+    """
+
+
+# ---------------------------------------------------------------------------
+# lattice daemon start
+# ---------------------------------------------------------------------------
+
+
+@daemon.command("start")
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Exit after this many seconds without a command (0 = never). Default: 1800.",
+)
+@click.option("--foreground", is_flag=True, help="Run in this terminal instead of detaching.")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_start(idle_timeout: float | None, foreground: bool, output_json: bool) -> None:
+    """Start the daemon for this project."""
+    from lattice.daemon import (
+        DEFAULT_IDLE_TIMEOUT,
+        DaemonError,
+        log_path,
+        running_pid,
+        serve,
+        socket_path,
+    )
+
+    lattice_dir = require_root(output_json)
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        output_error("The daemon is not supported on this platform.", "UNSUPPORTED", output_json)
+    if idle_timeout is None:
+        idle_timeout = DEFAULT_IDLE_TIMEOUT
+
+    try:
+        sock_path = socket_path(lattice_dir)
+        pid = running_pid(lattice_dir)
+        if pid is not None:
+            output_error(f"Daemon already running (pid {pid}).", "ALREADY_RUNNING", output_json)
+        if foreground:
+            click.echo(f"Lattice daemon listening on {sock_path}", err=True)
+            serve(lattice_dir, idle_timeout=idle_timeout)
+            return
+        with open(log_path(lattice_dir), "ab") as log:
+            proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "lattice.daemon",
+                    str(lattice_dir),
+                    "--idle-timeout",
+                    str(idle_timeout),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                close_fds=True,
+                start_new_session=True,
+            )
+    except DaemonError as e:
+        output_error(str(e), "DAEMON_ERROR", output_json)
+
+    if not _wait_until_listening(sock_path, proc):
+        output_error(
+            f"Daemon did not start; see {log_path(lattice_dir)}", "DAEMON_ERROR", output_json
+        )
+    output_result(
+        data={"pid": proc.pid, "socket": str(sock_path)},
+        human_message=f"Daemon started (pid {proc.pid}).",
+        quiet_value=str(proc.pid),
+        is_json=output_json,
+        is_quiet=False,
+    )
+
+
+def _wait_until_listening(sock_path: Path, proc: subprocess.Popen) -> bool:
+    deadline = time.monotonic() + _START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(sock_path))
+            except OSError:
+                time.sleep(0.05)
+            else:
+                return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# lattice daemon stop
+# ---------------------------------------------------------------------------
+
+
+@daemon.command("stop")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_stop(output_json: bool) -> None:
+    """Stop the daemon for this project."""
+    from lattice.daemon import running_pid
+
+    lattice_dir = require_root(output_json)
+    pid = running_pid(lattice_dir)
+    if pid is None:
+        output_error("No daemon is running for this project.", "NOT_RUNNING", output_json)
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    deadline = time.monotonic() + _STOP_TIMEOUT
+    while running_pid(lattice_dir) == pid and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if running_pid(lattice_dir) == pid:
+        output_error(f"Daemon (pid {pid}) did not stop.", "DAEMON_ERROR", output_json)
+    output_result(
+        data={"pid": pid},
+        human_message=f"Daemon stopped (pid {pid}).",
+        quiet_value=str(pid),
+        is_json=output_json,
+        is_quiet=False,
+    )
+
+
+# ---------------------------------------------------------------------------
+# lattice daemon status
+# ---------------------------------------------------------------------------
+
+
+@daemon.command("status")
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+def daemon_status(output_json: bool) -> None:
+    """Show whether a daemon is running for this project."""
+    from lattice.daemon import DaemonError, running_pid, socket_path
+
+    lattice_dir = require_root(output_json)
+    try:
+        sock_path = socket_path(lattice_dir)
+    except DaemonError as e:
+        output_error(str(e), "DAEMON_ERROR", output_json)
+    pid = running_pid(lattice_dir)
+    output_result(
+        data={"running": pid is not None, "pid": pid, "socket": str(sock_path)},
+        human_message=(
+            f"Daemon running (pid {pid}), socket {sock_path}"
+            if pid is not None
+            else "No daemon running."
+        ),
+        quiet_value=str(pid or ""),
+        is_json=output_json,
+        is_quiet=False,
+    )
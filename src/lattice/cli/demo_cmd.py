@@ -11,10 +11,10 @@ from lattice.cli.main import cli
 from lattice.core.config import default_config, serialize_config
 from lattice.core.events import create_event
 from lattice.core.ids import generate_instance_id, generate_task_id
-from lattice.core.tasks import apply_event_to_snapshot
+from lattice.core.tasks import apply_event_to_snapshot, apply_events
 from lattice.storage.fs import LATTICE_DIR, atomic_write, ensure_lattice_dirs
-from lattice.storage.operations import scaffold_plan, write_task_event
-from lattice.storage.short_ids import _default_index, allocate_short_id, save_id_index
+from lattice.storage.operations import scaffold_plan, write_new_tasks, write_task_event
+from lattice.storage.short_ids import _default_index, save_id_index
 
 
 # ---------------------------------------------------------------------------
@@ -1223,17 +1223,11 @@ def _seed_demo(target_dir: Path, quiet: bool = False) -> None:
 
     # 4. Create all tasks
     task_defs = _task_definitions(ts)
-    task_ids: list[str] = []  # index-parallel with task_defs
-    short_ids: list[str] = []
-
-    for i, tdef in enumerate(task_defs):
-        task_id = generate_task_id()
-        task_ids.append(task_id)
-
-        # Allocate short ID
-        sid, _ = allocate_short_id(lattice_dir, "LGHT", task_ulid=task_id)
-        short_ids.append(sid)
+    # Index-parallel with task_defs; short IDs are reserved by the bulk write
+    task_ids = [generate_task_id() for _ in task_defs]
+    new_tasks: list[tuple[str, list[dict], dict]] = []
 
+    for task_id, tdef in zip(task_ids, task_defs, strict=True):
         # Build creation event with initial status = "backlog"
         initial_status = "backlog"
         event_data: dict = {
@@ -1241,7 +1235,6 @@ def _seed_demo(target_dir: Path, quiet: bool = False) -> None:
             "status": initial_status,
             "type": tdef["type"],
             "priority": tdef["priority"],
-            "short_id": sid,
         }
         if tdef.get("description"):
             event_data["description"] = tdef["description"]
@@ -1263,76 +1256,79 @@ def _seed_demo(target_dir: Path, quiet: bool = False) -> None:
             ts=tdef.get("ts", ts["mon_9am"]),
         )
 
-        # Apply creation to get initial snapshot
-        snapshot = apply_event_to_snapshot(None, create_event_obj)
         all_events = [create_event_obj]
+        current_status = initial_status
+        current_assignee = event_data.get("assigned_to")
 
-        # Apply status transitions
+        # Status transitions
         for target_status, transition_ts, transition_actor in tdef.get("status_history", []):
-            current_status = snapshot["status"]
             if current_status == target_status:
                 continue
-            status_event = create_event(
-                type="status_changed",
-                task_id=task_id,
-                actor=transition_actor,
-                data={"from": current_status, "to": target_status},
-                ts=transition_ts,
+            all_events.append(
+                create_event(
+                    type="status_changed",
+                    task_id=task_id,
+                    actor=transition_actor,
+                    data={"from": current_status, "to": target_status},
+                    ts=transition_ts,
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, status_event)
-            all_events.append(status_event)
+            current_status = target_status
 
         # If target status not reached via history, force it
-        if snapshot["status"] != tdef["status"]:
-            final_event = create_event(
-                type="status_changed",
-                task_id=task_id,
-                actor=create_actor,
-                data={"from": snapshot["status"], "to": tdef["status"]},
-                ts=tdef.get("ts", ts["mon_9am"]),
+        if current_status != tdef["status"]:
+            all_events.append(
+                create_event(
+                    type="status_changed",
+                    task_id=task_id,
+                    actor=create_actor,
+                    data={"from": current_status, "to": tdef["status"]},
+                    ts=tdef.get("ts", ts["mon_9am"]),
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, final_event)
-            all_events.append(final_event)
-
-        # Apply assignment if present and not already set
-        if tdef.get("assigned_to") and snapshot.get("assigned_to") != tdef["assigned_to"]:
-            assign_event = create_event(
-                type="assignment_changed",
-                task_id=task_id,
-                actor=create_actor,
-                data={"from": None, "to": tdef["assigned_to"]},
-                ts=tdef.get("ts", ts["mon_9am"]),
+
+        # Assignment if present and not already set
+        if tdef.get("assigned_to") and current_assignee != tdef["assigned_to"]:
+            all_events.append(
+                create_event(
+                    type="assignment_changed",
+                    task_id=task_id,
+                    actor=create_actor,
+                    data={"from": None, "to": tdef["assigned_to"]},
+                    ts=tdef.get("ts", ts["mon_9am"]),
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, assign_event)
-            all_events.append(assign_event)
 
-        # Apply comments
+        # Comments
         for comment_body, comment_ts, comment_actor in tdef.get("comments", []):
-            comment_event = create_event(
-                type="comment_added",
-                task_id=task_id,
-                actor=comment_actor,
-                data={"body": comment_body},
-                ts=comment_ts,
+            all_events.append(
+                create_event(
+                    type="comment_added",
+                    task_id=task_id,
+                    actor=comment_actor,
+                    data={"body": comment_body},
+                    ts=comment_ts,
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, comment_event)
-            all_events.append(comment_event)
 
-        # Apply branch link
+        # Branch link
         if tdef.get("branch"):
-            branch_event = create_event(
-                type="branch_linked",
-                task_id=task_id,
-                actor=create_actor,
-                data={"branch": tdef["branch"]},
-                ts=tdef.get("ts", ts["mon_9am"]),
+            all_events.append(
+                create_event(
+                    type="branch_linked",
+                    task_id=task_id,
+                    actor=create_actor,
+                    data={"branch": tdef["branch"]},
+                    ts=tdef.get("ts", ts["mon_9am"]),
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, branch_event)
-            all_events.append(branch_event)
 
-        # Write all events + snapshot
-        write_task_event(lattice_dir, task_id, all_events, snapshot, config)
+        new_tasks.append((task_id, all_events, apply_events(None, all_events)))
+
+    # Write all events + snapshots in one bulk write
+    short_ids = write_new_tasks(lattice_dir, new_tasks, config, short_id_prefix="LGHT")
 
+    for task_id, sid, tdef in zip(task_ids, short_ids, task_defs, strict=True):
         # Scaffold plan
         plan_content = tdef.get("plan_content")
         if plan_content:
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
 from pathlib import Path
-from typing import NoReturn
+from typing import Any, NoReturn
 
 import click
 
@@ -94,6 +95,34 @@ def output_error(message: str, code: str, is_json: bool, exit_code: int = 1) ->
     raise SystemExit(exit_code)
 
 
+class TaskOpError(Exception):
+    """A task operation that cannot be applied, with the code to report it under.
+
+    Raised by the shared validation (:mod:`lattice.cli.task_ops`) so that a
+    single command can exit with it (:meth:`exit`) and ``lattice batch`` can
+    record it as one line's result.
+    """
+
+    def __init__(self, message: str, code: str, **details: object) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.details = details
+
+    @property
+    def error(self) -> dict:
+        """The error object for the JSON envelope, with any extra details."""
+        return {**json_error_obj(self.code, self.message), **self.details}
+
+    def exit(self, is_json: bool) -> NoReturn:
+        """Print the error as :func:`output_error` does and exit."""
+        if is_json:
+            click.echo(json_envelope(False, error=self.error))
+        else:
+            click.echo(f"Error: {self.message}", err=True)
+        raise SystemExit(1)
+
+
 def output_result(
     *,
     data: object,
@@ -128,6 +157,14 @@ def resolve_task_id(
     Accepts both ULIDs (``task_01...``) and short IDs (``LAT-42``).
     Exits with an error if the ID is unrecognized.
     """
+    try:
+        return lookup_task_id(lattice_dir, raw_id)
+    except TaskOpError as e:
+        e.exit(is_json)
+
+
+def lookup_task_id(lattice_dir: Path, raw_id: str) -> str:
+    """Like :func:`resolve_task_id`, but raise :class:`TaskOpError` instead of exiting."""
     # Direct ULID
     if validate_id(raw_id, "task"):
         return raw_id
@@ -138,18 +175,10 @@ def resolve_task_id(
         ulid = _resolve_short(lattice_dir, normalized)
         if ulid is not None:
             return ulid
-        output_error(
-            f"Short ID '{normalized}' not found.",
-            "NOT_FOUND",
-            is_json,
-        )
+        raise TaskOpError(f"Short ID '{normalized}' not found.", "NOT_FOUND")
 
     # Not a valid format
-    output_error(
-        f"Invalid task ID format: '{raw_id}'.",
-        "INVALID_ID",
-        is_json,
-    )
+    raise TaskOpError(f"Invalid task ID format: '{raw_id}'.", "INVALID_ID")
 
 
 # ---------------------------------------------------------------------------
@@ -248,7 +277,7 @@ def _store_actor(ctx: click.Context, _param: click.Parameter, value: str | None)
     ctx.obj["_actor"] = value
 
 
-def common_options(f):  # noqa: ANN001, ANN201
+def common_options(f: Callable[..., Any]) -> Callable[..., Any]:
     """Decorator adding common write-command options.
 
     Identity flags (``--name``, ``--actor``) are stored on the Click
@@ -258,6 +287,15 @@ def common_options(f):  # noqa: ANN001, ANN201
     """
     f = click.option("--quiet", is_flag=True, help="Print only the primary ID.")(f)
     f = click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")(f)
+    return provenance_options(f)
+
+
+def provenance_options(f: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator adding the identity and provenance options of ``common_options``.
+
+    For write commands with an output format of their own, which define
+    their own ``--quiet`` (if any) and take no ``--json``.
+    """
     f = click.option("--session", default=None, help="Session identifier (legacy).")(f)
     f = click.option("--model", default=None, help="Model identifier (legacy).")(f)
     f = click.option(
@@ -468,23 +506,37 @@ def check_plan_gate(
     """
     if target_status != "in_progress":
         return
+    try:
+        enforce_plan_gate(lattice_dir, task_id, force=force, reason=reason)
+    except TaskOpError as e:
+        e.exit(is_json)
+
+
+def enforce_plan_gate(
+    lattice_dir: Path,
+    task_id: str,
+    *,
+    snapshot: dict | None = None,
+    force: bool = False,
+    reason: str | None = None,
+) -> None:
+    """The plan gate of :func:`check_plan_gate`, raising :class:`TaskOpError`.
+
+    The task's description is taken from *snapshot* if given, else read
+    from its snapshot on disk.
+    """
     if force:
         if not reason:
-            output_error(
-                "--reason is required with --force.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
+            raise TaskOpError("--reason is required with --force.", "VALIDATION_ERROR")
         return
 
     plan_path = lattice_dir / "plans" / f"{task_id}.md"
     if not plan_path.exists():
-        output_error(
+        raise TaskOpError(
             f"Plan file missing for {task_id}. "
             "Write a plan before moving to in_progress. "
             "Override with --force --reason.",
             "PLAN_REQUIRED",
-            is_json,
         )
 
     try:
@@ -494,19 +546,17 @@ def check_plan_gate(
 
     # Load the task description so we can distinguish "plan is just the
     # auto-generated description" from "plan has real content".
-    description: str | None = None
-    snap_path = lattice_dir / "tasks" / f"{task_id}.json"
-    try:
-        snap = json.loads(snap_path.read_text())
-        description = snap.get("description")
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
-        pass
+    if snapshot is None:
+        try:
+            snapshot = read_snapshot(lattice_dir, task_id) or {}
+        except (json.JSONDecodeError, OSError):
+            snapshot = {}
+    description = snapshot.get("description")
 
     if is_scaffold_plan(content, description=description):
-        output_error(
+        raise TaskOpError(
             f"Plan for {task_id} is still scaffold. "
             "Write the plan (even one line) before moving to in_progress. "
             "Override with --force --reason.",
             "PLAN_REQUIRED",
-            is_json,
         )
@@ -21,9 +21,8 @@ from lattice.cli.main import cli
 from lattice.core.config import validate_status
 from lattice.core.events import create_event
 from lattice.core.ids import generate_task_id
-from lattice.core.tasks import apply_event_to_snapshot
-from lattice.storage.operations import scaffold_plan, write_task_event
-from lattice.storage.short_ids import allocate_short_id
+from lattice.core.tasks import apply_events
+from lattice.storage.operations import scaffold_plan, write_new_tasks
 
 DEFAULT_STATUS_MAP: dict[str, str] = {
     "Backlog": "backlog",
@@ -220,6 +219,13 @@ def import_github_project(
 
     project_code = config.get("project_code")
     subproject_code = config.get("subproject_code")
+    prefix = None
+    if project_code:
+        prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
+
+    # New tasks are collected and written together once the loop is done:
+    # (task_id, events, snapshot, title, issue_number, description)
+    pending: list[tuple[str, list[dict], dict, str, object, str]] = []
 
     for item in items:
         item_id = item.get("id", "")
@@ -249,12 +255,8 @@ def import_github_project(
                 click.echo(f"  [dry-run] #{issue_number or '?'}: {title} → {lattice_status}")
             continue
 
-        # Generate IDs
+        # Generate IDs (short IDs are reserved when the new tasks are written)
         task_id = generate_task_id()
-        short_id = None
-        if project_code:
-            prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
-            short_id, _ = allocate_short_id(lattice_dir, prefix, task_ulid=task_id)
 
         # Build custom fields
         custom_fields: dict = {}
@@ -282,15 +284,12 @@ def import_github_project(
             "priority": config.get("default_priority", "medium"),
             "custom_fields": custom_fields,
         }
-        if short_id:
-            event_data["short_id"] = short_id
         if description:
             event_data["description"] = description
         if tags:
             event_data["tags"] = tags
         if assigned_to:
             event_data["assigned_to"] = assigned_to
-
         try:
             event = create_event(
                 type="task_created",
@@ -303,17 +302,48 @@ def import_github_project(
                 on_behalf_of=on_behalf_of,
                 reason=provenance_reason,
             )
-            snapshot = apply_event_to_snapshot(None, event)
-            write_task_event(lattice_dir, task_id, [event], snapshot, config)
-            scaffold_plan(lattice_dir, task_id, title, short_id, description or None)
-            imported += 1
-
+            snapshot = apply_events(None, [event])
+        except Exception as exc:
+            errors.append({"title": title, "issue_number": issue_number, "error": str(exc)})
             if not quiet and not is_json:
-                click.echo(f"  [ok] #{issue_number or '?'}: {title} → {short_id or task_id[:12]}")
+                click.echo(f"  [error] #{issue_number or '?'}: {title} — {exc}")
+            continue
+        pending.append((task_id, [event], snapshot, title, issue_number, description))
+
+    # Write every new task in one bulk write. If that fails (it leaves no
+    # task behind and releases its short IDs), retry item by item so one bad
+    # item doesn't sink the rest.
+    written: list[tuple[tuple, str | None]] = []
+    try:
+        short_ids = write_new_tasks(
+            lattice_dir, [p[:3] for p in pending], config, short_id_prefix=prefix
+        )
+        written = list(zip(pending, short_ids, strict=True))
+    except Exception:
+        for entry in pending:
+            _task_id, _events, _snapshot, title, issue_number, _desc = entry
+            try:
+                (short_id,) = write_new_tasks(
+                    lattice_dir, [entry[:3]], config, short_id_prefix=prefix
+                )
+            except Exception as exc:
+                errors.append({"title": title, "issue_number": issue_number, "error": str(exc)})
+                if not quiet and not is_json:
+                    click.echo(f"  [error] #{issue_number or '?'}: {title} — {exc}")
+                continue
+            written.append((entry, short_id))
+
+    for (task_id, _events, _snapshot, title, issue_number, description), short_id in written:
+        try:
+            scaffold_plan(lattice_dir, task_id, title, short_id, description or None)
         except Exception as exc:
             errors.append({"title": title, "issue_number": issue_number, "error": str(exc)})
             if not quiet and not is_json:
                 click.echo(f"  [error] #{issue_number or '?'}: {title} — {exc}")
+            continue
+        imported += 1
+        if not quiet and not is_json:
+            click.echo(f"  [ok] #{issue_number or '?'}: {title} → {short_id or task_id[:12]}")
 
     # 8. Output summary
     summary = {
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
 from pathlib import Path
+from typing import Any
 
 import click
 
@@ -16,8 +22,9 @@ from lattice.cli.helpers import (
 from lattice.cli.main import cli
 from lattice.core.events import LIFECYCLE_EVENT_TYPES, serialize_event
 from lattice.core.ids import validate_id, validate_short_id, parse_short_id
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write
+from lattice.core.tasks import serialize_snapshot
+from lattice.storage.checkpoints import replay_task_log
+from lattice.storage.fs import atomic_write, ensure_index_dir
 from lattice.storage.locks import multi_lock
 from lattice.storage.short_ids import load_id_index, save_id_index
 
@@ -27,14 +34,26 @@ from lattice.storage.short_ids import load_id_index, save_id_index
 # ---------------------------------------------------------------------------
 
 
-def _parse_jsonl_file(path: Path) -> tuple[list[dict], list[dict]]:
+def _pool_map(pool: Executor | None, fn: Callable[[Any], Any], items: list) -> list:
+    """Map *fn* over *items* in order, on *pool* when given.
+
+    Results come back in input order regardless of which worker finishes
+    first, so everything derived from them is deterministic.
+    """
+    if pool is None:
+        return [fn(item) for item in items]
+    return list(pool.map(fn, items, chunksize=max(1, len(items) // 64)))
+
+
+def _parse_jsonl_file(path: Path, text: str | None = None) -> tuple[list[dict], list[dict]]:
     """Parse a JSONL file line by line.
 
     Returns (valid_events, findings) where findings contain any parse errors.
+    *text* is the file's content when the caller has already read it.
     """
     findings: list[dict] = []
     events: list[dict] = []
-    lines = path.read_text().splitlines()
+    lines = (path.read_text() if text is None else text).splitlines()
 
     for i, line in enumerate(lines):
         stripped = line.strip()
@@ -149,6 +168,179 @@ def _collect_artifact_meta_files(lattice_dir: Path) -> list[Path]:
     return []
 
 
+# ---------------------------------------------------------------------------
+# doctor: per-file digests and the incremental manifest
+# ---------------------------------------------------------------------------
+
+DOCTOR_MANIFEST_FILE = "doctor_manifest.json"
+
+# Bump when a digest's shape or the per-file checks change.
+DOCTOR_MANIFEST_VERSION = 1
+
+
+def _snapshot_digest(snap: dict) -> dict:
+    """Reduce a task snapshot to the fields the cross-file checks read."""
+    # Read artifact refs from evidence_refs (new) or artifact_refs (legacy)
+    evidence_refs = snap.get("evidence_refs")
+    if evidence_refs is not None:
+        art_ids = [ref["id"] for ref in evidence_refs if ref.get("source_type") == "artifact"]
+    else:
+        art_ids = [
+            (ref["id"] if isinstance(ref, dict) else ref) for ref in snap.get("artifact_refs", [])
+        ]
+    return {
+        "last_event_id": snap.get("last_event_id"),
+        "short_id": snap.get("short_id"),
+        "relationships_out": [
+            {"type": rel.get("type"), "target_task_id": rel.get("target_task_id")}
+            for rel in snap.get("relationships_out", [])
+        ],
+        "artifact_ids": art_ids,
+    }
+
+
+def _digest_file(path: Path, kind: str, text: str) -> dict:
+    """Parse one file and return what doctor needs from it.
+
+    *kind* is ``json``, ``snapshot``, ``jsonl`` or ``lifecycle``. Digests are
+    plain JSON so they can be cached in the manifest and sent between processes.
+    """
+    if kind in ("json", "snapshot"):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            return {"ok": False, "error": str(e)}
+        if kind == "snapshot":
+            return {"ok": True, "snapshot": _snapshot_digest(data)}
+        return {"ok": True}
+
+    events, findings = _parse_jsonl_file(path, text)
+    if kind == "lifecycle":
+        return {
+            "findings": findings,
+            "events": [[ev.get("id", ""), ev.get("type"), ev.get("task_id")] for ev in events],
+        }
+    return {
+        "findings": findings,
+        "count": len(events),
+        "last_id": events[-1].get("id") if events else None,
+        "lifecycle": [
+            [ev.get("id", ""), ev.get("type")]
+            for ev in events
+            if ev.get("type") in LIFECYCLE_EVENT_TYPES
+        ],
+        "bad_ids": [
+            [ev["id"], ev.get("task_id")]
+            for ev in events
+            if ev.get("id") and not validate_id(ev["id"], "ev")
+        ],
+    }
+
+
+def _check_file(job: tuple[Path, str, str | None]) -> tuple[int, int, str, dict | None]:
+    """Read, hash and digest one file.
+
+    Returns (size, mtime_ns, content_hash, digest). The digest is None when
+    the content hash equals *known_hash*, i.e. a cached digest is still valid.
+    Module-level so it can run in a worker process.
+    """
+    path, kind, known_hash = job
+    with open(path, "rb") as fh:
+        st = os.fstat(fh.fileno())
+        raw = fh.read()
+    content_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if content_hash == known_hash:
+        return st.st_size, st.st_mtime_ns, content_hash, None
+    return st.st_size, st.st_mtime_ns, content_hash, _digest_file(path, kind, raw.decode())
+
+
+def _load_doctor_manifest(lattice_dir: Path) -> dict:
+    try:
+        manifest = json.loads((lattice_dir / "index" / DOCTOR_MANIFEST_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != DOCTOR_MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _save_doctor_manifest(lattice_dir: Path, scan_started_ns: int, files: dict) -> None:
+    manifest = {
+        "version": DOCTOR_MANIFEST_VERSION,
+        "scan_started_ns": scan_started_ns,
+        "files": files,
+    }
+    path = lattice_dir / "index" / DOCTOR_MANIFEST_FILE
+    try:
+        ensure_index_dir(path.parent)
+        atomic_write(
+            path, json.dumps(manifest, sort_keys=True, separators=(",", ":")), durable=False
+        )
+    except OSError:
+        pass  # derived data; the next incremental run re-checks everything
+
+
+def _digest_files(
+    lattice_dir: Path,
+    files: list[tuple[Path, str]],
+    *,
+    incremental: bool,
+    pool: Executor | None,
+) -> tuple[dict[Path, dict], int]:
+    """Digest every (path, kind) in *files*, returning ({path: digest}, files re-read).
+
+    In incremental mode a file whose size and mtime match the manifest reuses
+    its cached digest without being read. A file whose stat changed is hashed,
+    and only re-parsed if its content changed too. Files modified at or after
+    the previous scan started are always hashed, since their mtime may not
+    have ticked since the manifest entry was taken. The manifest is then
+    rewritten to cover exactly the files seen.
+
+    Cross-file checks always run over the full set of digests, so anything
+    that references a changed file is re-evaluated as well.
+    """
+    scan_started_ns = time.time_ns()
+    cached: dict = {}
+    racy_after = 0
+    if incremental:
+        manifest = _load_doctor_manifest(lattice_dir)
+        cached = manifest.get("files", {})
+        racy_after = manifest.get("scan_started_ns", 0)
+
+    digests: dict[Path, dict] = {}
+    jobs: list[tuple[Path, str, str | None]] = []
+    entries: dict[str, list] = {}
+    for path, kind in files:
+        rel = path.relative_to(lattice_dir).as_posix()
+        entry = cached.get(rel)
+        if entry is not None and entry[4] == kind:
+            st = path.stat()
+            if (
+                st.st_size == entry[0]
+                and st.st_mtime_ns == entry[1]
+                and st.st_mtime_ns < racy_after
+            ):
+                digests[path] = entry[3]
+                entries[rel] = entry
+                continue
+            jobs.append((path, kind, entry[2]))
+        else:
+            jobs.append((path, kind, None))
+
+    for (path, kind, _), (size, mtime_ns, content_hash, digest) in zip(
+        jobs, _pool_map(pool, _check_file, jobs), strict=True
+    ):
+        rel = path.relative_to(lattice_dir).as_posix()
+        if digest is None:
+            digest = cached[rel][3]
+        digests[path] = digest
+        entries[rel] = [size, mtime_ns, content_hash, digest, kind]
+
+    if incremental:
+        _save_doctor_manifest(lattice_dir, scan_started_ns, dict(sorted(entries.items())))
+    return digests, len(jobs)
+
+
 # ---------------------------------------------------------------------------
 # lattice doctor
 # ---------------------------------------------------------------------------
@@ -156,8 +348,20 @@ def _collect_artifact_meta_files(lattice_dir: Path) -> list[Path]:
 
 @cli.command()
 @click.option("--fix", is_flag=True, help="Attempt to fix detected issues.")
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-parse files changed since the last incremental run.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for parsing files.",
+)
 @click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
-def doctor(fix: bool, output_json: bool) -> None:
+def doctor(fix: bool, incremental: bool, jobs: int, output_json: bool) -> None:
     """Check project integrity and report issues."""
     is_json = output_json
     lattice_dir = require_root(is_json)
@@ -188,26 +392,52 @@ def doctor(fix: bool, output_json: bool) -> None:
     if config_path.exists():
         json_files.append(config_path)
 
+    all_jsonl_files = list(event_files)
+    lifecycle_log_path = lattice_dir / "events" / "_lifecycle.jsonl"
+    if lifecycle_log_path.exists():
+        all_jsonl_files.append(lifecycle_log_path)
+    resource_event_files = _collect_resource_event_files(lattice_dir)
+
+    # Parse every file up front (in parallel with --jobs, from the manifest with
+    # --incremental); the checks below only look at the resulting digests.
+    kinds: list[tuple[Path, str]] = []
+    for jf in json_files:
+        is_snapshot = jf.parent.name == "tasks"
+        kinds.append((jf, "snapshot" if is_snapshot else "json"))
+    for jf in all_jsonl_files:
+        kinds.append((jf, "lifecycle" if jf.name == "_lifecycle.jsonl" else "jsonl"))
+    kinds.extend((ref, "jsonl") for ref in resource_event_files)
+
+    pool = None
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        digests, checked_files = _digest_files(
+            lattice_dir, kinds, incremental=incremental, pool=pool
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
     json_ok = True
     for jf in json_files:
-        try:
-            data = json.loads(jf.read_text())
+        digest = digests[jf]
+        if digest["ok"]:
             # Store snapshot data for later checks
-            if jf.parent.name in ("tasks",) and jf.suffix == ".json":
-                snapshots[jf.stem] = data
-                known_task_ids.add(jf.stem)
-            elif jf.parent.parent.name == "archive" and jf.parent.name == "tasks":
-                snapshots[jf.stem] = data
+            if "snapshot" in digest:
+                snapshots[jf.stem] = digest["snapshot"]
                 known_task_ids.add(jf.stem)
             elif jf.parent.name == "meta":
                 known_artifact_ids.add(jf.stem)
-        except json.JSONDecodeError as e:
+        else:
             json_ok = False
             findings.append(
                 {
                     "level": "error",
                     "check": "json_parse",
-                    "message": f"Invalid JSON in {jf.name}: {e}",
+                    "message": f"Invalid JSON in {jf.name}: {digest['error']}",
                     "task_id": jf.stem if jf.stem.startswith("task_") else None,
                 }
             )
@@ -215,18 +445,14 @@ def doctor(fix: bool, output_json: bool) -> None:
     # -----------------------------------------------------------------
     # Check 2: JSONL parseability
     # -----------------------------------------------------------------
-    all_jsonl_files = list(event_files)
-    lifecycle_log_path = lattice_dir / "events" / "_lifecycle.jsonl"
-    if lifecycle_log_path.exists():
-        all_jsonl_files.append(lifecycle_log_path)
-
     jsonl_ok = True
-    per_task_events: dict[str, list[dict]] = {}
-    global_events: list[dict] = []
+    per_task_logs: dict[str, dict] = {}
+    global_events: list[list] = []
     total_event_count = 0
 
     for jf in all_jsonl_files:
-        events, parse_findings = _parse_jsonl_file(jf)
+        digest = digests[jf]
+        parse_findings = [dict(f) for f in digest["findings"]]
         if parse_findings:
             jsonl_ok = False
             if fix:
@@ -238,11 +464,11 @@ def doctor(fix: bool, output_json: bool) -> None:
             findings.extend(parse_findings)
 
         if jf.name == "_lifecycle.jsonl":
-            global_events = events
+            global_events = digest["events"]
         else:
             task_id = jf.stem
-            per_task_events[task_id] = events
-            total_event_count += len(events)
+            per_task_logs[task_id] = digest
+            total_event_count += digest["count"]
 
     event_count = total_event_count
 
@@ -257,9 +483,9 @@ def doctor(fix: bool, output_json: bool) -> None:
         if not snap_path.exists():
             continue  # archived task, skip drift check
         last_event_id = snap.get("last_event_id")
-        events = per_task_events.get(task_id, [])
-        if events:
-            actual_last_id = events[-1].get("id")
+        log = per_task_logs.get(task_id)
+        if log and log["count"]:
+            actual_last_id = log["last_id"]
             if last_event_id != actual_last_id:
                 drift_ok = False
                 findings.append(
@@ -300,16 +526,7 @@ def doctor(fix: bool, output_json: bool) -> None:
     # -----------------------------------------------------------------
     artifacts_ok = True
     for task_id, snap in snapshots.items():
-        # Read artifact refs from evidence_refs (new) or artifact_refs (legacy)
-        evidence_refs = snap.get("evidence_refs")
-        if evidence_refs is not None:
-            art_ids = [ref["id"] for ref in evidence_refs if ref.get("source_type") == "artifact"]
-        else:
-            art_ids = [
-                (ref["id"] if isinstance(ref, dict) else ref)
-                for ref in snap.get("artifact_refs", [])
-            ]
-        for art_id in art_ids:
+        for art_id in snap["artifact_ids"]:
             if art_id not in known_artifact_ids:
                 artifacts_ok = False
                 findings.append(
@@ -375,19 +592,17 @@ def doctor(fix: bool, output_json: bool) -> None:
                     "task_id": task_id,
                 }
             )
-    for events in per_task_events.values():
-        for ev in events:
-            ev_id = ev.get("id", "")
-            if ev_id and not validate_id(ev_id, "ev"):
-                ids_ok = False
-                findings.append(
-                    {
-                        "level": "warning",
-                        "check": "malformed_id",
-                        "message": f"Malformed event ID: {ev_id}",
-                        "task_id": ev.get("task_id"),
-                    }
-                )
+    for log in per_task_logs.values():
+        for ev_id, ev_task_id in log["bad_ids"]:
+            ids_ok = False
+            findings.append(
+                {
+                    "level": "warning",
+                    "check": "malformed_id",
+                    "message": f"Malformed event ID: {ev_id}",
+                    "task_id": ev_task_id,
+                }
+            )
     for art_id in known_artifact_ids:
         if not validate_id(art_id, "art"):
             ids_ok = False
@@ -406,37 +621,40 @@ def doctor(fix: bool, output_json: bool) -> None:
     global_ok = True
     # Build a set of (event_id) from global log
     global_event_ids: set[str] = set()
-    for ev in global_events:
-        global_event_ids.add(ev.get("id", ""))
+    for ev_id, _, _ in global_events:
+        global_event_ids.add(ev_id)
 
     # Every lifecycle event in per-task logs should be in global
-    for task_id, events in per_task_events.items():
-        for ev in events:
-            if ev.get("type") in LIFECYCLE_EVENT_TYPES:
-                ev_id = ev.get("id", "")
-                if ev_id not in global_event_ids:
-                    global_ok = False
-                    findings.append(
-                        {
-                            "level": "warning",
-                            "check": "global_log_consistency",
-                            "message": (
-                                f"Lifecycle event {ev_id} ({ev.get('type')}) "
-                                f"for {task_id} missing from _lifecycle.jsonl"
-                            ),
-                            "task_id": task_id,
-                        }
-                    )
-
-    # Also check the reverse: every event in global should exist in a per-task log
-    # Build set of all event IDs from per-task logs
-    all_per_task_event_ids: set[str] = set()
-    for events in per_task_events.values():
-        for ev in events:
-            all_per_task_event_ids.add(ev.get("id", ""))
+    lifecycle_event_ids: set[str] = set()
+    for task_id, log in per_task_logs.items():
+        for ev_id, ev_type in log["lifecycle"]:
+            lifecycle_event_ids.add(ev_id)
+            if ev_id not in global_event_ids:
+                global_ok = False
+                findings.append(
+                    {
+                        "level": "warning",
+                        "check": "global_log_consistency",
+                        "message": (
+                            f"Lifecycle event {ev_id} ({ev_type}) "
+                            f"for {task_id} missing from _lifecycle.jsonl"
+                        ),
+                        "task_id": task_id,
+                    }
+                )
 
-    for ev in global_events:
-        ev_id = ev.get("id", "")
+    # Also check the reverse: every event in global should exist in a per-task log.
+    # Digests only keep lifecycle event IDs, so only when one is unmatched are
+    # the per-task logs re-read for the full set of event IDs.
+    all_per_task_event_ids: set[str] | None = None
+    for ev_id, ev_type, ev_task_id in global_events:
+        if ev_id in lifecycle_event_ids:
+            continue
+        if all_per_task_event_ids is None:
+            all_per_task_event_ids = set()
+            for jf in event_files:
+                for ev in _parse_jsonl_file(jf)[0]:
+                    all_per_task_event_ids.add(ev.get("id", ""))
         if ev_id not in all_per_task_event_ids:
             global_ok = False
             findings.append(
@@ -444,10 +662,9 @@ def doctor(fix: bool, output_json: bool) -> None:
                     "level": "warning",
                     "check": "global_log_consistency",
                     "message": (
-                        f"Lifecycle log event {ev_id} ({ev.get('type')}) "
-                        f"has no matching per-task event"
+                        f"Lifecycle log event {ev_id} ({ev_type}) has no matching per-task event"
                     ),
-                    "task_id": ev.get("task_id"),
+                    "task_id": ev_task_id,
                 }
             )
 
@@ -573,7 +790,6 @@ def doctor(fix: bool, output_json: bool) -> None:
     # -----------------------------------------------------------------
     resource_ok = True
     resource_snap_files = _collect_resource_snapshot_files(lattice_dir)
-    resource_event_files = _collect_resource_event_files(lattice_dir)
     resource_count = len(resource_snap_files)
 
     # Parse resource snapshots
@@ -595,21 +811,21 @@ def doctor(fix: bool, output_json: bool) -> None:
             )
 
     # Parse resource event files and check drift
-    per_resource_events: dict[str, list[dict]] = {}
+    per_resource_logs: dict[str, dict] = {}
     for ref in resource_event_files:
         res_id = ref.stem
-        r_events, r_findings = _parse_jsonl_file(ref)
-        if r_findings:
+        r_digest = digests[ref]
+        if r_digest["findings"]:
             resource_ok = False
-            findings.extend(r_findings)
-        per_resource_events[res_id] = r_events
+            findings.extend(dict(f) for f in r_digest["findings"])
+        per_resource_logs[res_id] = r_digest
 
     # Check snapshot drift for resources
     for res_id, rsnap in resource_snapshots.items():
         last_event_id = rsnap.get("last_event_id")
-        r_events = per_resource_events.get(res_id, [])
-        if r_events:
-            actual_last_id = r_events[-1].get("id")
+        r_log = per_resource_logs.get(res_id)
+        if r_log and r_log["count"]:
+            actual_last_id = r_log["last_id"]
             if last_event_id != actual_last_id:
                 resource_ok = False
                 findings.append(
@@ -645,6 +861,61 @@ def doctor(fix: bool, output_json: bool) -> None:
                     }
                 )
 
+    # -----------------------------------------------------------------
+    # Check 12: Changefeed completeness
+    # -----------------------------------------------------------------
+    # Every event reaches the changefeed after its own log, so a crash in
+    # between leaves the feed short; readers that follow it (search index,
+    # stats aggregates) would never see the event. A feed merged by git
+    # from two branches repeats and reorders sequence numbers instead.
+    # Readers never repair the feed themselves; only --fix and rebuild do.
+    from lattice.storage.changefeed import changefeed_path, last_seq
+    from lattice.storage.event_log import EventLog
+
+    feed_ok = True
+    logged_events = total_event_count + sum(log["count"] for log in per_resource_logs.values())
+    missing_from_feed = logged_events - last_seq(lattice_dir)
+    out_of_order = 0
+    highest = 0
+    for record in EventLog(changefeed_path(lattice_dir)).iter_events():
+        seq = record.get("seq")
+        if isinstance(seq, int):
+            if seq <= highest:
+                out_of_order += 1
+            highest = max(highest, seq)
+    # (present tense, past tense) per problem
+    feed_problems: list[tuple[str, str]] = []
+    if missing_from_feed > 0:
+        events_text = f"{missing_from_feed} event{'s' if missing_from_feed != 1 else ''}"
+        feed_problems.append((f"is missing {events_text}", f"was missing {events_text}"))
+    if out_of_order:
+        records_text = (
+            f"{out_of_order} record{'s' if out_of_order != 1 else ''} numbered out of order"
+        )
+        feed_problems.append((f"has {records_text}", f"had {records_text}"))
+    if feed_problems:
+        feed_ok = False
+        finding = {
+            "level": "warning",
+            "check": "changefeed_consistency",
+            "message": (
+                f"Changefeed {' and '.join(p for p, _ in feed_problems)} "
+                "(run 'lattice rebuild --all' to regenerate it)"
+            ),
+            "task_id": None,
+        }
+        if fix:
+            _rebuild_changefeed(lattice_dir)
+            finding["message"] = (
+                f"Changefeed {' and '.join(p for _, p in feed_problems)} "
+                "(fixed by regenerating it)"
+            )
+        findings.append(finding)
+
+    # Ordinary reads only sweep when a snapshot directory changed; catch the
+    # snapshot index up with files rewritten in place as well.
+    _sweep_snapshot_index(lattice_dir)
+
     # -----------------------------------------------------------------
     # Output
     # -----------------------------------------------------------------
@@ -676,6 +947,7 @@ def doctor(fix: bool, output_json: bool) -> None:
                         "warnings": warnings,
                         "errors": errors,
                     },
+                    "files": {"total": len(kinds), "read": checked_files},
                 },
             )
         )
@@ -683,6 +955,8 @@ def doctor(fix: bool, output_json: bool) -> None:
         click.echo(
             f"Checking {task_count} tasks, {event_count} events, {artifact_count} artifacts..."
         )
+        if incremental:
+            click.echo(f"Re-read {checked_files} of {len(kinds)} files changed since last run")
 
         # Report each check category
         if json_ok:
@@ -763,6 +1037,13 @@ def doctor(fix: bool, output_json: bool) -> None:
                     if f["check"] == "resource_integrity":
                         click.echo(f"\u26a0 {f['message']}")
 
+        if feed_ok:
+            click.echo("\u2713 Changefeed complete")
+        else:
+            for f in findings:
+                if f["check"] == "changefeed_consistency":
+                    click.echo(f"\u26a0 {f['message']}")
+
         total = warnings + errors
         if total == 0:
             click.echo("\nNo issues found.")
@@ -784,7 +1065,7 @@ def doctor(fix: bool, output_json: bool) -> None:
 # ---------------------------------------------------------------------------
 
 
-def _rebuild_task(lattice_dir: Path, task_id: str) -> dict:
+def _rebuild_task(lattice_dir: Path, task_id: str, use_checkpoints: bool = True) -> dict:
     """Rebuild a single task snapshot from its event log.
 
     Returns the rebuilt snapshot dict.
@@ -797,33 +1078,68 @@ def _rebuild_task(lattice_dir: Path, task_id: str) -> dict:
     if not event_path.exists():
         raise FileNotFoundError(f"No event log found for {task_id}")
 
-    # Parse events
-    events: list[dict] = []
-    for line in event_path.read_text().splitlines():
-        stripped = line.strip()
-        if stripped:
-            events.append(json.loads(stripped))
+    # Replay from the nearest valid checkpoint (or the start of the log)
+    return replay_task_log(lattice_dir, task_id, event_path, use_checkpoints=use_checkpoints)
 
-    if not events:
-        raise ValueError(f"Event log for {task_id} is empty")
 
-    # Replay events
-    snapshot: dict | None = None
-    for event in events:
-        snapshot = apply_event_to_snapshot(snapshot, event)
+def _task_event_files(lattice_dir: Path) -> list[tuple[Path, Path]]:
+    """Return (event_file, target_tasks_dir) for every task log, active then archived."""
+    jobs: list[tuple[Path, Path]] = []
+    for event_dir, target_tasks_dir in [
+        (lattice_dir / "events", lattice_dir / "tasks"),
+        (lattice_dir / "archive" / "events", lattice_dir / "archive" / "tasks"),
+    ]:
+        if not event_dir.is_dir():
+            continue
+        for jsonl_file in sorted(event_dir.glob("*.jsonl")):
+            if jsonl_file.name == "_lifecycle.jsonl":
+                continue
+            # Skip resource event files (handled separately)
+            if jsonl_file.stem.startswith("res_"):
+                continue
+            jobs.append((jsonl_file, target_tasks_dir))
+    return jobs
 
-    assert snapshot is not None
-    return snapshot
+
+def _rebuild_task_job(job: tuple[Path, str, Path, bool]) -> str | None:
+    """Rebuild and write one task snapshot. Returns an error message, or None.
+
+    Module-level so it can run in a worker process.
+    """
+    lattice_dir, task_id, snapshot_path, use_checkpoints = job
+    try:
+        snapshot = _rebuild_task(lattice_dir, task_id, use_checkpoints)
+    except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
+        return str(e)
+    with multi_lock(lattice_dir / "locks", [f"tasks_{task_id}"]):
+        atomic_write(snapshot_path, serialize_snapshot(snapshot))
+    return None
+
+
+def _lifecycle_events_in(path: Path) -> list[dict]:
+    """Return the lifecycle events recorded in one per-task event log."""
+    events: list[dict] = []
+    for line in path.read_text().splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        try:
+            event = json.loads(stripped)
+        except json.JSONDecodeError:
+            continue  # skip malformed lines during rebuild
+        if event.get("type") in LIFECYCLE_EVENT_TYPES:
+            events.append(event)
+    return events
 
 
-def _rebuild_lifecycle_log(lattice_dir: Path) -> list[str]:
+def _rebuild_lifecycle_log(lattice_dir: Path, pool: Executor | None = None) -> list[str]:
     """Rebuild _lifecycle.jsonl from all per-task event logs.
 
+    When *pool* is given, the per-file scans run on it.
     Returns list of rebuilt task IDs (for reporting).
     """
-    all_lifecycle_events: list[dict] = []
-
     # Scan all per-task event logs (active + archive)
+    files: list[Path] = []
     for directory in [
         lattice_dir / "events",
         lattice_dir / "archive" / "events",
@@ -833,16 +1149,11 @@ def _rebuild_lifecycle_log(lattice_dir: Path) -> list[str]:
         for jsonl_file in sorted(directory.glob("*.jsonl")):
             if jsonl_file.name == "_lifecycle.jsonl":
                 continue
-            for line in jsonl_file.read_text().splitlines():
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                try:
-                    event = json.loads(stripped)
-                except json.JSONDecodeError:
-                    continue  # skip malformed lines during rebuild
-                if event.get("type") in LIFECYCLE_EVENT_TYPES:
-                    all_lifecycle_events.append(event)
+            files.append(jsonl_file)
+
+    all_lifecycle_events: list[dict] = []
+    for events in _pool_map(pool, _lifecycle_events_in, files):
+        all_lifecycle_events.extend(events)
 
     # Sort by (ts, id) for deterministic ordering
     all_lifecycle_events.sort(key=lambda e: (e.get("ts", ""), e.get("id", "")))
@@ -858,26 +1169,62 @@ def _rebuild_lifecycle_log(lattice_dir: Path) -> list[str]:
     return [e.get("task_id", "") for e in all_lifecycle_events]
 
 
-def _rebuild_id_index(lattice_dir: Path) -> None:
-    """Rebuild ``ids.json`` from all task snapshots (active + archived)."""
-    id_map: dict[str, str] = {}
-    max_seq: dict[str, int] = {}  # per-prefix max seq
+def _rebuild_changefeed(lattice_dir: Path, pool: Executor | None = None) -> int:
+    """Regenerate ``changes.jsonl`` from every task and resource log.
 
+    Events are ordered by (ts, id), as in the lifecycle log, and numbered
+    from 1. The search index and stats aggregates track feed positions, so
+    they are dropped and rebuilt on next use. When *pool* is given, the
+    per-file scans run on it. Returns the number of records written.
+    """
+    from lattice.storage.changefeed import rewrite_changes
+    from lattice.storage.search_index import drop_search_index
+    from lattice.storage.stats_aggregates import drop_aggregates
+
+    files = _collect_event_files(lattice_dir) + _collect_resource_event_files(lattice_dir)
+    events: list[dict] = []
+    for parsed, _findings in _pool_map(pool, _parse_jsonl_file, files):
+        events.extend(parsed)
+    events.sort(key=lambda e: (e.get("ts", ""), e.get("id", "")))
+
+    count = rewrite_changes(lattice_dir, events)
+    drop_search_index(lattice_dir)
+    drop_aggregates(lattice_dir)
+    return count
+
+
+def _short_id_entry(snap_file: Path) -> tuple[str, str] | None:
+    """Return (short_id, task_id) from a snapshot file, or None if it has none."""
+    try:
+        snap = json.loads(snap_file.read_text())
+    except (json.JSONDecodeError, OSError):
+        return None
+    short_id = snap.get("short_id")
+    if short_id and validate_short_id(short_id):
+        return short_id, snap.get("id", snap_file.stem)
+    return None
+
+
+def _rebuild_id_index(lattice_dir: Path, pool: Executor | None = None) -> None:
+    """Rebuild ``ids.json`` from all task snapshots (active + archived).
+
+    When *pool* is given, snapshot files are read on it.
+    """
+    snap_files: list[Path] = []
     for directory in [lattice_dir / "tasks", lattice_dir / "archive" / "tasks"]:
-        if not directory.is_dir():
+        if directory.is_dir():
+            snap_files.extend(sorted(directory.glob("*.json")))
+
+    id_map: dict[str, str] = {}
+    max_seq: dict[str, int] = {}  # per-prefix max seq
+    for entry in _pool_map(pool, _short_id_entry, snap_files):
+        if entry is None:
             continue
-        for snap_file in sorted(directory.glob("*.json")):
-            try:
-                snap = json.loads(snap_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            short_id = snap.get("short_id")
-            if short_id and validate_short_id(short_id):
-                task_ulid = snap.get("id", snap_file.stem)
-                id_map[short_id] = task_ulid
-                prefix, num = parse_short_id(short_id)
-                if prefix not in max_seq or num > max_seq[prefix]:
-                    max_seq[prefix] = num
+        short_id, task_ulid = entry
+        id_map[short_id] = task_ulid
+        prefix, num = parse_short_id(short_id)
+        if prefix not in max_seq or num > max_seq[prefix]:
+            max_seq[prefix] = num
 
     # Compute per-prefix next_seqs (v2 schema)
     next_seqs: dict[str, int] = {}
@@ -892,6 +1239,44 @@ def _rebuild_id_index(lattice_dir: Path) -> None:
     save_id_index(lattice_dir, index)
 
 
+def _rebuild_snapshot_index(lattice_dir: Path) -> int:
+    """Regenerate the snapshot index (``index/snapshots.db``) from the snapshot files.
+
+    Returns the number of indexed tasks. The search index and stats
+    aggregates are dropped too and rebuilt on next use. The rest of
+    ``index/`` (replay checkpoints, cached event counts, the doctor manifest
+    and the commit cache) is left alone: each entry there is validated
+    against the file or git history it was derived from before use.
+    """
+    from lattice.storage.search_index import drop_search_index
+    from lattice.storage.snapshot_store import SnapshotStore
+    from lattice.storage.stats_aggregates import drop_aggregates
+
+    drop_search_index(lattice_dir)
+    drop_aggregates(lattice_dir)
+    with SnapshotStore(lattice_dir) as store:
+        return store.rebuild()
+
+
+def _sweep_snapshot_index(lattice_dir: Path, task_ids: list[str] | None = None) -> None:
+    """Re-check snapshot files against the index (all of them, or just *task_ids*).
+
+    Best-effort: the index is derived, and ``rebuild --index`` regenerates it.
+    """
+    import sqlite3
+
+    from lattice.storage.snapshot_store import SnapshotStore
+
+    try:
+        with SnapshotStore(lattice_dir) as store:
+            if task_ids is None:
+                store.sweep()
+            else:
+                store.refresh_tasks(task_ids)
+    except (sqlite3.Error, OSError):
+        pass
+
+
 def _rebuild_resource(lattice_dir: Path, resource_id: str) -> dict:
     """Rebuild a single resource snapshot from its event log.
 
@@ -921,15 +1306,69 @@ def _rebuild_resource(lattice_dir: Path, resource_id: str) -> dict:
     return snapshot
 
 
+def _rebuild_resource_job(job: tuple[Path, str]) -> tuple[str | None, str | None]:
+    """Rebuild and write one resource snapshot.
+
+    Returns (resource_name, None) on success or (None, error message).
+    Module-level so it can run in a worker process.
+    """
+    from lattice.core.resources import serialize_resource_snapshot
+
+    lattice_dir, resource_id = job
+    try:
+        res_snapshot = _rebuild_resource(lattice_dir, resource_id)
+    except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
+        return None, str(e)
+    res_name = res_snapshot.get("name", resource_id)
+    resource_dir = lattice_dir / "resources" / res_name
+    resource_dir.mkdir(parents=True, exist_ok=True)
+    with multi_lock(lattice_dir / "locks", [f"resources_{res_name}"]):
+        atomic_write(resource_dir / "resource.json", serialize_resource_snapshot(res_snapshot))
+    return res_name, None
+
+
 @cli.command()
 @click.argument("task_id", required=False, default=None)
 @click.option("--all", "rebuild_all", is_flag=True, help="Rebuild all tasks.")
+@click.option(
+    "--index",
+    "rebuild_index",
+    is_flag=True,
+    help="Regenerate the snapshot index only (search and stats caches are dropped too).",
+)
+@click.option(
+    "--no-checkpoints",
+    is_flag=True,
+    help="Replay every event log from the start and rewrite its checkpoints.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for --all.",
+)
 @click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
-def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
+def rebuild(
+    task_id: str | None,
+    rebuild_all: bool,
+    rebuild_index: bool,
+    no_checkpoints: bool,
+    jobs: int,
+    output_json: bool,
+) -> None:
     """Rebuild task snapshots from event logs."""
     is_json = output_json
     lattice_dir = require_root(is_json)
 
+    if rebuild_index and task_id is None and not rebuild_all:
+        indexed = _rebuild_snapshot_index(lattice_dir)
+        if is_json:
+            click.echo(json_envelope(True, data={"index_rebuilt": True, "indexed_tasks": indexed}))
+        else:
+            click.echo(f"Rebuilt snapshot index ({indexed} task{'s' if indexed != 1 else ''})")
+        return
+
     # Validate arguments: exactly one of task_id or --all
     if task_id is not None and rebuild_all:
         output_error(
@@ -939,75 +1378,83 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
         )
     if task_id is None and not rebuild_all:
         output_error(
-            "Provide a task ID or use --all.",
+            "Provide a task ID or use --all (or --index).",
             "VALIDATION_ERROR",
             is_json,
         )
 
     if rebuild_all:
-        # Rebuild all tasks (active + archived)
-        rebuilt_ids: list[str] = []
-
-        # Collect event files from both active and archive directories
-        event_dirs = [
-            (lattice_dir / "events", lattice_dir / "tasks"),
-            (lattice_dir / "archive" / "events", lattice_dir / "archive" / "tasks"),
-        ]
-
-        for event_dir, target_tasks_dir in event_dirs:
-            if not event_dir.is_dir():
-                continue
-            for jsonl_file in sorted(event_dir.glob("*.jsonl")):
-                if jsonl_file.name == "_lifecycle.jsonl":
-                    continue
-                # Skip resource event files (handled separately)
-                if jsonl_file.stem.startswith("res_"):
-                    continue
-                tid = jsonl_file.stem
-                try:
-                    snapshot = _rebuild_task(lattice_dir, tid)
-                except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
-                    if is_json:
-                        output_error(str(e), "REBUILD_ERROR", is_json)
-                    else:
-                        click.echo(f"Error rebuilding {tid}: {e}", err=True)
-                    continue
-
-                # Write snapshot to the correct location (active or archive)
-                snapshot_path = target_tasks_dir / f"{tid}.json"
-                locks_dir = lattice_dir / "locks"
-                with multi_lock(locks_dir, [f"tasks_{tid}"]):
-                    atomic_write(snapshot_path, serialize_snapshot(snapshot))
-                rebuilt_ids.append(tid)
-
-        # Rebuild lifecycle log
-        _rebuild_lifecycle_log(lattice_dir)
-
-        # Rebuild ids.json from snapshots
-        _rebuild_id_index(lattice_dir)
-
-        # Rebuild resource snapshots
-        rebuilt_resources: list[str] = []
-        resource_event_files = _collect_resource_event_files(lattice_dir)
-        for ref in resource_event_files:
-            res_id = ref.stem
-            try:
-                from lattice.core.resources import serialize_resource_snapshot
-
-                res_snapshot = _rebuild_resource(lattice_dir, res_id)
-                res_name = res_snapshot.get("name", res_id)
-                resource_dir = lattice_dir / "resources" / res_name
-                resource_dir.mkdir(parents=True, exist_ok=True)
-                snapshot_path = resource_dir / "resource.json"
-                locks_dir = lattice_dir / "locks"
-                with multi_lock(locks_dir, [f"resources_{res_name}"]):
-                    atomic_write(snapshot_path, serialize_resource_snapshot(res_snapshot))
-                rebuilt_resources.append(res_name)
-            except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
-                if is_json:
-                    output_error(str(e), "REBUILD_ERROR", is_json)
+        # Rebuild all tasks (active + archived), then the derived global state.
+        # With --jobs > 1 the per-file work fans out to worker processes; results
+        # are merged in file order so the output matches a serial run exactly.
+        pool = None
+        if jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=jobs)
+        timings: dict[str, float] = {}
+        try:
+            start = time.perf_counter()
+            task_jobs = [
+                (
+                    lattice_dir,
+                    event_file.stem,
+                    target_tasks_dir / f"{event_file.stem}.json",
+                    not no_checkpoints,
+                )
+                for event_file, target_tasks_dir in _task_event_files(lattice_dir)
+            ]
+            rebuilt_ids: list[str] = []
+            for (_, tid, _, _), error in zip(
+                task_jobs, _pool_map(pool, _rebuild_task_job, task_jobs), strict=True
+            ):
+                if error is None:
+                    rebuilt_ids.append(tid)
+                elif is_json:
+                    output_error(error, "REBUILD_ERROR", is_json)
+                else:
+                    click.echo(f"Error rebuilding {tid}: {error}", err=True)
+            timings["tasks"] = time.perf_counter() - start
+
+            # Rebuild lifecycle log
+            start = time.perf_counter()
+            _rebuild_lifecycle_log(lattice_dir, pool)
+            timings["lifecycle"] = time.perf_counter() - start
+
+            # Regenerate the changefeed, restoring events a crash left out
+            start = time.perf_counter()
+            _rebuild_changefeed(lattice_dir, pool)
+            timings["changefeed"] = time.perf_counter() - start
+
+            # Rebuild ids.json from snapshots
+            start = time.perf_counter()
+            _rebuild_id_index(lattice_dir, pool)
+            timings["ids"] = time.perf_counter() - start
+
+            # Regenerate the derived snapshot index from the rewritten snapshots
+            start = time.perf_counter()
+            _rebuild_snapshot_index(lattice_dir)
+            timings["index"] = time.perf_counter() - start
+
+            # Rebuild resource snapshots
+            start = time.perf_counter()
+            resource_jobs = [
+                (lattice_dir, ref.stem) for ref in _collect_resource_event_files(lattice_dir)
+            ]
+            rebuilt_resources: list[str] = []
+            for (_, res_id), (res_name, error) in zip(
+                resource_jobs, _pool_map(pool, _rebuild_resource_job, resource_jobs), strict=True
+            ):
+                if res_name is not None:
+                    rebuilt_resources.append(res_name)
+                elif is_json:
+                    output_error(str(error), "REBUILD_ERROR", is_json)
                 else:
-                    click.echo(f"Error rebuilding resource {res_id}: {e}", err=True)
+                    click.echo(f"Error rebuilding resource {res_id}: {error}", err=True)
+            timings["resources"] = time.perf_counter() - start
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
 
         if is_json:
             click.echo(
@@ -1017,6 +1464,8 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
                         "rebuilt_tasks": rebuilt_ids,
                         "rebuilt_resources": rebuilt_resources,
                         "global_log_rebuilt": True,
+                        "jobs": jobs,
+                        "timings": {phase: round(t, 4) for phase, t in timings.items()},
                     },
                 )
             )
@@ -1026,13 +1475,16 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
                 parts.append(
                     f"{len(rebuilt_resources)} resource{'s' if len(rebuilt_resources) != 1 else ''}"
                 )
-            parts.append("regenerated lifecycle log")
+            parts.append("regenerated lifecycle log and changefeed")
             click.echo(", ".join(parts))
+            click.echo(
+                "Timings: " + ", ".join(f"{phase} {t:.2f}s" for phase, t in timings.items())
+            )
     else:
         # Single task rebuild
         assert task_id is not None
         try:
-            snapshot = _rebuild_task(lattice_dir, task_id)
+            snapshot = _rebuild_task(lattice_dir, task_id, not no_checkpoints)
         except FileNotFoundError:
             output_error(
                 f"No event log found for {task_id}.",
@@ -1051,6 +1503,8 @@ def rebuild(task_id: str | None, rebuild_all: bool, output_json: bool) -> None:
         locks_dir = lattice_dir / "locks"
         with multi_lock(locks_dir, [f"tasks_{task_id}"]):
             atomic_write(snapshot_path, serialize_snapshot(snapshot))
+        # A rebuild adds no events, so feed readers would not notice it
+        _sweep_snapshot_index(lattice_dir, [task_id])
 
         if is_json:
             click.echo(
@@ -5,6 +5,7 @@ from __future__ import annotations
 import click
 
 from lattice.cli.helpers import (
+    TaskOpError,
     common_options,
     load_project_config,
     output_error,
@@ -17,10 +18,10 @@ from lattice.cli.helpers import (
     write_task_event,
 )
 from lattice.cli.main import cli
-from lattice.core.events import create_event, serialize_event
+from lattice.cli.task_ops import relationship_event
+from lattice.core.events import create_event
 from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.core.tasks import apply_event_to_snapshot
 from lattice.storage.hooks import execute_hooks
 from lattice.storage.locks import multi_lock
 
@@ -87,62 +88,25 @@ def link(
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
     target_task_id = resolve_task_id(lattice_dir, target_task_id, is_json)
 
-    # Validate relationship type
-    if not validate_relationship_type(rel_type):
-        sorted_types = ", ".join(sorted(RELATIONSHIP_TYPES))
-        output_error(
-            f"Invalid relationship type: '{rel_type}'. Valid types: {sorted_types}.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
-
-    # Reject self-links
-    if task_id == target_task_id:
-        output_error(
-            "Cannot create a relationship from a task to itself.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
-
     # Validate both tasks exist
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
     # Check target exists (we don't need the snapshot, just existence)
-    target_path = lattice_dir / "tasks" / f"{target_task_id}.json"
-    if not target_path.exists():
-        output_error(
-            f"Target task {target_task_id} not found.",
-            "NOT_FOUND",
-            is_json,
-        )
-
-    # Reject duplicates: same type + same target already in relationships_out
-    for rel in snapshot.get("relationships_out", []):
-        if rel["type"] == rel_type and rel["target_task_id"] == target_task_id:
-            output_error(
-                f"Duplicate: {rel_type} relationship to {target_task_id} already exists.",
-                "CONFLICT",
-                is_json,
-            )
-
-    # Build event
-    event_data: dict = {
-        "type": rel_type,
-        "target_task_id": target_task_id,
+    target_exists = (lattice_dir / "tasks" / f"{target_task_id}.json").exists()
+
+    meta = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
     }
-    if note is not None:
-        event_data["note"] = note
-
-    event = create_event(
-        type="relationship_added",
-        task_id=task_id,
-        actor=actor,
-        data=event_data,
-        model=model,
-        session=session,
-        triggered_by=triggered_by,
-        on_behalf_of=on_behalf_of,
-        reason=provenance_reason,
-    )
+    try:
+        event = relationship_event(
+            task_id, snapshot, rel_type, target_task_id, target_exists, meta, note=note
+        )
+    except TaskOpError as e:
+        e.exit(is_json)
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
     # Write (event-first, then snapshot, under lock)
@@ -326,12 +290,7 @@ def branch_link(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -429,12 +388,7 @@ def branch_unlink(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
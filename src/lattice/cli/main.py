@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import importlib
 import sys
 from pathlib import Path
+from typing import Any
 
 import click
 
@@ -15,7 +17,6 @@ from lattice.core.config import (
 )
 from lattice.core.ids import generate_instance_id, generate_task_id, validate_actor
 from lattice.storage.fs import LATTICE_DIR, atomic_write, ensure_lattice_dirs
-from lattice.storage.short_ids import _default_index, allocate_short_id, save_id_index
 
 
 # ---------------------------------------------------------------------------
@@ -118,8 +119,9 @@ def _seed_example_tasks(lattice_dir: Path, config: dict) -> None:
     import json as json_mod
 
     from lattice.core.events import create_event
-    from lattice.core.tasks import apply_event_to_snapshot
+    from lattice.core.tasks import apply_event_to_snapshot, apply_events
     from lattice.storage.operations import scaffold_plan, write_task_event
+    from lattice.storage.short_ids import allocate_short_id
 
     project_code = config.get("project_code", "")
     actor = "system:init"
@@ -175,51 +177,44 @@ def _seed_example_tasks(lattice_dir: Path, config: dict) -> None:
                 "tags": ["example"],
             },
         )
-        snapshot = apply_event_to_snapshot(None, create_ev)
         events = [create_ev]
 
         # Transition to target status if not backlog
         if ex["status"] != "backlog":
-            if ex["status"] == "done":
-                for target in ("in_progress", "done"):
-                    status_ev = create_event(
+            targets = ("in_progress", "done") if ex["status"] == "done" else (ex["status"],)
+            current = "backlog"
+            for target in targets:
+                events.append(
+                    create_event(
                         type="status_changed",
                         task_id=task_id,
                         actor=actor,
-                        data={"from": snapshot["status"], "to": target},
+                        data={"from": current, "to": target},
                     )
-                    snapshot = apply_event_to_snapshot(snapshot, status_ev)
-                    events.append(status_ev)
-            else:
-                status_ev = create_event(
-                    type="status_changed",
-                    task_id=task_id,
-                    actor=actor,
-                    data={"from": "backlog", "to": ex["status"]},
                 )
-                snapshot = apply_event_to_snapshot(snapshot, status_ev)
-                events.append(status_ev)
+                current = target
 
         # Add comment if present
         if ex.get("comment"):
-            comment_ev = create_event(
-                type="comment_added",
-                task_id=task_id,
-                actor=actor,
-                data={"body": ex["comment"]},
+            events.append(
+                create_event(
+                    type="comment_added",
+                    task_id=task_id,
+                    actor=actor,
+                    data={"body": ex["comment"]},
+                )
             )
-            snapshot = apply_event_to_snapshot(snapshot, comment_ev)
-            events.append(comment_ev)
 
         # subtask_of parent
-        rel_ev = create_event(
-            type="relationship_added",
-            task_id=task_id,
-            actor=actor,
-            data={"type": "subtask_of", "target_task_id": parent_id},
+        events.append(
+            create_event(
+                type="relationship_added",
+                task_id=task_id,
+                actor=actor,
+                data={"type": "subtask_of", "target_task_id": parent_id},
+            )
         )
-        snapshot = apply_event_to_snapshot(snapshot, rel_ev)
-        events.append(rel_ev)
+        snapshot = apply_events(None, events)
 
         write_task_event(lattice_dir, task_id, events, snapshot, config)
         scaffold_plan(lattice_dir, task_id, ex["title"], sid, ex["description"])
@@ -243,7 +238,101 @@ def _seed_example_tasks(lattice_dir: Path, config: dict) -> None:
         write_task_event(lattice_dir, source_id, [rel_ev], snapshot, config)
 
 
-@click.group(invoke_without_command=True)
+# ---------------------------------------------------------------------------
+# Lazy command loading
+# ---------------------------------------------------------------------------
+
+# Built-in commands defined outside this module, by name -> the module whose
+# import registers them on ``cli``. Only the module of the command being run
+# is imported. Keep in sync when adding commands (a test checks it).
+_LAZY_COMMANDS: dict[str, str] = {
+    "archive": "lattice.cli.archive_cmds",
+    "assign": "lattice.cli.task_cmds",
+    "attach": "lattice.cli.artifact_cmds",
+    "batch": "lattice.cli.batch_cmds",
+    "backfill-ids": "lattice.cli.migration_cmds",
+    "branch-link": "lattice.cli.link_cmds",
+    "branch-unlink": "lattice.cli.link_cmds",
+    "comment": "lattice.cli.task_cmds",
+    "comment-delete": "lattice.cli.task_cmds",
+    "comment-edit": "lattice.cli.task_cmds",
+    "comments": "lattice.cli.query_cmds",
+    "complete": "lattice.cli.task_cmds",
+    "create": "lattice.cli.task_cmds",
+    "daemon": "lattice.cli.daemon_cmds",
+    "dashboard": "lattice.cli.dashboard_cmd",
+    "demo": "lattice.cli.demo_cmd",
+    "doctor": "lattice.cli.integrity_cmds",
+    "event": "lattice.cli.query_cmds",
+    "import-github-project": "lattice.cli.import_cmds",
+    "link": "lattice.cli.link_cmds",
+    "list": "lattice.cli.query_cmds",
+    "next": "lattice.cli.query_cmds",
+    "plan": "lattice.cli.query_cmds",
+    "react": "lattice.cli.task_cmds",
+    "rebuild": "lattice.cli.integrity_cmds",
+    "resource": "lattice.cli.resource_cmds",
+    "restart": "lattice.cli.dashboard_cmd",
+    "search": "lattice.cli.query_cmds",
+    "session": "lattice.cli.session_cmds",
+    "show": "lattice.cli.query_cmds",
+    "stats": "lattice.cli.stats_cmds",
+    "status": "lattice.cli.task_cmds",
+    "unarchive": "lattice.cli.archive_cmds",
+    "unlink": "lattice.cli.link_cmds",
+    "unreact": "lattice.cli.task_cmds",
+    "update": "lattice.cli.task_cmds",
+    "weather": "lattice.cli.weather_cmds",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a command's module only when the command is used.
+
+    Names in *lazy_commands* resolve by importing their module, whose
+    ``@cli.command`` decorators register them. Any other name, and listing
+    the commands (``--help``), loads the ``lattice.cli_plugins`` entry points,
+    so installed plugins are scanned only when they could be needed.
+    """
+
+    def __init__(
+        self, *args: Any, lazy_commands: dict[str, str] | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+        self._plugins_loaded = False
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+        module = self.lazy_commands.get(cmd_name)
+        if module is not None:
+            importlib.import_module(module)
+        else:
+            self.load_plugins()
+        return self.commands.get(cmd_name)
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        self.load_plugins()
+        return sorted({*self.commands, *self.lazy_commands})
+
+    def load_all(self) -> None:
+        """Register every built-in and plugin command."""
+        for module in sorted(set(self.lazy_commands.values())):
+            importlib.import_module(module)
+        self.load_plugins()
+
+    def load_plugins(self) -> None:
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        from lattice.plugins import load_cli_plugins
+
+        load_cli_plugins(self)
+
+
+@click.group(cls=LazyGroup, lazy_commands=_LAZY_COMMANDS, invoke_without_command=True)
 @click.version_option(package_name="lattice-tracker")
 @click.pass_context
 def cli(ctx: click.Context) -> None:
@@ -378,6 +467,8 @@ def init(
     project_description: str | None,
 ) -> None:
     """Initialize a new Lattice project."""
+    from lattice.storage.short_ids import _default_index, save_id_index
+
     root = Path(target_path)
     lattice_dir = root / LATTICE_DIR
 
@@ -1006,7 +1097,7 @@ def _offer_claude_md(root: Path, *, auto_accept: bool = False) -> None:
 def set_project_code(code: str, force: bool) -> None:
     """Set or change the project code for short task IDs."""
     from lattice.cli.helpers import load_project_config, output_error, require_root
-    from lattice.storage.short_ids import load_id_index
+    from lattice.storage.short_ids import load_id_index, save_id_index
 
     lattice_dir = require_root(False)
     config = load_project_config(lattice_dir)
@@ -1395,30 +1486,5 @@ def plugins_cmd(as_json: bool) -> None:
             click.echo(f"  {block['marker']} (position: {block.get('position', 'after_base')})")
 
 
-# ---------------------------------------------------------------------------
-# Register command modules (must be after cli group is defined)
-# ---------------------------------------------------------------------------
-from lattice.cli import migration_cmds as _migration_cmds  # noqa: E402, F401
-from lattice.cli import task_cmds as _task_cmds  # noqa: E402, F401
-from lattice.cli import link_cmds as _link_cmds  # noqa: E402, F401
-from lattice.cli import artifact_cmds as _artifact_cmds  # noqa: E402, F401
-from lattice.cli import query_cmds as _query_cmds  # noqa: E402, F401
-from lattice.cli import integrity_cmds as _integrity_cmds  # noqa: E402, F401
-from lattice.cli import archive_cmds as _archive_cmds  # noqa: E402, F401
-from lattice.cli import dashboard_cmd as _dashboard_cmd  # noqa: E402, F401
-from lattice.cli import stats_cmds as _stats_cmds  # noqa: E402, F401
-from lattice.cli import weather_cmds as _weather_cmds  # noqa: E402, F401
-from lattice.cli import resource_cmds as _resource_cmds  # noqa: E402, F401
-from lattice.cli import demo_cmd as _demo_cmd  # noqa: E402, F401
-from lattice.cli import session_cmds as _session_cmds  # noqa: E402, F401
-from lattice.cli import import_cmds as _import_cmds  # noqa: E402, F401
-
-# ---------------------------------------------------------------------------
-# Load CLI plugins (must be after all built-in commands are registered)
-# ---------------------------------------------------------------------------
-from lattice.plugins import load_cli_plugins as _load_cli_plugins  # noqa: E402
-
-_load_cli_plugins(cli)
-
 if __name__ == "__main__":
     cli()
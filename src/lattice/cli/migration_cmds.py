@@ -16,6 +16,7 @@ from lattice.cli.main import cli
 from lattice.core.config import serialize_config, validate_project_code
 from lattice.core.events import create_event
 from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage.changefeed import append_changes, snapshot_dirs_key
 from lattice.storage.fs import atomic_write, jsonl_append
 from lattice.storage.locks import multi_lock
 from lattice.storage.short_ids import load_id_index, register_short_id, save_id_index
@@ -151,7 +152,9 @@ def backfill_ids(
         locks_dir = lattice_dir / "locks"
         with multi_lock(locks_dir, sorted([f"events_{task_ulid}", f"tasks_{task_ulid}"])):
             jsonl_append(event_path, serialize_event(event))
+            before = snapshot_dirs_key(lattice_dir)
             atomic_write(snap_path, serialize_snapshot(updated_snap))
+            append_changes(lattice_dir, [event], dirs=(before, snapshot_dirs_key(lattice_dir)))
 
         # Register in index
         register_short_id(index, short_id, task_ulid)
@@ -1,8 +1,9 @@
-"""Query and display commands: comments, event, list, next, show."""
+"""Query and display commands: comments, event, list, search, next, show."""
 
 from __future__ import annotations
 
 import json
+import sqlite3
 from pathlib import Path
 
 import click
@@ -335,46 +336,24 @@ def list_cmd(
         valid = ", ".join(config.get("workflow", {}).get("statuses", []))
         status_warning = f"'{status}' is not a configured status. Valid statuses: {valid}."
 
-    # Scan all .json files in tasks/ directory
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
+    # Filters (AND combination) are answered by the snapshot index
+    from lattice.storage.snapshot_store import SnapshotStore
 
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snap = json.loads(task_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            snapshots.append(snap)
-
-    # Include archived tasks if requested
-    if include_archived:
-        archive_dir = lattice_dir / "archive" / "tasks"
-        if archive_dir.is_dir():
-            for task_file in sorted(archive_dir.glob("*.json")):
-                try:
-                    snap = json.loads(task_file.read_text())
-                except (json.JSONDecodeError, OSError):
-                    continue
-                snap["_archived"] = True
-                snapshots.append(snap)
-
-    # Apply filters (AND combination)
     filtered: list[dict] = []
-    for snap in snapshots:
-        if status is not None and snap.get("status") != status:
-            continue
-        if assigned is not None:
-            raw = snap.get("assigned_to")
-            if raw is None or get_actor_display(raw) != assigned:
-                continue
-        if tag is not None and tag not in (snap.get("tags") or []):
-            continue
-        if task_type is not None and snap.get("type") != task_type:
-            continue
-        if priority is not None and snap.get("priority") != priority:
-            continue
-        filtered.append(snap)
+    with SnapshotStore(lattice_dir) as store:
+        # Include archived tasks if requested
+        for archived in (False, True) if include_archived else (False,):
+            for snap in store.query(
+                archived=archived,
+                status=status,
+                assigned=assigned,
+                tag=tag,
+                task_type=task_type,
+                priority=priority,
+            ):
+                if archived:
+                    snap["_archived"] = True
+                filtered.append(snap)
 
     # Sort by task ID (ULID = chronological order)
     filtered.sort(key=lambda s: s.get("id", ""))
@@ -426,6 +405,81 @@ def list_cmd(
             )
 
 
+# ---------------------------------------------------------------------------
+# lattice search
+# ---------------------------------------------------------------------------
+
+
+@cli.command("search")
+@click.argument("query")
+@click.option(
+    "--kind",
+    "kinds",
+    multiple=True,
+    type=click.Choice(["task", "comment", "note", "plan", "event"]),
+    help="Document kind to search (repeatable). Default: task, comment, note, plan.",
+)
+@click.option("--task", "task_ref", default=None, help="Only search within this task.")
+@click.option("--include-archived", is_flag=True, help="Include archived tasks.")
+@click.option(
+    "--limit", type=click.IntRange(min=1), default=20, show_default=True, help="Maximum hits."
+)
+@click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
+@click.option("--quiet", is_flag=True, help="Print one task ID per line (deduplicated).")
+def search_cmd(
+    query: str,
+    kinds: tuple[str, ...],
+    task_ref: str | None,
+    include_archived: bool,
+    limit: int,
+    output_json: bool,
+    quiet: bool,
+) -> None:
+    """Full-text search over titles, descriptions, comments, notes and plans.
+
+    Every word of QUERY must match (as a word prefix). Results are ranked,
+    best first; title matches rank above body matches.
+    """
+    is_json = output_json
+    lattice_dir = require_root(is_json)
+
+    task_id = None
+    if task_ref is not None:
+        task_id = resolve_task_id(lattice_dir, task_ref, is_json, allow_archived=True)
+
+    from lattice.storage.search_index import DEFAULT_KINDS, SearchIndex
+
+    try:
+        with SearchIndex(lattice_dir) as index:
+            hits = index.search(
+                query,
+                kinds=kinds or DEFAULT_KINDS,
+                task_id=task_id,
+                include_archived=include_archived or task_id is not None,
+                limit=limit,
+            )
+    except sqlite3.Error as e:
+        output_error(f"Search index unavailable: {e}", "SEARCH_ERROR", is_json)
+
+    if is_json:
+        click.echo(json_envelope(True, data=hits))
+    elif quiet:
+        seen: set[str] = set()
+        for hit in hits:
+            display_id = hit["short_id"] or hit["task_id"]
+            if display_id not in seen:
+                seen.add(display_id)
+                click.echo(display_id)
+    elif not hits:
+        click.echo("No matches.")
+    else:
+        for hit in hits:
+            display_id = hit["short_id"] or hit["task_id"]
+            archived_marker = " [A]" if hit["archived"] else ""
+            snippet = " ".join(hit["snippet"].split())
+            click.echo(f"{display_id}  {hit['kind']:<7}  {snippet}{archived_marker}")
+
+
 # ---------------------------------------------------------------------------
 # lattice next
 # ---------------------------------------------------------------------------
@@ -581,18 +635,8 @@ def next_cmd(
                     prev_status = next_status
 
             if events:
-                # Write directly under the already-held lock (bypass write_task_event
-                # which would try to acquire its own locks)
-                from lattice.core.events import serialize_event
-                from lattice.core.tasks import serialize_snapshot
-                from lattice.storage.fs import atomic_write, jsonl_append
-
-                event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-                for event in events:
-                    jsonl_append(event_path, serialize_event(event))
-
-                snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-                atomic_write(snapshot_path, serialize_snapshot(snapshot))
+                # Caller already holds the task locks
+                write_task_event(lattice_dir, task_id, events, snapshot, _caller_holds_lock=True)
 
             selected = snapshot
 
@@ -732,8 +776,11 @@ def show_cmd(
     # Read outgoing relationship target titles (best effort)
     relationships_out = _enrich_relationships(lattice_dir, snapshot)
 
-    # Derive incoming relationships by scanning all task snapshots
-    relationships_in = _find_incoming_relationships(lattice_dir, task_id)
+    # Incoming relationships come from the reverse-edge index
+    from lattice.storage.snapshot_store import SnapshotStore
+
+    with SnapshotStore(lattice_dir) as store:
+        relationships_in = store.incoming(task_id)
 
     # Read artifact metadata (best effort)
     artifact_info = _read_artifact_info(lattice_dir, snapshot)
@@ -796,53 +843,21 @@ def show_cmd(
 def _get_current_git_branch(lattice_dir: Path) -> str | None:
     """Return the current git branch name, or None if unavailable.
 
-    Uses ``git rev-parse --abbrev-ref HEAD`` from the repo root
-    (parent of ``.lattice/``).  Silently returns None on any error.
+    Read from HEAD via the shared git session for the repo containing
+    ``.lattice/``.  Silently returns None on any error.
     """
-    import shutil
-    import subprocess
+    from lattice.git_session import get_session
 
-    if not shutil.which("git"):
-        return None
-    repo_root = lattice_dir.parent
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            name = result.stdout.strip()
-            if name and name != "HEAD":
-                return name
-    except (subprocess.TimeoutExpired, OSError):
-        pass
-    return None
+    session = get_session(lattice_dir.parent)
+    return session.current_branch() if session is not None else None
 
 
 def _get_all_git_branches(lattice_dir: Path) -> list[str]:
     """Return all local git branch names, or empty list if unavailable."""
-    import shutil
-    import subprocess
+    from lattice.git_session import get_session
 
-    if not shutil.which("git"):
-        return []
-    repo_root = lattice_dir.parent
-    try:
-        result = subprocess.run(
-            ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/"],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return [b.strip() for b in result.stdout.strip().splitlines() if b.strip()]
-    except (subprocess.TimeoutExpired, OSError):
-        pass
-    return []
+    session = get_session(lattice_dir.parent)
+    return sorted(session.branches()) if session is not None else []
 
 
 def _auto_detect_branch_links(
@@ -872,49 +887,33 @@ def _auto_detect_branch_links(
 
 
 def _auto_detect_commits(short_id: str | None, lattice_dir: Path) -> list[dict[str, str]]:
-    """Find commits whose message contains *short_id*.
+    """Find commits whose message mentions *short_id*.
 
-    Uses ``git log --grep=<short_id>`` and returns commit summaries in reverse
-    chronological order. Returns an empty list when git is unavailable, the
-    directory is not in a git repo, or any git error occurs.
+    Looks the ID up in the commit reference index (``index/commits.db``),
+    which covers every local branch and is extended incrementally as they
+    move, and returns commit summaries in reverse chronological order.
+    Returns an empty list when git is unavailable, the directory is not in
+    a git repo, or any git error occurs.
     """
-    import shutil
-    import subprocess
+    from lattice.git_session import get_session
+    from lattice.storage.commit_index import CommitIndex
 
-    if not short_id or not shutil.which("git"):
+    if not short_id:
         return []
-
-    repo_root = lattice_dir.parent
-    fmt = "%h%x1f%ad%x1f%s"
-
-    try:
-        result = subprocess.run(
-            [
-                "git",
-                "log",
-                f"--grep={short_id}",
-                "--fixed-strings",
-                "--regexp-ignore-case",
-                "--date=short",
-                f"--pretty=format:{fmt}",
-            ],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-    except (subprocess.TimeoutExpired, OSError):
+    session = get_session(lattice_dir.parent)
+    if session is None:
         return []
 
-    if result.returncode != 0:
+    try:
+        with CommitIndex(lattice_dir, session) as index:
+            if not index.refresh():
+                return []
+            commits = index.commits_mentioning(short_id.upper())
+        abbrev = session.abbrev()
+    except (OSError, sqlite3.Error):
         return []
-
-    commits: list[dict[str, str]] = []
-    for line in result.stdout.splitlines():
-        sha, date, subject = (line.split("\x1f", 2) + ["", "", ""])[:3]
-        if not sha:
-            continue
-        commits.append({"sha": sha, "date": date, "subject": subject})
+    for commit in commits:
+        commit["sha"] = commit["sha"][:abbrev]
     return commits
 
 
@@ -984,38 +983,6 @@ def _enrich_relationships(lattice_dir: Path, snapshot: dict) -> list[dict]:
     return relationships
 
 
-def _find_incoming_relationships(lattice_dir: Path, task_id: str) -> list[dict]:
-    """Find all tasks that have outgoing relationships pointing at *task_id*.
-
-    Scans active and archived snapshots. Returns a list of dicts with
-    ``source_task_id``, ``source_title``, ``type``, and ``note``.
-    """
-    incoming: list[dict] = []
-
-    for directory in [lattice_dir / "tasks", lattice_dir / "archive" / "tasks"]:
-        if not directory.is_dir():
-            continue
-        for snap_file in directory.glob("*.json"):
-            if snap_file.stem == task_id:
-                continue  # skip self
-            try:
-                snap = json.loads(snap_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            for rel in snap.get("relationships_out", []):
-                if rel.get("target_task_id") == task_id:
-                    incoming.append(
-                        {
-                            "source_task_id": snap.get("id", snap_file.stem),
-                            "source_title": snap.get("title"),
-                            "type": rel.get("type"),
-                            "note": rel.get("note"),
-                        }
-                    )
-
-    return incoming
-
-
 def _read_artifact_info(lattice_dir: Path, snapshot: dict) -> list[dict]:
     """Read artifact metadata for each artifact evidence ref (best effort).
 
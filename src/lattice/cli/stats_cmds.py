@@ -119,16 +119,47 @@ def _print_human_stats(stats: dict, config: dict) -> None:
 
 @cli.command("stats")
 @click.option("--json", "output_json", is_flag=True, help="Output structured JSON.")
-def stats_cmd(output_json: bool) -> None:
+@click.option(
+    "--recompute",
+    is_flag=True,
+    help="Recompute the event aggregates from the full history and verify the stored ones.",
+)
+def stats_cmd(output_json: bool, recompute: bool) -> None:
     """Show project statistics and insights."""
     is_json = output_json
 
     lattice_dir = require_root(is_json)
     config = load_project_config(lattice_dir)
 
+    mismatches: list[str] | None = None
+    initialized = False
+    if recompute:
+        from lattice.storage.stats_aggregates import verify_aggregates
+
+        mismatches = verify_aggregates(lattice_dir)
+        if mismatches is None:
+            # Nothing stored yet: the recomputed aggregates are the first ones
+            mismatches, initialized = [], True
+
     stats = build_stats(lattice_dir, config)
 
     if is_json:
+        if recompute:
+            stats["recompute"] = {
+                "verified": not mismatches,
+                "initialized": initialized,
+                "mismatches": mismatches,
+            }
         click.echo(json_envelope(True, data=stats))
     else:
         _print_human_stats(stats, config)
+        if recompute:
+            click.echo("")
+            if initialized:
+                click.echo("Aggregates computed from the full history (none were stored yet).")
+            elif mismatches:
+                click.echo(
+                    f"Aggregates rebuilt: stored totals differed in {', '.join(mismatches)}."
+                )
+            else:
+                click.echo("Aggregates verified against the full history.")
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
+from typing import IO
 
 import click
 
 from lattice.cli.helpers import (
-    check_plan_gate,
+    TaskOpError,
     common_options,
+    json_envelope,
+    json_error_obj,
     load_project_config,
     output_error,
     output_result,
+    read_snapshot,
     read_snapshot_or_exit,
     require_root,
     resolve_task_id,
@@ -21,58 +26,39 @@ from lattice.cli.helpers import (
 )
 from lattice.storage.operations import scaffold_plan
 from lattice.cli.main import cli
+from lattice.cli.task_ops import (
+    append_plan_reset_section,
+    assignment_event,
+    check_create_retry,
+    comment_event,
+    create_task_data,
+    resets_plan,
+    status_change_event,
+    update_events,
+)
 from lattice.core.comments import (
     materialize_comments,
     validate_comment_body,
     validate_comment_for_delete,
     validate_comment_for_edit,
     validate_comment_for_react,
-    validate_comment_for_reply,
     validate_emoji,
 )
-from lattice.core.config import (
-    VALID_COMPLEXITIES,
-    VALID_PRIORITIES,
-    VALID_URGENCIES,
-    get_configured_roles,
-    get_review_cycle_limit,
-    get_valid_transitions,
-    validate_completion_policy,
-    validate_status,
-    validate_task_type,
-    validate_transition,
-)
-from lattice.core.events import count_review_rework_cycles, create_event, utc_now
-from lattice.core.ids import generate_task_id, validate_actor, validate_id
-from lattice.core.tasks import apply_event_to_snapshot, is_backward_status_transition
+from lattice.core.config import get_configured_roles
+from lattice.core.events import create_event, utc_now
+from lattice.core.ids import generate_task_id, validate_id
+from lattice.core.tasks import apply_event_to_snapshot
 from lattice.storage.readers import read_task_events
 from lattice.storage.short_ids import allocate_short_id
 
 
-# ---------------------------------------------------------------------------
-# Idempotency comparison fields for create
-# ---------------------------------------------------------------------------
-
-_CREATE_COMPARE_FIELDS = (
-    "title",
-    "type",
-    "priority",
-    "urgency",
-    "complexity",
-    "status",
-    "description",
-    "tags",
-    "assigned_to",
-)
-
-
 # ---------------------------------------------------------------------------
 # lattice create
 # ---------------------------------------------------------------------------
 
 
 @cli.command()
-@click.argument("title")
+@click.argument("title", required=False)
 @click.option("--type", "task_type", default=None, help="Task type (task, bug, spike, chore).")
 @click.option("--priority", default=None, help="Priority (critical, high, medium, low).")
 @click.option("--urgency", default=None, help="Urgency (immediate, high, normal, low).")
@@ -82,9 +68,16 @@ _CREATE_COMPARE_FIELDS = (
 @click.option("--tags", default=None, help="Comma-separated tags.")
 @click.option("--assigned-to", default=None, help="Assignee (actor format).")
 @click.option("--id", "task_id", default=None, help="Caller-supplied task ID.")
+@click.option(
+    "--from-file",
+    "from_file",
+    type=click.File("r", encoding="utf-8"),
+    default=None,
+    help="Create every task in a JSONL file (- for stdin), one JSON object per line.",
+)
 @common_options
 def create(
-    title: str,
+    title: str | None,
     task_type: str | None,
     priority: str | None,
     urgency: str | None,
@@ -94,6 +87,7 @@ def create(
     tags: str | None,
     assigned_to: str | None,
     task_id: str | None,
+    from_file: IO[str] | None,
     model: str | None,
     session: str | None,
     output_json: bool,
@@ -102,69 +96,59 @@ def create(
     on_behalf_of: str | None,
     provenance_reason: str | None,
 ) -> None:
-    """Create a new task."""
+    """Create a new task, or many with --from-file.
+
+    Each line of a --from-file file is a JSON object with "title" and any of
+    "type", "priority", "urgency", "complexity", "status", "description",
+    "tags", "assigned_to" and "id" (the create operation of `lattice batch`).
+    Every line is validated first; if any is invalid, nothing is created.
+    """
     is_json = output_json
 
     lattice_dir = require_root(is_json)
     config = load_project_config(lattice_dir)
 
-    actor = require_actor(is_json)
-    if on_behalf_of is not None:
-        validate_actor_format_or_exit(on_behalf_of, is_json)
-
-    # Apply defaults
-    if status is None:
-        status = config.get("default_status", "backlog")
-    if priority is None:
-        priority = config.get("default_priority", "medium")
-    if task_type is None:
-        task_type = "task"
-
-    # Validate inputs
-    if not validate_status(config, status):
-        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
-        output_error(
-            f"Invalid status: '{status}'. Valid statuses: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if not validate_task_type(config, task_type):
-        valid = ", ".join(config.get("task_types", []))
-        output_error(
-            f"Invalid task type: '{task_type}'. Valid types: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if priority not in VALID_PRIORITIES:
-        valid = ", ".join(VALID_PRIORITIES)
-        output_error(
-            f"Invalid priority: '{priority}'. Valid priorities: {valid}.",
-            "VALIDATION_ERROR",
-            is_json,
-        )
-    if urgency is not None and urgency not in VALID_URGENCIES:
-        valid = ", ".join(VALID_URGENCIES)
-        output_error(
-            f"Invalid urgency: '{urgency}'. Valid urgencies: {valid}.", "VALIDATION_ERROR", is_json
-        )
-    if complexity is not None and complexity not in VALID_COMPLEXITIES:
-        valid = ", ".join(VALID_COMPLEXITIES)
-        output_error(
-            f"Invalid complexity: '{complexity}'. Valid complexities: {valid}.",
-            "VALIDATION_ERROR",
+    if from_file is not None:
+        task_options = (task_type, priority, urgency, complexity, status, description, tags)
+        if (
+            title is not None
+            or task_id is not None
+            or assigned_to is not None
+            or any(option is not None for option in task_options)
+        ):
+            output_error(
+                "--from-file cannot be combined with TITLE or task options; "
+                "set them per line in the file.",
+                "VALIDATION_ERROR",
+                is_json,
+            )
+        _create_from_file(
+            lattice_dir,
+            config,
+            from_file,
+            {
+                "actor": require_actor(is_json, optional=True),
+                "model": model,
+                "session": session,
+                "triggered_by": triggered_by,
+                "on_behalf_of": on_behalf_of,
+                "reason": provenance_reason,
+            },
             is_json,
+            quiet,
         )
-    if assigned_to is not None and not validate_actor(assigned_to):
-        output_error(f"Invalid assigned-to format: '{assigned_to}'.", "INVALID_ACTOR", is_json)
+        return
+    if title is None:
+        output_error("Missing argument 'TITLE' (or use --from-file).", "VALIDATION_ERROR", is_json)
 
-    # Parse tags
-    tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+    actor = require_actor(is_json)
+    if on_behalf_of is not None:
+        validate_actor_format_or_exit(on_behalf_of, is_json)
 
-    # Generate or validate task ID
-    if task_id is not None:
-        if not validate_id(task_id, "task"):
-            output_error(f"Invalid task ID format: '{task_id}'.", "INVALID_ID", is_json)
-        # Idempotency check
-        existing_path = lattice_dir / "tasks" / f"{task_id}.json"
-        if existing_path.exists():
-            existing = json.loads(existing_path.read_text())
-            new_data = {
+    try:
+        event_data = create_task_data(
+            config,
+            {
                 "title": title,
                 "type": task_type,
                 "priority": priority,
@@ -172,28 +156,32 @@ def create(
                 "complexity": complexity,
                 "status": status,
                 "description": description,
-                "tags": tag_list,
+                "tags": tags,
                 "assigned_to": assigned_to,
-            }
-            existing_data = {field: existing.get(field) for field in _CREATE_COMPARE_FIELDS}
-            # Normalize: snapshot stores tags as list, default is None
-            if existing_data.get("tags") is None:
-                existing_data["tags"] = []
-            if new_data == existing_data:
-                output_result(
-                    data=existing,
-                    human_message=f"Task {task_id} already exists (idempotent).",
-                    quiet_value=task_id,
-                    is_json=is_json,
-                    is_quiet=quiet,
-                )
-                return
-            else:
-                output_error(
-                    f"Conflict: task {task_id} exists with different data.",
-                    "CONFLICT",
-                    is_json,
-                )
+            },
+        )
+    except TaskOpError as e:
+        e.exit(is_json)
+
+    # Generate or validate task ID
+    if task_id is not None:
+        if not validate_id(task_id, "task"):
+            output_error(f"Invalid task ID format: '{task_id}'.", "INVALID_ID", is_json)
+        # Idempotency check
+        existing = read_snapshot(lattice_dir, task_id)
+        if existing is not None:
+            try:
+                check_create_retry(task_id, existing, event_data)
+            except TaskOpError as e:
+                e.exit(is_json)
+            output_result(
+                data=existing,
+                human_message=f"Task {task_id} already exists (idempotent).",
+                quiet_value=task_id,
+                is_json=is_json,
+                is_quiet=quiet,
+            )
+            return
     else:
         task_id = generate_task_id()
 
@@ -204,25 +192,6 @@ def create(
     if project_code:
         prefix = f"{project_code}-{subproject_code}" if subproject_code else project_code
         short_id, _idx = allocate_short_id(lattice_dir, prefix, task_ulid=task_id)
-
-    # Build event data
-    event_data: dict = {
-        "title": title,
-        "status": status,
-        "type": task_type,
-        "priority": priority,
-    }
-    if urgency is not None:
-        event_data["urgency"] = urgency
-    if complexity is not None:
-        event_data["complexity"] = complexity
-    if description is not None:
-        event_data["description"] = description
-    if tag_list:
-        event_data["tags"] = tag_list
-    if assigned_to is not None:
-        event_data["assigned_to"] = assigned_to
-    if short_id is not None:
         event_data["short_id"] = short_id
 
     # Build event and snapshot
@@ -247,6 +216,7 @@ def create(
 
     # Output: prefer short_id when available
     display_id = short_id if short_id else task_id
+    status, priority, task_type = event_data["status"], event_data["priority"], event_data["type"]
     output_result(
         data=snapshot,
         human_message=(
@@ -262,18 +232,51 @@ def create(
     )
 
 
-# ---------------------------------------------------------------------------
-# Updatable field names for `lattice update`
-# ---------------------------------------------------------------------------
+def _create_from_file(
+    lattice_dir: Path,
+    config: dict,
+    source: IO[str],
+    defaults: dict,
+    is_json: bool,
+    quiet: bool,
+) -> None:
+    """Validate every line of *source*, then create all the tasks in one bulk write."""
+    from lattice.cli.batch_cmds import _plan_creates, _read_lines, _write_creates
 
-_UPDATABLE_FIELDS = frozenset(
-    {"title", "description", "priority", "urgency", "complexity", "type", "tags"}
-)
+    if defaults["on_behalf_of"] is not None:
+        validate_actor_format_or_exit(defaults["on_behalf_of"], is_json)
 
-_REDIRECT_FIELDS = {
-    "status": "Use 'lattice status' to change status.",
-    "assigned_to": "Use 'lattice assign' to change assignment.",
-}
+    changes, errors = _plan_creates(lattice_dir, config, defaults, _read_lines(source))
+    if errors:
+        message = f"{len(errors)} invalid line(s); nothing was created."
+        if is_json:
+            error = json_error_obj("VALIDATION_ERROR", message)
+            error["lines"] = [{"line": line, **err} for line, err in errors.items()]
+            click.echo(json_envelope(False, error=error))
+        else:
+            for line, err in errors.items():
+                click.echo(f"Error: line {line}: {err['message']}", err=True)
+            click.echo(f"Error: {message}", err=True)
+        raise SystemExit(1)
+
+    try:
+        _write_creates(lattice_dir, config, changes)
+    except FileExistsError as e:
+        output_error(f"{e}; nothing was created.", "CONFLICT", is_json)
+
+    created = sum(1 for change in changes if change.events)
+    snapshots = [change.snapshot for change in changes if change.snapshot is not None]
+    display_ids = [snap.get("short_id") or snap["id"] for snap in snapshots]
+    human_message = f"Created {created} task(s)"
+    if created != len(changes):
+        human_message += f", {len(changes) - created} already existed (idempotent)"
+    output_result(
+        data=snapshots,
+        human_message=human_message + ".",
+        quiet_value="\n".join(display_ids),
+        is_json=is_json,
+        is_quiet=quiet,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -313,7 +316,7 @@ def update(
         output_error("No field=value pairs provided.", "VALIDATION_ERROR", is_json)
 
     # Parse field=value pairs — split on first '=' only
-    parsed: list[tuple[str, str]] = []
+    parsed: list[tuple[str, object]] = []
     for pair in pairs:
         if "=" not in pair:
             output_error(
@@ -325,105 +328,18 @@ def update(
         parsed.append((field, value))
 
     # Validate and build events
-    shared_ts = utc_now()
-    events: list[dict] = []
-
-    for field, value in parsed:
-        # Reject status and assigned_to with helpful messages
-        if field in _REDIRECT_FIELDS:
-            output_error(_REDIRECT_FIELDS[field], "VALIDATION_ERROR", is_json)
-
-        # Handle custom_fields.* dot notation
-        if field.startswith("custom_fields."):
-            key = field[len("custom_fields.") :]
-            if not key:
-                output_error(
-                    "Invalid custom field: 'custom_fields.' requires a key name.",
-                    "VALIDATION_ERROR",
-                    is_json,
-                )
-            old_value = (snapshot.get("custom_fields") or {}).get(key)
-            new_value = value
-            if old_value == new_value:
-                continue
-            events.append(
-                create_event(
-                    type="field_updated",
-                    task_id=task_id,
-                    actor=actor,
-                    data={"field": field, "from": old_value, "to": new_value},
-                    ts=shared_ts,
-                    model=model,
-                    session=session,
-                    triggered_by=triggered_by,
-                    on_behalf_of=on_behalf_of,
-                    reason=provenance_reason,
-                )
-            )
-            continue
-
-        if field not in _UPDATABLE_FIELDS:
-            valid = ", ".join(sorted(_UPDATABLE_FIELDS))
-            output_error(
-                f"Unknown or non-updatable field: '{field}'. "
-                f"Updatable fields: {valid}. Use custom_fields.<key> for custom data.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-        # Validate enum fields
-        if field == "priority" and value not in VALID_PRIORITIES:
-            valid = ", ".join(VALID_PRIORITIES)
-            output_error(
-                f"Invalid priority: '{value}'. Valid priorities: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "urgency" and value not in VALID_URGENCIES:
-            valid = ", ".join(VALID_URGENCIES)
-            output_error(
-                f"Invalid urgency: '{value}'. Valid urgencies: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "complexity" and value not in VALID_COMPLEXITIES:
-            valid = ", ".join(VALID_COMPLEXITIES)
-            output_error(
-                f"Invalid complexity: '{value}'. Valid complexities: {valid}.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-        if field == "type" and not validate_task_type(config, value):
-            valid = ", ".join(config.get("task_types", []))
-            output_error(
-                f"Invalid task type: '{value}'. Valid types: {valid}.", "VALIDATION_ERROR", is_json
-            )
-
-        # Get old value and compute new value
-        if field == "tags":
-            new_value = [t.strip() for t in value.split(",") if t.strip()]
-            old_value = snapshot.get("tags") or []
-        else:
-            new_value = value
-            old_value = snapshot.get(field)
-
-        if old_value == new_value:
-            continue
-
-        events.append(
-            create_event(
-                type="field_updated",
-                task_id=task_id,
-                actor=actor,
-                data={"field": field, "from": old_value, "to": new_value},
-                ts=shared_ts,
-                model=model,
-                session=session,
-                triggered_by=triggered_by,
-                on_behalf_of=on_behalf_of,
-                reason=provenance_reason,
-            )
-        )
+    meta = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
+    }
+    try:
+        events = update_events(config, task_id, snapshot, parsed, meta)
+    except TaskOpError as e:
+        e.exit(is_json)
 
     if not events:
         if is_json:
@@ -462,34 +378,6 @@ def update(
 # ---------------------------------------------------------------------------
 
 
-def _status_rank_from_config(config: dict) -> dict[str, int] | None:
-    statuses = config.get("workflow", {}).get("statuses", [])
-    if not isinstance(statuses, list):
-        return None
-    rank = {status: idx for idx, status in enumerate(statuses) if isinstance(status, str)}
-    return rank or None
-
-
-def _append_plan_reset_section(
-    lattice_dir,
-    task_id: str,
-    actor: str,
-    event_ts: str | None,
-) -> None:
-    plan_path = lattice_dir / "plans" / f"{task_id}.md"
-    if not plan_path.exists():
-        return
-
-    date = "unknown-date"
-    if isinstance(event_ts, str) and event_ts:
-        date = event_ts.split("T", 1)[0]
-
-    content = plan_path.read_text(encoding="utf-8")
-    separator = "" if content.endswith("\n") else "\n"
-    reset_heading = f"## Reset {date} by {actor}"
-    plan_path.write_text(f"{content}{separator}\n{reset_heading}\n", encoding="utf-8")
-
-
 @cli.command("status")
 @click.argument("task_id")
 @click.argument("new_status")
@@ -521,27 +409,27 @@ def status_cmd(
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
 
     current_status = snapshot["status"]
-
-    # Resolve display name to slug (e.g. "on it" → "in_progress")
-    from lattice.core.config import resolve_status_input
-
-    new_status = resolve_status_input(config, new_status)
-
-    # Validate new_status is a known status
-    if not validate_status(config, new_status):
-        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
-        output_error(
-            f"Invalid status: '{new_status}'. Valid statuses: {valid}.",
-            "VALIDATION_ERROR",
-            is_json,
+    meta = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
+    }
+    try:
+        event = status_change_event(
+            lattice_dir, config, task_id, snapshot, new_status, meta, force=force
         )
+    except TaskOpError as e:
+        e.exit(is_json)
 
     # Already at the target status
-    if current_status == new_status:
+    if event is None:
         if is_json:
             click.echo(
                 json.dumps(
-                    {"ok": True, "data": {"message": f"Already at status {new_status}"}},
+                    {"ok": True, "data": {"message": f"Already at status {current_status}"}},
                     sort_keys=True,
                     indent=2,
                 )
@@ -550,110 +438,14 @@ def status_cmd(
         elif quiet:
             click.echo("ok")
         else:
-            click.echo(f"Already at status {new_status}")
+            click.echo(f"Already at status {current_status}")
         return
 
-    status_rank = _status_rank_from_config(config)
-    is_backward_transition = is_backward_status_transition(
-        current_status,
-        new_status,
-        status_rank,
-    )
-
-    # Check transition validity
-    if not validate_transition(config, current_status, new_status):
-        if not force:
-            valid_targets = get_valid_transitions(config, current_status)
-            valid_list = ", ".join(valid_targets) if valid_targets else "(none)"
-            msg = (
-                f"Invalid transition from {current_status} to {new_status}. "
-                f"Valid transitions from {current_status}: {valid_list}. "
-                "Use --force --reason to override."
-            )
-            if is_json:
-                from lattice.cli.helpers import json_envelope, json_error_obj
-
-                error_obj = json_error_obj("INVALID_TRANSITION", msg)
-                error_obj["current_status"] = current_status
-                error_obj["requested_status"] = new_status
-                error_obj["valid_transitions"] = valid_targets
-                click.echo(json_envelope(False, error=error_obj))
-                raise SystemExit(1)
-            else:
-                click.echo(f"Error: {msg}", err=True)
-                raise SystemExit(1)
-        if not provenance_reason:
-            output_error(
-                "--reason is required with --force.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-    # Review cycle limit: block rework transitions if cycle limit reached
-    if current_status == "review" and new_status in ("in_progress", "in_planning") and not force:
-        events = read_task_events(lattice_dir, task_id)
-        cycle_count = count_review_rework_cycles(events)
-        cycle_limit = get_review_cycle_limit(config)
-        if cycle_count >= cycle_limit:
-            msg = (
-                f"Review cycle limit reached ({cycle_count}/{cycle_limit}). "
-                f"This task has been sent back from review {cycle_count} time(s). "
-                "Move to needs_human with a comment explaining the situation "
-                "instead of cycling further. "
-                "Override with --force --reason."
-            )
-            output_error(msg, "REVIEW_CYCLE_LIMIT", is_json)
-
-    # Check completion policies (evidence gating)
-    policy_ok, policy_failures = validate_completion_policy(config, snapshot, new_status)
-    if not policy_ok:
-        if not force:
-            failure_msg = "; ".join(policy_failures)
-            output_error(
-                f"Completion policy not satisfied: {failure_msg}. Override with --force --reason.",
-                "COMPLETION_BLOCKED",
-                is_json,
-            )
-        if not provenance_reason:
-            output_error(
-                "--reason is required with --force.",
-                "VALIDATION_ERROR",
-                is_json,
-            )
-
-    # Planning gate: block in_progress if plan is still scaffold
-    check_plan_gate(
-        lattice_dir,
-        task_id,
-        new_status,
-        is_json,
-        force=force,
-        reason=provenance_reason,
-    )
-
-    event_data: dict = {
-        "from": current_status,
-        "to": new_status,
-    }
-    if force:
-        event_data["force"] = True
-        event_data["reason"] = provenance_reason
-
-    event = create_event(
-        type="status_changed",
-        task_id=task_id,
-        actor=actor,
-        data=event_data,
-        model=model,
-        session=session,
-        triggered_by=triggered_by,
-        on_behalf_of=on_behalf_of,
-        reason=provenance_reason,
-    )
+    new_status = event["data"]["to"]
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
     write_task_event(lattice_dir, task_id, [event], updated_snapshot, config)
-    if is_backward_transition:
-        _append_plan_reset_section(lattice_dir, task_id, actor, event.get("ts"))
+    if resets_plan(config, event):
+        append_plan_reset_section(lattice_dir, task_id, actor, event.get("ts"))
 
     display_id = updated_snapshot.get("short_id") or task_id
     output_result(
@@ -670,9 +462,6 @@ def status_cmd(
 # ---------------------------------------------------------------------------
 
 
-_UNASSIGN_SENTINELS = frozenset({"none", "unassigned", "-"})
-
-
 @cli.command()
 @click.argument("task_id")
 @click.argument("actor_id")
@@ -699,25 +488,23 @@ def assign(
 
     task_id = resolve_task_id(lattice_dir, task_id, is_json)
 
-    # Check for unassignment sentinel values
-    is_unassign = actor_id.lower() in _UNASSIGN_SENTINELS
-    target_actor: str | None = None if is_unassign else actor_id
-
-    # Validate assignee actor format (skip for unassignment)
-    if not is_unassign and not validate_actor(actor_id):
-        output_error(
-            f"Invalid actor format: '{actor_id}'. "
-            "Expected prefix:identifier (e.g., human:atin, agent:claude). "
-            "Use 'none', 'unassigned', or '-' to unassign.",
-            "INVALID_ACTOR",
-            is_json,
-        )
-
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
     current_assigned = snapshot.get("assigned_to")
+    meta = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
+    }
+    try:
+        event, target_actor = assignment_event(task_id, snapshot, actor_id, meta)
+    except TaskOpError as e:
+        e.exit(is_json)
 
-    if current_assigned == target_actor:
-        if is_unassign:
+    if event is None:
+        if target_actor is None:
             label = "Already unassigned"
         else:
             label = f"Already assigned to {target_actor}"
@@ -736,17 +523,6 @@ def assign(
             click.echo(label)
         return
 
-    event = create_event(
-        type="assignment_changed",
-        task_id=task_id,
-        actor=actor,
-        data={"from": current_assigned, "to": target_actor},
-        model=model,
-        session=session,
-        triggered_by=triggered_by,
-        on_behalf_of=on_behalf_of,
-        reason=provenance_reason,
-    )
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
     write_task_event(lattice_dir, task_id, [event], updated_snapshot, config)
 
@@ -807,16 +583,16 @@ def comment(
             "VALIDATION_ERROR",
             is_json,
         )
-    if text is None and file_path is None:
+    if file_path is not None:
+        from pathlib import Path
+
+        text = Path(file_path).read_text()
+    elif text is None:
         output_error(
             "Provide comment text as an argument or via --file.",
             "VALIDATION_ERROR",
             is_json,
         )
-    if file_path is not None:
-        from pathlib import Path
-
-        text = Path(file_path).read_text()
 
     lattice_dir = require_root(is_json)
     config = load_project_config(lattice_dir)
@@ -828,47 +604,20 @@ def comment(
 
     snapshot = read_snapshot_or_exit(lattice_dir, task_id, is_json)
 
-    # Validate reply-to if provided
-    if reply_to is not None:
-        events = read_task_events(lattice_dir, task_id)
-        try:
-            validate_comment_for_reply(events, reply_to)
-        except ValueError as exc:
-            output_error(str(exc), "VALIDATION_ERROR", is_json)
-
-    # Validate and normalize body
+    meta = {
+        "actor": actor,
+        "model": model,
+        "session": session,
+        "triggered_by": triggered_by,
+        "on_behalf_of": on_behalf_of,
+        "reason": provenance_reason,
+    }
     try:
-        text = validate_comment_body(text)
-    except ValueError as exc:
-        output_error(str(exc), "VALIDATION_ERROR", is_json)
-
-    # Validate role against configured completion policy roles
-    if role is not None:
-        configured_roles = get_configured_roles(config)
-        if configured_roles and role not in configured_roles:
-            output_error(
-                f"Unknown role: '{role}'. Valid roles: {', '.join(sorted(configured_roles))}.",
-                "INVALID_ROLE",
-                is_json,
-            )
-
-    event_data: dict = {"body": text}
-    if reply_to is not None:
-        event_data["parent_id"] = reply_to
-    if role is not None:
-        event_data["role"] = role
-
-    event = create_event(
-        type="comment_added",
-        task_id=task_id,
-        actor=actor,
-        data=event_data,
-        model=model,
-        session=session,
-        triggered_by=triggered_by,
-        on_behalf_of=on_behalf_of,
-        reason=provenance_reason,
-    )
+        event = comment_event(
+            lattice_dir, config, task_id, text, meta, reply_to=reply_to, role=role
+        )
+    except TaskOpError as e:
+        e.exit(is_json)
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
     write_task_event(lattice_dir, task_id, [event], updated_snapshot, config)
 
@@ -0,0 +1,475 @@
+"""Validation and event building for task writes.
+
+Shared by the single task commands (``lattice create``, ``update``,
+``status``, ``assign``, ``comment``, ``link``) and ``lattice batch``, so the
+rules live in one place. Nothing here writes or exits: every function either
+returns the events to write or raises :class:`~lattice.cli.helpers.TaskOpError`.
+
+*meta* is the provenance passed on to :func:`create_event`: ``actor``,
+``model``, ``session``, ``triggered_by``, ``on_behalf_of`` and ``reason``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from lattice.cli.helpers import TaskOpError, enforce_plan_gate
+from lattice.core.comments import validate_comment_body, validate_comment_for_reply
+from lattice.core.config import (
+    VALID_COMPLEXITIES,
+    VALID_PRIORITIES,
+    VALID_URGENCIES,
+    get_configured_roles,
+    get_review_cycle_limit,
+    get_valid_transitions,
+    resolve_status_input,
+    validate_completion_policy,
+    validate_status,
+    validate_task_type,
+    validate_transition,
+)
+from lattice.core.events import count_review_rework_cycles, create_event, utc_now
+from lattice.core.ids import validate_actor
+from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
+from lattice.core.tasks import is_backward_status_transition
+from lattice.storage.readers import read_task_events
+
+# Fields compared when a create with an existing ID is retried
+_CREATE_COMPARE_FIELDS = (
+    "title",
+    "type",
+    "priority",
+    "urgency",
+    "complexity",
+    "status",
+    "description",
+    "tags",
+    "assigned_to",
+)
+
+# Field names `lattice update` may change
+_UPDATABLE_FIELDS = frozenset(
+    {"title", "description", "priority", "urgency", "complexity", "type", "tags"}
+)
+
+_REDIRECT_FIELDS = {
+    "status": "Use 'lattice status' to change status.",
+    "assigned_to": "Use 'lattice assign' to change assignment.",
+}
+
+_UNASSIGN_SENTINELS = frozenset({"none", "unassigned", "-"})
+
+
+# ---------------------------------------------------------------------------
+# Field validation
+# ---------------------------------------------------------------------------
+
+
+def check_choice(name: str, value: str, valid: tuple[str, ...], plural: str) -> None:
+    """Reject *value* unless it is one of *valid*."""
+    if value not in valid:
+        raise TaskOpError(
+            f"Invalid {name}: '{value}'. Valid {plural}: {', '.join(valid)}.", "VALIDATION_ERROR"
+        )
+
+
+def parse_tags(value: object) -> list[str]:
+    """Parse tags given as a comma-separated string or a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(",") if t.strip()]
+    if isinstance(value, list) and all(isinstance(t, str) for t in value):
+        return [t.strip() for t in value if t.strip()]
+    raise TaskOpError(
+        "'tags' must be a comma-separated string or a list of strings.", "VALIDATION_ERROR"
+    )
+
+
+def _check_status(config: dict, status: str) -> None:
+    if not validate_status(config, status):
+        valid = ", ".join(config.get("workflow", {}).get("statuses", []))
+        raise TaskOpError(
+            f"Invalid status: '{status}'. Valid statuses: {valid}.", "VALIDATION_ERROR"
+        )
+
+
+def _check_task_type(config: dict, task_type: str) -> None:
+    if not validate_task_type(config, task_type):
+        valid = ", ".join(config.get("task_types", []))
+        raise TaskOpError(
+            f"Invalid task type: '{task_type}'. Valid types: {valid}.", "VALIDATION_ERROR"
+        )
+
+
+# ---------------------------------------------------------------------------
+# create
+# ---------------------------------------------------------------------------
+
+
+def create_task_data(config: dict, fields: dict) -> dict:
+    """Validate the fields of a new task and return its ``task_created`` data.
+
+    *fields* holds ``title`` and any of ``type``, ``priority``, ``urgency``,
+    ``complexity``, ``status``, ``description``, ``tags`` and ``assigned_to``;
+    missing (or ``None``) ones take the project defaults.
+    """
+    status = fields.get("status") or config.get("default_status", "backlog")
+    priority = fields.get("priority") or config.get("default_priority", "medium")
+    task_type = fields.get("type") or "task"
+    urgency = fields.get("urgency")
+    complexity = fields.get("complexity")
+    assigned_to = fields.get("assigned_to")
+
+    _check_status(config, status)
+    _check_task_type(config, task_type)
+    check_choice("priority", priority, VALID_PRIORITIES, "priorities")
+    if urgency is not None:
+        check_choice("urgency", urgency, VALID_URGENCIES, "urgencies")
+    if complexity is not None:
+        check_choice("complexity", complexity, VALID_COMPLEXITIES, "complexities")
+    if assigned_to is not None and not validate_actor(assigned_to):
+        raise TaskOpError(f"Invalid assigned-to format: '{assigned_to}'.", "INVALID_ACTOR")
+    tag_list = parse_tags(fields.get("tags"))
+
+    data: dict = {
+        "title": fields["title"],
+        "status": status,
+        "type": task_type,
+        "priority": priority,
+    }
+    for key, value in (
+        ("urgency", urgency),
+        ("complexity", complexity),
+        ("description", fields.get("description")),
+    ):
+        if value is not None:
+            data[key] = value
+    if tag_list:
+        data["tags"] = tag_list
+    if assigned_to is not None:
+        data["assigned_to"] = assigned_to
+    return data
+
+
+def check_create_retry(task_id: str, existing: dict, data: dict) -> None:
+    """Accept a create of an existing task only if it repeats the same data."""
+    proposed = {key: data.get(key) for key in _CREATE_COMPARE_FIELDS}
+    proposed["tags"] = data.get("tags") or []
+    current = {key: existing.get(key) for key in _CREATE_COMPARE_FIELDS}
+    # Normalize: snapshot stores tags as list, default is None
+    if current.get("tags") is None:
+        current["tags"] = []
+    if proposed != current:
+        raise TaskOpError(f"Conflict: task {task_id} exists with different data.", "CONFLICT")
+
+
+# ---------------------------------------------------------------------------
+# update
+# ---------------------------------------------------------------------------
+
+
+def update_events(
+    config: dict, task_id: str, snapshot: dict, fields: list[tuple[str, object]], meta: dict
+) -> list[dict]:
+    """Validate *fields* (name, value pairs) and return a ``field_updated`` per change.
+
+    Values are strings, except ``tags``, which may also be a list. Fields
+    already at their value produce no event.
+    """
+    shared_ts = utc_now()
+    events: list[dict] = []
+    for name, value in fields:
+        # Reject status and assigned_to with helpful messages
+        if name in _REDIRECT_FIELDS:
+            raise TaskOpError(_REDIRECT_FIELDS[name], "VALIDATION_ERROR")
+
+        if name.startswith("custom_fields."):
+            key = name[len("custom_fields.") :]
+            if not key:
+                raise TaskOpError(
+                    "Invalid custom field: 'custom_fields.' requires a key name.",
+                    "VALIDATION_ERROR",
+                )
+            old_value = (snapshot.get("custom_fields") or {}).get(key)
+        elif name not in _UPDATABLE_FIELDS:
+            valid = ", ".join(sorted(_UPDATABLE_FIELDS))
+            raise TaskOpError(
+                f"Unknown or non-updatable field: '{name}'. "
+                f"Updatable fields: {valid}. Use custom_fields.<key> for custom data.",
+                "VALIDATION_ERROR",
+            )
+        else:
+            old_value = snapshot.get(name)
+
+        if name == "tags":
+            new_value: object = parse_tags(value)
+            old_value = old_value or []
+        elif not isinstance(value, str):
+            raise TaskOpError(f"Value of '{name}' must be a string.", "VALIDATION_ERROR")
+        else:
+            if name == "priority":
+                check_choice("priority", value, VALID_PRIORITIES, "priorities")
+            elif name == "urgency":
+                check_choice("urgency", value, VALID_URGENCIES, "urgencies")
+            elif name == "complexity":
+                check_choice("complexity", value, VALID_COMPLEXITIES, "complexities")
+            elif name == "type":
+                _check_task_type(config, value)
+            new_value = value
+
+        if old_value == new_value:
+            continue
+        events.append(
+            create_event(
+                type="field_updated",
+                task_id=task_id,
+                data={"field": name, "from": old_value, "to": new_value},
+                ts=shared_ts,
+                **meta,
+            )
+        )
+    return events
+
+
+# ---------------------------------------------------------------------------
+# status
+# ---------------------------------------------------------------------------
+
+
+def status_change_event(
+    lattice_dir: Path,
+    config: dict,
+    task_id: str,
+    snapshot: dict,
+    requested: str,
+    meta: dict,
+    *,
+    force: bool = False,
+    load_events: Callable[[], list[dict]] | None = None,
+) -> dict | None:
+    """Validate moving the task to *requested* and return its ``status_changed`` event.
+
+    *requested* may be a status display name. Returns None if the task is
+    already at that status. Applies the workflow transitions, the review
+    cycle limit, the completion policy and the plan gate; *force* (with
+    ``meta["reason"]``) overrides them. *load_events* returns the task's
+    events for the review cycle count (default: read from disk).
+    """
+    reason = meta.get("reason")
+    current = snapshot["status"]
+    # Resolve display name to slug (e.g. "on it" → "in_progress")
+    new_status = resolve_status_input(config, requested)
+    _check_status(config, new_status)
+    if current == new_status:
+        return None
+
+    # Check transition validity
+    if not validate_transition(config, current, new_status):
+        if not force:
+            valid_targets = get_valid_transitions(config, current)
+            valid_list = ", ".join(valid_targets) if valid_targets else "(none)"
+            raise TaskOpError(
+                f"Invalid transition from {current} to {new_status}. "
+                f"Valid transitions from {current}: {valid_list}. "
+                "Use --force --reason to override.",
+                "INVALID_TRANSITION",
+                current_status=current,
+                requested_status=new_status,
+                valid_transitions=valid_targets,
+            )
+        if not reason:
+            raise TaskOpError("--reason is required with --force.", "VALIDATION_ERROR")
+
+    # Review cycle limit: block rework transitions if cycle limit reached
+    if current == "review" and new_status in ("in_progress", "in_planning") and not force:
+        events = load_events() if load_events else read_task_events(lattice_dir, task_id)
+        cycle_count = count_review_rework_cycles(events)
+        cycle_limit = get_review_cycle_limit(config)
+        if cycle_count >= cycle_limit:
+            raise TaskOpError(
+                f"Review cycle limit reached ({cycle_count}/{cycle_limit}). "
+                f"This task has been sent back from review {cycle_count} time(s). "
+                "Move to needs_human with a comment explaining the situation "
+                "instead of cycling further. "
+                "Override with --force --reason.",
+                "REVIEW_CYCLE_LIMIT",
+            )
+
+    # Check completion policies (evidence gating)
+    policy_ok, policy_failures = validate_completion_policy(config, snapshot, new_status)
+    if not policy_ok:
+        if not force:
+            raise TaskOpError(
+                f"Completion policy not satisfied: {'; '.join(policy_failures)}. "
+                "Override with --force --reason.",
+                "COMPLETION_BLOCKED",
+            )
+        if not reason:
+            raise TaskOpError("--reason is required with --force.", "VALIDATION_ERROR")
+
+    # Planning gate: block in_progress if plan is still scaffold
+    if new_status == "in_progress":
+        enforce_plan_gate(lattice_dir, task_id, snapshot=snapshot, force=force, reason=reason)
+
+    data: dict = {"from": current, "to": new_status}
+    if force:
+        data["force"] = True
+        data["reason"] = reason
+    return create_event(type="status_changed", task_id=task_id, data=data, **meta)
+
+
+def resets_plan(config: dict, event: dict) -> bool:
+    """Whether the ``status_changed`` *event* moves the task backward in the workflow."""
+    statuses = config.get("workflow", {}).get("statuses", [])
+    rank = None
+    if isinstance(statuses, list):
+        rank = {status: idx for idx, status in enumerate(statuses) if isinstance(status, str)}
+    data = event["data"]
+    return is_backward_status_transition(data["from"], data["to"], rank or None)
+
+
+def append_plan_reset_section(
+    lattice_dir: Path,
+    task_id: str,
+    actor: str,
+    event_ts: str | None,
+) -> None:
+    """Mark in the task's plan that a backward move reset it."""
+    plan_path = lattice_dir / "plans" / f"{task_id}.md"
+    if not plan_path.exists():
+        return
+
+    date = "unknown-date"
+    if isinstance(event_ts, str) and event_ts:
+        date = event_ts.split("T", 1)[0]
+
+    content = plan_path.read_text(encoding="utf-8")
+    separator = "" if content.endswith("\n") else "\n"
+    reset_heading = f"## Reset {date} by {actor}"
+    plan_path.write_text(f"{content}{separator}\n{reset_heading}\n", encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# assign
+# ---------------------------------------------------------------------------
+
+
+def assignment_event(
+    task_id: str, snapshot: dict, assignee: str, meta: dict
+) -> tuple[dict | None, str | None]:
+    """Return the ``assignment_changed`` event and the new assignee.
+
+    'none', 'unassigned' and '-' unassign. The event is None if the task is
+    already assigned that way.
+    """
+    # Check for unassignment sentinel values
+    is_unassign = assignee.lower() in _UNASSIGN_SENTINELS
+    target = None if is_unassign else assignee
+    if not is_unassign and not validate_actor(assignee):
+        raise TaskOpError(
+            f"Invalid actor format: '{assignee}'. "
+            "Expected prefix:identifier (e.g., human:atin, agent:claude). "
+            "Use 'none', 'unassigned', or '-' to unassign.",
+            "INVALID_ACTOR",
+        )
+    current = snapshot.get("assigned_to")
+    if current == target:
+        return None, target
+    event = create_event(
+        type="assignment_changed",
+        task_id=task_id,
+        data={"from": current, "to": target},
+        **meta,
+    )
+    return event, target
+
+
+# ---------------------------------------------------------------------------
+# comment
+# ---------------------------------------------------------------------------
+
+
+def comment_event(
+    lattice_dir: Path,
+    config: dict,
+    task_id: str,
+    text: str,
+    meta: dict,
+    *,
+    reply_to: str | None = None,
+    role: str | None = None,
+    load_events: Callable[[], list[dict]] | None = None,
+) -> dict:
+    """Validate a comment (or a reply to *reply_to*) and return its ``comment_added`` event.
+
+    *load_events* returns the task's events to find the parent comment in
+    (default: read from disk).
+    """
+    try:
+        if reply_to is not None:
+            events = load_events() if load_events else read_task_events(lattice_dir, task_id)
+            validate_comment_for_reply(events, reply_to)
+        text = validate_comment_body(text)
+    except ValueError as e:
+        raise TaskOpError(str(e), "VALIDATION_ERROR") from None
+
+    # Validate role against configured completion policy roles
+    if role is not None:
+        configured_roles = get_configured_roles(config)
+        if configured_roles and role not in configured_roles:
+            raise TaskOpError(
+                f"Unknown role: '{role}'. Valid roles: {', '.join(sorted(configured_roles))}.",
+                "INVALID_ROLE",
+            )
+
+    data: dict = {"body": text}
+    if reply_to is not None:
+        data["parent_id"] = reply_to
+    if role is not None:
+        data["role"] = role
+    return create_event(type="comment_added", task_id=task_id, data=data, **meta)
+
+
+# ---------------------------------------------------------------------------
+# link
+# ---------------------------------------------------------------------------
+
+
+def relationship_event(
+    task_id: str,
+    snapshot: dict,
+    rel_type: str,
+    target_id: str,
+    target_exists: bool,
+    meta: dict,
+    *,
+    note: str | None = None,
+) -> dict:
+    """Validate a new relationship from the task to *target_id* and return its event."""
+    if not validate_relationship_type(rel_type):
+        sorted_types = ", ".join(sorted(RELATIONSHIP_TYPES))
+        raise TaskOpError(
+            f"Invalid relationship type: '{rel_type}'. Valid types: {sorted_types}.",
+            "VALIDATION_ERROR",
+        )
+    # Reject self-links
+    if task_id == target_id:
+        raise TaskOpError(
+            "Cannot create a relationship from a task to itself.", "VALIDATION_ERROR"
+        )
+    if not target_exists:
+        raise TaskOpError(f"Target task {target_id} not found.", "NOT_FOUND")
+
+    # Reject duplicates: same type + same target already in relationships_out
+    for rel in snapshot.get("relationships_out", []):
+        if rel["type"] == rel_type and rel["target_task_id"] == target_id:
+            raise TaskOpError(
+                f"Duplicate: {rel_type} relationship to {target_id} already exists.", "CONFLICT"
+            )
+
+    data: dict = {"type": rel_type, "target_task_id": target_id}
+    if note is not None:
+        data["note"] = note
+    return create_event(type="relationship_added", task_id=task_id, data=data, **meta)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -17,6 +16,7 @@ from lattice.core.stats import (
     load_all_snapshots,
     parse_ts,
 )
+from lattice.storage.event_log import EventLog
 
 # Future config shape for scheduling:
 # "schedule": {
@@ -87,14 +87,7 @@ def _load_recent_events(lattice_dir: Path, hours: float = 24.0) -> list[dict]:
     for f in events_dir.glob("*.jsonl"):
         if f.name.startswith("_"):
             continue
-        for line in f.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                ev = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+        for ev in EventLog(f).iter_events():
             ts = parse_ts(ev.get("ts", ""))
             if ts is not None:
                 delta = (now - ts).total_seconds()
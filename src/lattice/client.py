@@ -0,0 +1,128 @@
+"""The ``lattice`` console entry point.
+
+Hands the command to the project's warm daemon (:mod:`lattice.daemon`)
+when one is running and otherwise runs the CLI in-process. Keeps its own
+imports to the standard library so a forwarded command costs little more
+than interpreter startup.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+_FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def main() -> None:
+    status = forward(sys.argv)
+    if status is None:
+        from lattice.cli.main import cli
+
+        cli()
+    else:
+        sys.exit(status)
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run *argv* in the daemon and return its exit status.
+
+    Returns None, having run nothing, when the command should run
+    in-process instead: daemon disabled or unsupported, not inside a
+    project, no daemon listening, or the daemon is out of date.
+    """
+    from lattice import daemon
+
+    if (
+        os.environ.get(daemon.NO_DAEMON_ENV)
+        or argv[1:2] == ["daemon"]
+        or not hasattr(socket, "send_fds")
+        or any(stream is None for stream in (sys.stdin, sys.stdout, sys.stderr))
+    ):
+        return None
+    lattice_dir = _find_lattice_dir()
+    if lattice_dir is None:
+        return None
+    try:
+        # Only look: creating the socket directory is the daemon's job.
+        path = daemon.socket_path(Path(lattice_dir), create=False)
+        request = _request(argv)
+    except (OSError, daemon.DaemonError):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.connect(str(path))
+            daemon.send_message(sock, request, [0, 1, 2])
+            reply, _ = daemon.recv_message(sock)
+        except (OSError, ValueError):
+            return None
+        if reply is None or "pid" not in reply:
+            return None
+
+        # From here on the command is running: never fall back and run it twice.
+        child = reply["pid"]
+        for signum in _FORWARDED_SIGNALS:
+            signal.signal(signum, lambda signum, _frame: _kill(child, signum))
+        try:
+            reply, _ = daemon.recv_message(sock)
+        except (OSError, ValueError):
+            reply = None
+    status = None if reply is None else reply.get("exit")
+    if not isinstance(status, int):
+        print("Error: lost connection to the lattice daemon", file=sys.stderr)
+        return 1
+    return status
+
+
+def _find_lattice_dir() -> str | None:
+    """Locate ``.lattice/`` like :func:`lattice.storage.fs.find_root`, without importing it."""
+    env_root = os.environ.get("LATTICE_ROOT")
+    if env_root is not None:
+        candidate = os.path.join(env_root, ".lattice")
+        # An invalid LATTICE_ROOT is reported by the in-process CLI
+        return candidate if env_root and os.path.isdir(candidate) else None
+    current = os.path.realpath(os.getcwd())
+    while True:
+        candidate = os.path.join(current, ".lattice")
+        if os.path.isdir(candidate):
+            return candidate
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _request(argv: list[str]) -> dict:
+    from lattice.daemon import PROTOCOL
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return {
+        "protocol": PROTOCOL,
+        "argv": argv,
+        "prog_name": os.path.basename(argv[0]),
+        "env": dict(os.environ),
+        "cwd": os.getcwd(),
+        "umask": umask,
+        "stdio": [
+            {
+                "encoding": stream.encoding,
+                "errors": stream.errors,
+                "line_buffering": stream.line_buffering,
+                "write_through": getattr(stream, "write_through", False),
+            }
+            for stream in (sys.stdin, sys.stdout, sys.stderr)
+        ],
+    }
+
+
+def _kill(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
@@ -142,6 +142,7 @@ class LatticeConfig(TypedDict, total=False):
     project_name: str
     model: str
     dashboard_port: int
+    durability: str
 
 
 def default_config(preset: str = "classic") -> LatticeConfig:
@@ -4,8 +4,6 @@ from __future__ import annotations
 
 import re
 
-from ulid import ULID
-
 # Crockford Base32 alphabet: 0-9 A-Z excluding I, L, O, U
 _CROCKFORD_B32_RE = re.compile(r"^[0-9A-HJKMNP-TV-Z]{26}$", re.IGNORECASE)
 
@@ -64,34 +62,42 @@ def extract_short_ids(text: str) -> list[str]:
     return result
 
 
+def _new_ulid() -> str:
+    # Imported on first use: the ulid package pulls in importlib.metadata,
+    # which read-only commands never need.
+    from ulid import ULID
+
+    return str(ULID())
+
+
 def generate_instance_id() -> str:
     """Generate a new instance ID with the inst_ prefix."""
-    return f"inst_{ULID()}"
+    return f"inst_{_new_ulid()}"
 
 
 def generate_task_id() -> str:
     """Generate a new task ID with the task_ prefix."""
-    return f"task_{ULID()}"
+    return f"task_{_new_ulid()}"
 
 
 def generate_event_id() -> str:
     """Generate a new event ID with the ev_ prefix."""
-    return f"ev_{ULID()}"
+    return f"ev_{_new_ulid()}"
 
 
 def generate_artifact_id() -> str:
     """Generate a new artifact ID with the art_ prefix."""
-    return f"art_{ULID()}"
+    return f"art_{_new_ulid()}"
 
 
 def generate_resource_id() -> str:
     """Generate a new resource ID with the res_ prefix."""
-    return f"res_{ULID()}"
+    return f"res_{_new_ulid()}"
 
 
 def generate_session_id() -> str:
     """Generate a new session ID with the sess_ prefix."""
-    return f"sess_{ULID()}"
+    return f"sess_{_new_ulid()}"
 
 
 def validate_id(id_str: str, expected_prefix: str) -> bool:
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -13,26 +13,10 @@ def load_all_snapshots(lattice_dir: Path) -> tuple[list[dict], list[dict]]:
 
     Returns (active, archived) lists.
     """
-    active: list[dict] = []
-    archived: list[dict] = []
+    from lattice.storage.snapshot_store import SnapshotStore
 
-    tasks_dir = lattice_dir / "tasks"
-    if tasks_dir.is_dir():
-        for f in tasks_dir.glob("*.json"):
-            try:
-                active.append(json.loads(f.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-    archive_dir = lattice_dir / "archive" / "tasks"
-    if archive_dir.is_dir():
-        for f in archive_dir.glob("*.json"):
-            try:
-                archived.append(json.loads(f.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-    return active, archived
+    with SnapshotStore(lattice_dir) as store:
+        return store.load_all(), store.load_all(archived=True)
 
 
 def count_events(lattice_dir: Path, archived: bool = False) -> tuple[int, Counter]:
@@ -51,16 +35,15 @@ def count_events(lattice_dir: Path, archived: bool = False) -> tuple[int, Counte
     if not events_dir.is_dir():
         return total, per_task
 
-    for f in events_dir.glob("*.jsonl"):
-        if f.name.startswith("_"):
-            continue  # skip _lifecycle.jsonl
-        task_id = f.stem
-        count = 0
-        for line in f.read_text().splitlines():
-            if line.strip():
-                count += 1
-        total += count
-        per_task[task_id] = count
+    from lattice.storage.event_log import EventCounts
+
+    with EventCounts(lattice_dir) as counts:
+        for f in events_dir.glob("*.jsonl"):
+            if f.name.startswith("_"):
+                continue  # skip _lifecycle.jsonl
+            count = counts.count(f)
+            total += count
+            per_task[f.stem] = count
 
     return total, per_task
 
@@ -118,93 +101,160 @@ def load_all_events(lattice_dir: Path) -> list[dict]:
     return events
 
 
-def _compute_velocity(events: list[dict], now: datetime, weeks: int = 8) -> list[dict]:
+# ---------------------------------------------------------------------------
+# Rolling aggregates
+# ---------------------------------------------------------------------------
+
+AGGREGATES_VERSION = 1
+
+# The per-event passes behind the quality metrics, kept as running totals so
+# a stats call never replays history. Durations are integer microseconds,
+# so totals do not depend on the order events were folded in. ``tasks`` holds
+# the open state of each counted task: [status, since_ts, blocked_since_ts].
+
+
+def empty_aggregates() -> dict:
+    """Return aggregates for an empty history."""
+    return {
+        "version": AGGREGATES_VERSION,
+        "done_weeks": {},
+        "status_us": {},
+        "blocked": [0, 0],
+        "actors": {},
+        "tasks": {},
+    }
+
+
+def apply_event_to_aggregates(aggregates: dict, event: dict) -> None:
+    """Fold one event from an active log into *aggregates* (in place)."""
+    from lattice.core.events import get_actor_display
+
+    actor = event.get("actor")
+    if actor:
+        display = get_actor_display(actor)
+        aggregates["actors"][display] = aggregates["actors"].get(display, 0) + 1
+
+    task_id = event.get("task_id")
+    if not task_id:
+        return
+    state = aggregates["tasks"].setdefault(task_id, [None, None, None])
+    etype = event.get("type")
+    if etype not in ("task_created", "status_changed"):
+        return
+    ts_str = event.get("ts", "")
+    ts = parse_ts(ts_str)
+    if ts is None:
+        return
+    data = event.get("data", {})
+
+    if etype == "task_created":
+        state[0], state[1] = data.get("status", "backlog"), ts_str
+        return
+
+    # Time in status: close the open segment
+    since = parse_ts(state[1]) if state[0] and state[1] else None
+    if since is not None:
+        _add_duration(aggregates["status_us"], state[0], ts - since)
+    state[0], state[1] = data.get("to"), ts_str
+
+    # Blocked episodes
+    if data.get("to") == "blocked":
+        state[2] = ts_str
+    elif data.get("from") == "blocked" and state[2]:
+        blocked_at = parse_ts(state[2])
+        if blocked_at is not None:
+            aggregates["blocked"][0] += 1
+            aggregates["blocked"][1] += _micros(ts - blocked_at)
+        state[2] = None
+
+    # Velocity
+    if data.get("to") == "done":
+        label = _week_label(ts)
+        aggregates["done_weeks"][label] = aggregates["done_weeks"].get(label, 0) + 1
+
+
+def merge_aggregates(aggregates: dict, delta: dict, *, sign: int = 1) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) the totals of *delta* in place.
+
+    *delta* is the aggregates of a set of whole tasks, e.g. one task being
+    archived or unarchived. Their open state is copied in or dropped.
+    """
+    for key in ("done_weeks", "actors"):
+        for name, count in delta[key].items():
+            total = aggregates[key].get(name, 0) + sign * count
+            if total:
+                aggregates[key][name] = total
+            else:
+                aggregates[key].pop(name, None)
+    for status, (micros, samples) in delta["status_us"].items():
+        current = aggregates["status_us"].get(status, [0, 0])
+        merged = [current[0] + sign * micros, current[1] + sign * samples]
+        if merged[1]:
+            aggregates["status_us"][status] = merged
+        else:
+            aggregates["status_us"].pop(status, None)
+    aggregates["blocked"] = [
+        aggregates["blocked"][0] + sign * delta["blocked"][0],
+        aggregates["blocked"][1] + sign * delta["blocked"][1],
+    ]
+    for task_id, state in delta["tasks"].items():
+        if sign > 0:
+            aggregates["tasks"][task_id] = list(state)
+        else:
+            aggregates["tasks"].pop(task_id, None)
+
+
+def _micros(delta: timedelta) -> int:
+    return delta // timedelta(microseconds=1)
+
+
+def _add_duration(status_us: dict, status: str, delta: timedelta) -> None:
+    entry = status_us.setdefault(status, [0, 0])
+    entry[0] += _micros(delta)
+    entry[1] += 1
+
+
+def _week_label(dt: datetime) -> str:
+    iso_year, iso_week, _ = dt.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def _compute_velocity(aggregates: dict, now: datetime, weeks: int = 8) -> list[dict]:
     """Compute tasks completed per week for the last N weeks.
 
     Returns list of {week_label, count} dicts, oldest first.
     """
-    # Find status_changed events where to == "done"
-    done_events: list[datetime] = []
-    for ev in events:
-        if ev.get("type") == "status_changed" and ev.get("data", {}).get("to") == "done":
-            dt = parse_ts(ev.get("ts", ""))
-            if dt:
-                done_events.append(dt)
-
-    # Bucket by ISO week
-    cutoff = now - timedelta(weeks=weeks)
-    buckets: Counter = Counter()
-    for dt in done_events:
-        if dt >= cutoff:
-            # Use ISO year-week as key
-            iso_year, iso_week, _ = dt.isocalendar()
-            buckets[f"{iso_year}-W{iso_week:02d}"] = (
-                buckets.get(f"{iso_year}-W{iso_week:02d}", 0) + 1
-            )
-
-    # Build ordered list for the last N weeks
+    done_weeks = aggregates["done_weeks"]
     result: list[dict] = []
     for i in range(weeks - 1, -1, -1):
-        week_start = now - timedelta(weeks=i)
-        iso_year, iso_week, _ = week_start.isocalendar()
-        label = f"{iso_year}-W{iso_week:02d}"
-        result.append({"week": label, "count": buckets.get(label, 0)})
-
+        label = _week_label(now - timedelta(weeks=i))
+        result.append({"week": label, "count": done_weeks.get(label, 0)})
     return result
 
 
-def _compute_time_in_status(events: list[dict], now: datetime) -> list[dict]:
+def _compute_time_in_status(aggregates: dict, now: datetime) -> list[dict]:
     """Compute average time spent in each status across all tasks.
 
-    Returns list of {status, avg_hours, sample_count} dicts, sorted by avg_hours desc.
+    Closed segments come from the running totals; each task's open segment
+    runs up to now. Returns list of {status, avg_hours, sample_count} dicts,
+    sorted by avg_hours desc.
     """
-    # Group events by task_id
-    task_events: dict[str, list[dict]] = defaultdict(list)
-    for ev in events:
-        tid = ev.get("task_id")
-        if tid:
-            task_events[tid].append(ev)
-
-    # For each task, walk status transitions and accumulate durations
-    status_durations: defaultdict[str, list[float]] = defaultdict(list)  # status -> list of hours
-
-    for tid, tevs in task_events.items():
-        tevs.sort(key=lambda e: e.get("ts", ""))
-
-        # Find initial status from task_created event
-        current_status = None
-        current_ts = None
-
-        for ev in tevs:
-            etype = ev.get("type")
-            ts = parse_ts(ev.get("ts", ""))
-            if ts is None:
-                continue
+    totals = {status: list(entry) for status, entry in aggregates["status_us"].items()}
+    for status, since, _blocked in aggregates["tasks"].values():
+        since_dt = parse_ts(since) if status and since else None
+        if since_dt is not None:
+            entry = totals.setdefault(status, [0, 0])
+            entry[0] += _micros(now - since_dt)
+            entry[1] += 1
 
-            if etype == "task_created":
-                current_status = ev.get("data", {}).get("status", "backlog")
-                current_ts = ts
-            elif etype == "status_changed":
-                if current_status and current_ts:
-                    hours = (ts - current_ts).total_seconds() / 3600
-                    status_durations[current_status].append(hours)
-                current_status = ev.get("data", {}).get("to")
-                current_ts = ts
-
-        # Account for time in current status up to now
-        if current_status and current_ts:
-            hours = (now - current_ts).total_seconds() / 3600
-            status_durations[current_status].append(hours)
-
-    # Compute averages
     result: list[dict] = []
-    for status, durations in status_durations.items():
-        avg = sum(durations) / len(durations)
+    for status in sorted(totals):
+        micros, samples = totals[status]
         result.append(
             {
                 "status": status,
-                "avg_hours": round(avg, 1),
-                "sample_count": len(durations),
+                "avg_hours": round(micros / samples / 3_600_000_000, 1),
+                "sample_count": samples,
             }
         )
 
@@ -212,64 +262,39 @@ def _compute_time_in_status(events: list[dict], now: datetime) -> list[dict]:
     return result
 
 
-def _compute_blocked_counts(events: list[dict], active: list[dict]) -> dict:
+def _compute_blocked_counts(aggregates: dict, active: list[dict]) -> dict:
     """Compute blocked-related metrics.
 
     Returns {currently_blocked, total_blocked_episodes, avg_blocked_hours}.
     """
     currently_blocked = sum(1 for s in active if s.get("status") == "blocked")
 
-    # Count how many times any task entered "blocked"
-    unblocked_times: list[float] = []  # hours spent blocked
-
-    task_blocked_at: dict[str, datetime] = {}  # task_id -> when it entered blocked
-
-    for ev in events:
-        if ev.get("type") != "status_changed":
-            continue
-        data = ev.get("data", {})
-        ts = parse_ts(ev.get("ts", ""))
-        tid = ev.get("task_id", "")
-        if not ts:
-            continue
-
-        if data.get("to") == "blocked":
-            task_blocked_at[tid] = ts
-        elif data.get("from") == "blocked" and tid in task_blocked_at:
-            hours = (ts - task_blocked_at[tid]).total_seconds() / 3600
-            unblocked_times.append(hours)
-            del task_blocked_at[tid]
-
-    total_episodes = len(unblocked_times) + len(task_blocked_at)  # resolved + still blocked
-    avg_hours = round(sum(unblocked_times) / len(unblocked_times), 1) if unblocked_times else 0
+    resolved, resolved_us = aggregates["blocked"]
+    still_blocked = sum(1 for state in aggregates["tasks"].values() if state[2])
+    avg_hours = round(resolved_us / resolved / 3_600_000_000, 1) if resolved else 0
 
     return {
         "currently_blocked": currently_blocked,
-        "total_blocked_episodes": total_episodes,
+        "total_blocked_episodes": resolved + still_blocked,  # resolved + still blocked
         "avg_blocked_hours": avg_hours,
     }
 
 
-def _compute_agent_activity(events: list[dict]) -> list[dict]:
+def _compute_agent_activity(aggregates: dict) -> list[dict]:
     """Compute event counts per actor.
 
     Returns list of {actor, event_count} dicts, sorted by count desc. Top 10.
     """
-    from lattice.core.events import get_actor_display
-
-    actor_counts: Counter = Counter()
-    for ev in events:
-        actor = ev.get("actor")
-        if actor:
-            actor_counts[get_actor_display(actor)] += 1
+    ranked = sorted(aggregates["actors"].items(), key=lambda item: (-item[1], item[0]))
+    return [{"actor": actor, "event_count": count} for actor, count in ranked[:10]]
 
-    return [
-        {"actor": actor, "event_count": count} for actor, count in actor_counts.most_common(10)
-    ]
 
+def build_stats(lattice_dir: Path, config: dict, aggregates: dict | None = None) -> dict:
+    """Build the full stats data structure.
 
-def build_stats(lattice_dir: Path, config: dict) -> dict:
-    """Build the full stats data structure."""
+    The event-derived metrics read the rolling aggregates kept under
+    ``index/`` (caught up first); pass *aggregates* to use others instead.
+    """
     now = datetime.now(timezone.utc)
     active, archived = load_all_snapshots(lattice_dir)
 
@@ -385,12 +410,15 @@ def build_stats(lattice_dir: Path, config: dict) -> dict:
         if s not in defined_statuses and c > 0:
             ordered_status.append((s, c))
 
-    # --- Quality Metrics (event-derived) ---
-    all_events = load_all_events(lattice_dir)
-    velocity = _compute_velocity(all_events, now)
-    time_in_status = _compute_time_in_status(all_events, now)
-    blocked = _compute_blocked_counts(all_events, active)
-    agent_activity = _compute_agent_activity(all_events)
+    # --- Quality Metrics (from the rolling aggregates) ---
+    if aggregates is None:
+        from lattice.storage.stats_aggregates import refresh_aggregates
+
+        aggregates = refresh_aggregates(lattice_dir)
+    velocity = _compute_velocity(aggregates, now)
+    time_in_status = _compute_time_in_status(aggregates, now)
+    blocked = _compute_blocked_counts(aggregates, active)
+    agent_activity = _compute_agent_activity(aggregates)
 
     return {
         "summary": {
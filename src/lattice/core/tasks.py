@@ -5,6 +5,7 @@ from __future__ import annotations
 import copy
 import json
 import sys
+from collections.abc import Iterable
 
 # Fields that cannot be overwritten by field_updated events.  These are
 # managed exclusively by internal bookkeeping or dedicated event types.
@@ -99,6 +100,41 @@ def apply_event_to_snapshot(snapshot: dict | None, event: dict) -> dict:
     return snap
 
 
+def apply_events(snapshot: dict | None, events: Iterable[dict]) -> dict:
+    """Apply *events* in order to *snapshot* (or ``None``) and return the result.
+
+    Equivalent to folding :func:`apply_event_to_snapshot` over *events*, but
+    copies *snapshot* once up front and then mutates that single working
+    copy, instead of deep-copying on every event. Use it for replays and
+    seeders that materialize many events at once.
+
+    Raises:
+        ValueError: If *events* is empty and *snapshot* is ``None``, or if an
+            event other than ``task_created`` comes first.
+    """
+    snap = copy.deepcopy(snapshot) if snapshot is not None else None
+    for event in events:
+        etype = event["type"]
+        if etype == "task_created":
+            snap = _init_snapshot(event)
+            # _init_snapshot shares the event's custom_fields dict; later
+            # custom_fields.* updates would otherwise write into the event.
+            snap["custom_fields"] = dict(snap["custom_fields"])
+        else:
+            if snap is None:
+                msg = (
+                    f"Cannot apply event type '{etype}' without an existing "
+                    "snapshot (expected 'task_created' first)"
+                )
+                raise ValueError(msg)
+            _apply_mutation(snap, etype, event)
+        snap["last_event_id"] = event["id"]
+        snap["updated_at"] = event["ts"]
+    if snap is None:
+        raise ValueError("No events to apply")
+    return snap
+
+
 # ---------------------------------------------------------------------------
 # Serialization helpers
 # ---------------------------------------------------------------------------
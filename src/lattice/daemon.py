@@ -0,0 +1,408 @@
+"""Warm command server for one ``.lattice/`` directory (``lattice daemon``).
+
+Every ``lattice`` invocation normally pays for interpreter startup, module
+imports, root discovery and index loads before doing any work. The daemon
+is a long-lived process per project that has already imported every
+command and keeps the snapshot index and short ID map current. The thin
+client in :mod:`lattice.client` sends it the command line, environment,
+working directory and umask, plus its own stdin/stdout/stderr file
+descriptors, over a Unix domain socket.
+
+Each request runs in a child forked from the warm process. The child
+takes over the client's descriptors, environment, directory and umask,
+then runs the CLI exactly as an in-process invocation would, so output
+is written straight to the client's terminal or pipes. Only the child's
+pid and exit status travel back over the socket.
+
+The daemon is opt-in (``lattice daemon start``) and POSIX-only. It exits
+after an idle timeout, when its ``.lattice/`` directory disappears, or
+when the installed lattice code changes underneath it; clients then run
+commands in-process again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import NoReturn, TextIO
+
+PROTOCOL = 1
+DAEMON_DIR_ENV = "LATTICE_DAEMON_DIR"
+NO_DAEMON_ENV = "LATTICE_NO_DAEMON"
+DEFAULT_IDLE_TIMEOUT = 1800  # seconds without a request before the daemon exits
+_TICK = 1.0  # seconds between housekeeping passes while idle
+_MAX_MESSAGE = 16 * 1024 * 1024
+_HEADER = struct.Struct(">I")
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot be started or its socket directory is unsafe."""
+
+
+# ---------------------------------------------------------------------------
+# Socket locations
+# ---------------------------------------------------------------------------
+
+
+def runtime_dir(*, create: bool = True) -> Path:
+    """Return the per-user directory holding daemon sockets, creating it if needed.
+
+    ``$LATTICE_DAEMON_DIR`` if set, else ``/tmp/lattice-<uid>``. The
+    directory must belong to the current user and be closed to everyone
+    else: anyone who can connect to a socket can run commands as its owner.
+    With ``create=False`` a missing directory raises :class:`DaemonError`
+    instead (no daemon has ever run, so none can be listening).
+    """
+    path = Path(os.environ.get(DAEMON_DIR_ENV) or f"/tmp/lattice-{os.getuid()}")
+    try:
+        if create:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.lstat()
+    except OSError as e:
+        raise DaemonError(f"Cannot use daemon directory {path}: {e}") from e
+    if not path.is_dir() or path.is_symlink():
+        raise DaemonError(f"Daemon directory {path} is not a directory")
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise DaemonError(f"Daemon directory {path} must be owned by you with mode 0700")
+    return path
+
+
+def socket_path(lattice_dir: Path, *, create: bool = True) -> Path:
+    """Return the socket path of the daemon serving *lattice_dir*.
+
+    *create* is passed to :func:`runtime_dir`.
+    """
+    key = hashlib.sha256(os.path.realpath(lattice_dir).encode()).hexdigest()[:24]
+    return runtime_dir(create=create) / f"{key}.sock"
+
+
+def pid_path(lattice_dir: Path) -> Path:
+    """Return the pid file of the daemon serving *lattice_dir* (locked while it runs)."""
+    return socket_path(lattice_dir).with_suffix(".pid")
+
+
+def log_path(lattice_dir: Path) -> Path:
+    """Return where a detached daemon's own output goes."""
+    return socket_path(lattice_dir).with_suffix(".log")
+
+
+def running_pid(lattice_dir: Path) -> int | None:
+    """Return the pid of the daemon serving *lattice_dir*, or None if none is running."""
+    import fcntl
+
+    try:
+        path = pid_path(lattice_dir)
+        with open(path) as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return int(f.read().strip() or 0) or None
+            return None  # nobody holds the lock: left over from a killed daemon
+    except (OSError, ValueError, DaemonError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Wire format: 4-byte big-endian length + JSON, descriptors as SCM_RIGHTS
+# ---------------------------------------------------------------------------
+
+
+def send_message(sock: socket.socket, message: dict, fds: list[int] | None = None) -> None:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    data = _HEADER.pack(len(body)) + body
+    sent = socket.send_fds(sock, [data], fds) if fds else 0
+    sock.sendall(data[sent:])
+
+
+def recv_message(sock: socket.socket, maxfds: int = 0) -> tuple[dict | None, list[int]]:
+    """Read one message; returns ``(None, fds)`` if the peer closed the connection."""
+    header = b""
+    fds: list[int] = []
+    while len(header) < _HEADER.size:
+        if maxfds:
+            chunk, received, _flags, _addr = socket.recv_fds(
+                sock, _HEADER.size - len(header), maxfds
+            )
+            fds.extend(received)
+        else:
+            chunk = sock.recv(_HEADER.size - len(header))
+        if not chunk:
+            return None, fds
+        header += chunk
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_MESSAGE:
+        return None, fds
+    body = b""
+    while len(body) < size:
+        chunk = sock.recv(min(size - len(body), 1 << 20))
+        if not chunk:
+            return None, fds
+        body += chunk
+    message = json.loads(body)
+    return (message if isinstance(message, dict) else None), fds
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+def serve(lattice_dir: Path, *, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Serve commands for *lattice_dir* until stopped, idle or out of date.
+
+    Raises :class:`DaemonError` if another daemon already serves the
+    directory. *idle_timeout* of 0 disables the idle exit.
+    """
+    import fcntl
+
+    from lattice.cli.main import cli
+
+    lattice_dir = Path(os.path.realpath(lattice_dir))
+    sock_path = socket_path(lattice_dir)
+    pid_file = open(pid_path(lattice_dir), "a+")  # noqa: SIM115 - held for the daemon's lifetime
+    try:
+        fcntl.flock(pid_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        pid_file.close()
+        raise DaemonError(f"A daemon is already running for {lattice_dir}") from None
+    pid_file.truncate(0)
+    pid_file.write(f"{os.getpid()}\n")
+    pid_file.flush()
+
+    cli.load_all()
+    sources = _code_files()
+    code = _code_key(sources)
+
+    stopping = False
+
+    def request_stop(signum: int, frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # children are reaped automatically
+
+    sock_path.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    bound = None
+    try:
+        server.bind(str(sock_path))
+        bound = sock_path.stat().st_ino
+        server.listen(64)
+        server.settimeout(_TICK)
+        seen = _warm(lattice_dir, None)
+        last_request = time.monotonic()
+        while not stopping:
+            try:
+                conn, _addr = server.accept()
+            except TimeoutError:
+                idle = time.monotonic() - last_request
+                if (
+                    (idle_timeout and idle >= idle_timeout)
+                    or not lattice_dir.is_dir()
+                    or _code_key(sources) != code
+                ):
+                    break
+                seen = _warm(lattice_dir, seen)
+                continue
+            last_request = time.monotonic()
+            with conn:
+                conn.settimeout(None)
+                if not _same_user(conn):
+                    continue
+                if _code_key(sources) != code:
+                    _reply(conn, {"error": "stale"})
+                    break
+                _dispatch(conn, server)
+    finally:
+        server.close()
+        try:
+            if sock_path.stat().st_ino == bound:
+                sock_path.unlink()
+        except OSError:
+            pass
+        pid_file.truncate(0)
+        pid_file.close()
+
+
+def _code_files() -> list[str]:
+    """Return the source files of every loaded lattice module."""
+    return sorted(
+        path
+        for name, module in list(sys.modules.items())
+        if (name == "lattice" or name.startswith("lattice."))
+        and (path := getattr(module, "__file__", None))
+    )
+
+
+def _code_key(files: list[str]) -> list[tuple[int, int] | None]:
+    """Stat *files*; any difference from startup means lattice was edited or reinstalled."""
+    key: list[tuple[int, int] | None] = []
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            key.append(None)
+        else:
+            key.append((st.st_mtime_ns, st.st_size))
+    return key
+
+
+def _warm(lattice_dir: Path, seen: tuple[str, int] | None) -> tuple[str, int] | None:
+    """Bring the snapshot index and short ID map up to date after new events.
+
+    Runs between requests so forked children find both current. Nothing is
+    held open across a fork: the index connection is closed again here.
+    """
+    import sqlite3
+
+    from lattice.storage.changefeed import feed_end
+    from lattice.storage.short_ids import load_id_map
+    from lattice.storage.snapshot_store import SnapshotStore
+
+    try:
+        end = feed_end(lattice_dir)
+        if end == seen:
+            return seen
+        with SnapshotStore(lattice_dir) as store:
+            store.refresh()
+        load_id_map(lattice_dir)
+    except (OSError, ValueError, sqlite3.Error):
+        return seen
+    return end
+
+
+def _same_user(conn: socket.socket) -> bool:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True  # the 0700 socket directory is the only gate
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return int(uid) == os.getuid()
+
+
+def _reply(conn: socket.socket, message: dict) -> None:
+    try:
+        send_message(conn, message)
+    except OSError:
+        pass
+
+
+def _dispatch(conn: socket.socket, server: socket.socket) -> None:
+    """Read one request and fork a child to run it."""
+    try:
+        request, fds = recv_message(conn, maxfds=3)
+    except (OSError, ValueError):
+        return
+    try:
+        if request is None or request.get("protocol") != PROTOCOL or len(fds) != 3:
+            _reply(conn, {"error": "bad request"})
+            return
+        if os.fork() == 0:
+            server.close()
+            _run_request(conn, request, fds)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _run_request(conn: socket.socket, request: dict, fds: list[int]) -> NoReturn:
+    """Become the client's process, run its command, report the exit status, exit."""
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        os.umask(request["umask"])
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        time.tzset()
+        sys.argv = list(request["argv"])
+        sys.stdin, sys.stdout, sys.stderr = (
+            _open_stdio(fd, spec) for fd, spec in enumerate(request["stdio"])
+        )
+        send_message(conn, {"pid": os.getpid()})
+        status = _finish(_run_cli(sys.argv[1:], request["prog_name"]))
+        send_message(conn, {"exit": status})
+    finally:
+        os._exit(0)
+
+
+def _open_stdio(fd: int, spec: dict) -> TextIO:
+    """Recreate a standard stream over *fd* with the client's text settings."""
+    import io
+
+    if fd == 0:
+        buffer: io.BufferedReader | io.BufferedWriter = io.BufferedReader(
+            io.FileIO(fd, "r", closefd=False)
+        )
+    else:
+        buffer = io.BufferedWriter(io.FileIO(fd, "w", closefd=False))
+    return io.TextIOWrapper(
+        buffer,
+        encoding=spec["encoding"],
+        errors=spec["errors"],
+        newline="\n",
+        line_buffering=spec["line_buffering"],
+        write_through=spec["write_through"],
+    )
+
+
+def _run_cli(args: list[str], prog_name: str) -> int | str | None:
+    """Run the CLI as ``python -m`` would and return what it passed to ``sys.exit``."""
+    import traceback
+
+    from lattice.cli.main import cli
+
+    try:
+        cli.main(args=args, prog_name=prog_name)
+    except SystemExit as e:
+        return e.code
+    except BaseException:  # noqa: BLE001 - reported like an uncaught exception
+        traceback.print_exc()
+        return 1
+    return None
+
+
+def _finish(code: int | str | None) -> int:
+    """Mirror interpreter shutdown: exit hooks, the exit message, stream flushes."""
+    import atexit
+
+    atexit._run_exitfuncs()
+    if code is None:
+        status = 0
+    elif isinstance(code, int):
+        status = code
+    else:
+        print(code, file=sys.stderr)
+        status = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            # The interpreter reports an unflushable stdout with status 120
+            status = status or 120
+    return status
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m lattice.daemon")
+    parser.add_argument("lattice_dir", type=Path)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    options = parser.parse_args()
+    try:
+        serve(options.lattice_dir, idle_timeout=options.idle_timeout)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
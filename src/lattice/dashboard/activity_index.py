@@ -0,0 +1,181 @@
+"""Time-ordered activity index: events by (ts, id) with per-field posting lists."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+
+from lattice.core.events import get_actor_display
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not produced by :func:`encode_cursor`."""
+
+
+def encode_cursor(key: tuple[str, str]) -> str:
+    """Return an opaque cursor for the (ts, id) *key* of the last event on a page."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return the (ts, id) key in *cursor*.
+
+    Raises:
+        InvalidCursor: If *cursor* is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(k, str) for k in key)):
+        raise InvalidCursor(cursor)
+    return key[0], key[1]
+
+
+class ActivityIndex:
+    """Events ordered by (ts, id), with posting lists by type, task and actor.
+
+    Positions count from the oldest event. Each posting list holds the
+    ascending positions of its events, so a filter narrows the candidates
+    to one list and a time range or cursor narrows that list by bisection;
+    only the rows on the requested page are visited beyond that.
+    """
+
+    def __init__(self, events: Iterable[dict]) -> None:
+        self.events = sorted(events, key=_key)
+        self._keys = [_key(e) for e in self.events]
+        self._ts = [k[0] for k in self._keys]
+        self._positions = {e.get("id"): pos for pos, e in enumerate(self.events)}
+        self._actors: list[str] = []
+        self.by_type: dict[str, list[int]] = {}
+        self.by_task: dict[str, list[int]] = {}
+        self.by_actor: dict[str, list[int]] = {}
+        for pos, event in enumerate(self.events):
+            actor = get_actor_display(event["actor"]) if event.get("actor") else ""
+            self._actors.append(actor)
+            if event.get("type"):
+                self.by_type.setdefault(event["type"], []).append(pos)
+            if event.get("task_id"):
+                self.by_task.setdefault(event["task_id"], []).append(pos)
+            if actor:
+                self.by_actor.setdefault(actor, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def facets(self) -> dict:
+        """Return the distinct types, actors and task IDs (precomputed)."""
+        return {
+            "types": sorted(self.by_type),
+            "actors": sorted(self.by_actor),
+            "task_ids": sorted(self.by_task),
+        }
+
+    def query(
+        self,
+        *,
+        types: set[str] | None = None,
+        task_id: str | None = None,
+        actor: str | None = None,
+        event_ids: set[str] | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        match: Callable[[dict], bool] | None = None,
+        cursor: tuple[str, str] | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[dict], int, bool]:
+        """Return (page newest first, total matches, has_more).
+
+        *event_ids* restricts the results to those events (the hits of a
+        search). *after* and *before* are exclusive ``ts`` bounds. *cursor*
+        is the (ts, id) of the last event already shown; the page starts just
+        below it. *match* is an extra predicate for filters the index cannot
+        answer.
+        """
+        lo = bisect_right(self._ts, after) if after else 0
+        hi = bisect_left(self._ts, before) if before else len(self.events)
+        if hi <= lo:
+            return [], 0, False
+
+        candidates, checks = self._plan(types, task_id, actor, event_ids)
+        if match is not None:
+            checks.append(lambda pos: match(self.events[pos]))
+
+        if candidates is None:
+            in_window: Iterable[int] | range = range(lo, hi)
+            window_len = hi - lo
+        else:
+            start, stop = bisect_left(candidates, lo), bisect_left(candidates, hi)
+            in_window = candidates[start:stop]
+            window_len = stop - start
+
+        def accepted(positions: Iterable[int]) -> Iterator[int]:
+            return (p for p in positions if all(check(p) for check in checks))
+
+        total = window_len if not checks else sum(1 for _ in accepted(in_window))
+
+        page_hi = hi if cursor is None else min(hi, bisect_left(self._keys, cursor))
+        if candidates is None:
+            newest_first: Iterable[int] = range(page_hi - 1, lo - 1, -1)
+        else:
+            stop = bisect_left(candidates, page_hi)
+            start = bisect_left(candidates, lo)
+            newest_first = (candidates[i] for i in range(stop - 1, start - 1, -1))
+
+        page: list[dict] = []
+        has_more = False
+        skipped = 0
+        for pos in accepted(newest_first):
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(self.events[pos])
+        return page, total, has_more
+
+    def cursor_after(self, event: dict) -> str:
+        """Return the cursor that continues a page ending with *event*."""
+        return encode_cursor(_key(event))
+
+    def _plan(
+        self,
+        types: set[str] | None,
+        task_id: str | None,
+        actor: str | None,
+        event_ids: set[str] | None,
+    ) -> tuple[list[int] | None, list[Callable[[int], bool]]]:
+        """Pick the smallest posting list to drive the scan; the rest become checks."""
+        options: list[tuple[list[int], Callable[[int], bool]]] = []
+        if types:
+            lists = [self.by_type.get(t, []) for t in sorted(types)]
+            merged = lists[0] if len(lists) == 1 else list(heapq.merge(*lists))
+            options.append((merged, lambda pos: self.events[pos].get("type") in types))
+        if task_id:
+            options.append(
+                (
+                    self.by_task.get(task_id, []),
+                    lambda pos: self.events[pos].get("task_id") == task_id,
+                )
+            )
+        if actor:
+            options.append((self.by_actor.get(actor, []), lambda pos: self._actors[pos] == actor))
+        if event_ids is not None:
+            positions = sorted(self._positions[i] for i in event_ids if i in self._positions)
+            options.append((positions, lambda pos: self.events[pos].get("id") in event_ids))
+        if not options:
+            return None, []
+        options.sort(key=lambda option: len(option[0]))
+        return options[0][0], [check for _, check in options[1:]]
+
+
+def _key(event: dict) -> tuple[str, str]:
+    return event.get("ts") or "", event.get("id") or ""
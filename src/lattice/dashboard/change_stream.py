@@ -0,0 +1,262 @@
+"""Change stream for the dashboard: changefeed records paired with fresh task snapshots."""
+
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from lattice.core.tasks import compact_snapshot
+from lattice.dashboard.state_cache import WATCH_ENV, _Inotify
+from lattice.storage.changefeed import (
+    CHANGEFEED_FILE,
+    event_of,
+    feed_end,
+    read_since,
+    record_generation,
+)
+
+# Seconds between stat polls when inotify is unavailable (also the fallback
+# check interval alongside inotify, for directories that could not be watched).
+POLL_INTERVAL = 0.5
+
+# Seconds a record waits for its task snapshot before it is sent anyway. The
+# changefeed is appended after the snapshot is written, so a record is held
+# only while a newer write to the same task is between its snapshot and its
+# own feed record.
+SETTLE_SECONDS = 2.0
+
+# Records read from the feed per poll.
+BATCH_SIZE = 500
+
+
+def format_position(generation: str, seq: int) -> str:
+    """Return the SSE id for a feed position: ``<generation>:<seq>``.
+
+    Position 0 is the start of every generation, and a feed written before
+    generations existed has none, so both are plain ``<seq>``.
+    """
+    return f"{generation}:{seq}" if generation and seq else str(seq)
+
+
+def parse_position(text: str) -> tuple[str | None, int] | None:
+    """Parse an SSE id or ``?since=`` value into (generation, seq).
+
+    A plain sequence number has no generation (None): it is taken to be in
+    the feed's current one. Returns None if *text* is not a position.
+    """
+    generation, sep, seq_text = text.rpartition(":")
+    try:
+        seq = int(seq_text)
+    except ValueError:
+        return None
+    if seq < 0:
+        return None
+    return (generation if sep else None, seq)
+
+
+class ChangeNotifier:
+    """Wakes stream subscribers when the changefeed or task snapshots change.
+
+    A single background thread per server watches ``changes.jsonl`` and the
+    ``events/``, ``tasks/`` and ``archive/tasks/`` directories (inotify where
+    available, stat polling otherwise) and bumps :attr:`generation` on every
+    change. The thread starts with the first :meth:`wait`.
+    """
+
+    def __init__(
+        self,
+        lattice_dir: Path,
+        *,
+        watch: str | None = None,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        self.lattice_dir = lattice_dir
+        self.generation = 0
+        self.closed = False
+        self._watch = watch or os.environ.get(WATCH_ENV, "auto")
+        self._poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._dirs = [
+            lattice_dir,
+            lattice_dir / "events",
+            lattice_dir / "tasks",
+            lattice_dir / "archive" / "tasks",
+        ]
+
+    def wait(self, generation: int, timeout: float) -> bool:
+        """Block until :attr:`generation` moves past *generation* or *timeout* expires.
+
+        Returns True if a change was seen, False on timeout or once closed.
+        """
+        with self._cond:
+            if self._thread is None and not self.closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="lattice-dashboard-watch", daemon=True
+                )
+                self._thread.start()
+            self._cond.wait_for(
+                lambda: self.generation != generation or self.closed, timeout=timeout
+            )
+            return self.generation != generation and not self.closed
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _bump(self) -> None:
+        with self._cond:
+            self.generation += 1
+            self._cond.notify_all()
+
+    def _signature(self) -> tuple[int, ...]:
+        # Directory mtimes catch snapshot writes (atomic renames); the feed's
+        # own stat catches appends.
+        sig: list[int] = []
+        for path in [*self._dirs, self.lattice_dir / CHANGEFEED_FILE]:
+            try:
+                st = os.stat(path)
+            except OSError:
+                sig.extend((-1, -1))
+                continue
+            sig.extend((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def _run(self) -> None:
+        inotify = _Inotify.create() if self._watch == "auto" else None
+        try:
+            root_wd = None
+            if inotify is not None:
+                wds = [inotify.add_watch(directory) for directory in self._dirs]
+                root_wd = wds[0]
+            signature = self._signature()
+            while not self.closed:
+                if inotify is not None:
+                    ready, _, _ = select.select([inotify.fileno()], [], [], self._poll_interval)
+                    events = inotify.read() if ready else []
+                    # In the project root only the feed matters (not config.json etc.)
+                    if events is None or any(
+                        wd != root_wd or name == CHANGEFEED_FILE for wd, _mask, name in events
+                    ):
+                        self._bump()
+                else:
+                    time.sleep(self._poll_interval)
+                current = self._signature()
+                if current != signature:
+                    signature = current
+                    self._bump()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+
+class ChangeCursor:
+    """Reads changefeed records after a sequence number, ready to send.
+
+    Each message is ``{"seq", "event", "task"}``: the feed record (without
+    ``seq``) and, for the last record of each task in a batch, that task's
+    compact snapshot once the snapshot reflects the record (``None`` if the
+    task no longer exists). ``archived`` marks a snapshot read from
+    ``archive/``. Resource events carry no ``task`` key.
+
+    A record whose snapshot has not been written yet is held (see
+    :attr:`held`) rather than sent with a stale snapshot, for at most
+    :data:`SETTLE_SECONDS`; later records wait behind it so order is kept.
+
+    The position is a sequence number in a feed :attr:`generation` (None:
+    whichever generation the feed is in now). When the feed is regenerated
+    (``lattice rebuild --all``), sequence numbers start over, so the cursor
+    moves to the end of the new feed and sets :attr:`reset`: the reader
+    must reload its state instead of applying changes.
+    """
+
+    def __init__(
+        self,
+        lattice_dir: Path,
+        seq: int,
+        lookup: Callable[[str, bool], dict | None],
+        generation: str | None = None,
+    ) -> None:
+        self.lattice_dir = lattice_dir
+        self.seq = seq
+        self.generation = feed_end(lattice_dir)[0] if generation is None else generation
+        self.held = False
+        self.more = False
+        self.reset = False
+        self._lookup = lookup
+        self._held_since: float | None = None
+
+    def poll(self) -> list[dict]:
+        """Return the messages now ready to send, advancing :attr:`seq` past them."""
+        generation, end = feed_end(self.lattice_dir)
+        self.reset = False
+        if self.seq == 0:
+            # The start of the feed is the same position in every generation.
+            self.generation = generation
+        elif generation != self.generation:
+            self.generation, self.seq = generation, end
+            self.reset = True
+            self.held = self.more = False
+            self._held_since = None
+            return []
+        records = read_since(self.lattice_dir, self.seq, limit=BATCH_SIZE)
+        # Regenerated since feed_end(): stop before the new numbering, the
+        # next poll resets.
+        for i, record in enumerate(records):
+            if record_generation(record) != self.generation:
+                records = records[:i]
+                break
+        self.more = len(records) >= BATCH_SIZE
+        last_for_task: dict[str, int] = {}
+        for i, record in enumerate(records):
+            task_id = record.get("task_id")
+            if isinstance(task_id, str) and task_id.startswith("task_"):
+                last_for_task[task_id] = i
+
+        messages: list[dict] = []
+        self.held = False
+        for i, record in enumerate(records):
+            event = event_of(record)
+            message: dict = {"seq": record["seq"], "event": event}
+            task_id = event.get("task_id")
+            if isinstance(task_id, str) and last_for_task.get(task_id) == i:
+                found = self._task_for(event)
+                if found is None:
+                    self.held = True
+                    self.more = False
+                    break
+                snapshot, archived = found
+                message["task"] = compact_snapshot(snapshot) if snapshot is not None else None
+                if archived:
+                    message["archived"] = True
+            messages.append(message)
+            self.seq = record["seq"]
+            self._held_since = None
+        return messages
+
+    def _task_for(self, event: dict) -> tuple[dict | None, bool] | None:
+        """Return (snapshot, archived) for *event*'s task, or None to hold the record."""
+        task_id = event["task_id"]
+        active = self._lookup(task_id, False)
+        if active is not None and active.get("last_event_id") == event["id"]:
+            return active, False
+        archived = self._lookup(task_id, True)
+        if archived is not None and archived.get("last_event_id") == event["id"]:
+            return archived, True
+
+        now = time.monotonic()
+        if self._held_since is None:
+            self._held_since = now
+        if now - self._held_since < SETTLE_SECONDS:
+            return None
+        # Gave up waiting: send whatever is on disk.
+        if active is not None:
+            return active, False
+        return archived, archived is not None
@@ -1,21 +1,26 @@
 """Read-only git integration for the Lattice dashboard.
 
-Shells out to ``git`` CLI via :mod:`subprocess` — no Python git dependencies.
-All operations are strictly read-only.  When git is unavailable or the
-``.lattice/`` directory is not inside a git repository, the module degrades
-gracefully and returns structured ``available=False`` payloads.
+Reads through the shared :class:`~lattice.git_session.GitSession` (refs from
+disk, objects from a persistent ``git cat-file --batch``), falling back to
+one-off ``git`` subprocesses when no session is available. No Python git
+dependencies. All operations are strictly read-only.  When git is
+unavailable or the ``.lattice/`` directory is not inside a git repository,
+the module degrades gracefully and returns structured ``available=False``
+payloads.
 """
 
 from __future__ import annotations
 
 import hashlib
-import re
 import shutil
 import subprocess
 import time
 from pathlib import Path
 from typing import Any
 
+from lattice.git_session import GitError, GitSession, find_repo, get_session
+from lattice.storage.commit_index import CommitIndex, extract_task_refs
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -23,12 +28,6 @@ from typing import Any
 GIT_COMMAND_TIMEOUT = 10  # seconds per subprocess call
 CACHE_TTL_SECONDS = 30  # how long the summary cache is valid
 
-# Patterns for extracting Lattice task references from commit messages.
-# Matches short IDs like LAT-42, PROJ-7, or any UPPER-ID pattern:
-_SHORT_ID_RE = re.compile(r"\b([A-Z][A-Z0-9]+-\d+)\b")
-# Matches ULID-style task IDs like task_01HQ...:
-_ULID_RE = re.compile(r"\b(task_[0-9A-Z]{26})\b")
-
 
 # ---------------------------------------------------------------------------
 # Low-level git helpers
@@ -61,18 +60,8 @@ def git_available() -> bool:
 
 def find_git_root(start: Path) -> Path | None:
     """Return the git repo root containing *start*, or None."""
-    try:
-        result = _run_git(
-            ["rev-parse", "--show-toplevel"],
-            cwd=start,
-        )
-        if result.returncode == 0:
-            root = result.stdout.strip()
-            if root:
-                return Path(root)
-    except (subprocess.TimeoutExpired, OSError):
-        pass
-    return None
+    found = find_repo(start)
+    return found[0] if found is not None else None
 
 
 # ---------------------------------------------------------------------------
@@ -82,6 +71,9 @@ def find_git_root(start: Path) -> Path | None:
 
 def get_current_branch(repo_root: Path) -> str | None:
     """Return the current branch name, or None if in detached HEAD state."""
+    session = get_session(repo_root)
+    if session is not None:
+        return session.current_branch()
     try:
         result = _run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_root)
         if result.returncode == 0:
@@ -99,6 +91,13 @@ def get_branches(repo_root: Path) -> list[dict[str, Any]]:
     Each dict has keys: ``name``, ``is_current``, ``commit_hash``,
     ``commit_subject``, ``commit_date``, ``author_name``, ``author_email``.
     """
+    session = get_session(repo_root)
+    if session is not None:
+        try:
+            return _session_branches(session)
+        except GitError:
+            pass
+
     # Format: refname:short, HEAD indicator, objectname:short, subject, authordate:iso-strict, authorname, authoremail
     fmt = "%(refname:short)%09%(HEAD)%09%(objectname:short)%09%(subject)%09%(authordate:iso-strict)%09%(authorname)%09%(authoremail)"
     try:
@@ -143,18 +142,35 @@ def get_recent_commits(
     branch: str,
     *,
     limit: int = 20,
+    lattice_dir: Path | None = None,
 ) -> list[dict[str, Any]]:
     """Return recent commits on *branch* as a list of dicts.
 
     Each dict has: ``hash``, ``short_hash``, ``subject``, ``body``,
     ``author_name``, ``author_email``, ``date``, ``task_refs``.
 
+    With *lattice_dir*, ``task_refs`` of local branches come from the
+    commit reference index instead of scanning each message.
+
     Returns an empty list if *branch* looks like a git flag (starts with
     ``-``) to prevent argument injection.
     """
     if not _validate_branch_name(branch):
         return []
 
+    session = get_session(repo_root)
+    if session is not None:
+        try:
+            sha = session.resolve(branch)
+            if sha is not None:
+                abbrev = session.abbrev()
+                logged = session.log(sha, limit=limit)
+                indexed = _indexed_refs(lattice_dir, session, sha, logged)
+                return [_commit_payload(c, abbrev, indexed) for c in logged]
+        except GitError:
+            pass
+
+    # Revisions the session cannot resolve (e.g. ``main~2``) go through git log.
     # Use %x00 as field separator, %x01 as record separator
     fmt = "%H%x00%h%x00%s%x00%b%x00%an%x00%ae%x00%aI%x01"
     try:
@@ -207,6 +223,9 @@ def get_recent_commits(
 
 def get_commit_count(repo_root: Path) -> int | None:
     """Return total commit count, or None on error."""
+    session = get_session(repo_root)
+    if session is not None:
+        return session.commit_count()
     try:
         result = _run_git(["rev-list", "--count", "HEAD"], cwd=repo_root)
         if result.returncode == 0:
@@ -218,6 +237,9 @@ def get_commit_count(repo_root: Path) -> int | None:
 
 def get_remote_url(repo_root: Path) -> str | None:
     """Return the URL of the 'origin' remote, or None."""
+    session = get_session(repo_root)
+    if session is not None:
+        return session.remote_url("origin")
     try:
         result = _run_git(["remote", "get-url", "origin"], cwd=repo_root)
         if result.returncode == 0:
@@ -228,33 +250,69 @@ def get_remote_url(repo_root: Path) -> str | None:
     return None
 
 
-# ---------------------------------------------------------------------------
-# Task reference extraction
-# ---------------------------------------------------------------------------
+def _session_branches(session: GitSession) -> list[dict[str, Any]]:
+    """Build the :func:`get_branches` payload from refs on disk and cached commits."""
+    current = session.current_branch()
+    abbrev = session.abbrev()
+    rows: list[tuple[int, str, dict[str, Any]]] = []
+    for name, sha in session.branches().items():
+        commit = session.commit(sha)
+        if commit is None:
+            continue
+        rows.append(
+            (
+                commit["author_time"],
+                name,
+                {
+                    "name": name,
+                    "is_current": name == current,
+                    "commit_hash": sha[:abbrev],
+                    "commit_subject": commit["subject"],
+                    "commit_date": commit["author_date"],
+                    "author_name": commit["author_name"],
+                    "author_email": f"<{commit['author_email']}>",
+                },
+            )
+        )
+    # Same order as ``for-each-ref --sort=-authordate`` (ties by ref name)
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return [row[2] for row in rows]
+
 
+def _indexed_refs(
+    lattice_dir: Path | None, session: GitSession, tip: str, commits: list[dict[str, Any]]
+) -> dict[str, list[str]] | None:
+    """Return the indexed task refs of *commits*, or None if the index does not cover *tip*."""
+    if lattice_dir is None:
+        return None
+    with CommitIndex(lattice_dir, session) as index:
+        if not index.refresh() or not index.covers(tip):
+            return None
+        return index.refs_for(c["sha"] for c in commits)
 
-def extract_task_refs(text: str) -> list[str]:
-    """Extract Lattice task references from a commit message.
 
-    Finds short IDs (e.g., ``LAT-42``) and ULID task IDs
-    (e.g., ``task_01HQABC...``).  Returns deduplicated list.
+def _commit_payload(
+    commit: dict[str, Any], abbrev: int, indexed: dict[str, list[str]] | None = None
+) -> dict[str, Any]:
+    """Return the :func:`get_recent_commits` dict for a parsed session commit.
+
+    *indexed* maps shas to their task refs; commits missing from it mention none.
     """
-    refs: list[str] = []
-    seen: set[str] = set()
-
-    for match in _SHORT_ID_RE.finditer(text):
-        ref = match.group(1)
-        if ref not in seen:
-            refs.append(ref)
-            seen.add(ref)
-
-    for match in _ULID_RE.finditer(text):
-        ref = match.group(1)
-        if ref not in seen:
-            refs.append(ref)
-            seen.add(ref)
-
-    return refs
+    body = commit["body"].strip()
+    if indexed is not None:
+        task_refs = indexed.get(commit["sha"], [])
+    else:
+        task_refs = extract_task_refs(f"{commit['subject']} {body}")
+    return {
+        "hash": commit["sha"],
+        "short_hash": commit["sha"][:abbrev],
+        "subject": commit["subject"],
+        "body": body if body else None,
+        "author_name": commit["author_name"],
+        "author_email": commit["author_email"],
+        "date": commit["author_date"],
+        "task_refs": task_refs,
+    }
 
 
 # ---------------------------------------------------------------------------
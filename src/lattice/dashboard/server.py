@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
 import platform
-import shutil
+import re
+import socket
+import sqlite3
 import subprocess
 import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any
@@ -29,25 +38,80 @@ from lattice.core.config import (
     validate_task_type,
     validate_transition,
 )
-from lattice.core.events import create_event, serialize_event, utc_now
+from lattice.core.events import create_event, utc_now
 from lattice.core.ids import generate_task_id, validate_actor, validate_id
 from lattice.core.tasks import (
     apply_event_to_snapshot,
     compact_snapshot,
-    serialize_snapshot,
 )
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.dashboard.activity_index import ActivityIndex, InvalidCursor, decode_cursor
+from lattice.dashboard.change_stream import (
+    ChangeCursor,
+    ChangeNotifier,
+    format_position,
+    parse_position,
+)
+from lattice.dashboard.state_cache import StateCache
+from lattice.storage.changefeed import feed_end
+from lattice.storage.fs import atomic_write
 from lattice.storage.locks import multi_lock
 from lattice.storage.hooks import execute_hooks
-from lattice.storage.operations import scaffold_plan, write_task_event
+from lattice.storage.operations import scaffold_plan, write_task_archive, write_task_event
 from lattice.storage.readers import read_task_events
+from lattice.storage.search_index import SearchIndex
 from lattice.storage.short_ids import allocate_short_id
+from lattice.storage.snapshot_store import SnapshotStore
 
 STATIC_DIR = Path(__file__).parent / "static"
 
 # Maximum allowed request body size (1 MiB) to prevent DoS via oversized payloads.
 MAX_REQUEST_BODY_BYTES = 1_048_576
 
+# Seconds a cached /api/stats response is reused while nothing changes on disk.
+STATS_MAX_AGE = 60.0
+
+# Worker threads serving connections. A keep-alive connection holds its
+# worker until it closes or idles out, so this bounds concurrent clients.
+MAX_WORKERS = 64
+
+# Seconds an idle keep-alive connection (or a stalled request) is kept open.
+KEEPALIVE_TIMEOUT = 15.0
+
+# Open /api/stream connections allowed at once. Each holds a worker thread,
+# so this stays well below MAX_WORKERS to leave room for ordinary requests.
+MAX_STREAMS = 32
+
+# Seconds between comment lines on an idle stream, so proxies and clients
+# keep the connection open and closed clients are noticed.
+STREAM_HEARTBEAT = 15.0
+
+# Client reconnect delay (milliseconds) sent as the stream's ``retry`` field.
+STREAM_RETRY_MS = 2000
+
+# Bodies smaller than this are sent uncompressed; gzip would barely shrink them.
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+# Compressed bodies kept for responses with an ETag (most recent first out).
+GZIP_CACHE_ENTRIES = 32
+
+# Static assets requested with ``?v=<content hash>`` never change at that URL.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Everything the per-task read endpoints derive from.
+TASK_DETAIL_DEPS = (
+    "tasks",
+    "archive/tasks",
+    "events",
+    "archive/events",
+    "notes",
+    "archive/notes",
+    "plans",
+    "archive/plans",
+    "artifacts",
+)
+ACTIVITY_DEPS = ("events", "archive/events", "tasks", "archive/tasks")
+
 # ---------------------------------------------------------------------------
 # JSON envelope helpers
 # ---------------------------------------------------------------------------
@@ -73,17 +137,49 @@ def _err(code: str, message: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
-    """Create a handler class bound to a specific .lattice/ directory."""
+def _make_handler_class(
+    lattice_dir: Path,
+    *,
+    readonly: bool = False,
+    state: StateCache | None = None,
+    notifier: ChangeNotifier | None = None,
+) -> type:
+    """Create a handler class bound to a specific .lattice/ directory.
+
+    GET endpoints answer from *state* (a fresh :class:`StateCache` if omitted)
+    and may run concurrently; POSTs are handled one at a time. ``/api/stream``
+    waits on *notifier* (likewise created if omitted).
+    """
 
     class LatticeHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps connections open between requests, so every response
+        # must carry a Content-Length (or be a bodiless 304).
+        protocol_version = "HTTP/1.1"
+        timeout = KEEPALIVE_TIMEOUT
+
         _lattice_dir: Path = lattice_dir
         _readonly: bool = readonly
+        _state: StateCache = state if state is not None else StateCache(lattice_dir)
+        _notifier: ChangeNotifier = (
+            notifier if notifier is not None else ChangeNotifier(lattice_dir)
+        )
+        _stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+        # Serializes mutations within this process: handlers read a snapshot
+        # before taking the per-task file locks, so two concurrent writes to
+        # one task could otherwise both apply to the same stale snapshot.
+        _write_lock = threading.Lock()
+        _body_read = False
 
         # Suppress default access logging to stdout; send to stderr instead
         def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
             sys.stderr.write(f"{self.address_string()} - {format % args}\n")
 
+        def log_error(self, format: str, *args: Any) -> None:
+            # Idle keep-alive connections time out routinely; not worth a log line.
+            if format.startswith("Request timed out"):
+                return
+            super().log_error(format, *args)
+
         def do_GET(self) -> None:  # noqa: N802
             parsed = urlparse(self.path)
             path = parsed.path.rstrip("/") or "/"
@@ -116,34 +212,51 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 self._send_json(404, _err("NOT_FOUND", f"Not found: {path}"))
 
         def do_POST(self) -> None:  # noqa: N802
-            if self._readonly:
-                self._send_json(403, _err("FORBIDDEN", "Dashboard is in read-only mode"))
-                return
+            self._body_read = False
+            try:
+                if self._readonly:
+                    self._send_json(403, _err("FORBIDDEN", "Dashboard is in read-only mode"))
+                    return
 
-            parsed = urlparse(self.path)
-            path = parsed.path.rstrip("/") or "/"
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/") or "/"
 
-            if path.startswith("/api/"):
-                self._route_api_post(path)
-            else:
-                self._send_json(404, _err("NOT_FOUND", f"Not found: {path}"))
+                if path.startswith("/api/"):
+                    with self._write_lock:
+                        self._route_api_post(path)
+                else:
+                    self._send_json(404, _err("NOT_FOUND", f"Not found: {path}"))
+            finally:
+                if not self._body_read and self.headers.get("Content-Length", "0") != "0":
+                    # The unread body would be parsed as the next request.
+                    self.close_connection = True
 
         # ---------------------------------------------------------------
         # Static file serving
         # ---------------------------------------------------------------
 
         def _serve_static(self, filename: str, content_type: str) -> None:
-            filepath = STATIC_DIR / filename
-            if not filepath.is_file():
+            asset = _static_asset(filename)
+            if asset is None:
                 self._send_json(404, _err("NOT_FOUND", f"Static file not found: {filename}"))
                 return
-            data = filepath.read_bytes()
-            self.send_response(200)
-            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("Cache-Control", "no-cache")
-            self.end_headers()
-            self.wfile.write(data)
+            data, digest = asset
+            if filename == "index.html":
+                data, digest = _versioned_index(data, digest)
+            # Pages link assets as ?v=<hash> (see _versioned_index); those URLs
+            # are immutable. Anything else is revalidated by ETag.
+            version = parse_qs(urlparse(self.path).query).get("v", [None])[0]
+            cache_control = IMMUTABLE_CACHE_CONTROL if version == digest else "no-cache"
+            etag = f'W/"{digest}"'
+            if self._not_modified(200, etag, cache_control):
+                return
+            self._send_body(
+                200,
+                data,
+                f"{content_type}; charset=utf-8",
+                etag=etag,
+                cache_control=cache_control,
+            )
 
         def _serve_notes_file(self, relpath: str, content_type: str) -> None:
             """Serve a file from the repo's notes/ directory."""
@@ -152,12 +265,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             if not filepath.is_file():
                 self._send_json(404, _err("NOT_FOUND", f"File not found: {relpath}"))
                 return
-            data = filepath.read_bytes()
-            self.send_response(200)
-            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
-            self.wfile.write(data)
+            self._send_body(200, filepath.read_bytes(), f"{content_type}; charset=utf-8")
 
         # ---------------------------------------------------------------
         # API routing
@@ -168,6 +276,10 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
 
             if path == "/api/config":
                 self._handle_config(ld)
+            elif path == "/api/cache":
+                self._send_json(200, _ok(self._state.stats()))
+            elif path == "/api/stream":
+                self._handle_stream(ld)
             elif path == "/api/tasks":
                 self._handle_tasks(ld)
             elif path == "/api/stats":
@@ -250,11 +362,65 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
         # JSON response helper
         # ---------------------------------------------------------------
 
-        def _send_json(self, status: int, body: str) -> None:
-            data = body.encode("utf-8")
+        def _send_json(
+            self,
+            status: int,
+            body: str,
+            *,
+            etag: str | None = None,
+            cache_control: str | None = None,
+        ) -> None:
+            if etag is not None and cache_control is None:
+                cache_control = "no-cache"  # always revalidate; a match costs a 304
+            if self._not_modified(status, etag, cache_control):
+                return
+            self._send_body(
+                status,
+                body.encode("utf-8"),
+                "application/json; charset=utf-8",
+                etag=etag,
+                cache_control=cache_control,
+            )
+
+        def _not_modified(self, status: int, etag: str | None, cache_control: str | None) -> bool:
+            """Send a 304 and return True if the client's If-None-Match is current."""
+            if status != 200 or etag is None:
+                return False
+            if not _etag_matches(self.headers.get("If-None-Match"), etag):
+                return False
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            if cache_control:
+                self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return True
+
+        def _send_body(
+            self,
+            status: int,
+            data: bytes,
+            content_type: str,
+            *,
+            etag: str | None = None,
+            cache_control: str | None = None,
+        ) -> None:
+            """Send *data*, gzip-compressed when the client accepts it and it is worth it."""
+            compressible = len(data) >= GZIP_MIN_BYTES
+            gzipped = compressible and _accepts_gzip(self.headers.get("Accept-Encoding"))
+            if gzipped:
+                # An ETag identifies the body, so its compressed form can be reused.
+                data = _gzip(data, (self.path, etag) if etag and status == 200 else None)
             self.send_response(status)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Type", content_type)
             self.send_header("Content-Length", str(len(data)))
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            if compressible:
+                self.send_header("Vary", "Accept-Encoding")
+            if etag and status == 200:
+                self.send_header("ETag", etag)
+            if cache_control:
+                self.send_header("Cache-Control", cache_control)
             self.end_headers()
             self.wfile.write(data)
 
@@ -262,24 +428,32 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
         # Endpoint handlers
         # ---------------------------------------------------------------
 
+        def _load_config(self, ld: Path) -> dict | None:
+            """Return the cached config, or send a 500 and return None."""
+            config_path = ld / "config.json"
+            try:
+                return self._state.view(
+                    "config", ("config",), lambda: json.loads(config_path.read_text())
+                )
+            except (json.JSONDecodeError, OSError) as exc:
+                self._send_json(500, _err("READ_ERROR", f"Failed to read config: {exc}"))
+                return None
+
         def _handle_config(self, ld: Path) -> None:
             config_path = ld / "config.json"
             try:
-                config = json.loads(config_path.read_text())
+                body, etag = self._state.view_with_etag(
+                    "api:config", ("config",), lambda: _ok(json.loads(config_path.read_text()))
+                )
             except (json.JSONDecodeError, OSError) as exc:
                 self._send_json(500, _err("READ_ERROR", f"Failed to read config: {exc}"))
                 return
-            self._send_json(200, _ok(config))
+            self._send_json(200, body, etag=etag)
 
         def _handle_tasks(self, ld: Path) -> None:
-            tasks_dir = ld / "tasks"
-            snapshots: list[dict] = []
-            if tasks_dir.is_dir():
-                for task_file in sorted(tasks_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
+            def build() -> str:
+                snapshots: list[dict] = []
+                for snap in self._state.snapshots():
                     compact = compact_snapshot(snap)
                     compact["updated_at"] = snap.get("updated_at")
                     compact["created_at"] = snap.get("created_at")
@@ -289,21 +463,27 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         snap.get("status") == "in_progress" and snap.get("assigned_to")
                     )
                     snapshots.append(compact)
-            # Sort by ID
-            snapshots.sort(key=lambda s: s.get("id", ""))
-            self._send_json(200, _ok(snapshots))
+                # Sort by ID
+                snapshots.sort(key=lambda s: s.get("id", ""))
+                return _ok(snapshots)
+
+            body, etag = self._state.view_with_etag("api:tasks", ("tasks",), build)
+            self._send_json(200, body, etag=etag)
 
         def _handle_task_detail(self, ld: Path, task_id: str) -> None:
             if not validate_id(task_id, "task"):
                 self._send_json(400, _err("INVALID_ID", "Invalid task ID format"))
                 return
+            etag = self._state.etag(TASK_DETAIL_DEPS)
+            if self._not_modified(200, etag, None):
+                return
 
-            snapshot = _read_snapshot(ld, task_id)
+            snapshot = self._state.snapshot(task_id)
             is_archived = False
 
             if snapshot is None:
                 # Check archive
-                snapshot = _read_snapshot_archive(ld, task_id)
+                snapshot = self._state.snapshot(task_id, archived=True)
                 if snapshot is not None:
                     is_archived = True
 
@@ -326,15 +506,20 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             result["has_active_session"] = bool(
                 snapshot.get("status") == "in_progress" and snapshot.get("assigned_to")
             )
+            with SnapshotStore(ld) as store:
+                result["relationships_in"] = store.incoming(task_id)
             if is_archived:
                 result["archived"] = True
 
-            self._send_json(200, _ok(result))
+            self._send_json(200, _ok(result), etag=etag)
 
         def _handle_task_events(self, ld: Path, task_id: str) -> None:
             if not validate_id(task_id, "task"):
                 self._send_json(400, _err("INVALID_ID", "Invalid task ID format"))
                 return
+            etag = self._state.etag(TASK_DETAIL_DEPS)
+            if self._not_modified(200, etag, None):
+                return
 
             events = read_task_events(ld, task_id)
             if not events:
@@ -343,13 +528,16 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
 
             # Return newest first
             events.reverse()
-            self._send_json(200, _ok(events))
+            self._send_json(200, _ok(events), etag=etag)
 
         def _handle_task_comments(self, ld: Path, task_id: str) -> None:
             """Handle GET /api/tasks/<id>/comments — materialized comment tree."""
             if not validate_id(task_id, "task"):
                 self._send_json(400, _err("INVALID_ID", "Invalid task ID format"))
                 return
+            etag = self._state.etag(TASK_DETAIL_DEPS)
+            if self._not_modified(200, etag, None):
+                return
 
             # Try active events first, then archive
             events = read_task_events(ld, task_id)
@@ -357,18 +545,21 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 events = read_task_events(ld, task_id, is_archived=True)
 
             comments = materialize_comments(events)
-            self._send_json(200, _ok(comments))
+            self._send_json(200, _ok(comments), etag=etag)
 
         def _handle_task_full(self, ld: Path, task_id: str) -> None:
             """Handle GET /api/tasks/<id>/full — combined snapshot + events + comments for Cube LOD 4."""
             if not validate_id(task_id, "task"):
                 self._send_json(400, _err("INVALID_ID", "Invalid task ID format"))
                 return
+            etag = self._state.etag(TASK_DETAIL_DEPS)
+            if self._not_modified(200, etag, None):
+                return
 
-            snapshot = _read_snapshot(ld, task_id)
+            snapshot = self._state.snapshot(task_id)
             is_archived = False
             if snapshot is None:
-                snapshot = _read_snapshot_archive(ld, task_id)
+                snapshot = self._state.snapshot(task_id, archived=True)
                 if snapshot is not None:
                     is_archived = True
 
@@ -405,7 +596,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             if is_archived:
                 result["archived"] = True
 
-            self._send_json(200, _ok(result))
+            self._send_json(200, _ok(result), etag=etag)
 
         def _handle_activity(self, ld: Path) -> None:
             # Re-parse path to get query string (since _route_api strips it)
@@ -433,8 +624,24 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
             before = _qs("before")
             search = _qs("search")
 
+            # An opaque cursor continues below the last event of the previous page
+            cursor: tuple[str, str] | None = None
+            cursor_param = _qs("cursor")
+            if cursor_param:
+                try:
+                    cursor = decode_cursor(cursor_param)
+                except InvalidCursor:
+                    self._send_json(
+                        400, _err("VALIDATION_ERROR", f"Invalid cursor: '{cursor_param}'")
+                    )
+                    return
+
             has_filters = any([type_filter, task_param, actor_filter, after, before, search])
 
+            etag = self._state.etag(ACTIVITY_DEPS)
+            if self._not_modified(200, etag, None):
+                return
+
             # Resolve short ID for task filter
             task_filter: str | None = None
             if task_param:
@@ -460,6 +667,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                                         "offset": offset,
                                         "limit": limit,
                                         "has_more": False,
+                                        "next_cursor": None,
                                         "facets": {"types": [], "actors": [], "tasks": []},
                                     }
                                 ),
@@ -475,30 +683,45 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         )
                         return
 
-            # Collect events — full scan when filters active, tail otherwise
-            all_events = _collect_events(ld, full_scan=has_filters, tail_n=10)
-
-            # Build facets from the full (unfiltered) set for dropdown population
-            facets = _build_facets(all_events, ld)
+            # Answer from the (ts, id) index — over every event when filters
+            # are active, over the tail of each active log otherwise.
+            scope = "all" if has_filters else "tail"
+            deps = ("events", "archive/events") if has_filters else ("events",)
+            index = self._state.view(
+                f"activity:{scope}",
+                deps,
+                lambda: ActivityIndex(self._state.events(full_scan=has_filters, tail_n=10)),
+            )
+            # Facets come from the unfiltered index, for dropdown population
+            facets = self._state.view(
+                f"facets:{scope}",
+                ACTIVITY_DEPS,
+                lambda: _build_facets(ld, index),
+            )
 
-            # Apply filters
-            filtered = _apply_activity_filters(
-                all_events,
-                type_filter=type_filter,
-                task_filter=task_filter,
-                actor_filter=actor_filter,
+            # Free text is answered by the search index; the substring scan is
+            # the fallback for SQLite builds without FTS5.
+            search_hits: set[str] | None = None
+            if search:
+                try:
+                    with SearchIndex(ld) as search_index:
+                        search_hits = search_index.matching_event_ids(search)
+                except sqlite3.Error:
+                    search_hits = None
+
+            page, total, has_more = index.query(
+                types={t.strip() for t in type_filter.split(",")} if type_filter else None,
+                task_id=task_filter,
+                actor=actor_filter,
                 after=after,
                 before=before,
-                search=search,
+                event_ids=search_hits,
+                match=_activity_search_matcher(search) if search and search_hits is None else None,
+                cursor=cursor,
+                offset=offset,
+                limit=limit,
             )
 
-            # Sort by (ts, id) descending
-            filtered.sort(key=lambda e: (e.get("ts", ""), e.get("id", "")), reverse=True)
-
-            total = len(filtered)
-            page = filtered[offset : offset + limit]
-            has_more = (offset + limit) < total
-
             self._send_json(
                 200,
                 _ok(
@@ -508,118 +731,134 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         "offset": offset,
                         "limit": limit,
                         "has_more": has_more,
+                        "next_cursor": index.cursor_after(page[-1]) if has_more else None,
                         "facets": facets,
                     }
                 ),
+                etag=etag,
             )
 
         def _handle_stats(self, ld: Path) -> None:
-            config_path = ld / "config.json"
-            try:
-                config = json.loads(config_path.read_text())
-            except (json.JSONDecodeError, OSError) as exc:
-                self._send_json(500, _err("READ_ERROR", f"Failed to read config: {exc}"))
+            config = self._load_config(ld)
+            if config is None:
                 return
             from lattice.core.stats import build_stats
 
-            stats = build_stats(ld, config)
-            self._send_json(200, _ok(stats))
+            # Staleness figures depend on the clock, so rebuild at least every minute.
+            body, etag = self._state.view_with_etag(
+                "api:stats",
+                ("tasks", "archive/tasks", "events", "archive/events", "config"),
+                lambda: _ok(build_stats(ld, config)),
+                max_age=STATS_MAX_AGE,
+            )
+            self._send_json(200, body, etag=etag)
 
         def _handle_archived(self, ld: Path) -> None:
-            archive_dir = ld / "archive" / "tasks"
-            snapshots: list[dict] = []
-            if archive_dir.is_dir():
-                for task_file in sorted(archive_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
+            def build() -> str:
+                snapshots: list[dict] = []
+                for snap in self._state.snapshots(archived=True):
                     compact = compact_snapshot(snap)
                     compact["updated_at"] = snap.get("updated_at")
                     compact["created_at"] = snap.get("created_at")
                     compact["done_at"] = snap.get("done_at")
                     compact["archived"] = True
                     snapshots.append(compact)
-            snapshots.sort(key=lambda s: s.get("id", ""))
-            self._send_json(200, _ok(snapshots))
+                snapshots.sort(key=lambda s: s.get("id", ""))
+                return _ok(snapshots)
+
+            body, etag = self._state.view_with_etag("api:archived", ("archive/tasks",), build)
+            self._send_json(200, body, etag=etag)
 
         def _handle_graph(self, ld: Path) -> None:
             """Handle GET /api/graph — return nodes + directed edges for graph visualization."""
-            tasks_dir = ld / "tasks"
-            snapshots: list[dict] = []
-            if tasks_dir.is_dir():
-                for task_file in sorted(tasks_dir.glob("*.json")):
-                    try:
-                        snap = json.loads(task_file.read_text())
-                    except (json.JSONDecodeError, OSError):
-                        continue
-                    snapshots.append(snap)
-
-            # Build set of active task IDs for filtering link targets
-            active_ids: set[str] = {s["id"] for s in snapshots if "id" in s}
-
-            # Build nodes — extract only the fields needed for graph rendering
-            nodes: list[dict] = []
-            max_updated_at = ""
-            for snap in snapshots:
-                node = {
-                    "id": snap.get("id"),
-                    "short_id": snap.get("short_id"),
-                    "title": snap.get("title"),
-                    "status": snap.get("status"),
-                    "priority": snap.get("priority"),
-                    "type": snap.get("type"),
-                    "assigned_to": snap.get("assigned_to"),
-                    "branch_links": snap.get("branch_links", []),
-                    "created_at": snap.get("created_at"),
-                    "updated_at": snap.get("updated_at"),
-                    "description_snippet": (snap.get("description") or "")[:200],
-                }
-                nodes.append(node)
-
-                updated = snap.get("updated_at", "")
-                if updated > max_updated_at:
-                    max_updated_at = updated
-
-            # Build directed edges from relationships_out.
-            # Edges are directed: source is the task containing the relationship,
-            # target is the referenced task. Edge direction meaning varies by type
-            # (e.g., for "blocks", source blocks target).
-            links: list[dict] = []
-            for snap in snapshots:
-                task_id = snap.get("id")
-                for rel in snap.get("relationships_out", []):
-                    target_id = rel.get("target_task_id")
-                    # Only emit link if target exists in the active task set
-                    if target_id and target_id in active_ids:
-                        links.append(
-                            {
-                                "source": task_id,
-                                "target": target_id,
-                                "type": rel.get("type"),
-                            }
-                        )
-
-            # Revision string for cheap change detection
-            revision = f"{len(nodes)}:{max_updated_at}"
-
-            # ETag / 304 support — return early if client has current data
-            etag = f'"{revision}"'  # ETags must be quoted per RFC 7232
-            if_none_match = self.headers.get("If-None-Match")
-            if if_none_match and if_none_match == etag:
-                self.send_response(304)
-                self.send_header("ETag", etag)
-                self.end_headers()
+            body, etag = self._state.view(
+                "api:graph", ("tasks",), lambda: _build_graph(self._state.snapshots())
+            )
+            self._send_json(200, body, etag=etag)
+
+        def _handle_stream(self, ld: Path) -> None:
+            """Handle GET /api/stream — server-sent events for every change.
+
+            Each ``change`` event carries the changefeed record and the task's
+            compact snapshot (see :class:`ChangeCursor`); its SSE id is the feed
+            position (see :func:`format_position`), so a reconnecting client
+            resumes through ``Last-Event-ID``. A new client may pass
+            ``?since=<position>``; otherwise the stream starts at the current
+            end of the feed, announced by a ``ready`` event. A ``ready`` event
+            with ``"reset": true`` means the feed was regenerated and the
+            client must reload instead of resuming.
+            """
+            params = parse_qs(urlparse(self.path).query)
+            resume = self.headers.get("Last-Event-ID") or next(iter(params.get("since", [])), None)
+            since: tuple[str | None, int] | None = (
+                feed_end(ld) if resume is None else parse_position(resume)
+            )
+            if since is None:
+                self._send_json(
+                    400, _err("VALIDATION_ERROR", f"Invalid stream position: '{resume}'")
+                )
                 return
 
-            body = _ok({"nodes": nodes, "links": links, "revision": revision})
-            data = body.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("ETag", etag)
-            self.end_headers()
-            self.wfile.write(data)
+            if not self._stream_slots.acquire(blocking=False):
+                self._send_json(503, _err("UNAVAILABLE", "Too many open change streams"))
+                return
+            try:
+                # No Content-Length: the stream ends when the connection does.
+                self.close_connection = True
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.send_header("X-Accel-Buffering", "no")
+                self.end_headers()
+                self._stream_changes(ld, since)
+            except (BrokenPipeError, ConnectionResetError, TimeoutError):
+                pass  # client went away
+            finally:
+                self._stream_slots.release()
+
+        def _stream_changes(self, ld: Path, since: tuple[str | None, int]) -> None:
+            notifier = self._notifier
+            cursor = ChangeCursor(
+                ld,
+                since[1],
+                lambda task_id, archived: self._state.snapshot(task_id, archived=archived),
+                since[0],
+            )
+            self.wfile.write(f"retry: {STREAM_RETRY_MS}\n".encode())
+            self._write_ready(cursor, reset=False)
+            last_write = time.monotonic()
+            while not notifier.closed:
+                generation = notifier.generation
+                messages = cursor.poll()
+                if cursor.reset:
+                    self._write_ready(cursor, reset=True)
+                    last_write = time.monotonic()
+                if messages:
+                    chunk = "".join(
+                        f"id: {format_position(cursor.generation, m['seq'])}\nevent: change\ndata: "
+                        f"{json.dumps(m, sort_keys=True, separators=(',', ':'))}\n\n"
+                        for m in messages
+                    )
+                    self.wfile.write(chunk.encode("utf-8"))
+                    last_write = time.monotonic()
+                if cursor.more:
+                    continue
+                # A held record waits on its snapshot write, so check again soon.
+                timeout = 0.1 if cursor.held else STREAM_HEARTBEAT
+                changed = notifier.wait(generation, timeout)
+                if not changed and time.monotonic() - last_write >= STREAM_HEARTBEAT:
+                    self.wfile.write(b": ping\n\n")
+                    last_write = time.monotonic()
+
+        def _write_ready(self, cursor: ChangeCursor, *, reset: bool) -> None:
+            ready: dict = {"seq": cursor.seq}
+            if reset:
+                ready["reset"] = True
+            position = format_position(cursor.generation, cursor.seq)
+            self.wfile.write(
+                f"id: {position}\nevent: ready\ndata: {json.dumps(ready)}\n\n".encode()
+            )
 
         # ---------------------------------------------------------------
         # Git API handlers
@@ -636,24 +875,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 self._send_json(200, _ok(summary))
                 return
 
-            # ETag / 304 support
-            etag = f'"{etag_value}"'
-            if_none_match = self.headers.get("If-None-Match")
-            if if_none_match and if_none_match == etag:
-                self.send_response(304)
-                self.send_header("ETag", etag)
-                self.end_headers()
-                return
-
-            body = _ok(summary)
-            data = body.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.send_header("ETag", etag)
-            self.send_header("Cache-Control", "max-age=30")
-            self.end_headers()
-            self.wfile.write(data)
+            self._send_json(200, _ok(summary), etag=f'"{etag_value}"', cache_control="max-age=30")
 
         def _handle_git_branch_commits(self, ld: Path, branch_name: str) -> None:
             """Handle GET /api/git/branches/<name>/commits — recent commits for a branch."""
@@ -696,7 +918,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                 )
                 return
 
-            commits = get_recent_commits(repo_root, branch_name)
+            commits = get_recent_commits(repo_root, branch_name, lattice_dir=ld)
             self._send_json(
                 200,
                 _ok(
@@ -735,6 +957,7 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
 
             try:
                 raw = self.rfile.read(content_length)
+                self._body_read = True
                 return json.loads(raw)
             except json.JSONDecodeError:
                 self._send_json(400, _err("BAD_REQUEST", "Invalid JSON in request body"))
@@ -1487,50 +1710,10 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
                         data={},
                     )
                     updated_snapshot = apply_event_to_snapshot(snapshot, event)
-
-                    # 1. Append event to per-task log
-                    event_path = ld / "events" / f"{task_id}.jsonl"
-                    jsonl_append(event_path, serialize_event(event))
-
-                    # 2. Append to lifecycle log
-                    lifecycle_path = ld / "events" / "_lifecycle.jsonl"
-                    jsonl_append(lifecycle_path, serialize_event(event))
-
-                    # 3. Write snapshot to archive
-                    atomic_write(
-                        ld / "archive" / "tasks" / f"{task_id}.json",
-                        serialize_snapshot(updated_snapshot),
+                    write_task_archive(
+                        ld, task_id, event, updated_snapshot, _caller_holds_lock=True
                     )
 
-                    # 4. Remove active snapshot
-                    snapshot_path = ld / "tasks" / f"{task_id}.json"
-                    if snapshot_path.exists():
-                        snapshot_path.unlink()
-
-                    # 5. Move event log to archive
-                    if event_path.exists():
-                        shutil.move(
-                            str(event_path),
-                            str(ld / "archive" / "events" / f"{task_id}.jsonl"),
-                        )
-
-                    # 6. Move notes if they exist
-                    notes_path = ld / "notes" / f"{task_id}.md"
-                    if notes_path.exists():
-                        shutil.move(
-                            str(notes_path),
-                            str(ld / "archive" / "notes" / f"{task_id}.md"),
-                        )
-
-                    # 7. Move plans if they exist
-                    plans_path = ld / "plans" / f"{task_id}.md"
-                    if plans_path.exists():
-                        (ld / "archive" / "plans").mkdir(parents=True, exist_ok=True)
-                        shutil.move(
-                            str(plans_path),
-                            str(ld / "archive" / "plans" / f"{task_id}.md"),
-                        )
-
             except Exception as exc:
                 self._send_json(500, _err("WRITE_ERROR", f"Failed to archive task: {exc}"))
                 return
@@ -1970,140 +2153,105 @@ def _make_handler_class(lattice_dir: Path, *, readonly: bool = False) -> type:
 
 
 # ---------------------------------------------------------------------------
-# Activity helpers (module-level, stateless)
+# View builders (module-level, stateless; results are memoized by StateCache)
 # ---------------------------------------------------------------------------
 
 
-def _collect_events(ld: Path, *, full_scan: bool = False, tail_n: int = 10) -> list[dict]:
-    """Read events from all JSONL files in the events directory.
+def _build_graph(snapshots: list[dict]) -> tuple[str, str]:
+    """Return the /api/graph response body and its ETag."""
+    # Build set of active task IDs for filtering link targets
+    active_ids: set[str] = {s["id"] for s in snapshots if "id" in s}
+
+    # Build nodes — extract only the fields needed for graph rendering
+    nodes: list[dict] = []
+    max_updated_at = ""
+    for snap in snapshots:
+        node = {
+            "id": snap.get("id"),
+            "short_id": snap.get("short_id"),
+            "title": snap.get("title"),
+            "status": snap.get("status"),
+            "priority": snap.get("priority"),
+            "type": snap.get("type"),
+            "assigned_to": snap.get("assigned_to"),
+            "branch_links": snap.get("branch_links", []),
+            "created_at": snap.get("created_at"),
+            "updated_at": snap.get("updated_at"),
+            "description_snippet": (snap.get("description") or "")[:200],
+        }
+        nodes.append(node)
+
+        updated = snap.get("updated_at", "")
+        if updated > max_updated_at:
+            max_updated_at = updated
+
+    # Build directed edges from relationships_out.
+    # Edges are directed: source is the task containing the relationship,
+    # target is the referenced task. Edge direction meaning varies by type
+    # (e.g., for "blocks", source blocks target).
+    links: list[dict] = []
+    for snap in snapshots:
+        task_id = snap.get("id")
+        for rel in snap.get("relationships_out", []):
+            target_id = rel.get("target_task_id")
+            # Only emit link if target exists in the active task set
+            if target_id and target_id in active_ids:
+                links.append(
+                    {
+                        "source": task_id,
+                        "target": target_id,
+                        "type": rel.get("type"),
+                    }
+                )
 
-    When *full_scan* is True, reads every line.  Otherwise reads the last
-    *tail_n* lines from each file (fast path for the unfiltered default).
-    Also scans archived events when doing a full scan.
-    """
-    all_events: list[dict] = []
-    dirs = [ld / "events"]
-    if full_scan:
-        archive_events = ld / "archive" / "events"
-        if archive_events.is_dir():
-            dirs.append(archive_events)
-
-    for events_dir in dirs:
-        if not events_dir.is_dir():
-            continue
-        for event_file in events_dir.glob("*.jsonl"):
-            if event_file.name == "_lifecycle.jsonl":
-                continue
-            try:
-                lines = event_file.read_text().splitlines()
-            except OSError:
-                continue
-            subset = lines if full_scan else lines[-tail_n:]
-            for line in subset:
-                line = line.strip()
-                if line:
-                    try:
-                        all_events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-    return all_events
+    # Revision string for cheap change detection
+    revision = f"{len(nodes)}:{max_updated_at}"
+    etag = f'"{revision}"'  # ETags must be quoted per RFC 7232
+    return _ok({"nodes": nodes, "links": links, "revision": revision}), etag
 
 
-def _build_facets(events: list[dict], ld: Path) -> dict:
-    """Extract distinct types, actors, and tasks from a set of events."""
-    from lattice.core.events import get_actor_display
+# ---------------------------------------------------------------------------
+# Activity helpers (module-level, stateless)
+# ---------------------------------------------------------------------------
 
-    types: set[str] = set()
-    actors: set[str] = set()
-    task_ids: set[str] = set()
 
-    for ev in events:
-        if ev.get("type"):
-            types.add(ev["type"])
-        if ev.get("actor"):
-            actors.add(get_actor_display(ev["actor"]))
-        if ev.get("task_id"):
-            task_ids.add(ev["task_id"])
+def _build_facets(ld: Path, index: ActivityIndex) -> dict:
+    """Return the index's distinct types and actors, and its tasks with short ID and title.
 
-    # Build task info list with short_id and title from snapshots
+    Short IDs and titles come from the snapshot index, for just those tasks.
+    """
+    facets = index.facets()
+    task_ids = facets.pop("task_ids")
+    with SnapshotStore(ld) as store:
+        summaries = store.summaries(task_ids)
     task_info: list[dict] = []
-    for tid in sorted(task_ids):
+    for tid in task_ids:
         info: dict = {"id": tid}
-        # Try active snapshot
-        snap_path = ld / "tasks" / f"{tid}.json"
-        if not snap_path.is_file():
-            snap_path = ld / "archive" / "tasks" / f"{tid}.json"
-        if snap_path.is_file():
-            try:
-                snap = json.loads(snap_path.read_text())
-                info["short_id"] = snap.get("short_id")
-                info["title"] = snap.get("title")
-            except (json.JSONDecodeError, OSError):
-                pass
+        info.update(summaries.get(tid, {}))
         task_info.append(info)
+    facets["tasks"] = task_info
+    return facets
 
-    return {
-        "types": sorted(types),
-        "actors": sorted(actors),
-        "tasks": task_info,
-    }
 
+def _activity_search_matcher(search: str) -> Callable[[dict], bool]:
+    """Return a predicate for a case-insensitive substring search over an event."""
+    from lattice.core.events import get_actor_display
 
-def _apply_activity_filters(
-    events: list[dict],
-    *,
-    type_filter: str | None = None,
-    task_filter: str | None = None,
-    actor_filter: str | None = None,
-    after: str | None = None,
-    before: str | None = None,
-    search: str | None = None,
-) -> list[dict]:
-    """Apply filter chain to a list of events. All filters are AND-combined."""
-    result = events
-
-    if type_filter:
-        allowed = {t.strip() for t in type_filter.split(",")}
-        result = [e for e in result if e.get("type") in allowed]
-
-    if task_filter:
-        result = [e for e in result if e.get("task_id") == task_filter]
-
-    if actor_filter:
-        from lattice.core.events import get_actor_display
-
-        result = [
-            e for e in result if e.get("actor") and get_actor_display(e["actor"]) == actor_filter
-        ]
-
-    if after:
-        result = [e for e in result if (e.get("ts") or "") > after]
-
-    if before:
-        result = [e for e in result if (e.get("ts") or "") < before]
-
-    if search:
-        search_lower = search.lower()
-
-        def _matches(ev: dict) -> bool:
-            from lattice.core.events import get_actor_display
+    search_lower = search.lower()
 
-            # Search in event data values (comment bodies, field values, etc.)
-            data = ev.get("data") or {}
-            for v in data.values():
-                if isinstance(v, str) and search_lower in v.lower():
-                    return True
-            # Also search in actor and type
-            actor_str = get_actor_display(ev["actor"]) if ev.get("actor") else ""
-            if search_lower in actor_str.lower():
-                return True
-            if search_lower in (ev.get("type") or "").lower():
+    def _matches(ev: dict) -> bool:
+        # Search in event data values (comment bodies, field values, etc.)
+        data = ev.get("data") or {}
+        for v in data.values():
+            if isinstance(v, str) and search_lower in v.lower():
                 return True
-            return False
+        # Also search in actor and type
+        actor_str = get_actor_display(ev["actor"]) if ev.get("actor") else ""
+        if search_lower in actor_str.lower():
+            return True
+        return search_lower in (ev.get("type") or "").lower()
 
-        result = [e for e in result if _matches(e)]
-
-    return result
+    return _matches
 
 
 # ---------------------------------------------------------------------------
@@ -2121,16 +2269,6 @@ def _read_snapshot(ld: Path, task_id: str) -> dict | None:
         return None
 
 
-def _read_snapshot_archive(ld: Path, task_id: str) -> dict | None:
-    path = ld / "archive" / "tasks" / f"{task_id}.json"
-    if not path.is_file():
-        return None
-    try:
-        return json.loads(path.read_text())
-    except (json.JSONDecodeError, OSError):
-        return None
-
-
 def _read_artifact_info(ld: Path, snapshot: dict) -> list[dict]:
     artifacts: list[dict] = []
     # Read from evidence_refs (new) with fallback to artifact_refs (legacy)
@@ -2168,14 +2306,188 @@ def _get_artifact_evidence_refs(snapshot: dict) -> list[tuple[str, str | None]]:
     return result
 
 
+# ---------------------------------------------------------------------------
+# Conditional requests, compression and static assets
+# ---------------------------------------------------------------------------
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weakly compare an If-None-Match header against *etag* (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        qvalue = params.strip().removeprefix("q=")
+        try:
+            return not params or float(qvalue) > 0
+        except ValueError:
+            return True
+    return False
+
+
+_gzip_cache: OrderedDict[tuple, bytes] = OrderedDict()
+_gzip_cache_lock = threading.Lock()
+
+
+def _gzip(data: bytes, key: tuple | None) -> bytes:
+    """Compress *data*, reusing the result for *key* (path and ETag) when given."""
+    if key is not None:
+        with _gzip_cache_lock:
+            cached = _gzip_cache.get(key)
+            if cached is not None:
+                _gzip_cache.move_to_end(key)
+                return cached
+    compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if key is not None:
+        with _gzip_cache_lock:
+            _gzip_cache[key] = compressed
+            while len(_gzip_cache) > GZIP_CACHE_ENTRIES:
+                _gzip_cache.popitem(last=False)
+    return compressed
+
+
+# relative path -> (mtime_ns, size, data, content hash)
+_static_cache: dict[str, tuple[int, int, bytes, str]] = {}
+_static_lock = threading.Lock()
+
+# Asset references in index.html that get a ?v=<content hash> suffix.
+_STATIC_REF_RE = re.compile(r'(\b(?:src|href)=")static/([^"?#]+)(")')
+
+
+def _static_asset(filename: str) -> tuple[bytes, str] | None:
+    """Return (data, content hash) for a file in STATIC_DIR, re-reading it only when it changes."""
+    path = STATIC_DIR / filename
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not path.is_file():
+        return None
+    with _static_lock:
+        cached = _static_cache.get(filename)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2], cached[3]
+    data = path.read_bytes()
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    with _static_lock:
+        _static_cache[filename] = (st.st_mtime_ns, st.st_size, data, digest)
+    return data, digest
+
+
+# (index.html hash, ((asset, hash), ...), rewritten page, combined hash)
+_versioned_index_cache: tuple[str, tuple[tuple[str, str], ...], bytes, str] | None = None
+
+
+def _versioned_index(data: bytes, digest: str) -> tuple[bytes, str]:
+    """Point index.html's static references at ``?v=<content hash>`` URLs.
+
+    Returns the rewritten page and a hash covering it and every referenced
+    asset, so the page's ETag changes whenever any of them does.
+    """
+    global _versioned_index_cache
+    cached = _versioned_index_cache
+    if cached is not None and cached[0] == digest:
+        _, assets, page, combined = cached
+        if all((_static_asset(name) or (b"", ""))[1] == v for name, v in assets):
+            return page, combined
+
+    referenced: list[tuple[str, str]] = []
+
+    def version(match: re.Match[str]) -> str:
+        asset = _static_asset(match.group(2))
+        if asset is None:
+            return match.group(0)
+        referenced.append((match.group(2), asset[1]))
+        return f"{match.group(1)}static/{match.group(2)}?v={asset[1]}{match.group(3)}"
+
+    page = _STATIC_REF_RE.sub(version, data.decode("utf-8")).encode("utf-8")
+    versions = "-".join([digest, *(v for _, v in referenced)])
+    combined = hashlib.blake2b(versions.encode(), digest_size=8).hexdigest()
+    _versioned_index_cache = (digest, tuple(referenced), page, combined)
+    return page, combined
+
+
 # ---------------------------------------------------------------------------
 # Server factory
 # ---------------------------------------------------------------------------
 
 
+class DashboardServer(HTTPServer):
+    """HTTP server that owns the dashboard's shared :class:`StateCache` and
+    :class:`ChangeNotifier`.
+
+    Each accepted connection is handled on a bounded thread pool, so a slow
+    request (a cold ``/api/stats``, a git call) no longer blocks other tabs.
+    Connections beyond *max_workers* wait in the pool's queue.
+    """
+
+    # Listen backlog; the default of 5 drops SYNs when many clients connect at once.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler_cls: type,
+        state: StateCache,
+        *,
+        notifier: ChangeNotifier | None = None,
+        max_workers: int = MAX_WORKERS,
+    ) -> None:
+        # Set before binding: TCPServer calls server_close() if the bind fails.
+        self.state_cache = state
+        self.notifier = notifier
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="lattice-dashboard")
+        self._connections: set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+        super().__init__(address, handler_cls)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._connections_lock:
+            self._connections.add(request)
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(request)
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.notifier is not None:
+            self.notifier.close()  # ends open /api/stream responses
+        # Wake workers blocked on idle keep-alive connections so they exit now
+        # rather than after KEEPALIVE_TIMEOUT.
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()  # queued connections that never reached a worker
+            self._connections.clear()
+        self.state_cache.close()
+
+
 def create_server(
     lattice_dir: Path, host: str, port: int, *, readonly: bool = False
-) -> HTTPServer:
+) -> DashboardServer:
     """Create an HTTP server bound to *host*:*port* serving the Lattice dashboard.
 
     Parameters
@@ -2189,6 +2501,9 @@ def create_server(
     readonly:
         If ``True``, all POST requests return 403 FORBIDDEN.
     """
-    handler_cls = _make_handler_class(lattice_dir, readonly=readonly)
-    server = HTTPServer((host, port), handler_cls)
-    return server
+    state = StateCache(lattice_dir)
+    notifier = ChangeNotifier(lattice_dir)
+    handler_cls = _make_handler_class(
+        lattice_dir, readonly=readonly, state=state, notifier=notifier
+    )
+    return DashboardServer((host, port), handler_cls, state, notifier=notifier)
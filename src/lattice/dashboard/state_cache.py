@@ -0,0 +1,467 @@
+"""Process-wide materialized dashboard state, invalidated per file as .lattice/ changes."""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import secrets
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from lattice.storage.event_log import EventLog
+
+# "auto" uses inotify where available and polls otherwise; "poll" always polls.
+WATCH_ENV = "LATTICE_DASHBOARD_WATCH"
+
+# Polling compares (mtime, size). A file modified this recently could change
+# again within the same timestamp tick, so it is re-read until it settles
+# (the same rule the snapshot index uses).
+_RACY_WINDOW_NS = 2_000_000_000
+
+# inotify(7) constants
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Non-blocking inotify descriptor (Linux only, via libc)."""
+
+    def __init__(self, fd: int, libc: ctypes.CDLL) -> None:
+        self._fd = fd
+        self._libc = libc
+
+    @classmethod
+    def create(cls) -> _Inotify | None:
+        """Return a watcher, or None where inotify is unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(fd, libc)
+
+    def add_watch(self, directory: Path) -> int | None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        return wd if wd >= 0 else None
+
+    def read(self) -> list[tuple[int, int, str]] | None:
+        """Drain pending events as (wd, mask, name). None means events were lost."""
+        events: list[tuple[int, int, str]] = []
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buf[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    return None
+                events.append((wd, mask, name))
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _FileSet:
+    """The matching files of one directory, with lazily loaded per-file values.
+
+    ``generation`` increases whenever a file is added, changed or removed, so
+    anything derived from the set can tell whether it is still current.
+    """
+
+    def __init__(self, directory: Path, match: Callable[[str], bool]) -> None:
+        self.directory = directory
+        self.generation = 0
+        self.loads = 0
+        self.wd: int | None = None
+        self._match = match
+        self._stamps: dict[str, tuple[int, int]] = {}
+        self._values: dict[str, dict[str, Any]] = {}
+
+    def names(self) -> list[str]:
+        return sorted(self._stamps)
+
+    def get(self, name: str, kind: str, loader: Callable[[Path], Any]) -> Any:
+        """Return *loader*'s result for *name*, loading it once per file version."""
+        if name not in self._stamps:
+            return None
+        values = self._values.setdefault(name, {})
+        if kind not in values:
+            values[kind] = loader(self.directory / name)
+            self.loads += 1
+        return values[kind]
+
+    def rescan(self) -> None:
+        """Poll the directory, dropping values for files whose (mtime, size) changed."""
+        try:
+            entries = list(os.scandir(self.directory))
+        except (FileNotFoundError, NotADirectoryError):
+            entries = []
+        now = time.time_ns()
+        seen: set[str] = set()
+        changed = False
+        for entry in entries:
+            if not self._match(entry.name):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            seen.add(entry.name)
+            if self._stamps.get(entry.name) != (st.st_mtime_ns, st.st_size):
+                self._values.pop(entry.name, None)
+                changed = True
+            self._stamps[entry.name] = _stamp(st, now)
+        for name in [n for n in self._stamps if n not in seen]:
+            del self._stamps[name]
+            self._values.pop(name, None)
+            changed = True
+        if changed:
+            self.generation += 1
+
+    def update(self, names: set[str]) -> None:
+        """Drop values for *names*, which a watcher reported as changed."""
+        changed = False
+        for name in names:
+            if not self._match(name):
+                continue
+            changed = True
+            self._values.pop(name, None)
+            try:
+                st = os.stat(self.directory / name)
+            except FileNotFoundError:
+                self._stamps.pop(name, None)
+                continue
+            self._stamps[name] = (st.st_mtime_ns, st.st_size)
+        if changed:
+            self.generation += 1
+
+
+def _stamp(st: os.stat_result, now: int) -> tuple[int, int]:
+    if now - st.st_mtime_ns < _RACY_WINDOW_NS:
+        return -1, st.st_size
+    return st.st_mtime_ns, st.st_size
+
+
+def _is_snapshot(name: str) -> bool:
+    return name.endswith(".json") and not name.startswith(".")
+
+
+def _is_markdown(name: str) -> bool:
+    return name.endswith(".md") and not name.startswith(".")
+
+
+def _is_event_log(name: str) -> bool:
+    return name.endswith(".jsonl") and not name.startswith(".") and name != "_lifecycle.jsonl"
+
+
+def _load_snapshot(path: Path) -> dict | None:
+    try:
+        snapshot = json.loads(path.read_text())
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+class StateCache:
+    """Materialized dashboard state shared by every request to one server.
+
+    Snapshots and event logs are loaded once per file version. Derived views
+    (compact task lists, the graph, activity facets, ...) are memoized with
+    :meth:`view` against the generations of the files they were built from,
+    so an unchanged tree answers from memory.
+
+    Changes are detected per file: on Linux through inotify, elsewhere (or
+    with ``LATTICE_DASHBOARD_WATCH=poll``) by stat-polling the watched
+    directories on each access. Either way a write is visible to the next
+    request, including writes by other processes.
+    """
+
+    def __init__(self, lattice_dir: Path, *, watch: str | None = None) -> None:
+        self.lattice_dir = lattice_dir
+        self._lock = threading.RLock()
+        self._sets = {
+            "tasks": _FileSet(lattice_dir / "tasks", _is_snapshot),
+            "archive/tasks": _FileSet(lattice_dir / "archive" / "tasks", _is_snapshot),
+            "events": _FileSet(lattice_dir / "events", _is_event_log),
+            "archive/events": _FileSet(lattice_dir / "archive" / "events", _is_event_log),
+            "config": _FileSet(lattice_dir, lambda name: name == "config.json"),
+            # Watched only for change detection (task detail shows whether they exist)
+            "notes": _FileSet(lattice_dir / "notes", _is_markdown),
+            "archive/notes": _FileSet(lattice_dir / "archive" / "notes", _is_markdown),
+            "plans": _FileSet(lattice_dir / "plans", _is_markdown),
+            "archive/plans": _FileSet(lattice_dir / "archive" / "plans", _is_markdown),
+            "artifacts": _FileSet(lattice_dir / "artifacts" / "meta", _is_snapshot),
+        }
+        # name -> (key, value, built_at, build number)
+        self._views: dict[str, tuple[tuple[int, ...], Any, float, int]] = {}
+        self._builds = 0
+        # Distinguishes this cache's ETags from those of an earlier server.
+        self._epoch = secrets.token_hex(4)
+        # Per-thread depth of view builds; nested reads skip the change check.
+        self._local = threading.local()
+        # One build at a time per view; other requests for it wait and reuse it.
+        self._build_locks: dict[str, threading.Lock] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        mode = watch or os.environ.get(WATCH_ENV, "auto")
+        self._inotify = _Inotify.create() if mode == "auto" else None
+        self._by_wd: dict[int, _FileSet] = {}
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "poll"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+
+    def _sync(self) -> None:
+        if self._inotify is None:
+            for file_set in self._sets.values():
+                file_set.rescan()
+            return
+
+        events = self._inotify.read()
+        if events is None:
+            # Queue overflow: some changes were dropped, so poll everything once.
+            for file_set in self._sets.values():
+                file_set.rescan()
+        else:
+            changed: dict[int, set[str]] = {}
+            for wd, mask, name in events:
+                watched = self._by_wd.get(wd)
+                if watched is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    # Directory removed or replaced; re-watched and rescanned below.
+                    del self._by_wd[wd]
+                    watched.wd = None
+                elif name:
+                    changed.setdefault(wd, set()).add(name)
+            for wd, names in changed.items():
+                if wd in self._by_wd:
+                    self._by_wd[wd].update(names)
+
+        for file_set in self._sets.values():
+            if file_set.wd is None:
+                # Not watched yet (or the directory does not exist): try to add
+                # a watch, then poll once to catch anything it could have missed.
+                file_set.wd = self._inotify.add_watch(file_set.directory)
+                if file_set.wd is not None:
+                    self._by_wd[file_set.wd] = file_set
+                file_set.rescan()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def view(
+        self,
+        name: str,
+        deps: tuple[str, ...],
+        build: Callable[[], Any],
+        *,
+        max_age: float | None = None,
+    ) -> Any:
+        """Return the memoized result of *build*, rebuilding it if any of *deps* changed.
+
+        *deps* names the watched file sets the view is derived from (``tasks``,
+        ``archive/tasks``, ``events``, ``archive/events``, ``config``, ...). With
+        *max_age*, the view is also rebuilt once it is that many seconds old,
+        for views that depend on the clock. Callers must not mutate the result.
+
+        *build* runs without the cache lock held, so a slow view does not
+        stall requests for other views. Concurrent misses on the same view
+        wait for a single build instead of each running their own.
+        """
+        return self.view_with_etag(name, deps, build, max_age=max_age)[0]
+
+    def view_with_etag(
+        self,
+        name: str,
+        deps: tuple[str, ...],
+        build: Callable[[], Any],
+        *,
+        max_age: float | None = None,
+    ) -> tuple[Any, str]:
+        """Like :meth:`view`, also returning a weak ETag that changes with each rebuild."""
+        with self._lock:
+            self._sync_unless_nested()
+            key, entry = self._lookup(name, deps, max_age)
+            if entry is not None:
+                return entry[1], self._view_etag(entry)
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+        with build_lock:
+            with self._lock:
+                # Another thread may have built it while this one waited.
+                key, entry = self._lookup(name, deps, max_age)
+                if entry is not None:
+                    return entry[1], self._view_etag(entry)
+            value = self._build(name, build)
+            with self._lock:
+                entry = self._store(name, key, value)
+            return value, self._view_etag(entry)
+
+    def etag(self, deps: tuple[str, ...]) -> str:
+        """Return a weak ETag that changes whenever any file in *deps* changes.
+
+        For responses assembled per request rather than memoized. Take it
+        before reading, so the body is never older than its tag.
+        """
+        with self._lock:
+            self._sync_unless_nested()
+            generations = ".".join(str(self._sets[dep].generation) for dep in deps)
+        return f'W/"{self._epoch}-{generations}"'
+
+    def _locked_view(self, name: str, deps: tuple[str, ...], build: Callable[[], Any]) -> Any:
+        """Like :meth:`view`, but build under the lock (for builds that load files)."""
+        with self._lock:
+            self._sync_unless_nested()
+            key, entry = self._lookup(name, deps, None)
+            if entry is not None:
+                return entry[1]
+            value = self._build(name, build)
+            self._store(name, key, value)
+            return value
+
+    def _lookup(
+        self, name: str, deps: tuple[str, ...], max_age: float | None
+    ) -> tuple[tuple[int, ...], tuple | None]:
+        """Return (key, cached entry or None) for *name*, counting hits."""
+        key = tuple(self._sets[dep].generation for dep in deps)
+        cached = self._views.get(name)
+        if (
+            cached is not None
+            and cached[0] == key
+            and (max_age is None or time.monotonic() - cached[2] < max_age)
+        ):
+            self.hits[name] += 1
+            return key, cached
+        return key, None
+
+    def _store(self, name: str, key: tuple[int, ...], value: Any) -> tuple:
+        self._builds += 1
+        entry = (key, value, time.monotonic(), self._builds)
+        self._views[name] = entry
+        return entry
+
+    def _view_etag(self, entry: tuple) -> str:
+        return f'W/"{self._epoch}-v{entry[3]}"'
+
+    def _depth(self) -> int:
+        return getattr(self._local, "building", 0)
+
+    def _sync_unless_nested(self) -> None:
+        if not self._depth():
+            self._sync()
+
+    def _build(self, name: str, build: Callable[[], Any]) -> Any:
+        self.misses[name] += 1
+        self._local.building = self._depth() + 1
+        try:
+            return build()
+        finally:
+            self._local.building -= 1
+
+    def snapshots(self, *, archived: bool = False) -> list[dict]:
+        """Return every readable snapshot in one directory, ordered by task ID."""
+        dep = "archive/tasks" if archived else "tasks"
+
+        def build() -> list[dict]:
+            file_set = self._sets[dep]
+            loaded = (file_set.get(name, "json", _load_snapshot) for name in file_set.names())
+            return [snap for snap in loaded if snap is not None]
+
+        snapshots: list[dict] = self._locked_view(f"snapshots:{dep}", (dep,), build)
+        return snapshots
+
+    def snapshot(self, task_id: str, *, archived: bool = False) -> dict | None:
+        """Return one snapshot, or None if it is missing or unreadable."""
+        with self._lock:
+            self._sync_unless_nested()
+            file_set = self._sets["archive/tasks" if archived else "tasks"]
+            snapshot: dict | None = file_set.get(f"{task_id}.json", "json", _load_snapshot)
+            return snapshot
+
+    def events(self, *, full_scan: bool = False, tail_n: int = 10) -> list[dict]:
+        """Return task and resource events, newest first by (ts, id).
+
+        Mirrors the activity feed's reads: the last *tail_n* events of each
+        active log, or with *full_scan* every event in active and archived logs.
+        """
+        deps = ("events", "archive/events") if full_scan else ("events",)
+        kind = "all" if full_scan else f"tail:{tail_n}"
+
+        def load(path: Path) -> list[dict]:
+            log = EventLog(path)
+            return list(log.iter_events()) if full_scan else log.tail(tail_n)
+
+        def build() -> list[dict]:
+            events: list[dict] = []
+            for dep in deps:
+                file_set = self._sets[dep]
+                for name in file_set.names():
+                    events.extend(file_set.get(name, kind, load) or [])
+            events.sort(key=lambda e: (e.get("ts", ""), e.get("id", "")), reverse=True)
+            return events
+
+        events: list[dict] = self._locked_view(f"events:{kind}", deps, build)
+        return events
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and load counts for monitoring."""
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "views": {
+                    name: {"hits": self.hits[name], "misses": self.misses[name]}
+                    for name in sorted(set(self.hits) | set(self.misses))
+                },
+                "file_loads": {dep: s.loads for dep, s in self._sets.items()},
+            }
@@ -0,0 +1,617 @@
+"""Long-lived, read-only git session: refs from disk, objects from ``git cat-file --batch``.
+
+Shared by the dashboard and the CLI. HEAD, loose refs, ``packed-refs`` and
+the repository config are read straight from the git directory; commit
+objects come from one persistent ``git cat-file --batch`` process and are
+cached (they are immutable). Serving a request therefore costs no process
+spawns once the session is warm. Layouts the session cannot read from disk
+(e.g. the reftable backend) yield no session, and callers fall back to
+running ``git`` directly.
+"""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+GIT_COMMAND_TIMEOUT = 10  # seconds per one-off subprocess call
+
+_HEX_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+_MAX_SYMREF_DEPTH = 5
+# git's minimum for ``core.abbrev=auto``; used when git cannot be asked.
+_DEFAULT_ABBREV = 7
+# Parsed commits kept per session (least recently used are evicted first).
+_COMMIT_CACHE_SIZE = 10_000
+
+
+class GitError(Exception):
+    """Raised when the ``cat-file`` stream cannot be used."""
+
+
+# ---------------------------------------------------------------------------
+# Repository discovery
+# ---------------------------------------------------------------------------
+
+
+def find_repo(start: Path) -> tuple[Path, Path, Path] | None:
+    """Return ``(work_tree, git_dir, common_dir)`` for the repo containing *start*.
+
+    Walks up from *start* looking for ``.git`` (a directory, or a ``gitdir:``
+    file as used by worktrees and submodules). Returns None outside a repo.
+    """
+    try:
+        current = start.resolve()
+    except OSError:
+        return None
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = (directory / content[len("gitdir:") :].strip()).resolve()
+        else:
+            continue
+        if not (git_dir / "HEAD").is_file():
+            return None
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.is_file():
+            try:
+                rel = commondir_file.read_text(encoding="utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                return None
+            common_dir = (git_dir / rel).resolve()
+        return directory, git_dir, common_dir
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Session
+# ---------------------------------------------------------------------------
+
+
+class GitSession:
+    """Read-only view of one repository, reused across requests.
+
+    Thread-safe: the ``cat-file`` pipe and the caches are guarded by a lock.
+    Parsed commits are kept in an LRU cache of :data:`_COMMIT_CACHE_SIZE`
+    entries, so a long-lived session stays bounded however much history
+    it walks.
+    """
+
+    def __init__(self, root: Path, git_dir: Path, common_dir: Path) -> None:
+        self.root = root
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self._lock = threading.RLock()
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._commits: OrderedDict[str, dict[str, Any] | None] = OrderedDict()
+        self._packed: tuple[tuple[int, int], dict[str, str], dict[str, str]] | None = None
+        self._config: tuple[tuple[int, int], dict[str, dict[str, str]], bool] | None = None
+        self._remote_urls: dict[tuple[str, tuple[int, int]], str | None] = {}
+        self._counts: dict[str, int | None] = {}
+        self._abbrev: tuple[str | None, int] | None = None
+
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is not None:
+            for stream in (proc.stdin, proc.stdout):
+                if stream is not None:
+                    stream.close()
+            try:
+                proc.wait(timeout=GIT_COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    # -- refs ---------------------------------------------------------------
+
+    def head(self) -> tuple[str | None, str | None]:
+        """Return ``(branch, sha)`` for HEAD; branch is None when detached."""
+        content = _read_ref_file(self.git_dir / "HEAD")
+        if content is None:
+            return None, None
+        if content.startswith("ref: "):
+            target = content[5:].strip()
+            branch = target[len("refs/heads/") :] if target.startswith("refs/heads/") else None
+            return branch, self.read_ref(target)
+        return None, content if _HEX_SHA_RE.match(content) else None
+
+    def current_branch(self) -> str | None:
+        """Return the checked-out branch, or None if detached or unborn.
+
+        Matches ``git rev-parse --abbrev-ref HEAD``.
+        """
+        branch, sha = self.head()
+        return branch if sha else None
+
+    def read_ref(self, name: str) -> str | None:
+        """Return the object name *name* (e.g. ``refs/heads/main``) points at."""
+        for _ in range(_MAX_SYMREF_DEPTH):
+            base = self.git_dir if _is_per_worktree(name) else self.common_dir
+            content = _read_ref_file(base / name)
+            if content is None:
+                return self._packed_refs()[0].get(name)
+            if not content.startswith("ref: "):
+                return content if _HEX_SHA_RE.match(content) else None
+            name = content[5:].strip()
+        return None
+
+    def branches(self) -> dict[str, str]:
+        """Return ``{short_name: sha}`` for every local branch."""
+        refs = {
+            name[len("refs/heads/") :]: sha
+            for name, sha in self._packed_refs()[0].items()
+            if name.startswith("refs/heads/")
+        }
+        heads_dir = self.common_dir / "refs" / "heads"
+        for dirpath, _dirnames, filenames in os.walk(heads_dir):
+            for filename in filenames:
+                if filename.endswith(".lock"):
+                    continue
+                rel = Path(dirpath, filename).relative_to(heads_dir).as_posix()
+                sha = self.read_ref(f"refs/heads/{rel}")
+                if sha:
+                    refs[rel] = sha
+        return refs
+
+    def resolve(self, rev: str) -> str | None:
+        """Return the commit *rev* names, or None if the session cannot tell.
+
+        Handles ``HEAD``, full object names and ref names (looked up in the
+        same order as git: as given, then under tags, heads and remotes).
+        Anything else (``main~2``, abbreviated names) returns None.
+        """
+        if rev == "HEAD":
+            return self.head()[1]
+        if _HEX_SHA_RE.match(rev):
+            return self.peel(rev)
+        for name in (
+            rev,
+            f"refs/{rev}",
+            f"refs/tags/{rev}",
+            f"refs/heads/{rev}",
+            f"refs/remotes/{rev}",
+            f"refs/remotes/{rev}/HEAD",
+        ):
+            if name != "HEAD" and name.startswith("refs/"):
+                sha = self.read_ref(name)
+                if sha:
+                    refs, peeled = self._packed_refs()
+                    if refs.get(name) == sha and name in peeled:
+                        return self.peel(peeled[name])
+                    return self.peel(sha)
+        return None
+
+    def _packed_refs(self) -> tuple[dict[str, str], dict[str, str]]:
+        """Return ``(refs, peeled)`` from ``packed-refs``, re-read when it changes."""
+        path = self.common_dir / "packed-refs"
+        with self._lock:
+            key = _file_key(path)
+            if self._packed is not None and self._packed[0] == key:
+                return self._packed[1], self._packed[2]
+            refs: dict[str, str] = {}
+            peeled: dict[str, str] = {}
+            last = None
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except (OSError, UnicodeDecodeError):
+                lines = []
+            for line in lines:
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("^"):
+                    if last is not None:
+                        peeled[last] = line[1:].strip()
+                    continue
+                sha, _, name = line.partition(" ")
+                if _HEX_SHA_RE.match(sha) and name:
+                    refs[name] = sha
+                    last = name
+            self._packed = (key, refs, peeled)
+            return refs, peeled
+
+    # -- objects ------------------------------------------------------------
+
+    def read_object(self, sha: str) -> tuple[str, bytes] | None:
+        """Return ``(type, content)`` for *sha*, or None if it does not exist."""
+        with self._lock:
+            proc = self._ensure_proc()
+            assert proc.stdin is not None and proc.stdout is not None
+            try:
+                proc.stdin.write(sha.encode("ascii") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+                if not header:
+                    raise GitError("git cat-file exited")
+                parts = header.split()
+                if len(parts) != 3:
+                    return None  # "<sha> missing"
+                size = int(parts[2])
+                content = proc.stdout.read(size + 1)[:size]
+            except (OSError, ValueError) as exc:
+                self._proc = None
+                proc.kill()
+                raise GitError(str(exc)) from exc
+            return parts[1].decode("ascii"), content
+
+    def peel(self, sha: str) -> str | None:
+        """Follow annotated tags from *sha* to the commit; None if not a commit."""
+        for _ in range(_MAX_SYMREF_DEPTH):
+            with self._lock:
+                if sha in self._commits:
+                    self._commits.move_to_end(sha)
+                    return sha if self._commits[sha] is not None else None
+            obj = self.read_object(sha)
+            if obj is None:
+                return None
+            kind, content = obj
+            if kind == "commit":
+                self._remember(sha, _parse_commit(sha, content))
+                return sha
+            if kind != "tag":
+                return None
+            first = content.split(b"\n", 1)[0]
+            if not first.startswith(b"object "):
+                return None
+            sha = first[len(b"object ") :].decode("ascii").strip()
+        return None
+
+    def commit(self, sha: str) -> dict[str, Any] | None:
+        """Return the parsed commit *sha* (cached), or None if missing."""
+        with self._lock:
+            if sha in self._commits:
+                self._commits.move_to_end(sha)
+                return self._commits[sha]
+        obj = self.read_object(sha)
+        parsed = _parse_commit(sha, obj[1]) if obj is not None and obj[0] == "commit" else None
+        self._remember(sha, parsed)
+        return parsed
+
+    def _remember(self, sha: str, parsed: dict[str, Any] | None) -> None:
+        with self._lock:
+            self._commits[sha] = parsed
+            self._commits.move_to_end(sha)
+            while len(self._commits) > _COMMIT_CACHE_SIZE:
+                self._commits.popitem(last=False)
+
+    def log(self, start: str, *, limit: int) -> list[dict[str, Any]]:
+        """Return up to *limit* commits reachable from *start*, newest first.
+
+        Walks parents in committer-date order, as ``git log`` does by default.
+        """
+        result: list[dict[str, Any]] = []
+        seen = {start}
+        queue: list[tuple[int, int, str]] = []
+        counter = 0
+        first = self.commit(start)
+        if first is not None:
+            heapq.heappush(queue, (-first["committer_time"], counter, start))
+        while queue and len(result) < limit:
+            _, _, sha = heapq.heappop(queue)
+            commit = self.commit(sha)
+            if commit is None:
+                continue
+            result.append(commit)
+            for parent in commit["parents"]:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                parent_commit = self.commit(parent)
+                if parent_commit is None:
+                    continue  # shallow clone boundary
+                counter += 1
+                heapq.heappush(queue, (-parent_commit["committer_time"], counter, parent))
+        return result
+
+    def commit_count(self) -> int | None:
+        """Return the number of commits reachable from HEAD.
+
+        Counted once per HEAD commit with ``git rev-list --count``.
+        """
+        sha = self.head()[1]
+        if sha is None:
+            return None
+        with self._lock:
+            if sha in self._counts:
+                return self._counts[sha]
+        count = None
+        try:
+            result = _run_git(["rev-list", "--count", sha], self.root)
+            if result.returncode == 0:
+                count = int(result.stdout.strip())
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            pass
+        with self._lock:
+            self._counts[sha] = count
+        return count
+
+    # -- config -------------------------------------------------------------
+
+    def config_value(self, section: str, key: str) -> str | None:
+        """Return ``section.key`` from the repository config (last value wins)."""
+        return self._read_config()[0].get(section, {}).get(key.lower())
+
+    def abbrev(self) -> int:
+        """Return the abbreviated object name length git uses in this repository.
+
+        A numeric ``core.abbrev`` is used as is. Otherwise (unset or
+        ``auto``) git scales the length with the number of objects, so it is
+        read from ``git rev-parse --short HEAD`` once per HEAD commit.
+        """
+        value = (self.config_value("core", "abbrev") or "").lower()
+        if value.isdigit():
+            return max(4, min(40, int(value)))
+        if value in ("no", "false", "off"):
+            return 40
+        sha = self.head()[1]
+        with self._lock:
+            if self._abbrev is not None and self._abbrev[0] == sha:
+                return self._abbrev[1]
+        length = _DEFAULT_ABBREV
+        if sha is not None:
+            try:
+                result = _run_git(["rev-parse", "--short", sha], self.root)
+                if result.returncode == 0 and result.stdout.strip():
+                    length = len(result.stdout.strip())
+            except (subprocess.TimeoutExpired, OSError):
+                pass
+        with self._lock:
+            self._abbrev = (sha, length)
+        return length
+
+    def remote_url(self, name: str = "origin") -> str | None:
+        """Return the URL of remote *name*, or None.
+
+        Read from the config file. Configs using ``include`` or ``insteadOf``
+        are resolved with ``git remote get-url`` (once per config change).
+        """
+        sections, needs_git = self._read_config()
+        if not needs_git:
+            return sections.get(f'remote "{name}"', {}).get("url") or None
+        cache_key = (name, _file_key(self.common_dir / "config"))
+        with self._lock:
+            if cache_key in self._remote_urls:
+                return self._remote_urls[cache_key]
+        url = None
+        try:
+            result = _run_git(["remote", "get-url", name], self.root)
+            if result.returncode == 0:
+                url = result.stdout.strip() or None
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+        with self._lock:
+            self._remote_urls[cache_key] = url
+        return url
+
+    def _read_config(self) -> tuple[dict[str, dict[str, str]], bool]:
+        path = self.common_dir / "config"
+        with self._lock:
+            key = _file_key(path)
+            if self._config is not None and self._config[0] == key:
+                return self._config[1], self._config[2]
+            try:
+                text = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                text = ""
+            sections = _parse_config(text)
+            lowered = text.lower()
+            needs_git = "[include" in lowered or "insteadof" in lowered
+            self._config = (key, sections, needs_git)
+            return sections, needs_git
+
+    # -- internals ----------------------------------------------------------
+
+    def _ensure_proc(self) -> subprocess.Popen[bytes]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=str(self.root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            raise GitError(str(exc)) from exc
+        return self._proc
+
+
+# ---------------------------------------------------------------------------
+# Shared sessions
+# ---------------------------------------------------------------------------
+
+_sessions: dict[Path, GitSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(start: Path) -> GitSession | None:
+    """Return the shared session for the repository containing *start*.
+
+    Returns None when git is not installed, *start* is not inside a
+    repository, or the repository's refs are not stored as files.
+    """
+    if shutil.which("git") is None:
+        return None
+    found = find_repo(start)
+    if found is None:
+        return None
+    root, git_dir, common_dir = found
+    if (common_dir / "reftable").is_dir():
+        return None
+    with _sessions_lock:
+        session = _sessions.get(git_dir)
+        if session is None:
+            session = GitSession(root, git_dir, common_dir)
+            _sessions[git_dir] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close every shared session (stops their ``cat-file`` processes)."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_sessions)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _run_git(
+    args: list[str], cwd: Path, *, timeout: int = GIT_COMMAND_TIMEOUT
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        ["git", *args],
+        cwd=str(cwd),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+
+
+def _file_key(path: Path) -> tuple[int, int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return (0, -1)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_ref_file(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _is_per_worktree(name: str) -> bool:
+    return "/" not in name or name.startswith(
+        ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+    )
+
+
+def _parse_ident(value: str) -> tuple[str, str, int, str]:
+    """Split ``Name <email> 1700000000 +0100`` into (name, email, epoch, iso date)."""
+    lt, gt = value.find("<"), value.rfind(">")
+    if lt == -1 or gt < lt:
+        return value.strip(), "", 0, ""
+    name, email = value[:lt].strip(), value[lt + 1 : gt]
+    stamp = value[gt + 1 :].split()
+    try:
+        epoch = int(stamp[0])
+        offset = stamp[1] if len(stamp) > 1 else "+0000"
+        sign = -1 if offset.startswith("-") else 1
+        minutes = sign * (int(offset[1:3]) * 60 + int(offset[3:5]))
+        tz = timezone(timedelta(minutes=minutes))
+        iso = datetime.fromtimestamp(epoch, tz).isoformat()
+    except (IndexError, ValueError, OverflowError, OSError):
+        return name, email, 0, ""
+    return name, email, epoch, iso
+
+
+def _parse_commit(sha: str, raw: bytes) -> dict[str, Any]:
+    """Parse a raw commit object into the fields the readers need."""
+    header, _, message = raw.partition(b"\n\n")
+    parents: list[str] = []
+    author = committer = ""
+    for line in header.split(b"\n"):
+        if line.startswith(b" "):
+            continue  # continuation of a multi-line header (gpgsig, mergetag)
+        key, _, value = line.partition(b" ")
+        if key == b"parent":
+            parents.append(value.decode("ascii", "replace").strip())
+        elif key == b"author":
+            author = value.decode("utf-8", "replace")
+        elif key == b"committer":
+            committer = value.decode("utf-8", "replace")
+    text = message.decode("utf-8", "replace")
+    subject, body = _split_message(text)
+    author_name, author_email, author_time, author_date = _parse_ident(author)
+    _, _, committer_time, _ = _parse_ident(committer)
+    return {
+        "sha": sha,
+        "parents": parents,
+        "subject": subject,
+        "body": body,
+        "author_name": author_name,
+        "author_email": author_email,
+        "author_date": author_date,
+        "author_time": author_time,
+        "committer_time": committer_time,
+    }
+
+
+def _split_message(text: str) -> tuple[str, str]:
+    """Return (subject, body) the way git's ``%s`` and ``%b`` do."""
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    subject_lines: list[str] = []
+    while i < len(lines) and lines[i].strip():
+        subject_lines.append(lines[i].strip())
+        i += 1
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    return " ".join(subject_lines), "\n".join(lines[i:]).rstrip()
+
+
+def _parse_config(text: str) -> dict[str, dict[str, str]]:
+    """Parse git config text into ``{section: {key: value}}``.
+
+    Section names keep their subsection verbatim (``remote "origin"``); the
+    section and key names are lower-cased as git treats them. Only simple
+    values are supported, which is all the readers need.
+    """
+    sections: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            end = line.find("]")
+            if end == -1:
+                current = None
+                continue
+            head = line[1:end].strip()
+            name, _, sub = head.partition(" ")
+            name = name.lower()
+            section = f"{name} {sub.strip()}" if sub else name
+            current = sections.setdefault(section, {})
+            continue
+        if current is None:
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip() if sep else "true"
+        for marker in (" #", " ;", "\t#", "\t;"):
+            if marker in value and not value.startswith('"'):
+                value = value.split(marker, 1)[0].rstrip()
+        if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        current[key.strip().lower()] = value
+    return sections
@@ -9,6 +9,7 @@ from lattice.core.ids import is_short_id, validate_id
 from lattice.mcp.server import mcp
 from lattice.storage.fs import find_root
 from lattice.storage.short_ids import resolve_short_id
+from lattice.storage.snapshot_store import SnapshotStore
 
 
 # ---------------------------------------------------------------------------
@@ -37,17 +38,12 @@ def _resolve_task_id(lattice_dir: Path, raw_id: str) -> str:
     raise ValueError(f"Invalid task ID format: '{raw_id}'.")
 
 
-def _load_all_snapshots(lattice_dir: Path) -> list[dict]:
-    """Load all active task snapshots."""
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snapshots.append(json.loads(task_file.read_text()))
-            except (json.JSONDecodeError, OSError):
-                continue
-    return snapshots
+def _query_snapshots(
+    lattice_dir: Path, *, status: str | None = None, assigned: str | None = None
+) -> list[dict]:
+    """Load active task snapshots matching the filters from the snapshot index."""
+    with SnapshotStore(lattice_dir) as store:
+        return store.query(status=status, assigned=assigned)
 
 
 def _read_events(lattice_dir: Path, task_id: str, is_archived: bool = False) -> list[dict]:
@@ -77,7 +73,7 @@ def _read_events(lattice_dir: Path, task_id: str, is_archived: bool = False) ->
 def resource_all_tasks() -> str:
     """All active task snapshots as a JSON array."""
     lattice_dir = _find_root_dir()
-    snapshots = _load_all_snapshots(lattice_dir)
+    snapshots = _query_snapshots(lattice_dir)
     return json.dumps(snapshots, sort_keys=True, indent=2)
 
 
@@ -111,8 +107,7 @@ def resource_task_detail(task_id: str) -> str:
 def resource_tasks_by_status(status: str) -> str:
     """Tasks filtered by status as a JSON array."""
     lattice_dir = _find_root_dir()
-    snapshots = _load_all_snapshots(lattice_dir)
-    filtered = [s for s in snapshots if s.get("status") == status]
+    filtered = _query_snapshots(lattice_dir, status=status)
     return json.dumps(filtered, sort_keys=True, indent=2)
 
 
@@ -120,8 +115,7 @@ def resource_tasks_by_status(status: str) -> str:
 def resource_tasks_by_assignee(actor: str) -> str:
     """Tasks filtered by assignee as a JSON array."""
     lattice_dir = _find_root_dir()
-    snapshots = _load_all_snapshots(lattice_dir)
-    filtered = [s for s in snapshots if s.get("assigned_to") == actor]
+    filtered = _query_snapshots(lattice_dir, assigned=actor)
     return json.dumps(filtered, sort_keys=True, indent=2)
 
 
@@ -33,8 +33,6 @@ from lattice.core.config import (
 from lattice.core.events import (
     BUILTIN_EVENT_TYPES,
     create_event,
-    get_actor_display,
-    serialize_event,
     validate_custom_event_type,
 )
 from lattice.core.ids import (
@@ -45,14 +43,21 @@ from lattice.core.ids import (
     validate_id,
 )
 from lattice.core.relationships import RELATIONSHIP_TYPES, validate_relationship_type
-from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.core.tasks import apply_event_to_snapshot
 from lattice.mcp.server import mcp
-from lattice.storage.fs import atomic_write, find_root, jsonl_append
+from lattice.storage.fs import atomic_write, find_root
 from lattice.storage.hooks import execute_hooks
 from lattice.storage.locks import multi_lock
-from lattice.storage.operations import scaffold_plan, write_task_event
+from lattice.storage.operations import (
+    scaffold_plan,
+    write_task_archive,
+    write_task_event,
+    write_task_unarchive,
+)
 from lattice.storage.readers import read_task_events
+from lattice.storage.search_index import DEFAULT_KINDS, DOCUMENT_KINDS, SearchIndex
 from lattice.storage.short_ids import allocate_short_id, resolve_short_id
+from lattice.storage.snapshot_store import SnapshotStore
 
 logger = logging.getLogger(__name__)
 
@@ -700,49 +705,7 @@ def lattice_archive(
     event = create_event(type="task_archived", task_id=task_id, actor=actor, data={})
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-    locks_dir = lattice_dir / "locks"
-    lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
-
-    with multi_lock(locks_dir, lock_keys):
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        atomic_write(
-            lattice_dir / "archive" / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        if snapshot_path.exists():
-            snapshot_path.unlink()
-
-        shutil.move(
-            str(event_path),
-            str(lattice_dir / "archive" / "events" / f"{task_id}.jsonl"),
-        )
-
-        notes_path = lattice_dir / "notes" / f"{task_id}.md"
-        if notes_path.exists():
-            shutil.move(
-                str(notes_path),
-                str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
-            )
-
-        plan_path = lattice_dir / "plans" / f"{task_id}.md"
-        if plan_path.exists():
-            archive_plans_dir = lattice_dir / "archive" / "plans"
-            archive_plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(plan_path),
-                str(archive_plans_dir / f"{task_id}.md"),
-            )
-
-    # Fire hooks after locks released
-    execute_hooks(config, lattice_dir, task_id, event)
-
+    write_task_archive(lattice_dir, task_id, event, updated_snapshot, config)
     return event
 
 
@@ -772,47 +735,7 @@ def lattice_unarchive(
     event = create_event(type="task_unarchived", task_id=task_id, actor=actor, data={})
     updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-    locks_dir = lattice_dir / "locks"
-    lock_keys = sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
-
-    with multi_lock(locks_dir, lock_keys):
-        archive_event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
-        jsonl_append(archive_event_path, serialize_event(event))
-
-        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-        jsonl_append(lifecycle_path, serialize_event(event))
-
-        shutil.move(
-            str(archive_event_path),
-            str(lattice_dir / "events" / f"{task_id}.jsonl"),
-        )
-
-        atomic_write(
-            lattice_dir / "tasks" / f"{task_id}.json",
-            serialize_snapshot(updated_snapshot),
-        )
-
-        archive_snapshot_path.unlink()
-
-        archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
-        if archive_notes_path.exists():
-            shutil.move(
-                str(archive_notes_path),
-                str(lattice_dir / "notes" / f"{task_id}.md"),
-            )
-
-        archive_plan_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
-        if archive_plan_path.exists():
-            plans_dir = lattice_dir / "plans"
-            plans_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(
-                str(archive_plan_path),
-                str(plans_dir / f"{task_id}.md"),
-            )
-
-    # Fire hooks after locks released
-    execute_hooks(config, lattice_dir, task_id, event)
-
+    write_task_unarchive(lattice_dir, task_id, event, updated_snapshot, config)
     return event
 
 
@@ -875,12 +798,7 @@ def lattice_branch_link(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -937,12 +855,7 @@ def lattice_branch_unlink(
 
         updated_snapshot = apply_event_to_snapshot(snapshot, event)
 
-        # Event-first write
-        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        jsonl_append(event_path, serialize_event(event))
-
-        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
-        atomic_write(snapshot_path, serialize_snapshot(updated_snapshot))
+        write_task_event(lattice_dir, task_id, [event], updated_snapshot, _caller_holds_lock=True)
 
     # Fire hooks after locks released
     if config:
@@ -1197,37 +1110,59 @@ def lattice_list(
 ) -> list[dict]:
     """List active Lattice tasks with optional filters. Returns list of task snapshots."""
     lattice_dir = _find_root(lattice_root)
-    tasks_dir = lattice_dir / "tasks"
-    snapshots: list[dict] = []
-
-    if tasks_dir.is_dir():
-        for task_file in sorted(tasks_dir.glob("*.json")):
-            try:
-                snap = json.loads(task_file.read_text())
-            except (json.JSONDecodeError, OSError):
-                continue
-            snapshots.append(snap)
-
-    filtered: list[dict] = []
-    for snap in snapshots:
-        if status is not None and snap.get("status") != status:
-            continue
-        if assigned is not None:
-            raw = snap.get("assigned_to")
-            if raw is None or get_actor_display(raw) != assigned:
-                continue
-        if tag is not None and tag not in (snap.get("tags") or []):
-            continue
-        if task_type is not None and snap.get("type") != task_type:
-            continue
-        if priority is not None and snap.get("priority") != priority:
-            continue
-        filtered.append(snap)
+    with SnapshotStore(lattice_dir) as store:
+        filtered = store.query(
+            status=status,
+            assigned=assigned,
+            tag=tag,
+            task_type=task_type,
+            priority=priority,
+        )
 
     filtered.sort(key=lambda s: s.get("id", ""))
     return filtered
 
 
+@mcp.tool()
+def lattice_search(
+    query: Annotated[str, Field(description="Words to search for (all must match, as prefixes)")],
+    kinds: Annotated[
+        list[str] | None,
+        Field(
+            description="Document kinds: task, comment, note, plan, event "
+            "(default: task, comment, note, plan)"
+        ),
+    ] = None,
+    task_id: Annotated[
+        str | None, Field(description="Only search within this task (ULID or short ID)")
+    ] = None,
+    include_archived: Annotated[bool, Field(description="Include archived tasks")] = False,
+    limit: Annotated[int, Field(description="Maximum number of hits", ge=1)] = 20,
+    lattice_root: Annotated[
+        str | None, Field(description="Path to project directory containing .lattice/")
+    ] = None,
+) -> list[dict]:
+    """Full-text search over task titles, descriptions, comments, notes and plans. Returns ranked hits with snippets."""
+    lattice_dir = _find_root(lattice_root)
+    if kinds is not None:
+        invalid = sorted(set(kinds) - set(DOCUMENT_KINDS))
+        if invalid:
+            raise ValueError(
+                f"Invalid kind(s): {', '.join(invalid)}. Valid kinds: {', '.join(DOCUMENT_KINDS)}"
+            )
+    if task_id is not None:
+        task_id = _resolve_task_id(lattice_dir, task_id)
+
+    with SearchIndex(lattice_dir) as index:
+        return index.search(
+            query,
+            kinds=kinds or DEFAULT_KINDS,
+            task_id=task_id,
+            include_archived=include_archived or task_id is not None,
+            limit=limit,
+        )
+
+
 @mcp.tool()
 def lattice_show(
     task_id: Annotated[str, Field(description="Task ID (ULID or short ID)")],
@@ -1256,6 +1191,9 @@ def lattice_show(
     if is_archived:
         result["archived"] = True
 
+    with SnapshotStore(lattice_dir) as store:
+        result["relationships_in"] = store.incoming(task_id)
+
     if include_events:
         result["events"] = _read_events(lattice_dir, task_id, is_archived)
 
@@ -0,0 +1,243 @@
+"""Global ordered changefeed: every task and resource event with a sequence number.
+
+Each record is the event plus the feed's own keys (:data:`FEED_KEYS`):
+``seq``, the ``gen`` of the feed it was numbered in (a fresh value whenever
+numbering restarts, so a position kept across a regenerated feed is
+noticed) and, on the last record of a task write, the ``dirs`` key of the
+snapshot directories before and after the write (see
+:func:`snapshot_dirs_key`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+from pathlib import Path
+from typing import BinaryIO
+
+from lattice.core.events import serialize_event
+from lattice.storage.event_log import EventLog
+from lattice.storage.fs import atomic_write, jsonl_append_many, sync_paths
+from lattice.storage.locks import lattice_lock
+
+CHANGEFEED_FILE = "changes.jsonl"
+CHANGEFEED_LOCK = "changefeed"
+
+# Keys the feed adds to an event; everything else is the event itself.
+FEED_KEYS = ("seq", "gen", "dirs")
+
+
+def changefeed_path(lattice_dir: Path) -> Path:
+    return lattice_dir / CHANGEFEED_FILE
+
+
+def last_record(lattice_dir: Path) -> dict | None:
+    """Return the feed record with the highest sequence number (None if empty).
+
+    Skips a torn or corrupt final line, so a crash mid-append never makes
+    sequence numbers restart.
+    """
+    log = EventLog(changefeed_path(lattice_dir))
+    for records in (log.tail(16), log.iter_events()):
+        numbered = [r for r in records if isinstance(r.get("seq"), int)]
+        if numbered:
+            return numbered[-1]
+    return None
+
+
+def last_seq(lattice_dir: Path) -> int:
+    """Return the highest sequence number in the feed (0 if empty)."""
+    record = last_record(lattice_dir)
+    return record["seq"] if record is not None else 0
+
+
+def feed_end(lattice_dir: Path) -> tuple[str, int]:
+    """Return the (generation, seq) of the last record (``("", 0)`` if empty)."""
+    record = last_record(lattice_dir)
+    if record is None:
+        return ("", 0)
+    return (record_generation(record), record["seq"])
+
+
+def record_generation(record: dict) -> str:
+    """Return the generation *record* was numbered in (``""`` for older feeds)."""
+    gen = record.get("gen")
+    return gen if isinstance(gen, str) else ""
+
+
+def event_of(record: dict) -> dict:
+    """Return the event a feed record carries, without the feed's own keys."""
+    return {k: v for k, v in record.items() if k not in FEED_KEYS}
+
+
+def snapshot_dirs_key(lattice_dir: Path) -> str:
+    """Stat key (inode, mtime, size) of ``tasks/`` and ``archive/tasks/``.
+
+    A directory's stat changes whenever an entry is added, removed or
+    renamed over, which every snapshot write does. Task writers record the
+    key before and after their write, so the snapshot index can tell the
+    changes the feed accounts for from changes made outside lattice.
+    """
+    parts = []
+    for directory in (lattice_dir / "tasks", lattice_dir / "archive" / "tasks"):
+        try:
+            st = os.stat(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            parts.append("-")
+            continue
+        parts.append(f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}")
+    return " ".join(parts)
+
+
+def append_changes(
+    lattice_dir: Path,
+    events: list[dict],
+    *,
+    sync: bool = True,
+    dirs: tuple[str, str] | None = None,
+) -> bool:
+    """Append *events* to the changefeed, assigning consecutive sequence numbers.
+
+    Takes the changefeed lock itself. Callers may already hold per-task or
+    per-resource locks: the changefeed lock is always acquired last, and
+    while it is held only the feed itself is read and written (no other
+    lock, no other file), so this cannot deadlock. Only numbering and the
+    write happen under it; the fsync follows once it is released, so
+    writers to different tasks never queue behind each other's disk
+    flushes.
+
+    Each record is the event with ``seq`` and ``gen`` keys added; records
+    continue the generation of the last one, and an empty feed starts a
+    fresh generation. The feed is written after the per-task log
+    (event-first) and after the task's snapshot, so a crash in between can
+    leave an event missing from the feed but never a feed entry without its
+    event, and a reader that sees a record finds a snapshot at least that
+    new. *dirs* is the (before, after) :func:`snapshot_dirs_key` of the
+    write's snapshot changes; it goes on the last record.
+
+    With ``sync=False`` nothing is fsynced and the caller makes the feed
+    durable, as for :func:`~lattice.storage.fs.jsonl_append_many`.
+
+    The append is all or nothing: if the write fails, the feed is cut back
+    to its previous end before the lock is released, so a caller that
+    undoes its own writes on error leaves no record behind.
+
+    Returns True if the feed file was created by this call.
+    """
+    if not events:
+        return False
+    path = changefeed_path(lattice_dir)
+    with lattice_lock(lattice_dir / "locks", CHANGEFEED_LOCK):
+        last = last_record(lattice_dir)
+        if last is None:
+            gen, seq = _new_generation(), 0
+        else:
+            gen, seq = record_generation(last), last["seq"]
+        records = []
+        for event in events:
+            seq += 1
+            records.append({**event_of(event), "gen": gen, "seq": seq})
+        if dirs is not None:
+            records[-1]["dirs"] = list(dirs)
+        lines = [serialize_event(record) for record in records]
+        try:
+            size: int | None = path.stat().st_size
+        except FileNotFoundError:
+            size = None
+        try:
+            created = jsonl_append_many(path, lines, sync=False)
+        except BaseException:
+            if size is None:
+                path.unlink(missing_ok=True)
+            else:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+            raise
+    if sync:
+        sync_paths([path], [lattice_dir] if created else [])
+    return created
+
+
+def rewrite_changes(lattice_dir: Path, events: list[dict]) -> int:
+    """Replace the feed with *events*, numbered from 1 in a new generation.
+
+    Used by ``lattice rebuild --all`` and ``lattice doctor --fix`` to
+    restore events a crash dropped between the per-task append and the feed
+    append. Readers that keep a feed position compare generations to notice
+    the new numbering; the search index and stats aggregates are dropped by
+    the caller. Returns the record count.
+    """
+    gen = _new_generation()
+    lines = [
+        serialize_event({**event_of(event), "gen": gen, "seq": seq})
+        for seq, event in enumerate(events, 1)
+    ]
+    with lattice_lock(lattice_dir / "locks", CHANGEFEED_LOCK):
+        atomic_write(changefeed_path(lattice_dir), "".join(lines))
+    return len(lines)
+
+
+def read_since(lattice_dir: Path, seq: int = 0, *, limit: int | None = None) -> list[dict]:
+    """Return feed records with a sequence number greater than *seq*, in order.
+
+    The feed is sorted by ``seq``, so the start position is found by binary
+    search over byte offsets; the cost is proportional to the records
+    returned, not to the size of the feed.
+    """
+    path = changefeed_path(lattice_dir)
+    records: list[dict] = []
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(_find_offset(fh, seq))
+            for raw in fh:
+                record = _parse(raw)
+                if record is None or record["seq"] <= seq:
+                    continue
+                records.append(record)
+                if limit is not None and len(records) >= limit:
+                    break
+    except OSError:
+        return []
+    return records
+
+
+def _new_generation() -> str:
+    return secrets.token_hex(6)
+
+
+def _parse(raw: bytes) -> dict | None:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        record = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("seq"), int):
+        return None
+    return record
+
+
+def _find_offset(fh: BinaryIO, seq: int) -> int:
+    """Return a line-start offset at or before the first record with seq > *seq*."""
+    lo, hi = 0, fh.seek(0, os.SEEK_END)
+    # Invariant: the first record after *seq* starts at or after lo; every
+    # line starting at or after hi has seq > *seq* (or is unreadable).
+    while hi - lo > 4096:
+        mid = (lo + hi) // 2
+        fh.seek(mid)
+        fh.readline()  # skip the (probably partial) line we landed in
+        line_start = fh.tell()
+        record = None
+        while record is None and fh.tell() < hi:
+            line_start = fh.tell()
+            record = _parse(fh.readline())
+        if record is None:
+            hi = mid
+        elif record["seq"] <= seq:
+            lo = line_start
+        else:
+            hi = mid
+    # lo is always the start of a line (0 or a line_start we parsed)
+    return lo
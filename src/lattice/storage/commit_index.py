@@ -0,0 +1,337 @@
+"""Commit reference index: which commits mention which tasks, kept in ``index/commits.db``."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import subprocess
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Self
+
+from lattice.git_session import GitSession
+from lattice.storage.sqlite_index import INDEX_DIR, connect_index
+
+COMMIT_INDEX_DB = "commits.db"
+
+# Bump when the table layout or reference extraction changes.
+SCHEMA_VERSION = 1
+
+# Patterns for extracting Lattice task references from commit messages.
+# Matches short IDs like LAT-42, PROJ-7, or any UPPER-ID pattern:
+_SHORT_ID_RE = re.compile(r"\b([A-Z][A-Z0-9]+-\d+)\b")
+# Matches ULID-style task IDs like task_01HQ...:
+_ULID_RE = re.compile(r"\b(task_[0-9A-Z]{26})\b")
+# Lookups ignore case, like ``git log --regexp-ignore-case`` did: "lat-42"
+# in a message is found under LAT-42.
+_SHORT_ID_ANY_CASE_RE = re.compile(_SHORT_ID_RE.pattern, re.IGNORECASE)
+
+# Only commits that mention at least one task get a row. ``refs`` holds the
+# message's references as :func:`extract_task_refs` returns them; ``mentions``
+# holds the upper-cased keys lookups match against. ``batch`` numbers each
+# ``git log`` read; with rowid it keeps git's order among commits made in the
+# same second. ``tips`` records the branch heads (and HEAD) whose full
+# history the rows cover.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    time INTEGER NOT NULL,
+    batch INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    refs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    ref TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (ref, sha)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mentions_sha ON mentions (sha);
+CREATE TABLE IF NOT EXISTS tips (
+    name TEXT PRIMARY KEY,
+    sha TEXT NOT NULL
+);
+"""
+
+# %s is the subject paragraph, %ad the author date (``--date=short``), %ct
+# the committer timestamp that orders results the way ``git log`` does.
+_LOG_FORMAT = "%H%x00%P%x00%ct%x00%ad%x00%s%x00%b%x01"
+
+# Rows written per executemany batch while ingesting ``git log`` output.
+_INSERT_BATCH = 1000
+
+
+def extract_task_refs(text: str) -> list[str]:
+    """Extract Lattice task references from a commit message.
+
+    Finds short IDs (e.g., ``LAT-42``) and ULID task IDs
+    (e.g., ``task_01HQABC...``).  Returns deduplicated list.
+    """
+    refs: list[str] = []
+    seen: set[str] = set()
+
+    for match in _SHORT_ID_RE.finditer(text):
+        ref = match.group(1)
+        if ref not in seen:
+            refs.append(ref)
+            seen.add(ref)
+
+    for match in _ULID_RE.finditer(text):
+        ref = match.group(1)
+        if ref not in seen:
+            refs.append(ref)
+            seen.add(ref)
+
+    return refs
+
+
+def commit_index_path(lattice_dir: Path) -> Path:
+    """Return the path of the commit reference index database."""
+    return lattice_dir / INDEX_DIR / COMMIT_INDEX_DB
+
+
+class CommitIndex:
+    """Map task short IDs and ULIDs to the commits whose messages mention them.
+
+    The index covers every commit reachable from the local branches and
+    HEAD. It remembers the tip it last indexed for each of them; a refresh
+    reads the current tips from disk through *session* and, when they moved,
+    runs one ``git log <new tips> --not <old tips>`` to add only the new
+    commits. Tips that were rewritten or deleted are handled by removing the
+    commits ``git rev-list <old tips> --not <new tips>`` reports as no
+    longer reachable. If the old tips are gone from the object store (a
+    rewrite followed by ``gc``), the index is rebuilt from scratch.
+
+    If the index cannot be opened on disk, it is built in memory instead.
+
+    Usage::
+
+        with CommitIndex(lattice_dir, session) as index:
+            if index.refresh():
+                commits = index.commits_mentioning("LAT-42")
+    """
+
+    def __init__(self, lattice_dir: Path, session: GitSession) -> None:
+        self.lattice_dir = lattice_dir
+        self.session = session
+        try:
+            self._conn = connect_index(commit_index_path(lattice_dir), _SCHEMA, SCHEMA_VERSION)
+        except (sqlite3.Error, OSError):
+            self._use_memory()
+
+    def _use_memory(self) -> None:
+        self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the current tips.
+
+        Costs no process spawns when no tip moved. Returns False when git
+        could not list the commits, in which case the index is unchanged.
+        """
+        tips = self._current_tips()
+        if tips == self._stored_tips():
+            return True
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                stored = self._stored_tips()  # another process may have caught up
+                if tips != stored and not self._advance(stored, tips):
+                    self._conn.execute("DELETE FROM commits")
+                    self._conn.execute("DELETE FROM mentions")
+                    if self._add_commits(tips.values(), ()) is None:
+                        raise _GitFailed
+                self._conn.execute("DELETE FROM tips")
+                self._conn.executemany("INSERT INTO tips VALUES (?, ?)", tips.items())
+        except _GitFailed:
+            return False
+        return True
+
+    def _current_tips(self) -> dict[str, str]:
+        tips = {f"refs/heads/{name}": sha for name, sha in self.session.branches().items()}
+        head = self.session.head()[1]
+        if head:
+            tips["HEAD"] = head
+        return tips
+
+    def _stored_tips(self) -> dict[str, str]:
+        return dict(self._conn.execute("SELECT name, sha FROM tips"))
+
+    def _advance(self, old: dict[str, str], new: dict[str, str]) -> bool:
+        """Move the index from the *old* tips to the *new* ones; False if git failed."""
+        old_shas, new_shas = set(old.values()), set(new.values())
+        parents = self._add_commits(new_shas - old_shas, old_shas)
+        if parents is None:
+            return False
+        # An old tip that is the parent of a new commit is still reachable
+        # (the usual fast-forward), so only rewrites and deletions cost a spawn.
+        dropped = old_shas - new_shas - parents
+        if not dropped:
+            return True
+        unreachable = _git_lines(
+            self.session.root, ["rev-list", *sorted(dropped), "--not", *sorted(new_shas), "--"]
+        )
+        if unreachable is None:
+            return False
+        for batch in _batched(unreachable):
+            rows = [(sha,) for sha in batch]
+            self._conn.executemany("DELETE FROM commits WHERE sha = ?", rows)
+            self._conn.executemany("DELETE FROM mentions WHERE sha = ?", rows)
+        return True
+
+    def _add_commits(self, include: Iterable[str], exclude: Iterable[str]) -> set[str] | None:
+        """Index the commits reachable from *include* but not from *exclude*.
+
+        Returns the parents of the commits read, or None if git failed.
+        """
+        include = sorted(include)
+        if not include:
+            return set()
+        args = ["log", f"--format={_LOG_FORMAT}", "--date=short", *include]
+        exclude = sorted(exclude)
+        if exclude:
+            args += ["--not", *exclude]
+        args.append("--")
+        try:
+            proc = subprocess.Popen(
+                ["git", *args],
+                cwd=str(self.session.root),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+        assert proc.stdout is not None
+        parents: set[str] = set()
+        (batch,) = self._conn.execute("SELECT COALESCE(MAX(batch), 0) + 1 FROM commits").fetchone()
+        rows: list[tuple[str, int, int, str, str, str]] = []
+        mentions: list[tuple[str, str]] = []
+        try:
+            for record in _records(proc.stdout):
+                fields = record.split("\x00")
+                if len(fields) < 6:
+                    continue
+                sha, parent_shas, ctime, date, subject, body = fields[:6]
+                parents.update(parent_shas.split())
+                message = f"{subject} {body.strip()}"
+                keys = _mention_keys(message)
+                if not keys:
+                    continue
+                refs = " ".join(extract_task_refs(message))
+                rows.append((sha, int(ctime or 0), batch, date, subject, refs))
+                mentions.extend((key, sha) for key in keys)
+                if len(rows) >= _INSERT_BATCH:
+                    self._insert(rows, mentions)
+                    rows, mentions = [], []
+            self._insert(rows, mentions)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        return parents if returncode == 0 else None
+
+    def _insert(
+        self, rows: list[tuple[str, int, int, str, str, str]], mentions: list[tuple[str, str]]
+    ) -> None:
+        self._conn.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._conn.executemany("INSERT OR IGNORE INTO mentions VALUES (?, ?)", mentions)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def commits_mentioning(self, *refs: str) -> list[dict]:
+        """Return commits whose message mentions any of *refs*, newest first.
+
+        Short IDs match regardless of case. Each dict has ``sha`` (full),
+        ``date`` (author date, ``YYYY-MM-DD``) and ``subject``.
+        """
+        refs = tuple(_mention_key(ref) for ref in refs if ref)
+        if not refs:
+            return []
+        marks = ",".join("?" * len(refs))
+        rows = self._conn.execute(
+            "SELECT c.sha, c.date, c.subject FROM commits c WHERE c.sha IN "
+            f"(SELECT sha FROM mentions WHERE ref IN ({marks})) "
+            "ORDER BY c.time DESC, c.batch DESC, c.rowid",
+            refs,
+        )
+        return [{"sha": sha, "date": date, "subject": subject} for sha, date, subject in rows]
+
+    def covers(self, sha: str) -> bool:
+        """Return True if *sha* is an indexed tip, i.e. its whole history is indexed."""
+        row = self._conn.execute("SELECT 1 FROM tips WHERE sha = ? LIMIT 1", (sha,)).fetchone()
+        return row is not None
+
+    def refs_for(self, shas: Iterable[str]) -> dict[str, list[str]]:
+        """Return the task references of each indexed commit in *shas*.
+
+        Commits that mention no task have no row and are absent from the result.
+        """
+        found: dict[str, list[str]] = {}
+        for batch in _batched(list(shas)):
+            marks = ",".join("?" * len(batch))
+            for sha, refs in self._conn.execute(
+                f"SELECT sha, refs FROM commits WHERE sha IN ({marks})", batch
+            ):
+                found[sha] = refs.split()
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _mention_key(ref: str) -> str:
+    return ref if ref.startswith("task_") else ref.upper()
+
+
+def _mention_keys(message: str) -> set[str]:
+    keys = {match.group(1).upper() for match in _SHORT_ID_ANY_CASE_RE.finditer(message)}
+    keys.update(match.group(1) for match in _ULID_RE.finditer(message))
+    return keys
+
+
+class _GitFailed(Exception):
+    """Rolls back a refresh when git could not list commits."""
+
+
+def _records(stream: IO[bytes]) -> Iterator[str]:
+    """Yield the ``%x01``-terminated records of a ``git log`` stream."""
+    pending = b""
+    while chunk := stream.read(1 << 16):
+        pending += chunk
+        *complete, pending = pending.split(b"\x01")
+        for record in complete:
+            yield record.lstrip(b"\n").decode("utf-8", errors="replace")
+
+
+def _git_lines(cwd: Path, args: list[str]) -> list[str] | None:
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=str(cwd), capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.split()
+
+
+def _batched(items: list[str], size: int = 500) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -0,0 +1,177 @@
+"""Streaming, tail-seeking and line-counting readers for JSONL event logs."""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO, Self
+
+from lattice.storage.fs import LATTICE_DIR, atomic_write, ensure_index_dir
+
+EVENT_COUNTS_FILE = "event_counts.json"
+
+_TAIL_BLOCK = 8192
+# Bytes before the cached offset that must be unchanged for the cached count
+# to be extended incrementally (event logs are append-only; rewrites such as
+# ``doctor --fix`` truncation change these bytes or shrink the file).
+_GUARD_BYTES = 64
+
+
+def _parse(raw: bytes) -> dict | None:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        event = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return event if isinstance(event, dict) else None
+
+
+class EventLog:
+    """Read-only view of a single JSONL event log.
+
+    Blank and unparseable lines are skipped, matching the tolerant readers
+    used across the CLI and dashboard. A missing file reads as empty.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def iter_events(self) -> Iterator[dict]:
+        """Yield events in file order without loading the whole file."""
+        try:
+            with open(self.path, "rb") as fh:
+                for raw in fh:
+                    event = _parse(raw)
+                    if event is not None:
+                        yield event
+        except OSError:
+            return
+
+    def tail(self, n: int) -> list[dict]:
+        """Return the events on the last *n* non-blank lines, oldest first.
+
+        Reads backwards from the end of the file in fixed-size blocks, so the
+        cost depends on *n*, not on the length of the log.
+        """
+        if n <= 0:
+            return []
+        lines: list[bytes] = []
+        try:
+            with open(self.path, "rb") as fh:
+                pos = fh.seek(0, os.SEEK_END)
+                buf = b""
+                while pos > 0 and len(lines) <= n:
+                    step = min(_TAIL_BLOCK, pos)
+                    pos -= step
+                    fh.seek(pos)
+                    buf = fh.read(step) + buf
+                    lines = [line for line in buf.split(b"\n") if line.strip()]
+        except OSError:
+            return []
+        # Unless we reached the start, the first piece may be a partial line.
+        if pos > 0:
+            lines = lines[1:]
+        events = [_parse(line) for line in lines[-n:]]
+        return [e for e in events if e is not None]
+
+    def count(self) -> int:
+        """Return the number of non-blank lines, using the line-count sidecar."""
+        lattice_dir = next((p for p in self.path.parents if p.name == LATTICE_DIR), None)
+        with EventCounts(lattice_dir) as counts:
+            return counts.count(self.path)
+
+
+class EventCounts:
+    """Cached non-blank line counts for event logs.
+
+    Counts live in ``.lattice/index/event_counts.json`` keyed by path relative
+    to the lattice dir. Each entry records the byte offset just past the last
+    counted newline, the count up to there, and a checksum of the bytes just
+    before the offset. When a log has only been appended to, counting costs
+    a read of the new bytes; anything else falls back to a full recount.
+
+    Use as a context manager; the sidecar is rewritten on exit only if an
+    entry changed. Without a lattice dir the cache is in-memory only.
+    """
+
+    def __init__(self, lattice_dir: Path | None) -> None:
+        self._lattice_dir = lattice_dir
+        self._entries: dict[str, list[int]] = {}
+        self._dirty = False
+        if lattice_dir is not None:
+            try:
+                loaded = json.loads(self._sidecar_path().read_text())
+                if isinstance(loaded, dict):
+                    self._entries = loaded
+            except (OSError, ValueError):
+                pass
+
+    def _sidecar_path(self) -> Path:
+        assert self._lattice_dir is not None
+        return self._lattice_dir / "index" / EVENT_COUNTS_FILE
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.save()
+
+    def save(self) -> None:
+        if not self._dirty or self._lattice_dir is None:
+            return
+        path = self._sidecar_path()
+        try:
+            ensure_index_dir(path.parent)
+            atomic_write(path, json.dumps(self._entries, sort_keys=True) + "\n", durable=False)
+        except OSError:
+            return  # derived data; recomputed next time
+        self._dirty = False
+
+    def _key(self, path: Path) -> str:
+        if self._lattice_dir is not None:
+            try:
+                return path.relative_to(self._lattice_dir).as_posix()
+            except ValueError:
+                pass
+        return str(path)
+
+    def count(self, path: Path) -> int:
+        """Return the number of non-blank lines in *path* (0 if missing)."""
+        key = self._key(path)
+        entry = self._entries.get(key)
+        if not (isinstance(entry, list) and len(entry) == 3):
+            entry = None
+        try:
+            with open(path, "rb") as fh:
+                size = os.fstat(fh.fileno()).st_size
+                if entry is not None and entry[0] <= size and _guard(fh, entry[0]) == entry[2]:
+                    offset, counted = entry[0], entry[1]
+                else:
+                    entry = None
+                    offset, counted = 0, 0
+                fh.seek(offset)
+                data = fh.read()
+                end = data.rfind(b"\n") + 1  # 0 when no complete line was read
+                new_offset = offset + end
+                counted += sum(1 for line in data[:end].split(b"\n") if line.strip())
+                if entry is None or new_offset != offset:
+                    self._entries[key] = [new_offset, counted, _guard(fh, new_offset)]
+                    self._dirty = True
+        except OSError:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+            return 0
+
+        return counted + (1 if data[end:].strip() else 0)
+
+
+def _guard(fh: BinaryIO, offset: int) -> int:
+    """Checksum of the bytes just before *offset* in *fh*."""
+    start = max(0, offset - _GUARD_BYTES)
+    fh.seek(start)
+    return zlib.crc32(fh.read(offset - start))
@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import atexit
+import json
 import os
 import tempfile
+import threading
+from collections.abc import Iterable
 from pathlib import Path
 
 LATTICE_DIR = ".lattice"
 LATTICE_ROOT_ENV = "LATTICE_ROOT"
+DURABILITY_ENV = "LATTICE_DURABILITY"
+
+DURABILITY_STRICT = "strict"
+DURABILITY_BATCHED = "batched"
+DURABILITY_RELAXED = "relaxed"
+DURABILITY_LEVELS = (DURABILITY_STRICT, DURABILITY_BATCHED, DURABILITY_RELAXED)
+
+# How long ``batched`` durability may leave writes unsynced.
+BATCHED_SYNC_INTERVAL = 1.0
 
 
 def _fsync_directory(path: Path) -> None:
@@ -26,12 +39,27 @@ def _fsync_directory(path: Path) -> None:
         pass
 
 
-def atomic_write(path: Path, content: str | bytes) -> None:
+def atomic_write(
+    path: Path, content: str | bytes, *, sync_dir: bool = True, durable: bool = True
+) -> None:
     """Write content to path atomically via temp file + fsync + rename.
 
     The temp file is created in the same directory as the target to ensure
     os.rename() is an atomic operation (same filesystem).
 
+    With ``sync_dir=False`` the parent directory is not fsynced after the
+    rename; the caller is expected to do it (e.g. via :func:`sync_paths`).
+
+    Fsyncs follow the project's durability level (see :func:`durability_for`).
+    Under ``strict`` and ``batched`` the temp file is always fsynced before
+    the rename, so the target never holds partial content, even after power
+    loss; ``batched`` only defers the directory fsync. ``relaxed`` skips
+    every fsync, so its rename is atomic against process crashes only.
+
+    ``durable=False`` skips every fsync whatever the level, for derived
+    caches under ``index/`` that are recomputed when lost or unreadable and
+    are often written on the read path.
+
     Raises:
         FileNotFoundError: If the parent directory does not exist.
     """
@@ -40,20 +68,22 @@ def atomic_write(path: Path, content: str | bytes) -> None:
         raise FileNotFoundError(f"Parent directory does not exist: {parent}")
 
     data = content.encode("utf-8") if isinstance(content, str) else content
+    level = durability_for(path) if durable else DURABILITY_RELAXED
 
     fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=".tmp.")
     closed = False
     try:
-        # os.write() can short-write; loop until all bytes are flushed.
-        mv = memoryview(data)
-        while mv:
-            written = os.write(fd, mv)
-            mv = mv[written:]
-        os.fsync(fd)
+        _write_all(fd, data)
+        if level != DURABILITY_RELAXED:
+            os.fsync(fd)
         os.close(fd)
         closed = True
         os.replace(tmp_path, path)
-        _fsync_directory(parent)
+        if sync_dir:
+            if level == DURABILITY_STRICT:
+                _fsync_directory(parent)
+            elif level == DURABILITY_BATCHED:
+                _deferred_sync.add([], [parent])
     except BaseException:
         if not closed:
             os.close(fd)
@@ -94,6 +124,49 @@ def ensure_lattice_dirs(root: Path) -> None:
     if not lifecycle_log.exists():
         lifecycle_log.touch()
 
+    ensure_lattice_gitignore(lattice)
+
+
+# Written to .lattice/.gitignore: the derived caches under index/ are binary or
+# machine-local, rebuilt from the committed files, and cannot be merged.
+LATTICE_GITIGNORE_ENTRIES = ("index/",)
+_GITIGNORE_HEADER = "# Derived caches, rebuilt locally by lattice (lattice rebuild --index)\n"
+
+
+def ensure_lattice_gitignore(lattice_dir: Path) -> None:
+    """Make ``.lattice/.gitignore`` ignore the derived cache directories.
+
+    Creates the file, or appends whichever of :data:`LATTICE_GITIGNORE_ENTRIES`
+    an existing one lacks; the user's own lines are left alone.
+    """
+    path = lattice_dir / ".gitignore"
+    try:
+        existing = path.read_text()
+    except FileNotFoundError:
+        existing = None
+    lines = {line.strip().rstrip("/") for line in (existing or "").splitlines()}
+    missing = [e for e in LATTICE_GITIGNORE_ENTRIES if e.rstrip("/") not in lines]
+    if not missing:
+        return
+    if existing is None:
+        atomic_write(path, _GITIGNORE_HEADER + "".join(f"{e}\n" for e in missing))
+        return
+    separator = "" if not existing or existing.endswith("\n") else "\n"
+    atomic_write(path, existing + separator + "".join(f"{e}\n" for e in missing))
+
+
+def ensure_index_dir(index_dir: Path) -> None:
+    """Create ``.lattice/index/`` for a derived cache if it does not exist yet.
+
+    A project from before the index existed gets its ``.gitignore`` entry
+    the first time the directory is created, so the caches never show up
+    in ``git status``.
+    """
+    if index_dir.is_dir():
+        return
+    index_dir.mkdir(parents=True, exist_ok=True)
+    ensure_lattice_gitignore(index_dir.parent)
+
 
 def find_root(start: Path | None = None) -> Path | None:
     """Find the project root containing .lattice/.
@@ -146,8 +219,7 @@ def jsonl_append(path: Path, line: str) -> None:
     no locking of its own.
 
     The line **must** already end with ``\\n``.  The function opens the file
-    in append mode, writes the line, then flushes and fsyncs to ensure
-    durability.
+    in append mode, writes the line, then fsyncs to ensure durability.
 
     As a defensive measure, if the file exists and does not end with a
     newline, one is prepended before writing to prevent concatenation
@@ -157,17 +229,206 @@ def jsonl_append(path: Path, line: str) -> None:
         path: Path to the JSONL file (created if it does not exist).
         line: A single JSONL record ending with a newline character.
     """
-    # Defensive: ensure file ends with newline before appending
-    needs_separator = False
-    if path.exists() and path.stat().st_size > 0:
-        with open(path, "rb") as fh:
-            fh.seek(-1, 2)
-            needs_separator = fh.read(1) != b"\n"
-
-    with open(path, "a", encoding="utf-8") as fh:
-        if needs_separator:
-            fh.write("\n")
-        fh.write(line)
-        fh.flush()
-        os.fsync(fh.fileno())
-    _fsync_directory(path.parent)
+    jsonl_append_many(path, [line])
+
+
+def jsonl_append_many(path: Path, lines: Iterable[str], *, sync: bool = True) -> bool:
+    """Append several JSONL records with a single ``os.write`` and one fsync.
+
+    Same contract as :func:`jsonl_append` (caller holds the lock, every line
+    ends with ``\\n``, a missing trailing newline is repaired first). The
+    parent directory is only fsynced when this call created the file — an
+    append to an existing file does not change its directory entry.
+
+    With ``sync=False`` nothing is fsynced; the caller must make the data
+    durable itself, e.g. via :func:`sync_paths` once its locks are released.
+    With ``sync=True`` the project's durability level applies, as for
+    :func:`atomic_write`.
+
+    Returns True if the file was created by this call.
+    """
+    data = "".join(lines).encode("utf-8")
+    if not data:
+        return False
+
+    level = durability_for(path) if sync else DURABILITY_RELAXED
+    flags = os.O_RDWR | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(path, flags | os.O_EXCL, 0o666)
+        created = True
+    except FileExistsError:
+        fd = os.open(path, flags, 0o666)
+        created = False
+    try:
+        # Defensive: ensure file ends with newline before appending
+        size = os.fstat(fd).st_size
+        if size > 0 and os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data
+        _write_all(fd, data)
+        if level == DURABILITY_STRICT:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    if level == DURABILITY_STRICT and created:
+        _fsync_directory(path.parent)
+    elif level == DURABILITY_BATCHED:
+        _deferred_sync.add([path], [path.parent] if created else [])
+    return created
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    # os.write() can short-write; loop until all bytes are flushed.
+    mv = memoryview(data)
+    while mv:
+        written = os.write(fd, mv)
+        mv = mv[written:]
+
+
+def sync_paths(files: Iterable[Path], dirs: Iterable[Path] = ()) -> None:
+    """Make *files* (and directory entries in *dirs*) durable, each path once.
+
+    For writers that appended with ``sync=False`` while holding their locks.
+    Under ``batched`` durability the paths are handed to the deferred
+    flusher; under ``relaxed`` nothing is done. Files that have been moved
+    away since the write (e.g. archived) are skipped — the mover is
+    responsible for their durability.
+    """
+    files, dirs = list(dict.fromkeys(files)), list(dict.fromkeys(dirs))
+    if not files and not dirs:
+        return
+    level = durability_for((files or dirs)[0])
+    if level == DURABILITY_BATCHED:
+        _deferred_sync.add(files, dirs)
+        return
+    if level != DURABILITY_STRICT:
+        return
+    for path in files:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    for directory in dirs:
+        _fsync_directory(directory)
+
+
+# ---------------------------------------------------------------------------
+# Durability levels
+# ---------------------------------------------------------------------------
+
+# lattice dir -> (config.json mtime_ns, configured level)
+_config_durability: dict[str, tuple[int, str | None]] = {}
+
+
+def _normalize_durability(value: object) -> str | None:
+    if isinstance(value, str) and value.strip().lower() in DURABILITY_LEVELS:
+        return value.strip().lower()
+    return None
+
+
+def _enclosing_lattice_dir(path: Path) -> Path | None:
+    for candidate in (path, *path.parents):
+        if candidate.name == LATTICE_DIR:
+            return candidate
+    return None
+
+
+def durability_for(path: Path) -> str:
+    """Return the durability level that applies to writes of *path*.
+
+    ``LATTICE_DURABILITY`` wins; otherwise the ``durability`` key of the
+    enclosing ``.lattice/config.json`` is used. Anything unset or unknown
+    means ``strict``:
+
+    - ``strict``  — fsync every file write and directory change (default)
+    - ``batched`` — queue fsyncs and flush them every
+      :data:`BATCHED_SYNC_INTERVAL` seconds and at process exit
+    - ``relaxed`` — never fsync; for throwaway workspaces such as CI runs
+    """
+    env_level = _normalize_durability(os.environ.get(DURABILITY_ENV))
+    if env_level is not None:
+        return env_level
+
+    lattice_dir = _enclosing_lattice_dir(path)
+    if lattice_dir is None:
+        return DURABILITY_STRICT
+    config_path = lattice_dir / "config.json"
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return DURABILITY_STRICT
+
+    key = str(lattice_dir)
+    cached = _config_durability.get(key)
+    if cached is None or cached[0] != mtime_ns:
+        try:
+            configured = json.loads(config_path.read_text()).get("durability")
+        except (OSError, ValueError, AttributeError):
+            configured = None
+        cached = (mtime_ns, _normalize_durability(configured))
+        _config_durability[key] = cached
+    return cached[1] or DURABILITY_STRICT
+
+
+class _DeferredSync:
+    """Background flusher for ``batched`` durability.
+
+    Paths are queued as they are written; a daemon timer fsyncs the queue
+    (each path once) :data:`BATCHED_SYNC_INTERVAL` seconds after the first
+    queued write, and an ``atexit`` hook flushes whatever is left.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: set[tuple[str, bool]] = set()
+        self._timer: threading.Timer | None = None
+        self._registered = False
+
+    def add(self, files: Iterable[Path], dirs: Iterable[Path] = ()) -> None:
+        with self._lock:
+            self._pending.update((str(p), False) for p in files)
+            self._pending.update((str(p), True) for p in dirs)
+            if not self._registered:
+                atexit.register(self.flush)
+                self._registered = True
+            if self._timer is None and self._pending:
+                self._timer = threading.Timer(BATCHED_SYNC_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Fsync every queued path now. Errors are ignored (best effort)."""
+        with self._lock:
+            todo, self._pending = self._pending, set()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for path, is_dir in sorted(todo):
+            if is_dir:
+                _fsync_directory(Path(path))
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+
+_deferred_sync = _DeferredSync()
+
+
+def flush_deferred_syncs() -> None:
+    """Flush writes queued by ``batched`` durability immediately."""
+    _deferred_sync.flush()
@@ -3,14 +3,22 @@
 from __future__ import annotations
 
 import contextlib
+import shutil
 from collections.abc import Generator
 from pathlib import Path
 
 from lattice.core.events import LIFECYCLE_EVENT_TYPES, serialize_event
 from lattice.core.tasks import serialize_snapshot
-from lattice.storage.fs import atomic_write, jsonl_append
+from lattice.storage.changefeed import append_changes, changefeed_path, snapshot_dirs_key
+from lattice.storage.fs import (
+    atomic_write,
+    jsonl_append,
+    jsonl_append_many,
+    sync_paths,
+)
 from lattice.storage.hooks import execute_hooks
 from lattice.storage.locks import lattice_lock, multi_lock
+from lattice.storage.short_ids import release_short_ids, reserve_short_ids
 
 
 def scaffold_plan(
@@ -82,17 +90,26 @@ def write_task_event(
     events: list[dict],
     snapshot: dict,
     config: dict | None = None,
+    *,
+    _caller_holds_lock: bool = False,
 ) -> None:
     """Write event(s) and snapshot atomically with proper locking.
 
     This is the canonical write path for all task mutations. Both the CLI
     and dashboard route through this function.
 
+    Args:
+        _caller_holds_lock: If True, skip acquiring the task locks (caller
+            already holds ``events_<id>``, ``tasks_<id>`` and, for lifecycle
+            events, ``events__lifecycle`` via ``multi_lock``).
+
     Steps:
-    1. Acquire locks in sorted order
-    2. Append events to per-task JSONL
-    3. Append lifecycle events to _lifecycle.jsonl
-    4. Atomic-write snapshot
+    1. Acquire locks in sorted order (unless caller holds them)
+    2. Append all events to per-task JSONL (one write, one fsync)
+    3. Append lifecycle events to _lifecycle.jsonl (one write, one fsync)
+    4. Atomic-write snapshot, then append all events to the global
+       changefeed with sequence numbers (feed readers such as the snapshot
+       index rely on the snapshot being in place before its record)
     5. Release locks
     6. Fire hooks (after locks released, data is durable)
     """
@@ -101,34 +118,300 @@ def write_task_event(
     # Determine which events go to lifecycle log
     lifecycle_events = [e for e in events if e["type"] in LIFECYCLE_EVENT_TYPES]
 
-    # Build lock keys
-    lock_keys = [f"events_{task_id}", f"tasks_{task_id}"]
-    if lifecycle_events:
-        lock_keys.append("events__lifecycle")
-    lock_keys.sort()
-
-    with multi_lock(locks_dir, lock_keys):
+    def _do_writes() -> None:
         # Event-first: append to per-task log
         event_path = lattice_dir / "events" / f"{task_id}.jsonl"
-        for event in events:
-            jsonl_append(event_path, serialize_event(event))
+        jsonl_append_many(event_path, [serialize_event(e) for e in events])
 
         # Lifecycle events go to lifecycle log
         if lifecycle_events:
             lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
-            for event in lifecycle_events:
-                jsonl_append(lifecycle_path, serialize_event(event))
+            jsonl_append_many(lifecycle_path, [serialize_event(e) for e in lifecycle_events])
 
         # Then materialize snapshot
         snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
+        before = snapshot_dirs_key(lattice_dir)
         atomic_write(snapshot_path, serialize_snapshot(snapshot))
 
+        # Global changefeed (sequence numbers assigned under its own lock)
+        append_changes(lattice_dir, events, dirs=(before, snapshot_dirs_key(lattice_dir)))
+
+    if _caller_holds_lock:
+        _do_writes()
+    else:
+        # Build lock keys
+        lock_keys = [f"events_{task_id}", f"tasks_{task_id}"]
+        if lifecycle_events:
+            lock_keys.append("events__lifecycle")
+        lock_keys.sort()
+
+        with multi_lock(locks_dir, lock_keys):
+            _do_writes()
+
     # Fire hooks after locks are released (data is durable)
     if config:
         for event in events:
             execute_hooks(config, lattice_dir, task_id, event)
 
 
+def write_new_tasks(
+    lattice_dir: Path,
+    tasks: list[tuple[str, list[dict], dict]],
+    config: dict | None = None,
+    *,
+    short_id_prefix: str | None = None,
+) -> list[str | None]:
+    """Write many new tasks at once: bulk form of :func:`write_task_event` for creates.
+
+    *tasks* holds ``(task_id, events, snapshot)`` per task, where ``events``
+    starts with its ``task_created`` event. With *short_id_prefix*, a short
+    ID is reserved for every task and written in copies of its
+    ``task_created`` event and snapshot; the caller's dicts get it too once
+    every write has succeeded, and are left untouched if one fails. Plans
+    are left to the caller (:func:`scaffold_plan`).
+
+    Returns the short IDs in the order of *tasks* (``None`` without a prefix).
+
+    Steps:
+    1. Acquire the lifecycle lock, which every task creation takes, so no
+       other create can race this one
+    2. Refuse (``FileExistsError``) if any task ID is repeated or already on disk
+    3. Reserve the short IDs. If a later step fails, the files written so
+       far are removed, _lifecycle.jsonl is cut back and the short IDs are
+       released again
+    4. Append each task's events to its new JSONL, then all lifecycle events
+       to _lifecycle.jsonl in one write
+    5. Write every snapshot (contents synced before the rename unless relaxed),
+       then append all events to the changefeed in one append, which
+       :func:`append_changes` undoes itself if it fails
+    6. Release the lock, then make everything durable in a single sync pass
+       (the durability level applies, as for ``write_task_event``)
+    7. Fire hooks
+
+    Per-task locks are not taken: no other writer can touch a task before
+    its snapshot exists, and each snapshot is written exactly once.
+    """
+    if not tasks:
+        return []
+    events_dir = lattice_dir / "events"
+    tasks_dir = lattice_dir / "tasks"
+    dirty_files: list[Path] = []
+    dirty_dirs: set[Path] = set()
+    short_ids: list[str | None] = [None] * len(tasks)
+
+    with lattice_lock(lattice_dir / "locks", "events__lifecycle"):
+        seen: set[str] = set()
+        for task_id, _events, _snapshot in tasks:
+            if (
+                task_id in seen
+                or (tasks_dir / f"{task_id}.json").exists()
+                or (events_dir / f"{task_id}.jsonl").exists()
+                or (lattice_dir / "archive" / "tasks" / f"{task_id}.json").exists()
+            ):
+                raise FileExistsError(f"Task {task_id} already exists")
+            seen.add(task_id)
+
+        reserved: list[str] = []
+        if short_id_prefix:
+            reserved = reserve_short_ids(lattice_dir, short_id_prefix, [t[0] for t in tasks])
+            short_ids = list(reserved)
+        lifecycle_path = events_dir / "_lifecycle.jsonl"
+        try:
+            lifecycle_size: int | None = lifecycle_path.stat().st_size
+        except FileNotFoundError:
+            lifecycle_size = None
+        to_write = list(tasks)
+        for i, short_id in enumerate(reserved):
+            task_id, events, snapshot = tasks[i]
+            created = {**events[0], "data": {**events[0]["data"], "short_id": short_id}}
+            to_write[i] = (task_id, [created, *events[1:]], {**snapshot, "short_id": short_id})
+        written: list[Path] = []
+        try:
+            all_events: list[dict] = []
+            for task_id, events, _snapshot in to_write:
+                path = events_dir / f"{task_id}.jsonl"
+                written.append(path)
+                jsonl_append_many(path, [serialize_event(e) for e in events], sync=False)
+                dirty_files.append(path)
+                all_events.extend(events)
+            dirty_dirs.add(events_dir)
+
+            lifecycle_events = [e for e in all_events if e["type"] in LIFECYCLE_EVENT_TYPES]
+            if jsonl_append_many(
+                lifecycle_path, [serialize_event(e) for e in lifecycle_events], sync=False
+            ):
+                dirty_dirs.add(events_dir)
+            dirty_files.append(lifecycle_path)
+
+            before = snapshot_dirs_key(lattice_dir)
+            for task_id, _events, snapshot in to_write:
+                path = tasks_dir / f"{task_id}.json"
+                written.append(path)
+                atomic_write(path, serialize_snapshot(snapshot), sync_dir=False)
+            dirty_dirs.add(tasks_dir)
+
+            dirs = (before, snapshot_dirs_key(lattice_dir))
+            feed_created = append_changes(lattice_dir, all_events, sync=False, dirs=dirs)
+        except BaseException:
+            # Undo what reached disk so no task keeps a short ID that is
+            # handed out again. The task IDs were checked to be new, so
+            # every file here was created by this call.
+            for path in written:
+                path.unlink(missing_ok=True)
+            if lifecycle_size is None:
+                lifecycle_path.unlink(missing_ok=True)
+            else:
+                with open(lifecycle_path, "r+b") as f:
+                    f.truncate(lifecycle_size)
+            if short_id_prefix:
+                release_short_ids(lattice_dir, short_id_prefix, reserved)
+            raise
+        if feed_created:
+            dirty_dirs.add(lattice_dir)
+        dirty_files.append(changefeed_path(lattice_dir))
+
+    for (_task_id, events, snapshot), short_id in zip(tasks, reserved, strict=False):
+        events[0]["data"]["short_id"] = short_id
+        snapshot["short_id"] = short_id
+    sync_paths(dirty_files, sorted(dirty_dirs))
+
+    if config:
+        for task_id, events, _snapshot in tasks:
+            for event in events:
+                execute_hooks(config, lattice_dir, task_id, event)
+    return short_ids
+
+
+def _archive_lock_keys(task_id: str) -> list[str]:
+    return sorted([f"events_{task_id}", f"tasks_{task_id}", "events__lifecycle"])
+
+
+def write_task_archive(
+    lattice_dir: Path,
+    task_id: str,
+    event: dict,
+    snapshot: dict,
+    config: dict | None = None,
+    *,
+    _caller_holds_lock: bool = False,
+) -> None:
+    """Append a ``task_archived`` event and move the task into ``archive/``.
+
+    Canonical archive path shared by the CLI, MCP server and dashboard.
+    *snapshot* is the post-event snapshot.
+
+    Steps:
+    1. Acquire locks (unless caller holds them)
+    2. Append event to per-task JSONL and _lifecycle.jsonl
+    3. Write archived snapshot, remove the active one, then append the
+       event to the changefeed
+    4. Move event log, notes and plan into ``archive/``
+    5. Release locks, then fire hooks
+    """
+
+    def _do_writes() -> None:
+        event_path = lattice_dir / "events" / f"{task_id}.jsonl"
+        jsonl_append(event_path, serialize_event(event))
+
+        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
+        jsonl_append(lifecycle_path, serialize_event(event))
+
+        before = snapshot_dirs_key(lattice_dir)
+        atomic_write(
+            lattice_dir / "archive" / "tasks" / f"{task_id}.json", serialize_snapshot(snapshot)
+        )
+
+        snapshot_path = lattice_dir / "tasks" / f"{task_id}.json"
+        if snapshot_path.exists():
+            snapshot_path.unlink()
+        append_changes(lattice_dir, [event], dirs=(before, snapshot_dirs_key(lattice_dir)))
+
+        if event_path.exists():
+            shutil.move(
+                str(event_path),
+                str(lattice_dir / "archive" / "events" / f"{task_id}.jsonl"),
+            )
+
+        notes_path = lattice_dir / "notes" / f"{task_id}.md"
+        if notes_path.exists():
+            shutil.move(
+                str(notes_path),
+                str(lattice_dir / "archive" / "notes" / f"{task_id}.md"),
+            )
+
+        plans_path = lattice_dir / "plans" / f"{task_id}.md"
+        if plans_path.exists():
+            archive_plans_dir = lattice_dir / "archive" / "plans"
+            archive_plans_dir.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(plans_path), str(archive_plans_dir / f"{task_id}.md"))
+
+    if _caller_holds_lock:
+        _do_writes()
+    else:
+        with multi_lock(lattice_dir / "locks", _archive_lock_keys(task_id)):
+            _do_writes()
+
+    if config:
+        execute_hooks(config, lattice_dir, task_id, event)
+
+
+def write_task_unarchive(
+    lattice_dir: Path,
+    task_id: str,
+    event: dict,
+    snapshot: dict,
+    config: dict | None = None,
+    *,
+    _caller_holds_lock: bool = False,
+) -> None:
+    """Append a ``task_unarchived`` event and move the task back out of ``archive/``.
+
+    Mirror of :func:`write_task_archive`. *snapshot* is the post-event snapshot.
+    """
+
+    def _do_writes() -> None:
+        archive_event_path = lattice_dir / "archive" / "events" / f"{task_id}.jsonl"
+        jsonl_append(archive_event_path, serialize_event(event))
+
+        lifecycle_path = lattice_dir / "events" / "_lifecycle.jsonl"
+        jsonl_append(lifecycle_path, serialize_event(event))
+
+        shutil.move(
+            str(archive_event_path),
+            str(lattice_dir / "events" / f"{task_id}.jsonl"),
+        )
+
+        before = snapshot_dirs_key(lattice_dir)
+        atomic_write(lattice_dir / "tasks" / f"{task_id}.json", serialize_snapshot(snapshot))
+
+        archive_snapshot_path = lattice_dir / "archive" / "tasks" / f"{task_id}.json"
+        if archive_snapshot_path.exists():
+            archive_snapshot_path.unlink()
+        append_changes(lattice_dir, [event], dirs=(before, snapshot_dirs_key(lattice_dir)))
+
+        archive_notes_path = lattice_dir / "archive" / "notes" / f"{task_id}.md"
+        if archive_notes_path.exists():
+            shutil.move(
+                str(archive_notes_path),
+                str(lattice_dir / "notes" / f"{task_id}.md"),
+            )
+
+        archive_plans_path = lattice_dir / "archive" / "plans" / f"{task_id}.md"
+        if archive_plans_path.exists():
+            plans_dir = lattice_dir / "plans"
+            plans_dir.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(archive_plans_path), str(plans_dir / f"{task_id}.md"))
+
+    if _caller_holds_lock:
+        _do_writes()
+    else:
+        with multi_lock(lattice_dir / "locks", _archive_lock_keys(task_id)):
+            _do_writes()
+
+    if config:
+        execute_hooks(config, lattice_dir, task_id, event)
+
+
 @contextlib.contextmanager
 def resource_write_context(
     lattice_dir: Path,
@@ -169,7 +452,8 @@ def write_resource_event(
     Steps:
     1. Ensure resource directory exists
     2. Acquire locks in sorted order (unless caller holds resource lock)
-    3. Append events to per-resource JSONL (in events/ dir, keyed by resource_id)
+    3. Append events to per-resource JSONL (in events/ dir, keyed by resource_id),
+       then to the global changefeed
     4. Atomic-write resource snapshot
     5. Release locks
     6. Fire hooks (after locks released, data is durable)
@@ -185,8 +469,8 @@ def write_resource_event(
     def _do_writes() -> None:
         # Event-first: append to per-resource event log
         event_path = lattice_dir / "events" / f"{resource_id}.jsonl"
-        for event in events:
-            jsonl_append(event_path, serialize_event(event))
+        jsonl_append_many(event_path, [serialize_event(e) for e in events])
+        append_changes(lattice_dir, events)
 
         # Then materialize snapshot
         snapshot_path = resource_dir / "resource.json"
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
+from lattice.storage.event_log import EventLog
+
 
 def read_task_events(lattice_dir: Path, task_id: str, *, is_archived: bool = False) -> list[dict]:
     """Read all events for a task from its JSONL log.
@@ -16,16 +17,4 @@ def read_task_events(lattice_dir: Path, task_id: str, *, is_archived: bool = Fal
     else:
         event_path = lattice_dir / "events" / f"{task_id}.jsonl"
 
-    events: list[dict] = []
-    if event_path.exists():
-        try:
-            for line in event_path.read_text().splitlines():
-                line = line.strip()
-                if line:
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-        except OSError:
-            pass
-    return events
+    return list(EventLog(event_path).iter_events())
@@ -0,0 +1,525 @@
+"""Full-text search index: a derived SQLite FTS5 cache over events, notes and plans."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Self
+
+from lattice.core.events import get_actor_display
+from lattice.storage.changefeed import last_seq, read_since
+from lattice.storage.event_log import EventLog
+from lattice.storage.sqlite_index import INDEX_DIR, connect_index, stable_mtime
+
+SEARCH_DB = "search.db"
+
+# Bump when the table layout or document mapping changes.
+SCHEMA_VERSION = 1
+
+# Changefeed records applied per transaction while catching up.
+_FEED_BATCH = 5000
+
+# Document kinds searched when the caller does not ask for specific ones.
+# "event" documents (the string values of every event's data) back the
+# dashboard's activity search.
+DOCUMENT_KINDS = ("task", "comment", "note", "plan", "event")
+DEFAULT_KINDS = ("task", "comment", "note", "plan")
+
+# Markdown directories indexed as documents: (directory, kind).
+_MARKDOWN_DIRS = (
+    ("notes", "note"),
+    ("plans", "plan"),
+    ("archive/notes", "note"),
+    ("archive/plans", "plan"),
+)
+
+# Word tokens (case and diacritics folded), with prefix indexes so partial
+# words are cheap to match.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    task_id TEXT,
+    ts TEXT,
+    actor TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_task ON docs (task_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_text USING fts5(
+    title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    short_id TEXT,
+    title TEXT,
+    archived INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# bm25 column weights: a hit in a title outranks the same hit in a body.
+_TITLE_WEIGHT = 4.0
+_BODY_WEIGHT = 1.0
+
+
+def search_index_path(lattice_dir: Path) -> Path:
+    """Return the path of the search index database."""
+    return lattice_dir / INDEX_DIR / SEARCH_DB
+
+
+class SearchIndex:
+    """Ranked full-text search backed by ``.lattice/index/search.db``.
+
+    Documents are task titles and descriptions, comment bodies, notes,
+    plans and the string values of every event's data. Event-derived
+    documents are kept current from the changefeed: each read applies only
+    the records after the last sequence number it indexed, so the cost of
+    catching up is proportional to the writes since the previous search.
+    Notes and plans are edited in place, so those directories are compared
+    by (mtime, size) like the snapshot index. The first use scans every
+    event log once.
+
+    If the index cannot be opened on disk, it is built in memory instead.
+
+    Usage::
+
+        with SearchIndex(lattice_dir) as index:
+            hits = index.search("login timeout")
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        self._pending: dict[str, dict | None] = {}
+        try:
+            self._conn = connect_index(search_index_path(lattice_dir), _SCHEMA, SCHEMA_VERSION)
+        except (sqlite3.Error, OSError):
+            self._use_memory()
+
+    def _use_memory(self) -> None:
+        self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """Bring the index up to date. Returns the number of sources applied.
+
+        A source is a changefeed record, an event during the initial scan,
+        or a changed markdown file. Nothing is locked unless there is
+        something to apply: the feed position is checked with a plain read
+        first, so concurrent searches over an up-to-date index don't contend.
+        """
+        applied = 0
+        feed_end = last_seq(self.lattice_dir)
+        if self._state("feed_seq") == feed_end:
+            return self._refresh_markdown()
+        while True:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                seq = self._state("feed_seq")
+                if seq is None or seq > feed_end:
+                    # First use, or the feed was reset: index every log.
+                    applied += self._scan_logs(feed_end)
+                    continue
+                records = read_since(self.lattice_dir, seq, limit=_FEED_BATCH)
+                for record in records:
+                    self._apply_event(record)
+                self._flush()
+                if records:
+                    self._set_state("feed_seq", records[-1]["seq"])
+                applied += len(records)
+            if len(records) < _FEED_BATCH:
+                break
+        return applied + self._refresh_markdown()
+
+    def rebuild(self) -> int:
+        """Drop every document and index all sources again."""
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for table in ("docs", "docs_text", "tasks", "files", "state"):
+                self._conn.execute(f"DELETE FROM {table}")
+        return self.refresh()
+
+    def _scan_logs(self, feed_end: int) -> int:
+        for table in ("docs", "docs_text", "tasks", "state"):
+            self._conn.execute(f"DELETE FROM {table}")
+        count = 0
+        for sub in ("events", "archive/events"):
+            try:
+                names = sorted(os.listdir(self.lattice_dir / sub))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for name in names:
+                # _lifecycle.jsonl repeats events already in the per-task logs
+                if not name.endswith(".jsonl") or name.startswith("_"):
+                    continue
+                for event in EventLog(self.lattice_dir / sub / name).iter_events():
+                    self._apply_event(event)
+                    count += 1
+                self._flush()
+        # Records appended while scanning are replayed from the feed; every
+        # document write is an upsert, so replaying is harmless.
+        self._set_state("feed_seq", feed_end)
+        return count
+
+    def _refresh_markdown(self) -> int:
+        indexed = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self._conn.execute(
+                "SELECT path, mtime_ns, size FROM files"
+            )
+        }
+        changed: list[tuple[str, str, int, int]] = []
+        seen: set[str] = set()
+        for sub, kind in _MARKDOWN_DIRS:
+            try:
+                entries = list(os.scandir(self.lattice_dir / sub))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                if not entry.name.endswith(".md") or entry.name.startswith("."):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                rel = f"{sub}/{entry.name}"
+                seen.add(rel)
+                if indexed.get(rel) != (st.st_mtime_ns, st.st_size):
+                    changed.append((rel, kind, stable_mtime(st), st.st_size))
+
+        removed = [rel for rel in indexed if rel not in seen]
+        if not changed and not removed:
+            return 0
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Removals first: a file moved into archive/ keeps its document key
+            for rel in removed:
+                self._conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                self._delete_doc(_markdown_key(rel))
+            for rel, kind, mtime_ns, size in changed:
+                try:
+                    text = (self.lattice_dir / rel).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    text = ""
+                task_id = rel.rsplit("/", 1)[1][: -len(".md")]
+                heading, _, rest = text.strip().partition("\n")
+                if kind == "plan" and self._is_scaffold(task_id, heading, rest):
+                    # The untouched scaffold only repeats the title and description
+                    self._delete_doc(_markdown_key(rel))
+                else:
+                    title = heading.lstrip("# ").strip()
+                    self._put_doc(_markdown_key(rel), kind, task_id, None, None, title, text)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                    (rel, mtime_ns, size),
+                )
+            self._flush()
+        return len(changed) + len(removed)
+
+    def _is_scaffold(self, task_id: str, heading: str, rest: str) -> bool:
+        if not heading.startswith("# "):
+            return False
+        body = rest.strip()
+        if not body:
+            return True
+        task = self._pending.get(f"task:{task_id}") or self._load_doc(f"task:{task_id}")
+        return task is not None and body == (task["body"] or "").strip()
+
+    def _apply_event(self, event: dict) -> None:
+        event_id, task_id = event.get("id"), event.get("task_id")
+        if not isinstance(event_id, str) or not isinstance(task_id, str):
+            return
+        etype = event.get("type") or ""
+        raw_data = event.get("data")
+        data: dict = raw_data if isinstance(raw_data, dict) else {}
+        ts = event.get("ts")
+        actor = get_actor_display(event["actor"]) if event.get("actor") else ""
+
+        # Every event is searchable by its data values, type and actor. A
+        # comment's event shares its document with the comment itself.
+        title = f"{etype} {actor}"
+        if etype != "comment_added":
+            body = "\n".join(v for v in data.values() if isinstance(v, str))
+            self._put_doc(f"event:{event_id}", "event", task_id, ts, actor, title, body)
+
+        if etype == "task_created":
+            task_title, description = _text(data.get("title")), _text(data.get("description"))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, short_id, title, archived) "
+                "VALUES (?, ?, ?, 0)",
+                (task_id, _text(data.get("short_id")), task_title),
+            )
+            self._put_doc(f"task:{task_id}", "task", task_id, ts, actor, task_title, description)
+        elif etype == "field_updated" and data.get("field") in ("title", "description"):
+            value = _text(data.get("to"))
+            if data["field"] == "title":
+                self._conn.execute(
+                    "UPDATE tasks SET title = ? WHERE task_id = ?", (value, task_id)
+                )
+                self._update_doc(f"task:{task_id}", title=value)
+            else:
+                self._update_doc(f"task:{task_id}", body=value)
+        elif etype == "task_short_id_assigned":
+            self._conn.execute(
+                "UPDATE tasks SET short_id = ? WHERE task_id = ?",
+                (_text(data.get("short_id")), task_id),
+            )
+        elif etype in ("task_archived", "task_unarchived"):
+            self._conn.execute(
+                "UPDATE tasks SET archived = ? WHERE task_id = ?",
+                (int(etype == "task_archived"), task_id),
+            )
+        elif etype == "comment_added":
+            self._put_doc(
+                f"comment:{event_id}",
+                "comment",
+                task_id,
+                ts,
+                actor,
+                title,
+                _text(data.get("body")),
+            )
+        elif etype == "comment_edited":
+            self._update_doc(f"comment:{data.get('comment_id')}", body=_text(data.get("body")))
+        elif etype == "comment_deleted":
+            # Still part of the activity feed, no longer a comment
+            self._update_doc(f"comment:{data.get('comment_id')}", kind="event")
+
+    # Document writes are buffered per key and applied by _flush(): an FTS5
+    # row costs a delete and an insert to change, so a task edited fifty
+    # times in one batch is written once.
+
+    def _put_doc(
+        self,
+        key: str,
+        kind: str,
+        task_id: str | None,
+        ts: str | None,
+        actor: str | None,
+        title: str | None,
+        body: str | None,
+    ) -> None:
+        self._pending[key] = {
+            "kind": kind,
+            "task_id": task_id,
+            "ts": ts,
+            "actor": actor,
+            "title": title,
+            "body": body,
+        }
+
+    def _update_doc(self, key: str, **fields: str | None) -> None:
+        if key not in self._pending:
+            self._pending[key] = self._load_doc(key)
+        doc = self._pending[key]
+        if doc is not None:
+            doc.update(fields)
+
+    def _delete_doc(self, key: str) -> None:
+        self._pending[key] = None
+
+    def _load_doc(self, key: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT id, kind, task_id, ts, actor FROM docs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        # Separate lookup: joining would let SQLite scan the FTS table
+        title, body = self._conn.execute(
+            "SELECT title, body FROM docs_text WHERE rowid = ?", (row[0],)
+        ).fetchone()
+        kind, task_id, ts, actor = row[1:]
+        return {
+            "kind": kind,
+            "task_id": task_id,
+            "ts": ts,
+            "actor": actor,
+            "title": title,
+            "body": body,
+        }
+
+    def _flush(self) -> None:
+        for key, doc in self._pending.items():
+            row = self._conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                doc_id = row[0]
+                self._conn.execute("DELETE FROM docs_text WHERE rowid = ?", (doc_id,))
+                if doc is None:
+                    self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+                    continue
+                self._conn.execute(
+                    "UPDATE docs SET kind = ?, task_id = ?, ts = ?, actor = ? WHERE id = ?",
+                    (doc["kind"], doc["task_id"], doc["ts"], doc["actor"], doc_id),
+                )
+            elif doc is None:
+                continue
+            else:
+                doc_id = self._conn.execute(
+                    "INSERT INTO docs (key, kind, task_id, ts, actor) VALUES (?, ?, ?, ?, ?)",
+                    (key, doc["kind"], doc["task_id"], doc["ts"], doc["actor"]),
+                ).lastrowid
+            self._conn.execute(
+                "INSERT INTO docs_text (rowid, title, body) VALUES (?, ?, ?)",
+                (doc_id, doc["title"] or "", doc["body"] or ""),
+            )
+        self._pending.clear()
+
+    def _state(self, name: str) -> int | None:
+        row = self._conn.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)", (name, value)
+        )
+
+    def _refresh_or_fallback(self) -> None:
+        try:
+            self.refresh()
+        except sqlite3.OperationalError:
+            # On-disk index is locked or read-only; serve from memory instead.
+            self._conn.close()
+            self._use_memory()
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        *,
+        kinds: tuple[str, ...] | list[str] = DEFAULT_KINDS,
+        task_id: str | None = None,
+        include_archived: bool = False,
+        limit: int | None = 20,
+    ) -> list[dict]:
+        """Return documents matching every term of *query*, best match first.
+
+        Terms are whitespace-separated and case-insensitive; each matches
+        words that start with it (``auth`` finds "authentication"), and a
+        term with punctuation matches its words as a phrase (``comment_added``).
+        Each hit has ``kind``, ``task_id``, ``short_id``, ``task_title``,
+        ``ref`` (the event or comment ID; the task ID for tasks, notes and
+        plans), ``ts``, ``actor``, ``archived``, ``score`` (higher is better)
+        and ``snippet`` (matches in ``[brackets]``).
+        """
+        expression = _match_expression(query)
+        if expression is None or not kinds:
+            return []
+        self._refresh_or_fallback()
+
+        clauses = ["docs_text MATCH ?", f"d.kind IN ({', '.join('?' * len(kinds))})"]
+        params: list[object] = [expression, *kinds]
+        if task_id is not None:
+            clauses.append("d.task_id = ?")
+            params.append(task_id)
+        if not include_archived:
+            clauses.append("COALESCE(k.archived, 0) = 0")
+
+        score = f"-bm25(docs_text, {_TITLE_WEIGHT}, {_BODY_WEIGHT})"
+        snippet = "snippet(docs_text, -1, '[', ']', '…', 12)"
+        sql = (
+            f"SELECT d.kind, d.task_id, k.short_id, k.title, d.key, d.ts, d.actor, "
+            f"COALESCE(k.archived, 0), {score} AS score, {snippet} "
+            "FROM docs_text JOIN docs d ON d.id = docs_text.rowid "
+            "LEFT JOIN tasks k ON k.task_id = d.task_id "
+            f"WHERE {' AND '.join(clauses)} ORDER BY score DESC, d.ts DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {
+                "kind": kind,
+                "task_id": doc_task_id,
+                "short_id": short_id,
+                "task_title": task_title,
+                "ref": key.split(":", 1)[1],
+                "ts": ts,
+                "actor": actor,
+                "archived": bool(archived),
+                "score": score_value,
+                "snippet": snippet_text,
+            }
+            for (
+                kind,
+                doc_task_id,
+                short_id,
+                task_title,
+                key,
+                ts,
+                actor,
+                archived,
+                score_value,
+                snippet_text,
+            ) in self._conn.execute(sql, params)
+        ]
+
+    def matching_event_ids(self, query: str) -> set[str]:
+        """Return the IDs of events (active or archived) matching every term of *query*.
+
+        Comment documents are keyed by their ``comment_added`` event, so
+        they count as that event.
+        """
+        expression = _match_expression(query)
+        if expression is None:
+            return set()
+        self._refresh_or_fallback()
+        rows = self._conn.execute(
+            "SELECT d.key FROM docs_text JOIN docs d ON d.id = docs_text.rowid "
+            "WHERE docs_text MATCH ? AND d.kind IN ('event', 'comment')",
+            (expression,),
+        )
+        return {key.split(":", 1)[1] for (key,) in rows}
+
+
+def _match_expression(query: str) -> str | None:
+    """Return an FTS5 query requiring every term of *query* as a prefix, or None."""
+    terms = [t for t in query.split() if any(c.isalnum() for c in t)]
+    if not terms:
+        return None
+    return " AND ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+
+def _markdown_key(rel: str) -> str:
+    """Return the document key for a notes/plans path (stable across archiving)."""
+    sub, name = rel.rsplit("/", 1)
+    kind = "note" if sub.endswith("notes") else "plan"
+    return f"{kind}:{name[: -len('.md')]}"
+
+
+def _text(value: object) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def drop_search_index(lattice_dir: Path) -> None:
+    """Delete the search index; the next search rebuilds it from the event logs."""
+    path = search_index_path(lattice_dir)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(f"{path}{suffix}")
+        except FileNotFoundError:
+            pass
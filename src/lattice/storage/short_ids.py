@@ -116,7 +116,75 @@ def allocate_short_id(
     return short_id, index
 
 
+def reserve_short_ids(lattice_dir: Path, prefix: str, task_ulids: list[str]) -> list[str]:
+    """Allocate consecutive short IDs for *task_ulids* in one lock acquisition.
+
+    Bulk counterpart of :func:`allocate_short_id`: the range is reserved and
+    every mapping registered with a single load and save of ``ids.json``.
+    Returns the short IDs in the order of *task_ulids*.
+    """
+    if not task_ulids:
+        return []
+    locks_dir = lattice_dir / "locks"
+    with lattice_lock(locks_dir, "ids_json"):
+        index = load_id_index(lattice_dir)
+        next_seqs = index.get("next_seqs", {})
+        first = next_seqs.get(prefix, 1)
+        short_ids = [f"{prefix}-{seq}" for seq in range(first, first + len(task_ulids))]
+        next_seqs[prefix] = first + len(task_ulids)
+        index["next_seqs"] = next_seqs
+        index["map"].update(zip(short_ids, task_ulids, strict=True))
+        save_id_index(lattice_dir, index)
+    return short_ids
+
+
+def release_short_ids(lattice_dir: Path, prefix: str, short_ids: list[str]) -> None:
+    """Undo a :func:`reserve_short_ids` whose tasks were never written.
+
+    Drops the mappings and, if nothing was allocated for *prefix* since,
+    rewinds its counter so the range is handed out again.
+    """
+    if not short_ids:
+        return
+    locks_dir = lattice_dir / "locks"
+    with lattice_lock(locks_dir, "ids_json"):
+        index = load_id_index(lattice_dir)
+        for short_id in short_ids:
+            index["map"].pop(short_id, None)
+        next_seqs = index.get("next_seqs", {})
+        first = int(short_ids[0].rsplit("-", 1)[1])
+        if next_seqs.get(prefix) == first + len(short_ids):
+            next_seqs[prefix] = first
+        index["next_seqs"] = next_seqs
+        save_id_index(lattice_dir, index)
+
+
 def resolve_short_id(lattice_dir: Path, short_id: str) -> str | None:
     """Look up a short ID and return the corresponding ULID, or None."""
-    index = load_id_index(lattice_dir)
-    return index.get("map", {}).get(short_id.upper())
+    return load_id_map(lattice_dir).get(short_id.upper())
+
+
+# (ids.json path, (inode, mtime_ns, size), map) of the last parse.
+_id_map_cache: tuple[Path, tuple[int, int, int], dict[str, str]] | None = None
+
+
+def load_id_map(lattice_dir: Path) -> dict[str, str]:
+    """Return the short ID -> ULID map, reusing the last parse while ids.json is unchanged.
+
+    :func:`save_id_index` replaces the file atomically, so every save changes
+    the inode the cache is keyed on. A long-lived process (``lattice daemon``)
+    keeps the map warm across commands. Treat the result as read-only.
+    """
+    global _id_map_cache
+    ids_path = lattice_dir / "ids.json"
+    try:
+        st = ids_path.stat()
+    except OSError:
+        return {}
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _id_map_cache
+    if cached is not None and cached[0] == ids_path and cached[1] == key:
+        return cached[2]
+    id_map: dict[str, str] = load_id_index(lattice_dir).get("map", {})
+    _id_map_cache = (ids_path, key, id_map)
+    return id_map
@@ -0,0 +1,503 @@
+"""Persistent snapshot index: a derived SQLite cache over tasks/ and archive/tasks/."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Self
+
+from lattice.core.events import get_actor_display
+from lattice.storage.changefeed import last_record, read_since, snapshot_dirs_key
+from lattice.storage.sqlite_index import INDEX_DIR, RACY_WINDOW_NS, connect_index, stable_mtime
+
+SNAPSHOT_DB = "snapshots.db"
+
+# Bump when the table layout changes; a mismatch drops and rebuilds the index.
+SCHEMA_VERSION = 5
+
+# Feed records one refresh applies before a full sweep is cheaper.
+_FEED_CATCHUP_LIMIT = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    task_id TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    body TEXT,
+    short_id TEXT,
+    title TEXT,
+    status TEXT,
+    assignee TEXT,
+    type TEXT,
+    priority TEXT,
+    PRIMARY KEY (task_id, archived)
+);
+CREATE INDEX IF NOT EXISTS snapshots_status ON snapshots (archived, status);
+CREATE INDEX IF NOT EXISTS snapshots_assignee ON snapshots (archived, assignee);
+CREATE INDEX IF NOT EXISTS snapshots_type ON snapshots (archived, type);
+CREATE INDEX IF NOT EXISTS snapshots_priority ON snapshots (archived, priority);
+CREATE TABLE IF NOT EXISTS tags (
+    task_id TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, archived, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag, archived);
+CREATE TABLE IF NOT EXISTS relationships (
+    source_id TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    target_id TEXT NOT NULL,
+    type TEXT,
+    note TEXT,
+    PRIMARY KEY (source_id, archived, position)
+);
+CREATE INDEX IF NOT EXISTS relationships_target ON relationships (target_id);
+CREATE TABLE IF NOT EXISTS feed_position (
+    seq INTEGER NOT NULL,
+    event_id TEXT,
+    dirs TEXT
+);
+"""
+
+# Snapshot fields with an inverted index, keyed by the query() argument name.
+_INDEXED_FIELDS = {
+    "status": "status",
+    "assigned": "assignee",
+    "task_type": "type",
+    "priority": "priority",
+}
+
+
+def index_path(lattice_dir: Path) -> Path:
+    """Return the path of the snapshot index database."""
+    return lattice_dir / INDEX_DIR / SNAPSHOT_DB
+
+
+class SnapshotStore:
+    """Read-through index of task snapshots backed by ``.lattice/index/snapshots.db``.
+
+    The JSON files under ``tasks/`` and ``archive/tasks/`` remain the source of
+    truth. Writers never touch the index. Every task write is recorded in
+    the changefeed after its snapshot, so each read applies the feed records
+    since the last one and re-parses only those tasks' files, and only if
+    their (mtime, size) differ from the indexed row. Files that change
+    outside lattice (``git pull``, a copied-in task, an editor's save) show
+    up as a change to the directories' stat that no feed record accounts
+    for, which makes the next read sweep every file instead.
+
+    If the index cannot be opened on disk (read-only checkout, permissions),
+    the store falls back to an in-memory database populated on demand.
+
+    Usage::
+
+        with SnapshotStore(lattice_dir) as store:
+            active = store.load_all()
+    """
+
+    def __init__(self, lattice_dir: Path) -> None:
+        self.lattice_dir = lattice_dir
+        try:
+            self._conn = connect_index(index_path(lattice_dir), _SCHEMA, SCHEMA_VERSION)
+        except (sqlite3.Error, OSError):
+            self._use_memory()
+
+    def _use_memory(self) -> None:
+        self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _dir(self, archived: bool) -> Path:
+        if archived:
+            return self.lattice_dir / "archive" / "tasks"
+        return self.lattice_dir / "tasks"
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _write_row(
+        self,
+        task_id: str,
+        archived: bool,
+        mtime_ns: int,
+        size: int,
+        body: str | None,
+        snapshot: object,
+    ) -> None:
+        snap = snapshot if isinstance(snapshot, dict) else {}
+        assigned_to = snap.get("assigned_to")
+        self._delete_row(task_id, archived)
+        self._conn.execute(
+            "INSERT INTO snapshots (task_id, archived, mtime_ns, size, body, short_id, title, "
+            "status, assignee, type, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                task_id,
+                int(archived),
+                mtime_ns,
+                size,
+                body,
+                _text(snap.get("short_id")),
+                _text(snap.get("title")),
+                _text(snap.get("status")),
+                _text(get_actor_display(assigned_to)) if assigned_to else None,
+                _text(snap.get("type")),
+                _text(snap.get("priority")),
+            ),
+        )
+        tags = snap.get("tags")
+        if isinstance(tags, list):
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tags (task_id, archived, tag) VALUES (?, ?, ?)",
+                [(task_id, int(archived), tag) for tag in tags if isinstance(tag, str)],
+            )
+        # Reverse-edge index: one row per outgoing relationship, looked up by target
+        rels = snap.get("relationships_out")
+        if isinstance(rels, list):
+            self._conn.executemany(
+                "INSERT INTO relationships (source_id, archived, position, target_id, type, note) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        task_id,
+                        int(archived),
+                        position,
+                        rel["target_task_id"],
+                        _text(rel.get("type")),
+                        _text(rel.get("note")),
+                    )
+                    for position, rel in enumerate(rels)
+                    if isinstance(rel, dict) and isinstance(rel.get("target_task_id"), str)
+                ],
+            )
+
+    def _delete_row(self, task_id: str, archived: bool) -> None:
+        params = (task_id, int(archived))
+        self._conn.execute("DELETE FROM snapshots WHERE task_id = ? AND archived = ?", params)
+        self._conn.execute("DELETE FROM tags WHERE task_id = ? AND archived = ?", params)
+        self._conn.execute(
+            "DELETE FROM relationships WHERE source_id = ? AND archived = ?", params
+        )
+
+    def refresh(self) -> int:
+        """Catch the index up with the snapshot writes recorded in the changefeed.
+
+        Only the tasks named by feed records newer than the last sync are
+        stat-ed, so a read costs O(changes since the last read), not O(all
+        tasks); with no new records it is one row lookup, a tail read and a
+        stat of the two snapshot directories.
+
+        Each task write records the directories' stat key before and after
+        its snapshot change (see :func:`snapshot_dirs_key`). When the new
+        records chain from the key of the last sync to the current one,
+        every directory change is one of theirs. Otherwise something else
+        changed the directories, and this falls back to :meth:`sweep`, as it
+        does when the index has never been synced, the record it last
+        applied is gone (the feed was regenerated) or the backlog is long.
+        A file rewritten in place, keeping its directory entry, is only
+        seen by ``lattice doctor`` and ``lattice rebuild --index``.
+
+        Returns the number of snapshot files that had to be (re-)read.
+        """
+        feed_end = _position(last_record(self.lattice_dir))
+        dirs = snapshot_dirs_key(self.lattice_dir)
+        if self._synced() == (feed_end, dirs):
+            return 0
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Re-check under the write lock: another reader may have caught up.
+            state = self._synced()
+            if state is None:
+                return self._sweep(feed_end, dirs)
+            synced, synced_dirs = state
+            if synced == feed_end:
+                # No new writes, so the directories changed outside lattice.
+                return self._sweep(feed_end, dirs) if synced_dirs != dirs else 0
+            seq = synced[0]
+            records = read_since(self.lattice_dir, seq - 1, limit=_FEED_CATCHUP_LIMIT + 2)
+            if seq and (not records or _position(records[0]) != synced):
+                return self._sweep(feed_end, dirs)
+            records = records[1:] if seq else records
+            if len(records) > _FEED_CATCHUP_LIMIT or _follow_dirs(synced_dirs, records) != dirs:
+                return self._sweep(feed_end, dirs)
+            task_ids = {
+                record["task_id"]
+                for record in records
+                if isinstance(record.get("task_id"), str) and record["task_id"].startswith("task_")
+            }
+            changed = self._sync_tasks(task_ids)
+            if records and records[-1]["seq"] > feed_end[0]:
+                feed_end = _position(records[-1])
+            self._set_synced(feed_end, dirs)
+            return changed
+
+    def refresh_tasks(self, task_ids: list[str]) -> int:
+        """Re-check the snapshot files of *task_ids* (after a write that is not in the feed)."""
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            return self._sync_tasks(set(task_ids))
+
+    def sweep(self) -> int:
+        """Stat every snapshot file and re-read those that differ from their rows.
+
+        Picks up out-of-band edits as well as feed writes. Returns the number
+        of snapshot files that had to be (re-)read.
+        """
+        feed_end = _position(last_record(self.lattice_dir))
+        dirs = snapshot_dirs_key(self.lattice_dir)
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            return self._sweep(feed_end, dirs)
+
+    def rebuild(self) -> int:
+        """Drop every row and re-read all snapshot files. Returns the row count."""
+        feed_end = _position(last_record(self.lattice_dir))
+        dirs = snapshot_dirs_key(self.lattice_dir)
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM snapshots")
+            self._conn.execute("DELETE FROM tags")
+            self._conn.execute("DELETE FROM relationships")
+            self._sweep(feed_end, dirs)
+        count: int = self._conn.execute(
+            "SELECT COUNT(*) FROM snapshots WHERE body IS NOT NULL"
+        ).fetchone()[0]
+        return count
+
+    def _sweep(self, feed_end: tuple[int, str | None], dirs: str) -> int:
+        """Full stat sweep; the caller holds the write transaction.
+
+        *feed_end* and *dirs* are read before the sweep starts, so records
+        appended and files changed while it runs are picked up by the next
+        :meth:`refresh`. A directory modified within the racy window is not
+        trusted: no key is stored, so the next read sweeps again rather than
+        miss a change made in the same timestamp tick.
+        """
+        indexed = {
+            (task_id, bool(archived)): (mtime_ns, size)
+            for task_id, archived, mtime_ns, size in self._conn.execute(
+                "SELECT task_id, archived, mtime_ns, size FROM snapshots"
+            )
+        }
+        changed = 0
+        seen: set[tuple[str, bool]] = set()
+        for archived in (False, True):
+            try:
+                entries = list(os.scandir(self._dir(archived)))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".json") or name.startswith("."):
+                    continue
+                task_id = name[: -len(".json")]
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                key = (task_id, archived)
+                seen.add(key)
+                if indexed.get(key) != (st.st_mtime_ns, st.st_size):
+                    self._read_row(task_id, archived, Path(entry.path), st)
+                    changed += 1
+        for task_id, archived in indexed.keys() - seen:
+            self._delete_row(task_id, archived)
+        self._set_synced(feed_end, None if _racy(dirs) else dirs)
+        return changed
+
+    def _sync_tasks(self, task_ids: set[str]) -> int:
+        """Re-check both locations of each task; the caller holds the write transaction."""
+        indexed: dict[tuple[str, bool], tuple[int, int]] = {}
+        ordered = sorted(task_ids)
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for start in range(0, len(ordered), 500):
+            chunk = ordered[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for task_id, archived, mtime_ns, size in self._conn.execute(
+                "SELECT task_id, archived, mtime_ns, size FROM snapshots "
+                f"WHERE task_id IN ({placeholders})",
+                chunk,
+            ):
+                indexed[(task_id, bool(archived))] = (mtime_ns, size)
+        changed = 0
+        for task_id in ordered:
+            for archived in (False, True):
+                key = (task_id, archived)
+                path = self._dir(archived) / f"{task_id}.json"
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    if key in indexed:
+                        self._delete_row(task_id, archived)
+                    continue
+                if indexed.get(key) != (st.st_mtime_ns, st.st_size):
+                    self._read_row(task_id, archived, path, st)
+                    changed += 1
+        return changed
+
+    def _read_row(self, task_id: str, archived: bool, path: Path, st: os.stat_result) -> None:
+        body: str | None = None
+        snapshot: object = None
+        try:
+            text = path.read_text()
+            snapshot = json.loads(text)
+            body = text
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+            pass
+        self._write_row(task_id, archived, stable_mtime(st), st.st_size, body, snapshot)
+
+    def _synced(self) -> tuple[tuple[int, str | None], str | None] | None:
+        """Return the (seq, event ID) of the last feed record applied and the
+        directory key (see :func:`snapshot_dirs_key`) taken with it, if synced at all."""
+        row = self._conn.execute("SELECT seq, event_id, dirs FROM feed_position").fetchone()
+        return ((row[0], row[1]), row[2]) if row else None
+
+    def _set_synced(self, position: tuple[int, str | None], dirs: str | None) -> None:
+        self._conn.execute("DELETE FROM feed_position")
+        self._conn.execute(
+            "INSERT INTO feed_position (seq, event_id, dirs) VALUES (?, ?, ?)", (*position, dirs)
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _refresh_or_fallback(self) -> None:
+        try:
+            self.refresh()
+        except sqlite3.OperationalError:
+            # On-disk index is locked or read-only; serve from memory instead.
+            self._conn.close()
+            self._use_memory()
+            self.refresh()
+
+    def load_all(self, *, archived: bool = False) -> list[dict]:
+        """Return every readable snapshot in one directory, ordered by task ID."""
+        return self.query(archived=archived)
+
+    def query(
+        self,
+        *,
+        archived: bool = False,
+        status: str | None = None,
+        assigned: str | None = None,
+        tag: str | None = None,
+        task_type: str | None = None,
+        priority: str | None = None,
+    ) -> list[dict]:
+        """Return snapshots matching every given filter, ordered by task ID.
+
+        Filters are answered from the column and tag indexes, so only the
+        matching snapshot bodies are decoded. *assigned* matches the
+        assignee's display name (see ``get_actor_display``).
+        """
+        self._refresh_or_fallback()
+        clauses = ["s.archived = ?", "s.body IS NOT NULL"]
+        params: list[object] = [int(archived)]
+        filters = {
+            "status": status,
+            "assigned": assigned,
+            "task_type": task_type,
+            "priority": priority,
+        }
+        for name, value in filters.items():
+            if value is not None:
+                clauses.append(f"s.{_INDEXED_FIELDS[name]} = ?")
+                params.append(value)
+        if tag is not None:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM tags t WHERE t.task_id = s.task_id "
+                "AND t.archived = s.archived AND t.tag = ?)"
+            )
+            params.append(tag)
+        rows = self._conn.execute(
+            f"SELECT s.body FROM snapshots s WHERE {' AND '.join(clauses)} ORDER BY s.task_id",
+            params,
+        )
+        return [json.loads(body) for (body,) in rows]
+
+    def summaries(self, task_ids: list[str]) -> dict[str, dict]:
+        """Return ``{task_id: {"short_id", "title"}}`` for known tasks (active preferred)."""
+        self._refresh_or_fallback()
+        result: dict[str, dict] = {}
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for task_id, short_id, title in self._conn.execute(
+                "SELECT task_id, short_id, title FROM snapshots WHERE body IS NOT NULL "
+                f"AND task_id IN ({placeholders}) ORDER BY archived DESC",
+                chunk,
+            ):
+                result[task_id] = {"short_id": short_id, "title": title}
+        return result
+
+    def incoming(self, task_id: str) -> list[dict]:
+        """Return relationships from other tasks (active, then archived) that target *task_id*.
+
+        Each entry has ``source_task_id``, ``source_title``, ``type`` and ``note``.
+        """
+        self._refresh_or_fallback()
+        rows = self._conn.execute(
+            "SELECT r.source_id, s.title, r.type, r.note FROM relationships r "
+            "JOIN snapshots s ON s.task_id = r.source_id AND s.archived = r.archived "
+            "WHERE r.target_id = ? AND r.source_id != ? "
+            "ORDER BY r.archived, r.source_id, r.position",
+            (task_id, task_id),
+        )
+        return [
+            {"source_task_id": source_id, "source_title": title, "type": rel_type, "note": note}
+            for source_id, title, rel_type, note in rows
+        ]
+
+
+def _text(value: object) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _follow_dirs(start: str | None, records: list[dict]) -> str | None:
+    """Follow the writers' directory keys from *start* across *records*.
+
+    Returns the key after the last write, or None if a write began from a
+    key other than where the previous one ended (a change in between that
+    the feed does not account for, or writers interleaving).
+    """
+    current = start
+    for record in records:
+        dirs = record.get("dirs")
+        if not (isinstance(dirs, list) and len(dirs) == 2):
+            continue  # resource events and other writes that touch no snapshots
+        if current is None or dirs[0] != current:
+            return None
+        current = dirs[1]
+    return current
+
+
+def _racy(dirs: str) -> bool:
+    """Return True if a directory in the key was modified within the racy window."""
+    now = time.time_ns()
+    for part in dirs.split(" "):
+        fields = part.split(":")
+        if len(fields) == 3 and now - int(fields[1]) < RACY_WINDOW_NS:
+            return True
+    return False
+
+
+def _position(record: dict | None) -> tuple[int, str | None]:
+    """Return the (seq, event ID) identifying a changefeed record ((0, None) for none)."""
+    if record is None:
+        return (0, None)
+    event_id = record.get("id")
+    return (record["seq"], event_id if isinstance(event_id, str) else None)
@@ -0,0 +1,65 @@
+"""Shared plumbing for the derived SQLite caches under ``.lattice/index/``."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from lattice.storage.fs import ensure_index_dir
+
+INDEX_DIR = "index"
+
+# Files modified this recently are "racy": a second write within the same
+# filesystem timestamp tick could leave mtime and size unchanged, so their
+# rows are stored with an invalid mtime and re-read when next checked.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def connect_index(path: Path, schema: str, schema_version: int) -> sqlite3.Connection:
+    """Open (creating if needed) the index at *path* and ensure its schema.
+
+    The schema version lives in ``PRAGMA user_version`` so the common case
+    (an existing, current index) costs a single pragma read. A corrupt or
+    schema-mismatched database is deleted and recreated — every index is
+    derived data and can always be regenerated from its sources.
+    """
+    ensure_index_dir(path.parent)
+    for attempt in range(2):
+        conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == schema_version:
+                return conn
+            has_tables = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]
+            if version != 0 or has_tables:
+                raise sqlite3.DatabaseError(f"index schema {version} != {schema_version}")
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.OperationalError:
+                pass
+            conn.executescript(schema + f"PRAGMA user_version = {schema_version};")
+            return conn
+        except sqlite3.OperationalError:
+            # Locked or read-only — not corruption; leave the file alone.
+            conn.close()
+            raise
+        except sqlite3.DatabaseError:
+            conn.close()
+            if attempt:
+                raise
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.unlink(f"{path}{suffix}")
+                except FileNotFoundError:
+                    pass
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def stable_mtime(st: os.stat_result) -> int:
+    """Return the mtime to record for *st*, or -1 if it is too recent to trust."""
+    if time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        return -1
+    return st.st_mtime_ns
@@ -0,0 +1,181 @@
+"""Persisted rolling stats aggregates, caught up from the changefeed."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from lattice.core.stats import (
+    AGGREGATES_VERSION,
+    apply_event_to_aggregates,
+    empty_aggregates,
+    merge_aggregates,
+)
+from lattice.storage.changefeed import last_seq, read_since
+from lattice.storage.event_log import EventLog
+from lattice.storage.fs import atomic_write, ensure_index_dir
+from lattice.storage.locks import lattice_lock
+
+STATS_AGGREGATES_FILE = "stats_aggregates.json"
+
+_FEED_BATCH = 5000
+
+
+def aggregates_path(lattice_dir: Path) -> Path:
+    return lattice_dir / "index" / STATS_AGGREGATES_FILE
+
+
+def refresh_aggregates(lattice_dir: Path) -> dict:
+    """Return the stats aggregates, caught up with every event written so far.
+
+    The aggregates file records the changefeed sequence number it covers;
+    only newer feed records are folded in, so the cost follows the number
+    of new events, not the length of the history. Without a usable file, or
+    when the feed restarted below that number, the active logs are scanned.
+    The file is rewritten when anything changed.
+    """
+    aggregates = _load(lattice_dir)
+    feed_end = last_seq(lattice_dir)
+    if aggregates is None or aggregates["feed_seq"] > feed_end:
+        aggregates = scan_aggregates(lattice_dir)
+    elif not _catch_up(lattice_dir, aggregates):
+        return aggregates
+    save_aggregates(lattice_dir, aggregates)
+    return aggregates
+
+
+def scan_aggregates(lattice_dir: Path) -> dict:
+    """Compute the aggregates from scratch by replaying every active log.
+
+    Each log is read under its ``events_<id>`` lock, so every event in it has
+    already reached the changefeed. Feed records written while the scan ran
+    are then folded in, skipping the ones the scan already counted.
+    """
+    feed_start = last_seq(lattice_dir)
+    aggregates = empty_aggregates()
+    scanned: set[str] = set()
+    events_dir = lattice_dir / "events"
+    locks_dir = lattice_dir / "locks"
+    if events_dir.is_dir():
+        for path in sorted(events_dir.glob("*.jsonl")):
+            if path.name.startswith("_"):
+                continue  # skip _lifecycle.jsonl
+            with lattice_lock(locks_dir, f"events_{path.stem}"):
+                events = list(EventLog(path).iter_events())
+            for event in events:
+                apply_event_to_aggregates(aggregates, event)
+                if event.get("id"):
+                    scanned.add(event["id"])
+    aggregates["feed_seq"] = feed_start
+    _catch_up(lattice_dir, aggregates, skip=scanned)
+    return aggregates
+
+
+def verify_aggregates(lattice_dir: Path) -> list[str] | None:
+    """Recompute the aggregates from the logs and compare them to the stored ones.
+
+    The stored aggregates are caught up to exactly the point the recompute
+    reached, then compared section by section. The recomputed aggregates
+    replace the stored ones. Returns the names of the sections that differed,
+    or None if no aggregates were stored (the recomputed ones are saved).
+    """
+    recomputed = scan_aggregates(lattice_dir)
+    stored = _load(lattice_dir)
+    if stored is None:
+        save_aggregates(lattice_dir, recomputed)
+        return None
+    if stored["feed_seq"] > recomputed["feed_seq"]:
+        # Stored past the end of the feed: they cannot be caught up to compare
+        mismatches = ["feed_seq"]
+    else:
+        _catch_up(lattice_dir, stored, until=recomputed["feed_seq"])
+        mismatches = [
+            key
+            for key in sorted(recomputed)
+            if key not in ("version", "feed_seq") and stored.get(key) != recomputed[key]
+        ]
+    save_aggregates(lattice_dir, recomputed)
+    return mismatches
+
+
+def save_aggregates(lattice_dir: Path, aggregates: dict) -> None:
+    path = aggregates_path(lattice_dir)
+    try:
+        ensure_index_dir(path.parent)
+        content = json.dumps(aggregates, sort_keys=True, separators=(",", ":")) + "\n"
+        atomic_write(path, content, durable=False)
+    except OSError:
+        return  # derived data; recomputed next time
+
+
+def drop_aggregates(lattice_dir: Path) -> None:
+    aggregates_path(lattice_dir).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _load(lattice_dir: Path) -> dict | None:
+    try:
+        loaded = json.loads(aggregates_path(lattice_dir).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(loaded, dict) or loaded.get("version") != AGGREGATES_VERSION:
+        return None
+    if not isinstance(loaded.get("feed_seq"), int):
+        return None
+    return loaded
+
+
+def _catch_up(
+    lattice_dir: Path,
+    aggregates: dict,
+    *,
+    skip: set[str] | None = None,
+    until: int | None = None,
+) -> bool:
+    """Fold feed records after ``aggregates["feed_seq"]`` into *aggregates*.
+
+    Returns True if any record was read.
+    """
+    advanced = False
+    while True:
+        records = read_since(lattice_dir, aggregates["feed_seq"], limit=_FEED_BATCH)
+        if until is not None:
+            records = [r for r in records if r["seq"] <= until]
+        if not records:
+            return advanced
+        for record in records:
+            if not (skip and record.get("id") in skip):
+                _apply_record(lattice_dir, aggregates, record)
+            aggregates["feed_seq"] = record["seq"]
+        advanced = True
+
+
+def _apply_record(lattice_dir: Path, aggregates: dict, record: dict) -> None:
+    """Apply one feed record; archiving moves a whole task out of (or into) the totals."""
+    etype, task_id = record.get("type"), record.get("task_id")
+    if etype == "task_archived" and task_id:
+        if task_id in aggregates["tasks"]:
+            merge_aggregates(aggregates, _task_totals(lattice_dir, task_id, record), sign=-1)
+        return
+    if etype == "task_unarchived" and task_id and task_id not in aggregates["tasks"]:
+        merge_aggregates(aggregates, _task_totals(lattice_dir, task_id, record))
+    apply_event_to_aggregates(aggregates, record)
+
+
+def _task_totals(lattice_dir: Path, task_id: str, upto: dict) -> dict:
+    """Return the aggregates of *task_id*'s events logged before the event *upto*."""
+    totals = empty_aggregates()
+    for events_dir in (lattice_dir / "events", lattice_dir / "archive" / "events"):
+        path = events_dir / f"{task_id}.jsonl"
+        if not path.exists():
+            continue
+        for event in EventLog(path).iter_events():
+            if event.get("id") == upto.get("id"):
+                break
+            apply_event_to_aggregates(totals, event)
+        break
+    return totals
@@ -3,6 +3,12 @@
 Prints a one-liner to stderr when a newer version of lattice-tracker is
 available. Designed to be silent and safe: any error at all is swallowed,
 non-TTY environments are skipped, and results are cached for 24 hours.
+
+The check never blocks a command. The notice is printed from the cache
+file alone; when the cache is stale, a detached ``python -m
+lattice.update_check`` process refreshes it (the network fetch and the
+installed-version lookup happen there), and the result shows on the next
+run.
 """
 
 from __future__ import annotations
@@ -16,8 +22,9 @@ from pathlib import Path
 _CACHE_DIR = Path.home() / ".cache" / "lattice"
 _CACHE_FILE = _CACHE_DIR / "version_check.json"
 _CACHE_TTL = 86400  # 24 hours
+_RETRY_INTERVAL = 3600  # seconds between refresh attempts while stale
 _PYPI_URL = "https://pypi.org/pypi/lattice-tracker/json"
-_TIMEOUT = 3  # seconds
+_TIMEOUT = 10  # seconds; only the background refresh waits on it
 
 
 def _parse_version(v: str) -> tuple[int, ...]:
@@ -25,43 +32,98 @@ def _parse_version(v: str) -> tuple[int, ...]:
     return tuple(int(x) for x in v.strip().split("."))
 
 
-def _read_cache() -> str | None:
-    """Return cached latest version if fresh, else None."""
+def _install_key() -> str:
+    """Identify the installed copy of this module; it changes on upgrade or reinstall."""
+    st = os.stat(__file__)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _load_cache(path: Path | None = None) -> dict:
+    """Return the cache file's contents, or an empty dict."""
     try:
-        data = json.loads(_CACHE_FILE.read_text())
-        if time.time() - data["ts"] < _CACHE_TTL:
-            return data["version"]
+        data = json.loads((path or _CACHE_FILE).read_text())
     except Exception:
-        pass
-    return None
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
-def _write_cache(version: str) -> None:
-    """Persist latest version to cache file."""
+def _write_cache(version: str, current: str | None = None, path: Path | None = None) -> None:
+    """Persist the latest version (and the installed one it was compared with)."""
+    path = path or _CACHE_FILE
+    data = {"version": version, "ts": time.time(), "install": _install_key()}
+    if current is not None:
+        data["current"] = current
+    _store(path, data)
+
+
+def _store(path: Path, data: dict) -> None:
     try:
-        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        _CACHE_FILE.write_text(
-            json.dumps({"version": version, "ts": time.time()}) + "\n"
-        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data) + "\n")
+        os.replace(tmp, path)
     except Exception:
         pass
 
 
-def _fetch_latest() -> str | None:
+def _fetch_latest(url: str | None = None) -> str | None:
     """Fetch the latest version from PyPI. Returns None on any failure."""
     try:
         from urllib.request import Request, urlopen
 
-        req = Request(_PYPI_URL, headers={"Accept": "application/json"})
+        req = Request(url or _PYPI_URL, headers={"Accept": "application/json"})
         with urlopen(req, timeout=_TIMEOUT) as resp:
             data = json.loads(resp.read())
-            return data["info"]["version"]
+            version = data["info"]["version"]
+            return version if isinstance(version, str) else None
+    except Exception:
+        return None
+
+
+def _installed_version() -> str | None:
+    try:
+        from importlib.metadata import version as pkg_version
+
+        return pkg_version("lattice-tracker")
     except Exception:
         return None
 
 
+def _start_refresh(data: dict) -> None:
+    """Record the attempt, then refresh the cache in a detached process."""
+    import subprocess
+
+    _store(_CACHE_FILE, {**data, "attempt": time.time()})
+    subprocess.Popen(
+        [sys.executable, "-m", "lattice.update_check", _PYPI_URL, str(_CACHE_FILE)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True,
+    )
+
+
+def refresh(url: str, cache_file: Path) -> None:
+    """Fetch the latest version from *url* and store it in *cache_file*.
+
+    Runs in the detached refresh process. Failures leave the cache as it
+    was; the attempt timestamp already recorded keeps the next one an
+    hour away.
+    """
+    latest = _fetch_latest(url)
+    if latest is None:
+        return
+    _write_cache(latest, _installed_version(), cache_file)
+
+
 def maybe_print_update_notice() -> None:
-    """Print an upgrade notice to stderr if a newer version exists.
+    """Print an upgrade notice to stderr if the cache says a newer version exists.
+
+    Reads only the cache file. A stale or missing cache starts a background
+    refresh (at most once per hour) whose result is shown on a later run.
+    A cache written by a different install (after an upgrade) is not
+    trusted until it has been refreshed.
 
     Skip conditions (no check, no output):
     - LATTICE_NO_UPDATE_CHECK=1 env var
@@ -75,22 +137,35 @@ def maybe_print_update_notice() -> None:
         if not hasattr(sys.stderr, "isatty") or not sys.stderr.isatty():
             return
 
-        from importlib.metadata import version as pkg_version
+        data = _load_cache()
+        now = time.time()
+        current, latest = data.get("current"), data.get("version")
+        valid = (
+            isinstance(current, str)
+            and isinstance(latest, str)
+            and data.get("install") == _install_key()
+        )
 
-        current = pkg_version("lattice-tracker")
-
-        latest = _read_cache()
-        if latest is None:
-            latest = _fetch_latest()
-            if latest is None:
-                return
-            _write_cache(latest)
-
-        if _parse_version(latest) > _parse_version(current):
-            print(
-                f"\nA new version of Lattice is available: {current} \u2192 {latest}"
-                f"\nRun: uv tool upgrade lattice-tracker",
-                file=sys.stderr,
-            )
+        # Schedule the refresh first, so a cached version that cannot be
+        # compared below never keeps the cache from being refreshed.
+        fresh = valid and now - data.get("ts", 0) < _CACHE_TTL
+        if not fresh and now - data.get("attempt", 0) >= _RETRY_INTERVAL:
+            _start_refresh(data)
+
+        if isinstance(current, str) and isinstance(latest, str) and valid:
+            try:
+                newer = _parse_version(latest) > _parse_version(current)
+            except ValueError:
+                return  # e.g. a pre-release ("0.3.0rc1"); no notice
+            if newer:
+                print(
+                    f"\nA new version of Lattice is available: {current} \u2192 {latest}"
+                    f"\nRun: uv tool upgrade lattice-tracker",
+                    file=sys.stderr,
+                )
     except Exception:
         pass
+
+
+if __name__ == "__main__":
+    refresh(sys.argv[1], Path(sys.argv[2]))
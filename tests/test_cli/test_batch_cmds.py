@@ -0,0 +1,273 @@
+"""Tests for the `lattice batch` command."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+A = "task_01AAAAAAAAAAAAAAAAAAAAAAAA"
+B = "task_01BBBBBBBBBBBBBBBBBBBBBBBB"
+
+
+def _ndjson(*ops: dict) -> str:
+    return "".join(json.dumps(op) + "\n" for op in ops)
+
+
+@pytest.fixture()
+def run_batch(invoke):
+    """Run ``lattice batch`` over *ops*; return (results, exit_code)."""
+
+    def _run(*ops: dict, args: tuple[str, ...] = ("--actor", "human:test")):
+        result = invoke("batch", *args, input=_ndjson(*ops))
+        results = [json.loads(line) for line in result.output.splitlines()]
+        return results, result.exit_code
+
+    return _run
+
+
+def _events(root: Path, task_id: str) -> list[dict]:
+    path = root / ".lattice" / "events" / f"{task_id}.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+
+
+class TestOperations:
+    def test_every_operation(self, run_batch, initialized_root: Path) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "First", "id": A, "tags": ["x", "y"]},
+            {"op": "create", "title": "Second", "id": B, "priority": "high"},
+            {"op": "status", "task": A, "status": "in_planning"},
+            {"op": "update", "task": A, "fields": {"description": "Details"}},
+            {"op": "assign", "task": A, "assignee": "agent:claude"},
+            {"op": "comment", "task": A, "text": "Looks good"},
+            {"op": "link", "task": A, "type": "blocks", "target": B, "note": "order"},
+            {"op": "archive", "task": B},
+        )
+        assert code == 0
+        assert [r["line"] for r in results] == list(range(1, 9))
+        assert all(r["ok"] for r in results)
+        assert [r["op"] for r in results][:3] == ["create", "create", "status"]
+
+        final = results[6]["data"]
+        assert final["status"] == "in_planning"
+        assert final["description"] == "Details"
+        assert final["assigned_to"] == "agent:claude"
+        assert final["tags"] == ["x", "y"]
+        assert final["relationships_out"][0]["target_task_id"] == B
+        assert results[7]["data"]["type"] == "task_archived"
+
+        lattice = initialized_root / ".lattice"
+        snapshot = json.loads((lattice / "tasks" / f"{A}.json").read_text())
+        assert snapshot == final
+        assert (lattice / "plans" / f"{A}.md").exists()
+        assert (lattice / "archive" / "tasks" / f"{B}.json").exists()
+        assert [e["type"] for e in _events(initialized_root, A)] == [
+            "task_created",
+            "status_changed",
+            "field_updated",
+            "assignment_changed",
+            "comment_added",
+            "relationship_added",
+        ]
+        lifecycle = (lattice / "events" / "_lifecycle.jsonl").read_text().splitlines()
+        assert [json.loads(line)["type"] for line in lifecycle] == [
+            "task_created",
+            "task_created",
+            "task_archived",
+        ]
+
+    def test_matches_individual_commands(self, run_batch, invoke, create_task) -> None:
+        task = create_task("Existing")
+        results, code = run_batch(
+            {"op": "status", "task": task["id"], "status": "in_planning"},
+            {"op": "assign", "task": task["id"], "assignee": "human:test"},
+        )
+        assert code == 0
+        shown = json.loads(invoke("show", task["id"], "--json").output)["data"]
+        assert shown["status"] == results[-1]["data"]["status"] == "in_planning"
+        assert shown["assigned_to"] == "human:test"
+
+    def test_short_ids(self, run_batch, initialized_root: Path) -> None:
+        config_path = initialized_root / ".lattice" / "config.json"
+        config = json.loads(config_path.read_text())
+        config["project_code"] = "BAT"
+        config_path.write_text(json.dumps(config))
+
+        results, code = run_batch(
+            {"op": "create", "title": "One"},
+            {"op": "create", "title": "Two"},
+            {"op": "link", "task": "BAT-2", "type": "related_to", "target": "bat-1"},
+        )
+        assert code == 0
+        assert [r["data"]["short_id"] for r in results] == ["BAT-1", "BAT-2", "BAT-2"]
+
+    def test_no_op_results(self, run_batch) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "Same", "id": A},
+            {"op": "create", "title": "Same", "id": A},
+            {"op": "assign", "task": A, "assignee": "agent:a"},
+            {"op": "assign", "task": A, "assignee": "agent:a"},
+            {"op": "create", "title": "Same", "id": A},
+        )
+        assert code == 1
+        assert results[1]["data"]["id"] == A
+        assert results[3]["data"] == {"message": "Already assigned to agent:a"}
+        assert results[4]["error"]["code"] == "CONFLICT"
+
+    def test_per_line_actor_and_provenance(self, run_batch, initialized_root: Path) -> None:
+        _, code = run_batch(
+            {"op": "create", "title": "T", "id": A, "actor": "agent:planner"},
+            {"op": "comment", "task": A, "text": "Why", "reason": "triage"},
+            args=("--actor", "human:test", "--triggered-by", "ev_01AAAAAAAAAAAAAAAAAAAAAAAA"),
+        )
+        assert code == 0
+        created, commented = _events(initialized_root, A)
+        assert created["actor"] == "agent:planner"
+        assert commented["actor"] == "human:test"
+        assert commented["provenance"]["reason"] == "triage"
+        assert created["provenance"]["triggered_by"] == "ev_01AAAAAAAAAAAAAAAAAAAAAAAA"
+
+    def test_reads_from_file(self, invoke, tmp_path: Path) -> None:
+        ops = tmp_path / "ops.ndjson"
+        ops.write_text(_ndjson({"op": "create", "title": "From file"}) + "\n\n")
+        result = invoke("batch", str(ops), "--actor", "human:test")
+        assert result.exit_code == 0
+        assert json.loads(result.output)["data"]["title"] == "From file"
+
+
+# ---------------------------------------------------------------------------
+# Errors
+# ---------------------------------------------------------------------------
+
+
+class TestErrors:
+    def test_failures_do_not_stop_the_batch(self, run_batch, initialized_root: Path) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "Ok", "id": A},
+            {"op": "status", "task": A, "status": "done"},
+            {"op": "frobnicate", "task": A},
+            "not an object",
+            {"op": "comment", "task": A},
+            {"op": "link", "task": A, "type": "blocks", "target": A},
+            {"op": "assign", "task": "task_01ZZZZZZZZZZZZZZZZZZZZZZZZ", "assignee": "agent:a"},
+            {"op": "comment", "task": A, "text": "Still applied"},
+        )
+        assert code == 1
+        assert [r["ok"] for r in results] == [True, False, False, False, False, False, False, True]
+        codes = [r["error"]["code"] for r in results if not r["ok"]]
+        assert codes == [
+            "INVALID_TRANSITION",
+            "VALIDATION_ERROR",
+            "INVALID_JSON",
+            "VALIDATION_ERROR",
+            "VALIDATION_ERROR",
+            "NOT_FOUND",
+        ]
+        assert results[1]["error"]["valid_transitions"]
+        assert results[2]["op"] is None
+        assert results[4]["op"] == "comment"  # known op, missing its text
+        assert [e["type"] for e in _events(initialized_root, A)] == [
+            "task_created",
+            "comment_added",
+        ]
+
+    def test_errors_match_individual_commands(self, run_batch, invoke, create_task) -> None:
+        task_id = create_task("Existing")["id"]
+        cases = [
+            (("status", task_id, "done"), {"op": "status", "status": "done"}),
+            (
+                ("status", task_id, "in_progress", "--force"),
+                {"op": "status", "status": "in_progress", "force": True},
+            ),
+            (
+                ("update", task_id, "priority=urgent"),
+                {"op": "update", "fields": {"priority": "urgent"}},
+            ),
+            (("assign", task_id, "nobody"), {"op": "assign", "assignee": "nobody"}),
+            (
+                ("comment", task_id, "Hi", "--reply-to", "ev_01AAAAAAAAAAAAAAAAAAAAAAAA"),
+                {"op": "comment", "text": "Hi", "reply_to": "ev_01AAAAAAAAAAAAAAAAAAAAAAAA"},
+            ),
+            (("link", task_id, "blocks", B), {"op": "link", "type": "blocks", "target": B}),
+        ]
+        for args, op in cases:
+            single = invoke(*args, "--actor", "human:test", "--json")
+            results, _code = run_batch({**op, "task": task_id})
+            assert single.exit_code == 1
+            assert results[0]["error"] == json.loads(single.output)["error"], args
+
+    def test_missing_actor(self, run_batch) -> None:
+        results, code = run_batch({"op": "create", "title": "Anon"}, args=())
+        assert code == 1
+        assert results[0]["error"]["code"] == "MISSING_ACTOR"
+
+    def test_quiet_prints_only_failures(self, run_batch) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "Ok"},
+            {"op": "archive", "task": A},
+            args=("--actor", "human:test", "--quiet"),
+        )
+        assert code == 1
+        assert [(r["line"], r["error"]["code"]) for r in results] == [(2, "NOT_FOUND")]
+
+
+# ---------------------------------------------------------------------------
+# --atomic
+# ---------------------------------------------------------------------------
+
+
+class TestAtomic:
+    def test_later_operations_see_earlier_ones(self, run_batch) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "New", "id": A},
+            {"op": "status", "task": A, "status": "in_planning"},
+            {"op": "comment", "task": A, "text": "Planned"},
+            {"op": "archive", "task": A},
+            args=("--actor", "human:test", "--atomic"),
+        )
+        assert code == 0
+        assert all(r["ok"] for r in results)
+        assert results[2]["data"]["status"] == "in_planning"
+
+    def test_invalid_operation_writes_nothing(
+        self, run_batch, create_task, initialized_root: Path
+    ) -> None:
+        existing = create_task("Existing")
+        lattice = initialized_root / ".lattice"
+        before = {path: path.read_bytes() for path in lattice.rglob("*") if path.is_file()}
+
+        results, code = run_batch(
+            {"op": "create", "title": "New", "id": A},
+            {"op": "assign", "task": existing["id"], "assignee": "agent:a"},
+            {"op": "status", "task": A, "status": "done"},
+            args=("--actor", "human:test", "--atomic"),
+        )
+        assert code == 1
+        assert [r["error"]["code"] for r in results] == [
+            "NOT_APPLIED",
+            "NOT_APPLIED",
+            "INVALID_TRANSITION",
+        ]
+        assert "line 3" in results[0]["error"]["message"]
+        after = {
+            path: path.read_bytes()
+            for path in lattice.rglob("*")
+            if path.is_file() and path.parent.name != "locks"
+        }
+        assert after == {p: b for p, b in before.items() if p.parent.name != "locks"}
+
+    def test_parse_error_writes_nothing(self, run_batch, initialized_root: Path) -> None:
+        results, code = run_batch(
+            {"op": "create", "title": "New", "id": A},
+            {"op": "create"},
+            args=("--actor", "human:test", "--atomic"),
+        )
+        assert code == 1
+        assert results[0]["error"]["code"] == "NOT_APPLIED"
+        assert not (initialized_root / ".lattice" / "tasks" / f"{A}.json").exists()
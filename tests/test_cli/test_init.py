@@ -50,6 +50,13 @@ class TestInitDirectoryStructure:
         assert lifecycle_log.is_file()
         assert lifecycle_log.read_text() == ""
 
+    def test_gitignores_the_derived_index(self, tmp_path: Path) -> None:
+        runner = CliRunner()
+        runner.invoke(cli, ["init", "--path", str(tmp_path)], input=_SKIP_ALL)
+
+        gitignore = tmp_path / ".lattice" / ".gitignore"
+        assert "index/" in gitignore.read_text().splitlines()
+
     def test_init_with_custom_path(self, tmp_path: Path) -> None:
         target = tmp_path / "myproject"
         target.mkdir()
@@ -227,6 +227,106 @@ class TestDoctor:
         assert result.exit_code == 0
         assert "lifecycle" in result.output.lower() or "Lifecycle" in result.output
 
+    def test_doctor_changefeed_gap(self, create_task, invoke, initialized_root):
+        """An event that never reached changes.jsonl is reported, and --fix restores it."""
+        create_task("Feed task 1")
+        create_task("Feed task 2")
+
+        feed_path = initialized_root / ".lattice" / "changes.jsonl"
+        lines = feed_path.read_text().splitlines(keepends=True)
+        feed_path.write_text("".join(lines[:-1]))
+
+        result = invoke("doctor")
+        assert result.exit_code == 0
+        assert "Changefeed is missing 1 event" in result.output
+
+        result = invoke("doctor", "--fix")
+        assert "fixed by regenerating it" in result.output
+        assert len(feed_path.read_text().splitlines()) == len(lines)
+
+        result = invoke("doctor")
+        assert "No issues found" in result.output
+
+    def test_doctor_changefeed_out_of_order(self, create_task, invoke, initialized_root):
+        """A feed merged from two branches is reported, left alone by reads, and renumbered."""
+        create_task("Merge task 1")
+        create_task("Merge task 2")
+
+        feed_path = initialized_root / ".lattice" / "changes.jsonl"
+        lines = feed_path.read_text().splitlines(keepends=True)
+        merged = "".join(lines + lines[-1:])
+        feed_path.write_text(merged)
+
+        assert invoke("list").exit_code == 0
+        assert feed_path.read_text() == merged
+
+        result = invoke("doctor")
+        assert "Changefeed has 1 record numbered out of order" in result.output
+
+        result = invoke("doctor", "--fix")
+        assert "fixed by regenerating it" in result.output
+        seqs = [json.loads(line)["seq"] for line in feed_path.read_text().splitlines()]
+        assert seqs == list(range(1, len(lines) + 1))
+
+    def test_doctor_incremental_reuses_unchanged_files(
+        self, create_task, invoke, initialized_root
+    ):
+        """--incremental only re-reads changed files but still re-runs cross-file checks."""
+        source = create_task("Source")
+        target = create_task("Target")
+        invoke("link", source["id"], "blocks", target["id"], "--actor", "human:test")
+        lattice_dir = initialized_root / ".lattice"
+
+        first = json.loads(invoke("doctor", "--incremental", "--json").output)["data"]
+        assert first["findings"] == []
+        assert first["files"]["read"] == first["files"]["total"]
+
+        second = json.loads(invoke("doctor", "--incremental", "--json").output)["data"]
+        assert second["files"]["read"] == 0
+        assert second["summary"] == first["summary"]
+
+        # Deleting the target flags the unchanged source snapshot that references it.
+        (lattice_dir / "tasks" / f"{target['id']}.json").unlink()
+        third = json.loads(invoke("doctor", "--incremental", "--json").output)["data"]
+        assert third["files"]["read"] == 0
+        assert [f["check"] for f in third["findings"]] == ["missing_reference"]
+
+        full = json.loads(invoke("doctor", "--json").output)["data"]
+        assert full["findings"] == third["findings"]
+        assert full["files"]["read"] == full["files"]["total"]
+
+    def test_doctor_incremental_rechecks_modified_file(
+        self, create_task, invoke, initialized_root
+    ):
+        """A rewritten file is re-parsed; a touched but identical file is only hashed."""
+        task = create_task("Changes")
+        other = create_task("Untouched")
+        lattice_dir = initialized_root / ".lattice"
+        invoke("doctor", "--incremental")
+
+        other_path = lattice_dir / "tasks" / f"{other['id']}.json"
+        other_path.write_text(other_path.read_text())
+        snap_path = lattice_dir / "tasks" / f"{task['id']}.json"
+        snap_path.write_text("{not json")
+
+        result = invoke("doctor", "--incremental", "--json")
+        assert result.exit_code == 1
+        data = json.loads(result.output)["data"]
+        assert data["files"]["read"] == 2
+        assert [f["check"] for f in data["findings"]] == ["json_parse"]
+
+    def test_doctor_parallel_matches_serial(self, create_task, invoke, initialized_root):
+        """--jobs N reports exactly what a serial run reports."""
+        tasks = [create_task(f"Parallel {i}") for i in range(5)]
+        event_path = initialized_root / ".lattice" / "events" / f"{tasks[2]['id']}.jsonl"
+        with open(event_path, "a") as f:
+            f.write('{"truncated": true')
+
+        serial = invoke("doctor", "--json")
+        parallel = invoke("doctor", "--jobs", "2", "--json")
+        assert parallel.exit_code == serial.exit_code
+        assert json.loads(parallel.output) == json.loads(serial.output)
+
 
 # ---------------------------------------------------------------------------
 # Rebuild tests
@@ -305,6 +405,57 @@ class TestRebuild:
 
         assert first == second
 
+    def test_rebuild_from_checkpoint_matches_write_path(
+        self, create_task, invoke, initialized_root, monkeypatch
+    ):
+        """A rebuild resumed from a checkpoint yields the incrementally-written snapshot."""
+        from lattice.storage import checkpoints
+
+        monkeypatch.setattr(checkpoints, "CHECKPOINT_INTERVAL", 2)
+        task = create_task("Checkpoint test")
+        task_id = task["id"]
+        for i in range(3):
+            invoke("comment", task_id, f"note {i}", "--actor", "human:test")
+
+        ld = initialized_root / ".lattice"
+        snap_path = ld / "tasks" / f"{task_id}.json"
+
+        invoke("rebuild", task_id)
+        assert checkpoints.load_checkpoints(ld, task_id)
+        invoke("comment", task_id, "after checkpoint", "--actor", "human:test")
+        expected = snap_path.read_text()
+
+        result = invoke("rebuild", task_id)
+        assert result.exit_code == 0
+        assert snap_path.read_text() == expected
+
+    def test_rebuild_no_checkpoints_replays_from_scratch(
+        self, create_task, invoke, initialized_root, monkeypatch
+    ):
+        """--no-checkpoints ignores (and replaces) checkpoints a buggy reducer left behind."""
+        from lattice.storage import checkpoints
+
+        monkeypatch.setattr(checkpoints, "CHECKPOINT_INTERVAL", 2)
+        task = create_task("Checkpoint reset")
+        task_id = task["id"]
+        for i in range(3):
+            invoke("comment", task_id, f"note {i}", "--actor", "human:test")
+        ld = initialized_root / ".lattice"
+        snap_path = ld / "tasks" / f"{task_id}.json"
+        expected = snap_path.read_text()
+
+        invoke("rebuild", "--all")
+        stale = checkpoints.load_checkpoints(ld, task_id)
+        stale[-1]["snapshot"] = {**stale[-1]["snapshot"], "title": "Stale"}
+        checkpoints._save_checkpoints(ld, task_id, stale)
+
+        result = invoke("rebuild", "--all", "--no-checkpoints")
+        assert result.exit_code == 0
+        assert snap_path.read_text() == expected
+        assert checkpoints.load_checkpoints(ld, task_id)[-1]["snapshot"]["title"] == (
+            "Checkpoint reset"
+        )
+
     def test_rebuild_fixes_drift(self, create_task, invoke, initialized_root):
         """Modify snapshot's last_event_id, rebuild, then doctor should pass."""
         task = create_task("Drift fix test")
@@ -379,6 +530,27 @@ class TestRebuild:
         sorted_events = sorted(events, key=lambda e: (e["ts"], e["id"]))
         assert events == sorted_events
 
+    def test_rebuild_regenerates_changefeed(self, create_task, invoke, initialized_root):
+        """Rebuild --all restores events missing from the changefeed and renumbers it."""
+        create_task("Feed rebuild 1")
+        create_task("Feed rebuild 2")
+        lattice_dir = initialized_root / ".lattice"
+        assert invoke("stats").exit_code == 0
+        assert (lattice_dir / "index" / "stats_aggregates.json").exists()
+
+        feed_path = lattice_dir / "changes.jsonl"
+        records = [json.loads(line) for line in feed_path.read_text().splitlines()]
+        feed_path.write_text("".join(json.dumps(r) + "\n" for r in records[1:]))
+
+        result = invoke("rebuild", "--all")
+        assert result.exit_code == 0
+
+        rebuilt = [json.loads(line) for line in feed_path.read_text().splitlines()]
+        assert [r["seq"] for r in rebuilt] == list(range(1, len(records) + 1))
+        assert {r["id"] for r in rebuilt} == {r["id"] for r in records}
+        # Feed readers start over from the regenerated feed
+        assert not (lattice_dir / "index" / "stats_aggregates.json").exists()
+
     def test_rebuild_all_json_output(self, create_task, invoke):
         """Rebuild --all with --json, verify structured envelope."""
         create_task("All JSON task 1")
@@ -391,3 +563,55 @@ class TestRebuild:
         assert parsed["ok"] is True
         assert len(parsed["data"]["rebuilt_tasks"]) == 2
         assert parsed["data"]["global_log_rebuilt"] is True
+        assert set(parsed["data"]["timings"]) == {
+            "tasks",
+            "lifecycle",
+            "changefeed",
+            "ids",
+            "index",
+            "resources",
+        }
+
+    def test_rebuild_all_parallel_matches_serial(self, create_task, invoke, initialized_root):
+        """Rebuild --all --jobs 2 writes exactly what a serial rebuild writes."""
+        lattice_dir = initialized_root / ".lattice"
+        tasks = [create_task(f"Parallel task {i}") for i in range(6)]
+        invoke("status", tasks[0]["id"], "in_progress", "--actor", "human:test")
+        assert invoke("archive", tasks[1]["id"], "--actor", "human:test").exit_code == 0
+
+        derived = [
+            *(lattice_dir / "tasks").glob("*.json"),
+            *(lattice_dir / "archive" / "tasks").glob("*.json"),
+            lattice_dir / "events" / "_lifecycle.jsonl",
+            lattice_dir / "ids.json",
+        ]
+
+        assert invoke("rebuild", "--all").exit_code == 0
+        serial = {p: p.read_bytes() for p in derived}
+        for p in derived:
+            p.write_text("")
+
+        result = invoke("rebuild", "--all", "--jobs", "2", "--json")
+        assert result.exit_code == 0
+        parsed = json.loads(result.output)
+        assert parsed["data"]["jobs"] == 2
+        assert parsed["data"]["rebuilt_tasks"] == sorted(
+            t["id"] for t in tasks if t["id"] != tasks[1]["id"]
+        ) + [tasks[1]["id"]]
+        assert {p: p.read_bytes() for p in derived} == serial
+
+    def test_rebuild_index_only(self, create_task, invoke, initialized_root):
+        """Rebuild --index regenerates the snapshot index without touching snapshots."""
+        task = create_task("Index task")
+        snap_path = initialized_root / ".lattice" / "tasks" / f"{task['id']}.json"
+        before = snap_path.read_text()
+
+        index_db = initialized_root / ".lattice" / "index" / "snapshots.db"
+        index_db.unlink(missing_ok=True)
+
+        result = invoke("rebuild", "--index", "--json")
+        assert result.exit_code == 0
+        parsed = json.loads(result.output)
+        assert parsed["data"] == {"index_rebuilt": True, "indexed_tasks": 1}
+        assert index_db.exists()
+        assert snap_path.read_text() == before
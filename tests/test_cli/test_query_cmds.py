@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
 from pathlib import Path
 from subprocess import CompletedProcess
 
@@ -482,6 +484,75 @@ class TestList:
         assert "Archived task" not in result.output
 
 
+# ---------------------------------------------------------------------------
+# TestSearch
+# ---------------------------------------------------------------------------
+
+
+class TestSearch:
+    """Tests for `lattice search <query>`."""
+
+    def test_human_output(self, invoke, create_task):
+        create_task("Flaky login test")
+        create_task("Unrelated")
+
+        result = invoke("search", "flaky")
+        assert result.exit_code == 0
+        lines = result.output.strip().splitlines()
+        assert len(lines) == 1
+        assert "task" in lines[0]
+        assert "[Flaky] login test" in lines[0]
+
+    def test_no_matches(self, invoke, create_task):
+        create_task("Something")
+        result = invoke("search", "nothing")
+        assert result.exit_code == 0
+        assert "No matches." in result.output
+
+    def test_json_ranks_title_above_description(self, invoke_json, create_task):
+        t1 = create_task("Cleanup", "--description", "Rewrite the importer")
+        t2 = create_task("Importer is slow")
+
+        parsed, code = invoke_json("search", "importer")
+        assert code == 0
+        assert parsed["ok"] is True
+        assert [h["task_id"] for h in parsed["data"]] == [t2["id"], t1["id"]]
+
+    def test_comments_and_kind_filter(self, invoke, invoke_json, create_task):
+        task = create_task("Task")
+        invoke("comment", task["id"], "rollback plan agreed", "--actor", "human:test")
+
+        parsed, _ = invoke_json("search", "rollback")
+        assert [h["kind"] for h in parsed["data"]] == ["comment"]
+        parsed, _ = invoke_json("search", "rollback", "--kind", "task")
+        assert parsed["data"] == []
+
+    def test_quiet_dedupes_tasks(self, invoke, create_task):
+        task = create_task("Cache warmup", "--description", "warmup the cache")
+        invoke("comment", task["id"], "cache warmup is done", "--actor", "human:test")
+
+        result = invoke("search", "warmup", "--quiet")
+        assert result.exit_code == 0
+        assert result.output.strip().splitlines() == [task.get("short_id") or task["id"]]
+
+    def test_task_scope(self, invoke_json, create_task):
+        create_task("Retry budget")
+        t2 = create_task("Retry storm")
+
+        parsed, _ = invoke_json("search", "retry", "--task", t2["id"])
+        assert [h["task_id"] for h in parsed["data"]] == [t2["id"]]
+
+    def test_archived_needs_opt_in(self, invoke, invoke_json, create_task):
+        task = create_task("Archived migration")
+        invoke("archive", task["id"], "--actor", "human:test")
+
+        parsed, _ = invoke_json("search", "migration")
+        assert parsed["data"] == []
+        parsed, _ = invoke_json("search", "migration", "--include-archived")
+        assert [h["task_id"] for h in parsed["data"]] == [task["id"]] * len(parsed["data"])
+        assert parsed["data"]
+
+
 # ---------------------------------------------------------------------------
 # TestShow
 # ---------------------------------------------------------------------------
@@ -645,33 +716,50 @@ class TestShow:
         commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
         assert commits == []
 
-    def test_auto_detect_commits_parses_git_log_output(self, monkeypatch, cli_env):
-        """Commit auto-detection parses git log output into structured commits."""
+    def test_auto_detect_commits_uses_commit_index(self, cli_env):
+        """Commit auto-detection looks short IDs up in the commit reference index."""
         from lattice.cli import query_cmds
+        from lattice.git_session import close_sessions
 
-        lattice_dir = Path(cli_env["LATTICE_ROOT"]) / ".lattice"
-        calls: list[list[str]] = []
-
-        def fake_run(args, **kwargs):
-            calls.append(args)
-            return CompletedProcess(
-                args,
-                0,
-                "abc1234\x1f2026-02-18\x1fLAT-144 add parser\n"
-                "def5678\x1f2026-02-17\x1fLAT-144 add tests",
-                "",
-            )
+        root = Path(cli_env["LATTICE_ROOT"])
+        lattice_dir = root / ".lattice"
 
-        monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/git")
-        monkeypatch.setattr("subprocess.run", fake_run)
+        def git(*args: str, date: str | None = None) -> str:
+            env = dict(os.environ)
+            if date:
+                env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = date
+            result = subprocess.run(
+                ["git", *args], cwd=str(root), check=True, capture_output=True, text=True, env=env
+            )
+            return result.stdout.strip()
+
+        git("init", "-q", "--initial-branch=main")
+        git("config", "user.email", "dev@example.com")
+        git("config", "user.name", "Dev")
+        git("commit", "--allow-empty", "-q", "-m", "LAT-144 add parser", date="2026-02-17T10:00")
+        git("commit", "--allow-empty", "-q", "-m", "LAT-1440 other task", date="2026-02-17T11:00")
+        git("commit", "--allow-empty", "-q", "-m", "lat-144 add tests", date="2026-02-18T10:00")
+        try:
+            commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
+            assert commits == [
+                {
+                    "sha": git("rev-parse", "--short", "HEAD"),
+                    "date": "2026-02-18",
+                    "subject": "lat-144 add tests",
+                },
+                {
+                    "sha": git("rev-parse", "--short", "HEAD~2"),
+                    "date": "2026-02-17",
+                    "subject": "LAT-144 add parser",
+                },
+            ]
+            assert (lattice_dir / "index" / "commits.db").exists()
 
-        commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
-        assert commits == [
-            {"sha": "abc1234", "date": "2026-02-18", "subject": "LAT-144 add parser"},
-            {"sha": "def5678", "date": "2026-02-17", "subject": "LAT-144 add tests"},
-        ]
-        assert calls, "Expected git log to run"
-        assert any(part.startswith("--grep=LAT-144") for part in calls[0])
+            git("commit", "--amend", "-q", "--allow-empty", "-m", "Reworded")
+            commits = query_cmds._auto_detect_commits("LAT-144", lattice_dir)
+            assert [c["subject"] for c in commits] == ["LAT-144 add parser"]
+        finally:
+            close_sessions()
 
     def test_compact_output(self, invoke, create_task):
         """--compact shows only compact fields."""
@@ -0,0 +1,128 @@
+"""Tests for CLI startup: lazy command loading and the import-time budget."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from lattice.cli.main import _LAZY_COMMANDS, LazyGroup, cli
+
+# Import time (ms) `lattice status --help` may add on top of a bare interpreter.
+# Eagerly importing every command module, the dashboard or the MCP server
+# blows well past it.
+IMPORT_BUDGET_MS = 150
+
+_RUN_CLI = (
+    "import sys, json\n"
+    "from lattice.cli.main import cli\n"
+    "try:\n"
+    "    cli({args!r})\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print(json.dumps(sorted(sys.modules)), file=sys.stderr)\n"
+)
+
+
+def _modules_after(*args: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _RUN_CLI.format(args=list(args))],
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "LATTICE_NO_UPDATE_CHECK": "1"},
+    )
+    return set(json.loads(result.stderr.strip().splitlines()[-1]))
+
+
+def _import_time_ms(code: str) -> float:
+    """Return the best-of-five total import time of *code*, per ``-X importtime``."""
+    best = None
+    for _ in range(5):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=False,
+            env={**os.environ, "LATTICE_NO_UPDATE_CHECK": "1"},
+        )
+        # Top-level imports only: their cumulative times cover everything nested.
+        total = sum(
+            int(m.group(1))
+            for m in re.finditer(
+                r"^import time:\s+\d+ \|\s+(\d+) \| \S", result.stderr, re.MULTILINE
+            )
+        )
+        best = total if best is None else min(best, total)
+    return best / 1000
+
+
+class TestLazyCommands:
+    def test_table_matches_registered_commands(self) -> None:
+        cli.load_all()
+        registered = {
+            name: command.callback.__module__
+            for name, command in cli.commands.items()
+            if command.callback.__module__.startswith("lattice.cli.")
+            and command.callback.__module__ != "lattice.cli.main"
+        }
+        assert registered == _LAZY_COMMANDS
+
+    def test_help_lists_every_command(self) -> None:
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name in ("init", "status", "show", "demo", "import-github-project"):
+            assert name in result.output
+
+    def test_invoking_a_command_imports_only_its_module(self) -> None:
+        modules = _modules_after("status", "--help")
+        assert {m for m in modules if m.startswith("lattice.cli.")} == {
+            "lattice.cli.helpers",
+            "lattice.cli.main",
+            "lattice.cli.task_cmds",
+            "lattice.cli.task_ops",
+        }
+        assert "lattice.plugins" not in modules
+        assert "importlib.metadata" not in modules
+
+    def test_unknown_command_loads_plugins(self) -> None:
+        group = LazyGroup("test", lazy_commands={})
+
+        @click.command()
+        def hello():
+            click.echo("hello from plugin")
+
+        fake_ep = MagicMock()
+        fake_ep.name = "hello"
+        fake_ep.load.return_value = lambda g: g.add_command(hello)
+
+        with patch("lattice.plugins.discover_cli_plugins", return_value=[fake_ep]) as discover:
+            result = CliRunner().invoke(group, ["hello"])
+            assert result.exit_code == 0
+            assert "hello from plugin" in result.output
+            CliRunner().invoke(group, ["--help"])
+        assert discover.call_count == 1  # scanned once, on demand
+
+
+@pytest.mark.slow
+def test_startup_import_budget() -> None:
+    baseline = _import_time_ms("pass")
+    startup = _import_time_ms(
+        "import sys\n"
+        "from lattice.cli.main import cli\n"
+        "try:\n"
+        "    cli(['status', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    assert startup - baseline < IMPORT_BUDGET_MS, (
+        f"`lattice status --help` spent {startup - baseline:.1f} ms importing modules "
+        f"(budget {IMPORT_BUDGET_MS} ms)"
+    )
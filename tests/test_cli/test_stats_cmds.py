@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 
 class TestStatsCommand:
     """Tests for the stats CLI command."""
@@ -162,3 +165,50 @@ class TestStatsCommand:
             "agent_activity",
         }
         assert expected_keys == set(data.keys())
+
+    def test_stats_recompute_verifies_aggregates(self, invoke, invoke_json, create_task):
+        """--recompute checks the stored aggregates against the full history."""
+        task = create_task("Verify me")
+        invoke("status", task["id"], "in_planning", "--actor", "human:test")
+        invoke_json("stats")
+
+        parsed, code = invoke_json("stats", "--recompute")
+        assert code == 0
+        assert parsed["data"]["recompute"] == {
+            "verified": True,
+            "initialized": False,
+            "mismatches": [],
+        }
+
+        result = invoke("stats", "--recompute")
+        assert result.exit_code == 0
+        assert "Aggregates verified against the full history." in result.output
+
+    def test_stats_recompute_without_stored_aggregates(self, invoke, invoke_json, create_task):
+        """With nothing stored yet, --recompute writes the aggregates and reports no drift."""
+        create_task("Fresh")
+
+        parsed, code = invoke_json("stats", "--recompute")
+        assert code == 0
+        assert parsed["data"]["recompute"] == {
+            "verified": True,
+            "initialized": True,
+            "mismatches": [],
+        }
+
+        result = invoke("stats", "--recompute")
+        assert "Aggregates verified against the full history." in result.output
+
+    def test_stats_recompute_repairs_drifted_aggregates(self, invoke_json, create_task, cli_env):
+        """Aggregates that drifted from the logs are reported and rewritten."""
+        create_task("Drift")
+        invoke_json("stats")
+        path = Path(cli_env["LATTICE_ROOT"]) / ".lattice" / "index" / "stats_aggregates.json"
+        aggregates = json.loads(path.read_text())
+        aggregates["actors"] = {"human:ghost": 99}
+        path.write_text(json.dumps(aggregates))
+
+        parsed, _ = invoke_json("stats", "--recompute")
+        assert parsed["data"]["recompute"]["mismatches"] == ["actors"]
+        actors = [row["actor"] for row in parsed["data"]["agent_activity"]]
+        assert "human:ghost" not in actors
@@ -111,6 +111,83 @@ class TestCreate:
         assert "message" in parsed["error"]
 
 
+class TestCreateFromFile:
+    """Tests for `lattice create --from-file`."""
+
+    @staticmethod
+    def _set_project_code(root, code: str) -> None:
+        config_path = root / ".lattice" / "config.json"
+        config = json.loads(config_path.read_text())
+        config["project_code"] = code
+        config_path.write_text(json.dumps(config))
+
+    def test_creates_every_line(self, invoke, initialized_root, tmp_path):
+        self._set_project_code(initialized_root, "BLK")
+        invoke("create", "Before", "--actor", "human:test")
+        tasks = tmp_path / "tasks.jsonl"
+        tasks.write_text(
+            '{"title": "One", "tags": ["a", "b"]}\n'
+            "\n"
+            '{"title": "Two", "priority": "high", "description": "Details"}\n'
+            '{"op": "create", "title": "Three", "actor": "agent:bulk"}\n'
+        )
+        result = invoke("create", "--from-file", str(tasks), "--actor", "human:test", "--json")
+        assert result.exit_code == 0
+        snaps = json.loads(result.output)["data"]
+        assert [s["short_id"] for s in snaps] == ["BLK-2", "BLK-3", "BLK-4"]
+        assert snaps[0]["tags"] == ["a", "b"]
+        assert snaps[1]["priority"] == "high"
+        assert snaps[2]["created_by"] == "agent:bulk"
+
+        lattice = initialized_root / ".lattice"
+        plan = (lattice / "plans" / f"{snaps[1]['id']}.md").read_text()
+        assert plan.startswith("# BLK-3: Two\n\nDetails")
+        lifecycle = (lattice / "events" / "_lifecycle.jsonl").read_text().splitlines()
+        assert len(lifecycle) == 4
+        shown = json.loads(invoke("show", "BLK-4", "--json").output)["data"]
+        assert shown["title"] == "Three"
+
+    def test_stdin_quiet_and_idempotent_ids(self, invoke):
+        lines = (
+            '{"title": "Fixed", "id": "task_01AAAAAAAAAAAAAAAAAAAAAAAA"}\n{"title": "Generated"}\n'
+        )
+        first = invoke(
+            "create", "--from-file", "-", "--actor", "human:test", "--quiet", input=lines
+        )
+        assert first.exit_code == 0
+        ids = first.output.split()
+        assert ids[0] == "task_01AAAAAAAAAAAAAAAAAAAAAAAA"
+        assert len(ids) == 2
+
+        again = invoke(
+            "create", "--from-file", "-", "--actor", "human:test", input=lines.splitlines()[0]
+        )
+        assert again.exit_code == 0
+        assert "Created 0 task(s), 1 already existed" in again.output
+
+    def test_invalid_line_creates_nothing(self, invoke, initialized_root):
+        lines = '{"title": "Fine"}\n{"title": "Bad", "status": "nope"}\n{"op": "status"}\n'
+        result = invoke(
+            "create", "--from-file", "-", "--actor", "human:test", "--json", input=lines
+        )
+        assert result.exit_code == 1
+        error = json.loads(result.output)["error"]
+        assert error["code"] == "VALIDATION_ERROR"
+        assert [line["line"] for line in error["lines"]] == [2, 3]
+        assert list((initialized_root / ".lattice" / "tasks").iterdir()) == []
+
+    def test_rejects_title_and_task_options(self, invoke):
+        for args in (("A title",), ("--priority", "high")):
+            result = invoke("create", *args, "--from-file", "-", "--actor", "human:test", input="")
+            assert result.exit_code == 1
+            assert "--from-file cannot be combined" in result.output
+
+    def test_title_still_required_without_file(self, invoke):
+        result = invoke("create", "--actor", "human:test")
+        assert result.exit_code == 1
+        assert "Missing argument 'TITLE'" in result.output
+
+
 # ---------------------------------------------------------------------------
 # TestUpdate
 # ---------------------------------------------------------------------------
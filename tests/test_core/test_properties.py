@@ -8,7 +8,12 @@ from hypothesis import given, settings, strategies as st
 
 from lattice.core.events import create_event, serialize_event
 from lattice.core.ids import generate_task_id
-from lattice.core.tasks import _init_snapshot, apply_event_to_snapshot, serialize_snapshot
+from lattice.core.tasks import (
+    _init_snapshot,
+    apply_event_to_snapshot,
+    apply_events,
+    serialize_snapshot,
+)
 
 # ---------------------------------------------------------------------------
 # Reusable strategies
@@ -292,3 +297,65 @@ def test_last_event_id_always_final(n_comments: int, actor: str) -> None:
         last_event_id = comment_event["id"]
 
     assert snap["last_event_id"] == last_event_id
+
+
+# ---------------------------------------------------------------------------
+# 8. Bulk replay is byte-identical to per-event replay
+# ---------------------------------------------------------------------------
+
+_mutation_specs = st.one_of(
+    st.tuples(st.just("status_changed"), valid_statuses),
+    st.tuples(st.just("assignment_changed"), st.one_of(st.none(), actor_ids)),
+    st.tuples(st.just("field_updated"), st.text(max_size=20)),
+    st.tuples(st.just("custom_field"), st.text(max_size=20)),
+    st.tuples(st.just("comment_added"), st.one_of(st.none(), st.just("review"))),
+    st.tuples(st.just("relationship_added"), valid_rel_types),
+    st.tuples(st.just("relationship_removed"), valid_rel_types),
+    st.tuples(st.just("branch_linked"), st.sampled_from(["main", "feat/x"])),
+    st.tuples(st.just("branch_unlinked"), st.sampled_from(["main", "feat/x"])),
+)
+
+
+def _event_from_spec(task_id: str, actor: str, spec: tuple, prev_status: str) -> dict:
+    kind, value = spec
+    if kind == "status_changed":
+        data: dict = {"from": prev_status, "to": value}
+    elif kind == "assignment_changed":
+        data = {"from": None, "to": value}
+    elif kind == "field_updated":
+        data = {"field": "title", "from": None, "to": value}
+    elif kind == "custom_field":
+        kind, data = "field_updated", {"field": "custom_fields.k", "from": None, "to": value}
+    elif kind == "comment_added":
+        data = {"body": "c"} if value is None else {"body": "c", "role": value}
+    elif kind in ("relationship_added", "relationship_removed"):
+        data = {"type": value, "target_task_id": "task_01TARGET000000000000000000"}
+    else:
+        data = {"branch": value}
+    return create_event(type=kind, task_id=task_id, actor=actor, data=data)
+
+
+@given(
+    specs=st.lists(_mutation_specs, max_size=25),
+    actor=actor_ids,
+)
+@settings(max_examples=50)
+def test_apply_events_matches_fold(specs: list[tuple], actor: str) -> None:
+    created = _make_task_created_event("Bulk", "backlog", "medium", "normal", actor)
+    created["data"]["custom_fields"] = {"k": "v0"}
+    events = [created]
+    status = "backlog"
+    for spec in specs:
+        event = _event_from_spec(created["task_id"], actor, spec, status)
+        if event["type"] == "status_changed":
+            status = event["data"]["to"]
+        events.append(event)
+    before = json.dumps(events, sort_keys=True)
+
+    folded = None
+    for event in events:
+        folded = apply_event_to_snapshot(folded, event)
+    bulk = apply_events(None, events)
+
+    assert serialize_snapshot(bulk) == serialize_snapshot(folded)
+    assert json.dumps(events, sort_keys=True) == before  # events left untouched
@@ -12,6 +12,7 @@ from lattice.core.tasks import (
     _MUTATION_HANDLERS,
     _NOOP_EVENT_TYPES,
     apply_event_to_snapshot,
+    apply_events,
     compact_snapshot,
     get_artifact_roles,
     get_comment_role_refs,
@@ -983,6 +984,62 @@ class TestNonCreateWithoutSnapshot:
 # ---------------------------------------------------------------------------
 
 
+class TestApplyEvents:
+    """apply_events() bulk replay."""
+
+    def _comment(self, ev_id: str, ts: str) -> dict:
+        return {
+            "schema_version": 1,
+            "id": ev_id,
+            "ts": ts,
+            "type": "comment_added",
+            "task_id": _TASK_ID,
+            "actor": _ACTOR,
+            "data": {"body": "hi", "role": "review"},
+        }
+
+    def test_matches_per_event_replay(self) -> None:
+        events = [_created_event(), self._comment(_EV_2, _TS_2), self._comment(_EV_3, _TS_3)]
+        expected = None
+        for event in events:
+            expected = apply_event_to_snapshot(expected, event)
+
+        assert serialize_snapshot(apply_events(None, events)) == serialize_snapshot(expected)
+
+    def test_does_not_mutate_input_snapshot(self) -> None:
+        snap = _make_snapshot()
+        before = serialize_snapshot(snap)
+
+        result = apply_events(snap, [self._comment(_EV_2, _TS_2)])
+
+        assert serialize_snapshot(snap) == before
+        assert result["comment_count"] == 1
+        assert result["evidence_refs"] is not snap["evidence_refs"]
+
+    def test_does_not_mutate_created_event(self) -> None:
+        created = _created_event()
+        update = {
+            "schema_version": 1,
+            "id": _EV_2,
+            "ts": _TS_2,
+            "type": "field_updated",
+            "task_id": _TASK_ID,
+            "actor": _ACTOR,
+            "data": {"field": "custom_fields.sprint", "from": 12, "to": 13},
+        }
+
+        result = apply_events(None, [created, update])
+
+        assert result["custom_fields"] == {"sprint": 13}
+        assert created["data"]["custom_fields"] == {"sprint": 12}
+
+    def test_requires_task_created_first(self) -> None:
+        with pytest.raises(ValueError, match="task_created"):
+            apply_events(None, [self._comment(_EV_2, _TS_2)])
+        with pytest.raises(ValueError, match="No events"):
+            apply_events(None, [])
+
+
 class TestSerializeSnapshot:
     def test_pretty_json(self) -> None:
         snap = _make_snapshot()
@@ -0,0 +1,281 @@
+"""Tests for the warm command daemon and the thin ``lattice`` client."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from lattice.daemon import socket_path
+
+# Runs the console entry point the way the installed ``lattice`` script does.
+_LATTICE = "import sys; sys.argv[0] = 'lattice'; from lattice.client import main; main()"
+
+# Reports whether the command was forwarded (None means it would run in-process).
+_FORWARD = (
+    "import sys; from lattice.client import forward; "
+    "print('forwarded:', forward(['lattice', *sys.argv[1:]]), file=sys.stderr)"
+)
+
+# Starts a daemon that also watches *probe*, standing in for an edited lattice module.
+_SERVE_WITH_PROBE = (
+    "import sys, types\n"
+    "from pathlib import Path\n"
+    "probe = types.ModuleType('lattice._probe')\n"
+    "probe.__file__ = sys.argv[2]\n"
+    "sys.modules['lattice._probe'] = probe\n"
+    "from lattice.daemon import serve\n"
+    "serve(Path(sys.argv[1]), idle_timeout=60)\n"
+)
+
+
+@pytest.fixture()
+def project(initialized_root: Path) -> Path:
+    lattice_dir = initialized_root / ".lattice"
+    config = json.loads((lattice_dir / "config.json").read_text())
+    config["project_code"] = "DMN"
+    (lattice_dir / "config.json").write_text(json.dumps(config))
+    return initialized_root
+
+
+@pytest.fixture()
+def env(monkeypatch):
+    # Socket paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    run_dir = tempfile.mkdtemp(prefix="lattice-daemon-test-")
+    monkeypatch.setenv("LATTICE_DAEMON_DIR", run_dir)
+    monkeypatch.delenv("LATTICE_NO_DAEMON", raising=False)
+    monkeypatch.delenv("LATTICE_ROOT", raising=False)
+    environ = {**os.environ, "LATTICE_NO_UPDATE_CHECK": "1"}
+    yield environ
+    shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def _lattice(project: Path, env: dict, *args: str, in_process: bool = False, code=_LATTICE):
+    if in_process:
+        env = {**env, "LATTICE_NO_DAEMON": "1"}
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        check=False,
+        timeout=60,
+    )
+
+
+def _wait_for_socket(path: Path, proc: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        assert proc.poll() is None, proc.stderr.read().decode() if proc.stderr else ""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(path))
+                return
+            except OSError:
+                time.sleep(0.05)
+    raise AssertionError("daemon did not start listening")
+
+
+def _start(project: Path, env: dict, *cmd: str) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, *cmd],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    _wait_for_socket(socket_path(project / ".lattice"), proc)
+    return proc
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.terminate()
+    proc.wait(timeout=10)
+    if proc.stderr:
+        proc.stderr.close()
+
+
+@pytest.fixture()
+def daemon(project: Path, env: dict):
+    proc = _start(project, env, "-m", "lattice.daemon", str(project / ".lattice"))
+    yield proc
+    _stop(proc)
+
+
+def _create(project: Path, env: dict, title: str) -> None:
+    result = _lattice(project, env, "create", title, "--actor", "human:test", in_process=True)
+    assert result.returncode == 0, result.stderr
+
+
+# ---------------------------------------------------------------------------
+# Forwarding
+# ---------------------------------------------------------------------------
+
+
+class TestForwarding:
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ("list",),
+            ("show", "DMN-1"),
+            ("show", "DMN-1", "--json"),
+            ("show", "DMN-99"),
+            ("show", "DMN-99", "--json"),
+            ("show",),
+            ("--help",),
+            ("status", "--help"),
+            ("no-such-command",),
+        ],
+    )
+    def test_output_matches_in_process(self, project, env, daemon, args) -> None:
+        _create(project, env, "Warm start")
+        forwarded = _lattice(project, env, *args)
+        in_process = _lattice(project, env, *args, in_process=True)
+        assert forwarded.stdout == in_process.stdout
+        assert forwarded.stderr == in_process.stderr
+        assert forwarded.returncode == in_process.returncode
+
+    def test_commands_run_in_the_daemon(self, project, env, daemon) -> None:
+        _create(project, env, "Warm start")
+        result = _lattice(project, env, "show", "DMN-1", "--json", code=_FORWARD)
+        assert result.stderr.decode().strip() == "forwarded: 0"
+        assert json.loads(result.stdout)["data"]["title"] == "Warm start"
+
+    def test_writes_and_new_tasks_are_visible_both_ways(self, project, env, daemon) -> None:
+        _create(project, env, "First")
+        result = _lattice(project, env, "status", "DMN-1", "in_planning", "--actor", "human:t")
+        assert result.returncode == 0, result.stderr
+        shown = _lattice(project, env, "show", "DMN-1", "--json", in_process=True)
+        assert json.loads(shown.stdout)["data"]["status"] == "in_planning"
+
+        # Created after the daemon loaded the short ID map
+        _create(project, env, "Second")
+        result = _lattice(project, env, "show", "DMN-2", "--json", code=_FORWARD)
+        assert result.stderr.decode().strip() == "forwarded: 0"
+        assert json.loads(result.stdout)["data"]["title"] == "Second"
+
+    def test_runs_in_the_client_directory_with_its_environment(self, project, env, daemon) -> None:
+        _create(project, env, "Anywhere")
+        subdir = project / "nested" / "deeper"
+        subdir.mkdir(parents=True)
+        result = _lattice(subdir, {**env, "LATTICE_ROOT": str(project)}, "list", code=_FORWARD)
+        assert result.stderr.decode().strip() == "forwarded: 0"
+        assert b"Anywhere" in result.stdout
+
+
+# ---------------------------------------------------------------------------
+# Fallback
+# ---------------------------------------------------------------------------
+
+
+class TestFallback:
+    def test_no_daemon_runs_in_process(self, project, env) -> None:
+        _create(project, env, "Cold start")
+        assert _lattice(project, env, "list", code=_FORWARD).stderr.strip() == b"forwarded: None"
+        result = _lattice(project, env, "list")
+        assert result.returncode == 0
+        assert b"Cold start" in result.stdout
+
+    def test_no_daemon_leaves_no_socket_directory(self, project, env) -> None:
+        run_dir = Path(env["LATTICE_DAEMON_DIR"]) / "never-created"
+        cold = {**env, "LATTICE_DAEMON_DIR": str(run_dir)}
+        assert _lattice(project, cold, "list", code=_FORWARD).stderr.strip() == b"forwarded: None"
+        assert _lattice(project, cold, "list").returncode == 0
+        assert not run_dir.exists()
+
+    def test_leftover_socket_runs_in_process(self, project, env) -> None:
+        path = socket_path(project / ".lattice")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as dead:
+            dead.bind(str(path))  # bound, never listening
+        result = _lattice(project, env, "list")
+        assert result.returncode == 0
+        assert result.stderr == b""
+
+    def test_opt_out_and_outside_a_project(self, project, env, daemon, tmp_path_factory) -> None:
+        no_daemon = {**env, "LATTICE_NO_DAEMON": "1"}
+        assert _lattice(project, no_daemon, "list", code=_FORWARD).stderr.strip() == (
+            b"forwarded: None"
+        )
+        elsewhere = tmp_path_factory.mktemp("elsewhere")
+        assert _lattice(elsewhere, env, "list", code=_FORWARD).stderr.strip() == (
+            b"forwarded: None"
+        )
+
+    def test_daemon_exits_when_lattice_code_changes(self, project, env, tmp_path) -> None:
+        probe = tmp_path / "probe.py"
+        probe.write_text("# v1\n")
+        proc = _start(project, env, "-c", _SERVE_WITH_PROBE, str(project / ".lattice"), str(probe))
+        try:
+            assert _lattice(project, env, "list", code=_FORWARD).stderr.strip() == b"forwarded: 0"
+            probe.write_text("# v2, edited\n")
+            result = _lattice(project, env, "list", code=_FORWARD)
+            assert result.stderr.strip() == b"forwarded: None"
+            proc.wait(timeout=10)
+        finally:
+            _stop(proc)
+        assert not socket_path(project / ".lattice").exists()
+
+
+# ---------------------------------------------------------------------------
+# lattice daemon start / status / stop
+# ---------------------------------------------------------------------------
+
+
+class TestDaemonCommands:
+    def test_start_status_stop(self, project, env) -> None:
+        def daemon_cmd(*args: str) -> tuple[dict, int]:
+            result = _lattice(project, env, "daemon", *args, "--json")
+            return json.loads(result.stdout), result.returncode
+
+        status, _ = daemon_cmd("status")
+        assert status["data"]["running"] is False
+
+        started, code = daemon_cmd("start", "--idle-timeout", "60")
+        assert code == 0
+        pid = started["data"]["pid"]
+        try:
+            status, _ = daemon_cmd("status")
+            assert status["data"] == {
+                "running": True,
+                "pid": pid,
+                "socket": str(socket_path(project / ".lattice")),
+            }
+            again, code = daemon_cmd("start")
+            assert code == 1
+            assert again["error"]["code"] == "ALREADY_RUNNING"
+            assert _lattice(project, env, "list", code=_FORWARD).stderr.strip() == (
+                b"forwarded: 0"
+            )
+        finally:
+            stopped, code = daemon_cmd("stop")
+        assert code == 0
+        assert stopped["data"]["pid"] == pid
+
+        status, _ = daemon_cmd("status")
+        assert status["data"]["running"] is False
+        missing, code = daemon_cmd("stop")
+        assert code == 1
+        assert missing["error"]["code"] == "NOT_RUNNING"
+
+    def test_idle_daemon_exits(self, project, env) -> None:
+        result = _lattice(project, env, "daemon", "start", "--idle-timeout", "0.5", "--json")
+        assert result.returncode == 0, result.stderr
+        pid = json.loads(result.stdout)["data"]["pid"]
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        status = _lattice(project, env, "daemon", "status", "--json")
+        assert json.loads(status.stdout)["data"]["running"] is False
@@ -0,0 +1,155 @@
+"""Tests for the (ts, id) activity index and cursor pagination."""
+
+from __future__ import annotations
+
+import json
+import random
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from lattice.dashboard.activity_index import (
+    ActivityIndex,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+TYPES = ["task_created", "status_changed", "comment_added", "field_updated"]
+ACTORS = ["human:alice", "human:bob", "agent:claude"]
+TASKS = [f"task_{n:026d}" for n in range(6)]
+
+
+def _events(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    events = []
+    for n in range(count):
+        # Few distinct timestamps, so (ts, id) ties on ts are common
+        events.append(
+            {
+                "id": f"ev_{n:026d}",
+                "ts": f"2026-01-{rng.randint(1, 9):02d}T00:00:00Z",
+                "type": rng.choice(TYPES),
+                "task_id": rng.choice(TASKS),
+                "actor": rng.choice(ACTORS),
+                "data": {},
+            }
+        )
+    return events
+
+
+def _brute_force(
+    events: list[dict], *, types=None, task_id=None, actor=None, after=None, before=None
+) -> list[dict]:
+    result = sorted(events, key=lambda e: (e["ts"], e["id"]), reverse=True)
+    return [
+        e
+        for e in result
+        if (not types or e["type"] in types)
+        and (not task_id or e["task_id"] == task_id)
+        and (not actor or e["actor"] == actor)
+        and (not after or e["ts"] > after)
+        and (not before or e["ts"] < before)
+    ]
+
+
+class TestCursor:
+    def test_round_trip(self) -> None:
+        key = ("2026-01-01T00:00:00Z", "ev_01ABC")
+        assert decode_cursor(encode_cursor(key)) == key
+
+    @pytest.mark.parametrize("cursor", ["", "!!!", "bm90anNvbg", encode_cursor(("a", "b"))[:-3]])
+    def test_rejects_malformed(self, cursor: str) -> None:
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
+
+
+class TestActivityIndex:
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {"types": {"comment_added"}},
+            {"types": {"comment_added", "status_changed"}, "actor": "human:bob"},
+            {"task_id": TASKS[2], "after": "2026-01-03T00:00:00Z"},
+            {"actor": "agent:claude", "before": "2026-01-05T00:00:00Z"},
+            {"task_id": "task_missing"},
+            {"after": "2026-01-09T00:00:00Z"},
+        ],
+    )
+    def test_matches_brute_force(self, filters: dict) -> None:
+        events = _events(400)
+        index = ActivityIndex(events)
+        expected = _brute_force(events, **filters)
+
+        page, total, has_more = index.query(**filters, offset=5, limit=20)
+        assert total == len(expected)
+        assert [e["id"] for e in page] == [e["id"] for e in expected[5:25]]
+        assert has_more is (len(expected) > 25)
+
+    def test_cursor_walks_every_match_once(self) -> None:
+        events = _events(300)
+        index = ActivityIndex(events)
+        expected = _brute_force(events, types={"status_changed", "field_updated"})
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page, total, has_more = index.query(
+                types={"status_changed", "field_updated"}, cursor=cursor, limit=17
+            )
+            assert total == len(expected)
+            seen.extend(e["id"] for e in page)
+            if not has_more:
+                break
+            cursor = decode_cursor(index.cursor_after(page[-1]))
+        assert seen == [e["id"] for e in expected]
+
+    def test_cursor_is_stable_when_newer_events_arrive(self) -> None:
+        events = _events(50)
+        first, _, _ = ActivityIndex(events).query(limit=10)
+        cursor = decode_cursor(encode_cursor((first[-1]["ts"], first[-1]["id"])))
+
+        newer = {**events[0], "id": "ev_zzz", "ts": "2026-02-01T00:00:00Z"}
+        before, _, _ = ActivityIndex(events).query(cursor=cursor, limit=10)
+        after, _, _ = ActivityIndex([*events, newer]).query(cursor=cursor, limit=10)
+        assert [e["id"] for e in after] == [e["id"] for e in before]
+
+    def test_facets(self) -> None:
+        index = ActivityIndex(_events(200))
+        facets = index.facets()
+        assert facets["types"] == sorted(TYPES)
+        assert facets["actors"] == sorted(ACTORS)
+        assert facets["task_ids"] == TASKS
+
+
+class TestActivityCursorEndpoint:
+    def _get(self, base_url: str, query: str) -> dict:
+        with urlopen(f"{base_url}/api/activity?{query}") as resp:
+            return json.loads(resp.read())["data"]
+
+    def test_cursor_pages_cover_the_offset_listing(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        everything = self._get(base_url, "limit=200&after=2000-01-01")
+        assert everything["next_cursor"] is None
+
+        ids: list[str] = []
+        query = "limit=3&after=2000-01-01"
+        while True:
+            data = self._get(base_url, query)
+            ids.extend(e["id"] for e in data["events"])
+            assert data["total"] == everything["total"]
+            if not data["has_more"]:
+                assert data["next_cursor"] is None
+                break
+            query = f"limit=3&after=2000-01-01&cursor={data['next_cursor']}"
+        assert ids == [e["id"] for e in everything["events"]]
+
+    def test_invalid_cursor_is_rejected(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        with pytest.raises(HTTPError) as exc_info:
+            urlopen(f"{base_url}/api/activity?cursor=not-a-cursor")
+        assert exc_info.value.code == 400
+        body = json.loads(exc_info.value.read())
+        assert body["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,114 @@
+"""Tests for concurrent request handling and keep-alive in the dashboard server."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+from lattice.dashboard import server as server_mod
+from lattice.dashboard.server import create_server
+
+
+def _connect(base_url: str) -> http.client.HTTPConnection:
+    parsed = urlparse(base_url)
+    return http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+
+
+def _get(conn: http.client.HTTPConnection, path: str) -> tuple[int, dict]:
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    return resp.status, json.loads(resp.read())
+
+
+class TestKeepAlive:
+    def test_requests_reuse_one_connection(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        conn = _connect(base_url)
+        try:
+            status, _ = _get(conn, "/api/tasks")
+            assert status == 200
+            sock = conn.sock
+            for path in ("/api/config", "/api/stats", "/api/graph", "/api/nope"):
+                _get(conn, path)
+                assert conn.sock is sock
+        finally:
+            conn.close()
+
+    def test_server_close_does_not_wait_for_idle_connections(self, populated_lattice_dir) -> None:
+        ld, _ids = populated_lattice_dir
+        server = create_server(ld, "127.0.0.1", 0)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        thread.start()
+        conn = _connect(f"http://127.0.0.1:{server.server_address[1]}")
+        try:
+            assert _get(conn, "/api/tasks")[0] == 200
+            server.shutdown()
+            start = time.monotonic()
+            server.server_close()
+            assert time.monotonic() - start < 2
+        finally:
+            conn.close()
+
+
+class TestConcurrency:
+    def test_slow_request_does_not_block_others(self, dashboard_server, monkeypatch) -> None:
+        base_url, _ld, _ids = dashboard_server
+        release = threading.Event()
+        real_build = server_mod._build_graph
+
+        def slow_build(snapshots):
+            release.wait(10)
+            return real_build(snapshots)
+
+        monkeypatch.setattr(server_mod, "_build_graph", slow_build)
+        results: list[int] = []
+        slow = threading.Thread(
+            target=lambda: results.append(_get(_connect(base_url), "/api/graph")[0])
+        )
+        slow.start()
+        try:
+            conn = _connect(base_url)
+            assert _get(conn, "/api/tasks")[0] == 200
+            conn.close()
+            assert slow.is_alive()
+        finally:
+            release.set()
+            slow.join(10)
+        assert results == [200]
+
+    def test_concurrent_writes_to_one_task_are_all_applied(self, dashboard_server) -> None:
+        base_url, _ld, ids = dashboard_server
+        task_id = ids["backlog"]
+        errors: list[int] = []
+
+        def comment(n: int) -> None:
+            conn = _connect(base_url)
+            body = json.dumps({"body": f"comment {n}", "actor": "human:test"})
+            conn.request(
+                "POST",
+                f"/api/tasks/{task_id}/comment",
+                body=body,
+                headers={"Content-Type": "application/json"},
+            )
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                errors.append(resp.status)
+            conn.close()
+
+        threads = [threading.Thread(target=comment, args=(n,)) for n in range(12)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        assert errors == []
+        conn = _connect(base_url)
+        _, detail = _get(conn, f"/api/tasks/{task_id}")
+        conn.close()
+        assert detail["data"]["comment_count"] == 12
@@ -322,6 +322,16 @@ class TestGetRecentCommits:
         assert lat1_commit is not None
         assert "LAT-1" in lat1_commit["task_refs"]
 
+    def test_task_refs_from_commit_index(self, lattice_in_git_repo: Path, git_repo: Path):
+        scanned = get_recent_commits(git_repo, "feat/LAT-42-login")
+        indexed = get_recent_commits(
+            git_repo, "feat/LAT-42-login", lattice_dir=lattice_in_git_repo
+        )
+        assert indexed == scanned
+        assert (lattice_in_git_repo / "index" / "commits.db").exists()
+        # Revisions that are not local branch tips still scan messages
+        assert get_recent_commits(git_repo, "main~1", lattice_dir=lattice_in_git_repo)
+
     def test_feature_branch_commits(self, git_repo: Path):
         commits = get_recent_commits(git_repo, "feat/LAT-42-login")
         # Feature branch has 3 commits (2 from main + 1 feature)
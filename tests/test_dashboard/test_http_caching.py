@@ -0,0 +1,178 @@
+"""Tests for ETag/304 revalidation, gzip compression and static asset caching."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import re
+from urllib.parse import urlparse
+
+import pytest
+
+from lattice.dashboard.server import IMMUTABLE_CACHE_CONTROL, _accepts_gzip, _etag_matches
+
+READ_PATHS = [
+    "/api/config",
+    "/api/tasks",
+    "/api/archived",
+    "/api/activity",
+    "/api/stats",
+    "/api/graph",
+    "/",
+]
+
+
+def _request(
+    base_url: str, path: str, headers: dict | None = None, method: str = "GET", body=None
+) -> tuple[int, dict[str, str], bytes]:
+    parsed = urlparse(base_url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, {k.lower(): v for k, v in resp.getheaders()}, resp.read()
+    finally:
+        conn.close()
+
+
+class TestHeaderParsing:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ('W/"abc"', True),
+            ('"abc"', True),
+            ('"x", W/"abc"', True),
+            ("*", True),
+            ('W/"abcd"', False),
+            (None, False),
+        ],
+    )
+    def test_etag_matches_weakly(self, header, expected) -> None:
+        assert _etag_matches(header, 'W/"abc"') is expected
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip, deflate, br", True),
+            ("br;q=1.0, gzip;q=0.8", True),
+            ("gzip;q=0", False),
+            ("identity", False),
+            (None, False),
+        ],
+    )
+    def test_accepts_gzip(self, header, expected) -> None:
+        assert _accepts_gzip(header) is expected
+
+
+class TestConditionalRequests:
+    @pytest.mark.parametrize("path", READ_PATHS)
+    def test_revalidation_returns_304(self, dashboard_server, path: str) -> None:
+        base_url, _ld, _ids = dashboard_server
+        status, headers, body = _request(base_url, path)
+        assert status == 200 and body
+        etag = headers["etag"]
+
+        status, headers, body = _request(base_url, path, {"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+        assert headers["etag"] == etag
+
+    def test_task_endpoints_revalidate(self, dashboard_server) -> None:
+        base_url, ld, ids = dashboard_server
+        task_id = ids["backlog"]
+        for sub in ("", "/events", "/comments", "/full"):
+            path = f"/api/tasks/{task_id}{sub}"
+            _, headers, _ = _request(base_url, path)
+            status, _, _ = _request(base_url, path, {"If-None-Match": headers["etag"]})
+            assert status == 304, path
+
+        # Adding a note changes notes_exists, so the detail ETag must change
+        task_id = next(
+            ids[role]
+            for role in ("backlog", "in_progress", "done")
+            if not (ld / "notes" / f"{ids[role]}.md").exists()
+        )
+        path = f"/api/tasks/{task_id}"
+        _, headers, body = _request(base_url, path)
+        assert json.loads(body)["data"]["notes_exists"] is False
+        (ld / "notes" / f"{task_id}.md").write_text("# Notes\n")
+        status, _, body = _request(base_url, path, {"If-None-Match": headers["etag"]})
+        assert status == 200
+        assert json.loads(body)["data"]["notes_exists"] is True
+
+    def test_write_invalidates_etag(self, dashboard_server) -> None:
+        base_url, _ld, ids = dashboard_server
+        _, headers, _ = _request(base_url, "/api/tasks")
+        etag = headers["etag"]
+
+        status, _, _ = _request(
+            base_url,
+            f"/api/tasks/{ids['backlog']}/status",
+            {"Content-Type": "application/json"},
+            method="POST",
+            body=json.dumps({"status": "planned", "actor": "human:test"}),
+        )
+        assert status == 200
+
+        status, headers, body = _request(base_url, "/api/tasks", {"If-None-Match": etag})
+        assert status == 200
+        assert headers["etag"] != etag
+        tasks = {t["id"]: t for t in json.loads(body)["data"]}
+        assert tasks[ids["backlog"]]["status"] == "planned"
+
+    def test_errors_carry_no_etag(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        status, headers, _ = _request(base_url, "/api/tasks/task_NOPE")
+        assert status == 400
+        assert "etag" not in headers
+
+
+class TestCompression:
+    def test_gzip_matches_identity_and_is_smaller(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        plain_total = gzip_total = 0
+        for path in READ_PATHS:
+            _, plain_headers, plain = _request(base_url, path)
+            _, headers, compressed = _request(base_url, path, {"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in plain_headers
+            if len(plain) < 1024:
+                assert "content-encoding" not in headers, path
+                assert compressed == plain
+                continue
+            assert headers["content-encoding"] == "gzip", path
+            assert headers["vary"] == "Accept-Encoding"
+            assert int(headers["content-length"]) == len(compressed)
+            assert gzip.decompress(compressed) == plain, path
+            plain_total += len(plain)
+            gzip_total += len(compressed)
+        assert gzip_total < plain_total / 3
+
+    def test_small_bodies_are_not_compressed(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        status, headers, body = _request(base_url, "/api/nope", {"Accept-Encoding": "gzip"})
+        assert status == 404
+        assert "content-encoding" not in headers
+        assert json.loads(body)["ok"] is False
+
+
+class TestStaticAssets:
+    def test_index_links_versioned_assets(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        _, headers, body = _request(base_url, "/")
+        assert headers["cache-control"] == "no-cache"
+        refs = re.findall(r'(?:src|href)="(static/cube3d\.js\?v=([0-9a-f]+))"', body.decode())
+        assert refs, "index.html should reference cube3d.js with a content hash"
+        url, version = refs[0]
+
+        _, headers, _ = _request(base_url, f"/{url}")
+        assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert headers["etag"] == f'W/"{version}"'
+
+        # Unversioned or outdated URLs are revalidated instead
+        _, headers, _ = _request(base_url, "/static/cube3d.js?v=0000")
+        assert headers["cache-control"] == "no-cache"
+        status, _, body = _request(
+            base_url, "/static/cube3d.js", {"If-None-Match": headers["etag"]}
+        )
+        assert status == 304 and body == b""
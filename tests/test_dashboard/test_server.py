@@ -149,6 +149,14 @@ class TestTaskDetailEndpoint:
         assert "notes_exists" in data
         assert isinstance(data["artifacts"], list)
 
+    def test_task_detail_incoming_relationships(self, dashboard_server):
+        base_url, _ld, ids = dashboard_server
+        _status, body = _get(base_url, f"/api/tasks/{ids['backlog']}")
+        incoming = body["data"]["relationships_in"]
+        assert [r["source_task_id"] for r in incoming] == [ids["in_progress"]]
+        assert incoming[0]["type"] == "blocks"
+        assert incoming[0]["note"] == "needs new deps"
+
     def test_task_detail_with_notes(self, dashboard_server):
         base_url, _ld, ids = dashboard_server
         task_id = ids["backlog"]
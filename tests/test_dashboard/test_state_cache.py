@@ -0,0 +1,156 @@
+"""Tests for the dashboard's in-memory state cache."""
+
+from __future__ import annotations
+
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from lattice.dashboard import state_cache
+from lattice.dashboard.state_cache import StateCache
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+
+
+def _snap(task_id: str, title: str) -> str:
+    return json.dumps({"id": task_id, "title": title}) + "\n"
+
+
+def _event(n: int, ts: str) -> str:
+    return json.dumps({"id": f"ev_{n:02d}", "ts": ts, "type": "comment_added"}) + "\n"
+
+
+@pytest.fixture(params=["auto", "poll"])
+def cache(request, tmp_path: Path):
+    ensure_lattice_dirs(tmp_path)
+    state = StateCache(tmp_path / ".lattice", watch=request.param)
+    yield state
+    state.close()
+
+
+class TestStateCache:
+    def test_picks_up_creates_edits_and_deletes(self, cache: StateCache) -> None:
+        tasks = cache.lattice_dir / "tasks"
+        assert cache.snapshots() == []
+
+        atomic_write(tasks / "task_A.json", _snap("task_A", "one"))
+        (tasks / "task_B.json").write_text(_snap("task_B", "two"))
+        assert [s["title"] for s in cache.snapshots()] == ["one", "two"]
+
+        # In-place rewrite of the same size, straight after the previous write
+        (tasks / "task_B.json").write_text(_snap("task_B", "TWO"))
+        assert cache.snapshot("task_B")["title"] == "TWO"
+
+        (tasks / "task_A.json").unlink()
+        assert [s["id"] for s in cache.snapshots()] == ["task_B"]
+        assert cache.snapshot("task_A") is None
+
+    def test_views_are_memoized_until_a_dependency_changes(
+        self, cache: StateCache, monkeypatch
+    ) -> None:
+        # Trust fresh mtimes so polling does not re-read just-written files
+        monkeypatch.setattr(state_cache, "_RACY_WINDOW_NS", 0)
+        tasks = cache.lattice_dir / "tasks"
+        atomic_write(tasks / "task_A.json", _snap("task_A", "one"))
+        builds: list[int] = []
+
+        def build() -> int:
+            builds.append(1)
+            return len(cache.snapshots())
+
+        assert cache.view("count", ("tasks",), build) == 1
+        assert cache.view("count", ("tasks",), build) == 1
+        assert builds == [1]
+        # Changes elsewhere do not invalidate the view
+        (cache.lattice_dir / "events" / "task_A.jsonl").write_text(_event(1, "2025-01-01"))
+        assert cache.view("count", ("tasks",), build) == 1
+        assert builds == [1]
+
+        atomic_write(tasks / "task_B.json", _snap("task_B", "two"))
+        assert cache.view("count", ("tasks",), build) == 2
+        assert builds == [1, 1]
+
+        stats = cache.stats()
+        assert stats["views"]["count"] == {"hits": 2, "misses": 2}
+        assert stats["file_loads"]["tasks"] == 2
+
+    def test_events_newest_first(self, cache: StateCache) -> None:
+        events_dir = cache.lattice_dir / "events"
+        (events_dir / "task_A.jsonl").write_text(
+            "".join(_event(n, f"2025-01-{n:02d}") for n in range(1, 13))
+        )
+        (events_dir / "task_B.jsonl").write_text(_event(20, "2025-01-05"))
+        (cache.lattice_dir / "archive" / "events" / "task_C.jsonl").write_text(
+            _event(30, "2024-12-31")
+        )
+
+        tail = cache.events()
+        assert [e["id"] for e in tail][:3] == ["ev_12", "ev_11", "ev_10"]
+        assert len(tail) == 11  # last 10 of task_A + task_B
+
+        full = cache.events(full_scan=True)
+        assert len(full) == 14
+        assert full[-1]["id"] == "ev_30"
+
+        with open(events_dir / "task_B.jsonl", "a") as fh:
+            fh.write(_event(21, "2025-02-01"))
+        assert cache.events()[0]["id"] == "ev_21"
+
+    def test_missing_directory_is_watched_once_created(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        state = StateCache(ld)
+        try:
+            assert state.snapshots() == []
+            (ld / "tasks").mkdir()
+            atomic_write(ld / "tasks" / "task_A.json", _snap("task_A", "one"))
+            assert [s["id"] for s in state.snapshots()] == ["task_A"]
+            atomic_write(ld / "tasks" / "task_B.json", _snap("task_B", "two"))
+            assert len(state.snapshots()) == 2
+        finally:
+            state.close()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_uses_inotify_on_linux(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.delenv("LATTICE_DASHBOARD_WATCH", raising=False)
+        state = StateCache(tmp_path)
+        assert state.backend == "inotify"
+        state.close()
+        monkeypatch.setenv("LATTICE_DASHBOARD_WATCH", "poll")
+        assert StateCache(tmp_path).backend == "poll"
+
+
+class TestServerCache:
+    def _get(self, base_url: str, path: str) -> dict:
+        with urllib.request.urlopen(f"{base_url}{path}") as resp:
+            return json.loads(resp.read())
+
+    def test_repeat_gets_hit_the_cache(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        first = self._get(base_url, "/api/tasks")
+        second = self._get(base_url, "/api/tasks")
+        assert first == second
+
+        stats = self._get(base_url, "/api/cache")["data"]
+        assert stats["views"]["api:tasks"]["hits"] >= 1
+        assert stats["views"]["api:tasks"]["misses"] >= 1
+
+    def test_writes_are_visible_to_the_next_get(self, dashboard_server) -> None:
+        base_url, _ld, ids = dashboard_server
+        self._get(base_url, "/api/tasks")
+
+        req = urllib.request.Request(
+            f"{base_url}/api/tasks/{ids['backlog']}/status",
+            data=json.dumps({"status": "planned", "actor": "human:test"}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req) as resp:
+            assert resp.status == 200
+
+        tasks = {t["id"]: t for t in self._get(base_url, "/api/tasks")["data"]}
+        assert tasks[ids["backlog"]]["status"] == "planned"
+        detail = self._get(base_url, f"/api/tasks/{ids['backlog']}")["data"]
+        assert detail["status"] == "planned"
@@ -0,0 +1,257 @@
+"""Tests for the /api/stream change stream."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+from lattice.core.events import create_event
+from lattice.core.ids import generate_task_id
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.dashboard import change_stream
+from lattice.dashboard.change_stream import (
+    ChangeCursor,
+    ChangeNotifier,
+    format_position,
+    parse_position,
+)
+from lattice.dashboard.server import create_server
+from lattice.storage.changefeed import append_changes, last_record, rewrite_changes
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.operations import write_task_event
+
+
+def _created(task_id: str, title: str = "T") -> dict:
+    return create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": title, "status": "backlog", "priority": "medium", "type": "task"},
+    )
+
+
+def _updated(task_id: str, title: str) -> dict:
+    return create_event(
+        type="field_updated",
+        task_id=task_id,
+        actor="human:test",
+        data={"field": "title", "from": None, "to": title},
+    )
+
+
+def _read_snapshot(ld: Path, task_id: str, archived: bool) -> dict | None:
+    base = ld / "archive" / "tasks" if archived else ld / "tasks"
+    try:
+        return json.loads((base / f"{task_id}.json").read_text())
+    except FileNotFoundError:
+        return None
+
+
+@pytest.fixture()
+def ld(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    return tmp_path / ".lattice"
+
+
+def _cursor(ld: Path, seq: int = 0) -> ChangeCursor:
+    return ChangeCursor(ld, seq, lambda tid, archived: _read_snapshot(ld, tid, archived))
+
+
+class TestChangeCursor:
+    def test_pairs_each_task_with_its_latest_snapshot(self, ld: Path) -> None:
+        task_id = generate_task_id()
+        events = [_created(task_id), _updated(task_id, "renamed")]
+        snap = None
+        for e in events:
+            snap = apply_event_to_snapshot(snap, e)
+        write_task_event(ld, task_id, events, snap)
+
+        messages = _cursor(ld).poll()
+        assert [m["seq"] for m in messages] == [1, 2]
+        assert "task" not in messages[0]  # superseded within the batch
+        assert messages[1]["task"]["title"] == "renamed"
+        assert messages[1]["event"]["id"] == events[1]["id"]
+        assert "seq" not in messages[1]["event"] and "gen" not in messages[1]["event"]
+
+    def test_holds_record_until_snapshot_is_written(self, ld: Path) -> None:
+        task_id = generate_task_id()
+        event = _created(task_id, "pending")
+        append_changes(ld, [event])  # feed first, snapshot not yet written
+        cursor = _cursor(ld)
+
+        assert cursor.poll() == []
+        assert cursor.held and cursor.seq == 0
+
+        snap = apply_event_to_snapshot(None, event)
+        atomic_write(ld / "tasks" / f"{task_id}.json", serialize_snapshot(snap))
+        messages = cursor.poll()
+        assert [m["task"]["title"] for m in messages] == ["pending"]
+        assert not cursor.held and cursor.seq == 1
+
+    def test_gives_up_waiting_after_settle_time(self, ld: Path, monkeypatch) -> None:
+        monkeypatch.setattr(change_stream, "SETTLE_SECONDS", 0.0)
+        task_id = generate_task_id()
+        append_changes(ld, [_created(task_id)])
+
+        messages = _cursor(ld).poll()
+        assert [m["seq"] for m in messages] == [1]
+        assert messages[0]["task"] is None
+
+    def test_resumes_after_sequence_number(self, ld: Path) -> None:
+        for n in range(3):
+            task_id = generate_task_id()
+            event = _created(task_id, f"t{n}")
+            write_task_event(ld, task_id, [event], apply_event_to_snapshot(None, event))
+
+        assert [m["task"]["title"] for m in _cursor(ld, 1).poll()] == ["t1", "t2"]
+
+    def test_resets_when_the_feed_is_regenerated(self, ld: Path) -> None:
+        events = []
+        for n in range(3):
+            task_id = generate_task_id()
+            events.append(_created(task_id, f"t{n}"))
+            write_task_event(ld, task_id, [events[-1]], apply_event_to_snapshot(None, events[-1]))
+        cursor = _cursor(ld)
+        assert len(cursor.poll()) == 3
+        old_generation = cursor.generation
+
+        # rebuild --all renumbers from 1; seq 2 now means something else
+        rewrite_changes(ld, events[1:])
+        assert cursor.poll() == []
+        assert cursor.reset and cursor.seq == 2
+        assert cursor.generation not in ("", old_generation)
+
+        task_id = generate_task_id()
+        event = _created(task_id, "after")
+        write_task_event(ld, task_id, [event], apply_event_to_snapshot(None, event))
+        messages = cursor.poll()
+        assert not cursor.reset
+        assert [(m["seq"], m["task"]["title"]) for m in messages] == [(3, "after")]
+
+
+class TestPositions:
+    def test_round_trip(self) -> None:
+        assert format_position("", 5) == "5"
+        assert format_position("abc", 0) == "0"
+        assert parse_position(format_position("abc", 7)) == ("abc", 7)
+        assert parse_position("7") == (None, 7)
+        assert parse_position("abc") is None
+        assert parse_position("abc:-1") is None
+
+
+class TestChangeNotifier:
+    @pytest.mark.parametrize("watch", ["auto", "poll"])
+    def test_wakes_on_feed_append(self, ld: Path, watch: str) -> None:
+        notifier = ChangeNotifier(ld, watch=watch, poll_interval=0.05)
+        try:
+            generation = notifier.generation
+            assert notifier.wait(generation, 0.2) is False
+            append_changes(ld, [_created(generate_task_id())])
+            assert notifier.wait(generation, 5) is True
+        finally:
+            notifier.close()
+
+
+def _read_messages(resp: http.client.HTTPResponse, count: int) -> list[dict]:
+    """Read *count* SSE messages as {"id", "event", "data"} dicts (comments skipped)."""
+    messages: list[dict] = []
+    current: dict = {}
+    while len(messages) < count:
+        line = resp.fp.readline().decode().rstrip("\n")
+        if not line:
+            if current:
+                messages.append(current)
+                current = {}
+            continue
+        field, _, value = line.partition(": ")
+        if field in ("id", "event", "data"):
+            current[field] = value
+    return messages
+
+
+def _open_stream(base_url: str, query: str = "", headers: dict | None = None):
+    parsed = urlparse(base_url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    conn.request("GET", f"/api/stream{query}", headers=headers or {})
+    return conn, conn.getresponse()
+
+
+def _post_status(base_url: str, task_id: str, status: str) -> None:
+    parsed = urlparse(base_url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    conn.request(
+        "POST",
+        f"/api/tasks/{task_id}/status",
+        body=json.dumps({"status": status, "actor": "human:test"}),
+        headers={"Content-Type": "application/json"},
+    )
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    assert resp.status == 200
+
+
+class TestStreamEndpoint:
+    def test_pushes_changes_and_resumes_from_last_event_id(self, dashboard_server) -> None:
+        base_url, ld, ids = dashboard_server
+        conn, resp = _open_stream(base_url)
+        try:
+            assert resp.status == 200
+            assert resp.getheader("Content-Type").startswith("text/event-stream")
+            ready = _read_messages(resp, 1)[0]
+            assert ready["event"] == "ready" and ready["id"] == "0"
+
+            _post_status(base_url, ids["backlog"], "planned")
+            change = _read_messages(resp, 1)[0]
+        finally:
+            conn.close()
+        data = json.loads(change["data"])
+        generation = last_record(ld)["gen"]
+        assert change["event"] == "change" and change["id"] == f"{generation}:{data['seq']}"
+        assert data["event"]["type"] == "status_changed"
+        assert data["task"]["id"] == ids["backlog"]
+        assert data["task"]["status"] == "planned"
+
+        # A reconnect sees only what it missed
+        _post_status(base_url, ids["backlog"], "in_progress")
+        conn, resp = _open_stream(base_url, headers={"Last-Event-ID": change["id"]})
+        try:
+            ready, missed = _read_messages(resp, 2)
+        finally:
+            conn.close()
+        assert ready["id"] == change["id"]
+        missed_data = json.loads(missed["data"])
+        assert missed_data["seq"] == data["seq"] + 1
+        assert missed_data["task"]["status"] == "in_progress"
+
+    def test_rejects_invalid_position(self, dashboard_server) -> None:
+        base_url, _ld, _ids = dashboard_server
+        conn, resp = _open_stream(base_url, "?since=abc")
+        try:
+            assert resp.status == 400
+            assert json.loads(resp.read())["error"]["code"] == "VALIDATION_ERROR"
+        finally:
+            conn.close()
+
+    def test_server_close_ends_open_streams(self, populated_lattice_dir) -> None:
+        ld, _ids = populated_lattice_dir
+        server = create_server(ld, "127.0.0.1", 0)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        thread.start()
+        conn, resp = _open_stream(f"http://127.0.0.1:{server.server_address[1]}")
+        try:
+            _read_messages(resp, 1)
+            server.shutdown()
+            start = time.monotonic()
+            server.server_close()
+            assert time.monotonic() - start < 3
+        finally:
+            conn.close()
@@ -0,0 +1,183 @@
+"""Tests for lattice.git_session — the shared read-only git session."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lattice.git_session import close_sessions, find_repo, get_session
+
+
+def _git(repo: Path, *args: str, date: str | None = None) -> str:
+    env = dict(os.environ)
+    if date:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = date
+    result = subprocess.run(
+        ["git", *args], cwd=str(repo), check=True, capture_output=True, text=True, env=env
+    )
+    return result.stdout.strip()
+
+
+def _commit(repo: Path, message: str, date: str) -> str:
+    _git(repo, "commit", "--allow-empty", "-q", "-m", message, date=date)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sessions():
+    close_sessions()
+    yield
+    close_sessions()
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    """A repo with a merged side branch, an annotated tag and a remote."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "--initial-branch=main")
+    _git(repo, "config", "user.email", "dev@example.com")
+    _git(repo, "config", "user.name", "Dev")
+    _commit(repo, "Initial commit", "2025-01-10T10:00:00+00:00")
+    _git(repo, "checkout", "-q", "-b", "side/LAT-7")
+    _commit(repo, "Side work LAT-7\n\nDetails here.", "2025-01-10T12:00:00+00:00")
+    _git(repo, "checkout", "-q", "main")
+    _commit(repo, "Main work", "2025-01-10T11:00:00+00:00")
+    _git(
+        repo,
+        "merge",
+        "-q",
+        "--no-ff",
+        "side/LAT-7",
+        "-m",
+        "Merge side",
+        date="2025-01-10T13:00:00+00:00",
+    )
+    _git(repo, "tag", "-a", "v1", "-m", "release", "HEAD~1")
+    _git(repo, "remote", "add", "origin", "https://example.com/repo.git")
+    return repo
+
+
+class TestDiscovery:
+    def test_finds_repo_from_subdir(self, repo: Path) -> None:
+        (repo / "sub").mkdir()
+        root, git_dir, common_dir = find_repo(repo / "sub")
+        assert root == repo
+        assert git_dir == common_dir == repo / ".git"
+
+    def test_worktree_uses_common_dir(self, repo: Path, tmp_path: Path) -> None:
+        _git(repo, "worktree", "add", "-q", str(tmp_path / "wt"), "side/LAT-7")
+        session = get_session(tmp_path / "wt")
+        assert session is not None
+        assert session.common_dir == (repo / ".git").resolve()
+        assert session.current_branch() == "side/LAT-7"
+        assert "main" in session.branches()
+
+    def test_not_a_repo(self, tmp_path: Path) -> None:
+        assert find_repo(tmp_path) is None
+        assert get_session(tmp_path) is None
+
+    def test_reftable_repos_have_no_session(self, repo: Path) -> None:
+        (repo / ".git" / "reftable").mkdir()
+        assert get_session(repo) is None
+
+
+class TestRefs:
+    def test_head_and_branches_follow_the_disk(self, repo: Path) -> None:
+        session = get_session(repo)
+        assert session is get_session(repo / ".git")  # one shared session per repo
+        assert session.current_branch() == "main"
+        assert session.branches()["main"] == _git(repo, "rev-parse", "main")
+
+        # Packed refs, then a loose ref shadowing a packed one
+        _git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+        assert session.branches()["main"] == _git(repo, "rev-parse", "main")
+        new_tip = _commit(repo, "After packing", "2025-01-11T10:00:00+00:00")
+        assert session.branches()["main"] == new_tip
+
+        _git(repo, "checkout", "-q", "--detach")
+        assert session.current_branch() is None
+        assert session.head()[1] == new_tip
+
+    def test_resolve(self, repo: Path) -> None:
+        session = get_session(repo)
+        tagged = _git(repo, "rev-parse", "v1^{commit}")
+        assert session.resolve("v1") == tagged
+        _git(repo, "pack-refs", "--all")
+        assert session.resolve("v1") == tagged
+        assert session.resolve("heads/main") == _git(repo, "rev-parse", "main")
+        assert session.resolve("HEAD") == _git(repo, "rev-parse", "HEAD")
+        assert session.resolve("main~1") is None
+        assert session.resolve("missing") is None
+
+    def test_remote_url(self, repo: Path) -> None:
+        session = get_session(repo)
+        assert session.remote_url() == "https://example.com/repo.git"
+        assert session.remote_url("upstream") is None
+        _git(repo, "config", "url.https://mirror.example.com/.insteadOf", "https://example.com/")
+        assert session.remote_url() == "https://mirror.example.com/repo.git"
+
+
+class TestObjects:
+    def test_log_matches_git_log(self, repo: Path) -> None:
+        session = get_session(repo)
+        expected = _git(repo, "log", "--format=%H", "main").splitlines()
+        commits = session.log(session.resolve("main"), limit=10)
+        assert [c["sha"] for c in commits] == expected
+        assert [c["sha"] for c in session.log(session.resolve("main"), limit=2)] == expected[:2]
+
+        side = next(c for c in commits if c["subject"] == "Side work LAT-7")
+        assert side["body"] == "Details here."
+        assert side["author_name"] == "Dev"
+        assert side["author_email"] == "dev@example.com"
+        assert side["author_date"] == "2025-01-10T12:00:00+00:00"
+        assert len(commits[0]["parents"]) == 2
+
+    def test_warm_session_spawns_no_processes(self, repo: Path, monkeypatch) -> None:
+        session = get_session(repo)
+        session.log(session.resolve("main"), limit=10)
+        session.commit_count()
+        session.abbrev()
+
+        def no_spawn(*args, **kwargs):
+            raise AssertionError(f"unexpected git process: {args[0]}")
+
+        monkeypatch.setattr(subprocess, "Popen", no_spawn)
+        monkeypatch.setattr(subprocess, "run", no_spawn)
+        assert session.commit_count() == 4
+        assert session.abbrev() >= 7
+        assert len(session.log(session.resolve("main"), limit=10)) == 4
+        assert session.current_branch() == "main"
+        assert session.remote_url() == "https://example.com/repo.git"
+
+    def test_cat_file_process_is_restarted(self, repo: Path) -> None:
+        session = get_session(repo)
+        sha = session.resolve("main")
+        session.close()
+        session._commits.clear()
+        assert session.commit(sha)["subject"] == "Merge side"
+        assert session.commit("0" * 40) is None
+
+    def test_commit_cache_is_bounded(self, repo: Path, monkeypatch) -> None:
+        from lattice import git_session
+
+        monkeypatch.setattr(git_session, "_COMMIT_CACHE_SIZE", 2)
+        session = get_session(repo)
+        expected = _git(repo, "log", "--format=%H", "main").splitlines()
+        commits = session.log(session.resolve("main"), limit=10)
+        assert [c["sha"] for c in commits] == expected
+        assert len(session._commits) == 2
+
+
+class TestAbbrev:
+    def test_follows_git_auto_abbreviation(self, repo: Path) -> None:
+        session = get_session(repo)
+        assert session.abbrev() == len(_git(repo, "rev-parse", "--short", "HEAD"))
+
+    def test_numeric_core_abbrev(self, repo: Path) -> None:
+        _git(repo, "config", "core.abbrev", "12")
+        assert get_session(repo).abbrev() == 12
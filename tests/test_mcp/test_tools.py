@@ -12,12 +12,15 @@ from lattice.mcp.tools import (
     lattice_assign,
     lattice_attach,
     lattice_comment,
+    lattice_comment_delete,
+    lattice_comment_edit,
     lattice_config,
     lattice_create,
     lattice_doctor,
     lattice_event,
     lattice_link,
     lattice_list,
+    lattice_search,
     lattice_show,
     lattice_status,
     lattice_unarchive,
@@ -350,6 +353,61 @@ class TestList:
         assert result[0]["title"] == "High"
 
 
+class TestSearch:
+    """Tests for lattice_search tool."""
+
+    def test_ranks_title_matches_first(self, lattice_env: Path):
+        body_hit = lattice_create(
+            title="Refactor settings page",
+            actor="human:test",
+            description="Also fixes the login timeout",
+        )
+        title_hit = lattice_create(title="Login timeout on slow networks", actor="human:test")
+        lattice_create(title="Unrelated", actor="human:test")
+
+        result = lattice_search(query="login timeout")
+        assert [h["task_id"] for h in result if h["kind"] == "task"] == [
+            title_hit["id"],
+            body_hit["id"],
+        ]
+        assert result[0]["short_id"] == title_hit["short_id"]
+        assert "[timeout]" in result[0]["snippet"].lower()
+
+    def test_follows_comment_edits_and_deletes(self, lattice_env: Path, lattice_dir: Path):
+        task = lattice_create(title="Task", actor="human:test")
+        lattice_comment(task_id=task["id"], text="first draft wording", actor="human:test")
+        comment_id = json.loads(
+            (lattice_dir / "events" / f"{task['id']}.jsonl").read_text().splitlines()[-1]
+        )["id"]
+        assert [h["ref"] for h in lattice_search(query="draft")] == [comment_id]
+
+        lattice_comment_edit(
+            task_id=task["id"], comment_id=comment_id, new_text="final text", actor="human:test"
+        )
+        assert lattice_search(query="draft") == []
+        assert [h["kind"] for h in lattice_search(query="final")] == ["comment"]
+
+        lattice_comment_delete(task_id=task["id"], comment_id=comment_id, actor="human:test")
+        assert lattice_search(query="final") == []
+
+    def test_archived_tasks_need_opt_in(self, lattice_env: Path):
+        task = lattice_create(title="Archived search target", actor="human:test")
+        lattice_status(
+            task_id=task["id"], new_status="done", actor="human:test", force=True, reason="test"
+        )
+        lattice_archive(task_id=task["id"], actor="human:test")
+
+        assert lattice_search(query="target") == []
+        hits = lattice_search(query="target", include_archived=True)
+        # The untouched scaffolded plan is not indexed
+        assert [h["kind"] for h in hits] == ["task"]
+        assert all(h["task_id"] == task["id"] and h["archived"] for h in hits)
+
+    def test_invalid_kind(self, lattice_env: Path):
+        with pytest.raises(ValueError, match="Invalid kind"):
+            lattice_search(query="x", kinds=["task", "bogus"])
+
+
 class TestShow:
     """Tests for lattice_show tool."""
 
@@ -376,6 +434,26 @@ class TestShow:
         with pytest.raises(ValueError, match="not found"):
             lattice_show(task_id="task_00000000000000000000000099")
 
+    def test_show_incoming_relationships(self, lattice_env: Path):
+        source = lattice_create(title="Source", actor="human:test")
+        target = lattice_create(title="Target", actor="human:test")
+        lattice_link(
+            source_id=source["id"],
+            relationship_type="blocks",
+            target_id=target["id"],
+            actor="human:test",
+        )
+        result = lattice_show(task_id=target["id"], include_events=False)
+        assert result["relationships_in"] == [
+            {
+                "source_task_id": source["id"],
+                "source_title": "Source",
+                "type": "blocks",
+                "note": None,
+            }
+        ]
+        assert lattice_show(task_id=source["id"])["relationships_in"] == []
+
 
 class TestConfig:
     """Tests for lattice_config tool."""
@@ -0,0 +1,175 @@
+"""Tests for lattice.storage.changefeed — the global ordered event feed."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event, create_resource_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.changefeed import (
+    CHANGEFEED_LOCK,
+    append_changes,
+    changefeed_path,
+    feed_end,
+    last_seq,
+    read_since,
+    rewrite_changes,
+)
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs, jsonl_append_many
+from lattice.storage.locks import LockTimeout, lattice_lock
+from lattice.storage.operations import write_resource_event, write_task_event
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _comment(task_id: str, n: int) -> dict:
+    return create_event(
+        type="comment_added", task_id=task_id, actor="human:test", data={"body": f"c{n}"}
+    )
+
+
+class TestChangefeed:
+    def test_task_writes_get_consecutive_seqs(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        created = create_event(
+            type="task_created",
+            task_id=TASK_A,
+            actor="human:test",
+            data={"title": "A", "status": "backlog", "priority": "medium", "type": "task"},
+        )
+        snap = apply_event_to_snapshot(None, created)
+        write_task_event(ld, TASK_A, [created], snap)
+        comments = [_comment(TASK_A, 1), _comment(TASK_A, 2)]
+        for ev in comments:
+            snap = apply_event_to_snapshot(snap, ev)
+        write_task_event(ld, TASK_A, comments, snap)
+
+        records = read_since(ld)
+        assert [r["seq"] for r in records] == [1, 2, 3]
+        assert [r["id"] for r in records] == [created["id"], comments[0]["id"], comments[1]["id"]]
+        assert last_seq(ld) == 3
+
+    def test_resource_events_are_included(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        event = create_resource_event(
+            type="resource_created",
+            resource_id="res_01AAAAAAAAAAAAAAAAAAAAAAAAAA",
+            actor="human:test",
+            data={"name": "gpu"},
+        )
+        write_resource_event(
+            ld, "res_01AAAAAAAAAAAAAAAAAAAAAAAAAA", "gpu", [event], {"name": "gpu"}
+        )
+
+        assert [r["type"] for r in read_since(ld)] == ["resource_created"]
+
+    def test_read_since_and_limit(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        append_changes(ld, [_comment(TASK_A, n) for n in range(2000)])
+
+        assert [r["seq"] for r in read_since(ld, 1995)] == [1996, 1997, 1998, 1999, 2000]
+        assert [r["seq"] for r in read_since(ld, 10, limit=3)] == [11, 12, 13]
+        assert read_since(ld, 2000) == []
+        assert len(read_since(ld, 0)) == 2000
+
+    def test_read_since_skips_corrupt_lines(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        append_changes(ld, [_comment(TASK_A, n) for n in range(500)])
+        with changefeed_path(ld).open("a") as fh:
+            fh.write("{CORRUPT\n")
+        append_changes(ld, [_comment(TASK_A, 500)])
+
+        assert [r["seq"] for r in read_since(ld, 498)] == [499, 500, 501]
+
+    def test_missing_feed_is_empty(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert read_since(ld) == []
+        assert last_seq(ld) == 0
+
+    def test_concurrent_appends_have_unique_seqs(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+
+        def _worker(n: int) -> None:
+            for i in range(10):
+                append_changes(ld, [_comment(TASK_A, n * 100 + i)])
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert [r["seq"] for r in read_since(ld)] == list(range(1, 41))
+
+    def test_fsync_happens_after_the_lock_is_released(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        free_during_sync: list[bool] = []
+
+        def _sync(files: list[Path], dirs: list[Path]) -> None:
+            try:
+                with lattice_lock(ld / "locks", CHANGEFEED_LOCK, timeout=0):
+                    free_during_sync.append(True)
+            except LockTimeout:
+                free_during_sync.append(False)
+
+        with patch("lattice.storage.changefeed.sync_paths", side_effect=_sync):
+            append_changes(ld, [_comment(TASK_A, 1)])
+
+        assert free_during_sync == [True]
+
+    def test_failed_append_leaves_the_feed_as_it_was(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        append_changes(ld, [_comment(TASK_A, 1)])
+        before = changefeed_path(ld).read_bytes()
+
+        def torn_append(path: Path, lines: list[str], **kwargs: object) -> bool:
+            jsonl_append_many(path, lines[:1], sync=False)
+            raise OSError("disk full")
+
+        with (
+            patch("lattice.storage.changefeed.jsonl_append_many", side_effect=torn_append),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            append_changes(ld, [_comment(TASK_A, 2), _comment(TASK_A, 3)])
+
+        assert changefeed_path(ld).read_bytes() == before
+        append_changes(ld, [_comment(TASK_A, 4)])
+        assert [r["seq"] for r in read_since(ld)] == [1, 2]
+
+    def test_rewrite_renumbers_from_one(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        append_changes(ld, [_comment(TASK_A, n) for n in range(5)])
+        events = [{k: v for k, v in r.items() if k != "seq"} for r in read_since(ld)]
+
+        assert rewrite_changes(ld, events[2:]) == 3
+        assert [r["seq"] for r in read_since(ld)] == [1, 2, 3]
+        assert [r["id"] for r in read_since(ld)] == [e["id"] for e in events[2:]]
+        append_changes(ld, [_comment(TASK_A, 5)])
+        assert last_seq(ld) == 4
+
+    def test_generation_is_kept_until_the_feed_is_rewritten(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        assert feed_end(ld) == ("", 0)
+        append_changes(ld, [_comment(TASK_A, 1)])
+        append_changes(ld, [_comment(TASK_A, 2)])
+        generation = feed_end(ld)[0]
+        assert generation
+        assert {r["gen"] for r in read_since(ld)} == {generation}
+
+        events = read_since(ld)
+        rewrite_changes(ld, events)
+        rewritten = read_since(ld)
+        assert [r["id"] for r in rewritten] == [e["id"] for e in events]
+        assert feed_end(ld)[1] == 2 and feed_end(ld)[0] not in ("", generation)
@@ -0,0 +1,159 @@
+"""Tests for lattice.storage.checkpoints — checkpointed event-log replay."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lattice.core.events import create_event, serialize_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage import checkpoints
+from lattice.storage.checkpoints import checkpoint_path, load_checkpoints, replay_task_log
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+
+
+@pytest.fixture(autouse=True)
+def small_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_INTERVAL", 10)
+
+
+def _events(n: int, start: int = 0) -> list[dict]:
+    events = []
+    if start == 0:
+        events.append(
+            create_event(
+                type="task_created",
+                task_id=TASK_A,
+                actor="human:test",
+                data={"title": "T", "status": "backlog", "priority": "medium", "type": "task"},
+            )
+        )
+    for i in range(start, n):
+        if i == 0:
+            continue
+        events.append(
+            create_event(
+                type="field_updated",
+                task_id=TASK_A,
+                actor="human:test",
+                data={"field": "title", "from": None, "to": f"T{i}"},
+            )
+        )
+    return events
+
+
+def _write(path: Path, events: list[dict], mode: str = "w") -> None:
+    with path.open(mode) as fh:
+        fh.write("".join(serialize_event(e) for e in events))
+
+
+def _full_replay(events: list[dict]) -> dict:
+    snap = None
+    for e in events:
+        snap = apply_event_to_snapshot(snap, e)
+    assert snap is not None
+    return snap
+
+
+class TestReplayTaskLog:
+    def test_matches_full_replay_and_records_checkpoints(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        events = _events(35)
+        _write(log, events)
+
+        assert replay_task_log(ld, TASK_A, log) == _full_replay(events)
+        assert [c["events"] for c in load_checkpoints(ld, TASK_A)] == [10, 20, 30]
+
+    def test_resumes_from_checkpoint(self, tmp_path: Path, monkeypatch) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        events = _events(35)
+        _write(log, events)
+        replay_task_log(ld, TASK_A, log)
+
+        more = _events(40, start=35)
+        _write(log, more, mode="a")
+
+        applied: list[str] = []
+        real_apply = checkpoints.apply_events
+
+        def counting_apply(snap, batch):
+            applied.extend(e["id"] for e in batch)
+            return real_apply(snap, batch)
+
+        monkeypatch.setattr(checkpoints, "apply_events", counting_apply)
+        result = replay_task_log(ld, TASK_A, log)
+
+        assert result == _full_replay(events + more)
+        assert applied == [e["id"] for e in events[30:] + more]
+
+    def test_rewritten_log_falls_back_to_full_replay(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        _write(log, _events(35))
+        replay_task_log(ld, TASK_A, log)
+
+        replacement = _events(12)
+        _write(log, replacement)
+
+        assert replay_task_log(ld, TASK_A, log) == _full_replay(replacement)
+        assert [c["events"] for c in load_checkpoints(ld, TASK_A)] == [10]
+
+    def test_corrupt_checkpoint_file_is_ignored(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        events = _events(15)
+        _write(log, events)
+        path = checkpoint_path(ld, TASK_A)
+        path.parent.mkdir(parents=True)
+        path.write_text('{not json\n{"version": 1}\n')
+
+        assert replay_task_log(ld, TASK_A, log) == _full_replay(events)
+
+    def test_checkpoints_from_another_reducer_are_ignored(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        _write(log, _events(35))
+        replay_task_log(ld, TASK_A, log)
+        assert load_checkpoints(ld, TASK_A)
+
+        monkeypatch.setattr(checkpoints, "reducer_fingerprint", lambda: "changed")
+        assert load_checkpoints(ld, TASK_A) == []
+
+    def test_without_checkpoints_replays_everything(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        events = _events(35)
+        _write(log, events)
+        replay_task_log(ld, TASK_A, log)
+
+        # A stale checkpoint that still passes the CRC check
+        stale = load_checkpoints(ld, TASK_A)
+        stale[-1]["snapshot"] = {**stale[-1]["snapshot"], "stale": True}
+        checkpoints._save_checkpoints(ld, TASK_A, stale)
+        assert replay_task_log(ld, TASK_A, log) != _full_replay(events)
+
+        assert replay_task_log(ld, TASK_A, log, use_checkpoints=False) == _full_replay(events)
+        assert replay_task_log(ld, TASK_A, log) == _full_replay(events)
+
+    def test_empty_log_raises(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        log = tmp_path / "log.jsonl"
+        log.write_text("\n")
+
+        with pytest.raises(ValueError, match="empty"):
+            replay_task_log(ld, TASK_A, log)
@@ -0,0 +1,175 @@
+"""Tests for the commit reference index (index/commits.db)."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lattice.git_session import close_sessions, get_session
+from lattice.storage.commit_index import CommitIndex, commit_index_path
+
+ULID_REF = "task_01KHM2ZCQ0VR86N10ZJ1ES8G4C"
+
+
+def _git(repo: Path, *args: str, date: str | None = None) -> str:
+    env = dict(os.environ)
+    if date:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = date
+    result = subprocess.run(
+        ["git", *args], cwd=str(repo), check=True, capture_output=True, text=True, env=env
+    )
+    return result.stdout.strip()
+
+
+def _commit(repo: Path, message: str, date: str) -> str:
+    _git(repo, "commit", "--allow-empty", "-q", "-m", message, date=date)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sessions():
+    close_sessions()
+    yield
+    close_sessions()
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "--initial-branch=main")
+    _git(repo, "config", "user.email", "dev@example.com")
+    _git(repo, "config", "user.name", "Dev")
+    (repo / ".lattice").mkdir()
+    _commit(repo, "Initial commit", "2025-01-10T10:00:00+00:00")
+    _commit(repo, "LAT-1 add parser", "2025-01-10T11:00:00+00:00")
+    _commit(repo, f"Parser tests\n\nRefs LAT-1 and {ULID_REF}", "2025-01-10T12:00:00+00:00")
+    _commit(repo, "LAT-12 unrelated", "2025-01-10T13:00:00+00:00")
+    return repo
+
+
+def _index(repo: Path) -> CommitIndex:
+    return CommitIndex(repo / ".lattice", get_session(repo))
+
+
+def _subjects(index: CommitIndex, *refs: str) -> list[str]:
+    assert index.refresh()
+    return [c["subject"] for c in index.commits_mentioning(*refs)]
+
+
+class TestLookup:
+    def test_finds_mentions_newest_first(self, repo: Path) -> None:
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-1") == ["Parser tests", "LAT-1 add parser"]
+            assert _subjects(index, ULID_REF) == ["Parser tests"]
+            assert _subjects(index, "LAT-99") == []
+            commit = index.commits_mentioning("LAT-12")[0]
+        assert commit == {
+            "sha": _git(repo, "rev-parse", "HEAD"),
+            "date": "2025-01-10",
+            "subject": "LAT-12 unrelated",
+        }
+        assert commit_index_path(repo / ".lattice").exists()
+
+    def test_short_ids_match_any_case(self, repo: Path) -> None:
+        _commit(repo, "fix lat-1 edge case", "2025-01-11T10:00:00+00:00")
+        with _index(repo) as index:
+            assert _subjects(index, "lat-1") == [
+                "fix lat-1 edge case",
+                "Parser tests",
+                "LAT-1 add parser",
+            ]
+            refs = index.refs_for([_git(repo, "rev-parse", "HEAD")])
+        # task_refs keep the dashboard's exact-case extraction
+        assert refs == {_git(repo, "rev-parse", "HEAD"): []}
+
+    def test_refs_for_and_covers(self, repo: Path) -> None:
+        tests_sha = _git(repo, "rev-parse", "HEAD~1")
+        with _index(repo) as index:
+            assert index.refresh()
+            assert index.refs_for([tests_sha, _git(repo, "rev-parse", "HEAD~3")]) == {
+                tests_sha: ["LAT-1", ULID_REF]
+            }
+            assert index.covers(_git(repo, "rev-parse", "HEAD"))
+            assert not index.covers(tests_sha)
+
+
+class TestIncremental:
+    def test_unchanged_tips_spawn_nothing(self, repo: Path, monkeypatch) -> None:
+        with _index(repo) as index:
+            assert index.refresh()
+
+        def no_spawn(*args, **kwargs):
+            raise AssertionError(f"unexpected git process: {args[0]}")
+
+        monkeypatch.setattr(subprocess, "Popen", no_spawn)
+        monkeypatch.setattr(subprocess, "run", no_spawn)
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-12") == ["LAT-12 unrelated"]
+
+    def test_new_commits_are_read_from_the_old_tip(self, repo: Path, monkeypatch) -> None:
+        old_tip = _git(repo, "rev-parse", "HEAD")
+        with _index(repo) as index:
+            assert index.refresh()
+        _commit(repo, "LAT-1 follow-up", "2025-01-11T10:00:00+00:00")
+
+        calls: list[list[str]] = []
+        real_popen = subprocess.Popen
+
+        def recording_popen(args, **kwargs):
+            calls.append(list(args))
+            return real_popen(args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "Popen", recording_popen)
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-1")[0] == "LAT-1 follow-up"
+        assert len(calls) == 1
+        assert calls[0][calls[0].index("--not") + 1] == old_tip
+
+    def test_other_branches_are_indexed(self, repo: Path) -> None:
+        _git(repo, "checkout", "-q", "-b", "feat/LAT-5")
+        _commit(repo, "LAT-5 start", "2025-01-11T10:00:00+00:00")
+        _git(repo, "checkout", "-q", "main")
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-5") == ["LAT-5 start"]
+
+
+class TestRewrites:
+    def test_amended_commit_replaces_the_old_one(self, repo: Path) -> None:
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-12") == ["LAT-12 unrelated"]
+        _git(repo, "commit", "--amend", "-q", "--allow-empty", "-m", "LAT-13 reworded")
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-12") == []
+            assert _subjects(index, "LAT-13") == ["LAT-13 reworded"]
+
+    def test_deleted_branch_drops_only_its_commits(self, repo: Path) -> None:
+        _git(repo, "checkout", "-q", "-b", "spike")
+        _commit(repo, "LAT-1 spike", "2025-01-11T10:00:00+00:00")
+        _git(repo, "checkout", "-q", "main")
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-1")[0] == "LAT-1 spike"
+        _git(repo, "branch", "-q", "-D", "spike")
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-1") == ["Parser tests", "LAT-1 add parser"]
+
+    def test_missing_old_tip_rebuilds(self, repo: Path) -> None:
+        with _index(repo) as index:
+            assert index.refresh()
+        # As if the old tip had been rewritten away and garbage-collected
+        conn = sqlite3.connect(commit_index_path(repo / ".lattice"))
+        with conn:
+            conn.execute("UPDATE tips SET sha = ?", ("0" * 40,))
+            conn.execute(
+                "INSERT INTO commits VALUES ('f' || hex(randomblob(19)), 0, 0, '', 'x', '')"
+            )
+        conn.close()
+        with _index(repo) as index:
+            assert _subjects(index, "LAT-12") == ["LAT-12 unrelated"]
+            assert len(index.refs_for(_git(repo, "rev-list", "HEAD").split())) == 3
+            count = index._conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+        assert count == 3
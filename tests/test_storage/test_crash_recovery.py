@@ -5,7 +5,18 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from lattice.core.events import create_event, serialize_event
+from lattice.storage.fs import DURABILITY_ENV, DURABILITY_LEVELS, flush_deferred_syncs
+
+
+@pytest.fixture(autouse=True, params=DURABILITY_LEVELS)
+def durability(request, monkeypatch):
+    """Run every recovery scenario under each durability level."""
+    monkeypatch.setenv(DURABILITY_ENV, request.param)
+    yield request.param
+    flush_deferred_syncs()
 
 
 # ---------------------------------------------------------------------------
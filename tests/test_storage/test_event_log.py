@@ -0,0 +1,163 @@
+"""Tests for lattice.storage.event_log — streaming, tail and count readers."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lattice.storage import event_log
+from lattice.storage.event_log import EVENT_COUNTS_FILE, EventCounts, EventLog
+from lattice.storage.fs import DURABILITY_ENV
+
+
+def _line(n: int, pad: int = 0) -> str:
+    return json.dumps({"id": f"ev_{n}", "pad": "x" * pad}) + "\n"
+
+
+def _write(path: Path, count: int, pad: int = 0) -> None:
+    path.write_text("".join(_line(i, pad) for i in range(count)))
+
+
+class TestIterEvents:
+    def test_yields_events_in_order_skipping_bad_lines(self, tmp_path: Path) -> None:
+        log = tmp_path / "t.jsonl"
+        log.write_text(_line(0) + "\n{CORRUPT\n" + _line(1) + "[1, 2]\n")
+
+        assert [e["id"] for e in EventLog(log).iter_events()] == ["ev_0", "ev_1"]
+
+    def test_missing_file_is_empty(self, tmp_path: Path) -> None:
+        assert list(EventLog(tmp_path / "nope.jsonl").iter_events()) == []
+
+
+class TestTail:
+    def test_returns_last_n_oldest_first(self, tmp_path: Path) -> None:
+        log = tmp_path / "t.jsonl"
+        _write(log, 50)
+
+        assert [e["id"] for e in EventLog(log).tail(3)] == ["ev_47", "ev_48", "ev_49"]
+
+    def test_spans_multiple_blocks(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(event_log, "_TAIL_BLOCK", 64)
+        log = tmp_path / "t.jsonl"
+        _write(log, 40, pad=100)
+
+        tail = EventLog(log).tail(5)
+        assert [e["id"] for e in tail] == [f"ev_{i}" for i in range(35, 40)]
+
+    def test_n_larger_than_file(self, tmp_path: Path) -> None:
+        log = tmp_path / "t.jsonl"
+        _write(log, 2)
+
+        assert [e["id"] for e in EventLog(log).tail(10)] == ["ev_0", "ev_1"]
+        assert EventLog(log).tail(0) == []
+
+    def test_truncated_final_line_is_skipped(self, tmp_path: Path) -> None:
+        log = tmp_path / "t.jsonl"
+        log.write_text(_line(0) + _line(1) + '{"id": "ev_')
+
+        assert [e["id"] for e in EventLog(log).tail(2)] == ["ev_1"]
+
+    def test_reads_only_the_end(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(event_log, "_TAIL_BLOCK", 256)
+        log = tmp_path / "t.jsonl"
+        _write(log, 5000)
+        reads: list[int] = []
+        real_open = open
+
+        class _Spy:
+            def __init__(self, fh) -> None:
+                self._fh = fh
+
+            def __getattr__(self, name):
+                return getattr(self._fh, name)
+
+            def read(self, size: int = -1) -> bytes:
+                data = self._fh.read(size)
+                reads.append(len(data))
+                return data
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc) -> None:
+                self._fh.close()
+
+        monkeypatch.setattr("builtins.open", lambda *a, **k: _Spy(real_open(*a, **k)))
+        EventLog(log).tail(3)
+        assert sum(reads) <= 512
+
+
+class TestCount:
+    def test_counts_non_blank_lines(self, tmp_path: Path) -> None:
+        log = tmp_path / "t.jsonl"
+        log.write_text(_line(0) + "\n" + "{CORRUPT\n" + _line(1) + '{"partial')
+
+        with EventCounts(None) as counts:
+            assert counts.count(log) == 4
+        assert EventCounts(None).count(tmp_path / "missing.jsonl") == 0
+
+    def test_sidecar_is_persisted_and_extended(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        (ld / "events").mkdir(parents=True)
+        log = ld / "events" / "t.jsonl"
+        _write(log, 10)
+
+        assert EventLog(log).count() == 10
+        sidecar = json.loads((ld / "index" / EVENT_COUNTS_FILE).read_text())
+        assert sidecar["events/t.jsonl"][:2] == [log.stat().st_size, 10]
+
+        with log.open("a") as fh:
+            fh.write(_line(10) + _line(11))
+        assert EventLog(log).count() == 12
+
+    def test_appends_only_read_new_bytes(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        (ld / "events").mkdir(parents=True)
+        log = ld / "events" / "t.jsonl"
+        _write(log, 10)
+        EventLog(log).count()
+
+        # Forge the cached count: if the prefix were re-read, it would be corrected.
+        sidecar_path = ld / "index" / EVENT_COUNTS_FILE
+        sidecar = json.loads(sidecar_path.read_text())
+        sidecar["events/t.jsonl"][1] = 1000
+        sidecar_path.write_text(json.dumps(sidecar))
+
+        with log.open("a") as fh:
+            fh.write(_line(10))
+        assert EventLog(log).count() == 1001
+
+    def test_rewrite_forces_full_recount(self, tmp_path: Path) -> None:
+        ld = tmp_path / ".lattice"
+        (ld / "events").mkdir(parents=True)
+        log = ld / "events" / "t.jsonl"
+        _write(log, 10)
+        assert EventLog(log).count() == 10
+
+        _write(log, 4)
+        assert EventLog(log).count() == 4
+
+        # Same size, different content before the cached offset.
+        log.write_text(log.read_text().replace("ev_3", "ev_9"))
+        with log.open("a") as fh:
+            fh.write(_line(4))
+        assert EventLog(log).count() == 5
+
+    def test_sidecar_is_written_without_fsync(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ld = tmp_path / ".lattice"
+        (ld / "events").mkdir(parents=True)
+        (ld / "index").mkdir()
+        log = ld / "events" / "t.jsonl"
+        _write(log, 3)
+
+        # Derived data: a plain read must not pay for fsyncs, even under strict
+        monkeypatch.setenv(DURABILITY_ENV, "strict")
+        with patch("lattice.storage.fs.os.fsync") as mock_fsync:
+            assert EventLog(log).count() == 3
+        assert mock_fsync.call_count == 0
+        assert (ld / "index" / EVENT_COUNTS_FILE).exists()
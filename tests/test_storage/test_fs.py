@@ -3,12 +3,25 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from lattice.storage.fs import _fsync_directory, atomic_write, jsonl_append
+from lattice.storage import fs
+from lattice.storage.fs import (
+    DURABILITY_ENV,
+    _fsync_directory,
+    atomic_write,
+    durability_for,
+    ensure_index_dir,
+    ensure_lattice_gitignore,
+    flush_deferred_syncs,
+    jsonl_append,
+    jsonl_append_many,
+    sync_paths,
+)
 
 
 class TestAtomicWrite:
@@ -127,6 +140,86 @@ class TestJsonlAppend:
         assert written == line
 
 
+class TestJsonlAppendMany:
+    """jsonl_append_many() appends a batch with one write and one fsync."""
+
+    def test_single_write_and_fsync(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        target.write_text('{"n":0}\n')
+        lines = ['{"n":1}\n', '{"n":2}\n', '{"n":3}\n']
+
+        with (
+            patch("lattice.storage.fs.os.write", wraps=os.write) as mock_write,
+            patch("lattice.storage.fs.os.fsync", wraps=os.fsync) as mock_fsync,
+        ):
+            created = jsonl_append_many(target, lines)
+
+        assert created is False
+        assert mock_write.call_count == 1
+        assert mock_fsync.call_count == 1
+        assert target.read_text() == '{"n":0}\n' + "".join(lines)
+
+    def test_repairs_missing_trailing_newline(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        target.write_text('{"n":0}')
+
+        jsonl_append_many(target, ['{"n":1}\n'])
+
+        assert target.read_text() == '{"n":0}\n{"n":1}\n'
+
+    def test_directory_fsync_only_on_create(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        with patch("lattice.storage.fs._fsync_directory") as mock_fsync:
+            assert jsonl_append_many(target, ['{"n":1}\n']) is True
+            assert jsonl_append_many(target, ['{"n":2}\n']) is False
+        mock_fsync.assert_called_once_with(tmp_path)
+
+    def test_sync_false_skips_fsync(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        with (
+            patch("lattice.storage.fs.os.fsync") as mock_fsync,
+            patch("lattice.storage.fs._fsync_directory") as mock_dir,
+        ):
+            jsonl_append_many(target, ['{"n":1}\n'], sync=False)
+        mock_fsync.assert_not_called()
+        mock_dir.assert_not_called()
+        assert target.read_text() == '{"n":1}\n'
+
+    def test_empty_batch_is_a_noop(self, tmp_path: Path) -> None:
+        target = tmp_path / "events.jsonl"
+        assert jsonl_append_many(target, []) is False
+        assert not target.exists()
+
+
+class TestSyncPaths:
+    """sync_paths() makes deferred writes durable, each path once."""
+
+    def test_syncs_every_path_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "strict")
+        paths = [tmp_path / f"f{i}.jsonl" for i in range(3)]
+        for p in paths:
+            p.write_text("x\n")
+
+        synced: list[int] = []
+        real_fsync = os.fsync
+
+        def record(fd: int) -> None:
+            synced.append(os.fstat(fd).st_ino)
+            real_fsync(fd)
+
+        with patch("lattice.storage.fs.os.fsync", side_effect=record):
+            sync_paths([*paths, paths[0]], [tmp_path, tmp_path])
+
+        expected = [p.stat().st_ino for p in paths] + [tmp_path.stat().st_ino]
+        assert sorted(synced) == sorted(expected)
+
+    def test_missing_file_is_skipped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "strict")
+        sync_paths([tmp_path / "moved.jsonl"])
+
+
 class TestFsyncDirectory:
     """_fsync_directory() syncs directory metadata for durability."""
 
@@ -148,3 +241,109 @@ class TestFsyncDirectory:
         """_fsync_directory should silently ignore OSError (e.g. macOS)."""
         with patch("lattice.storage.fs.os.open", side_effect=OSError("not supported")):
             _fsync_directory(tmp_path)  # Should not raise
+
+
+class TestDurability:
+    """Durability levels gate the fsyncs in atomic_write and jsonl_append."""
+
+    @pytest.fixture
+    def lattice_dir(self, tmp_path: Path) -> Path:
+        ld = tmp_path / ".lattice"
+        ld.mkdir()
+        return ld
+
+    def _write(self, ld: Path) -> None:
+        atomic_write(ld / "snap.json", "{}\n")
+        jsonl_append(ld / "events.jsonl", '{"n":1}\n')
+
+    def test_defaults_to_strict(self, lattice_dir: Path) -> None:
+        assert durability_for(lattice_dir / "x.json") == "strict"
+        assert durability_for(Path("/elsewhere/x.json")) == "strict"
+
+    def test_config_key_and_env_override(
+        self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv(DURABILITY_ENV, raising=False)
+        (lattice_dir / "config.json").write_text('{"durability": "relaxed"}\n')
+        assert durability_for(lattice_dir / "tasks" / "x.json") == "relaxed"
+
+        monkeypatch.setenv(DURABILITY_ENV, "batched")
+        assert durability_for(lattice_dir / "tasks" / "x.json") == "batched"
+
+        monkeypatch.setenv(DURABILITY_ENV, "bogus")
+        assert durability_for(lattice_dir / "tasks" / "x.json") == "relaxed"
+
+    def test_config_change_is_noticed(
+        self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv(DURABILITY_ENV, raising=False)
+        config = lattice_dir / "config.json"
+        config.write_text('{"durability": "relaxed"}\n')
+        assert durability_for(config) == "relaxed"
+
+        config.write_text('{"durability": "strict"}\n')
+        os.utime(config, ns=(0, config.stat().st_mtime_ns + 1_000_000))
+        assert durability_for(config) == "strict"
+
+    def test_strict_fsyncs(self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "strict")
+        with patch("lattice.storage.fs.os.fsync") as mock_fsync:
+            self._write(lattice_dir)
+        # file + dir for the snapshot, file + dir for the new log
+        assert mock_fsync.call_count == 4
+
+    def test_relaxed_never_fsyncs(
+        self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "relaxed")
+        with patch("lattice.storage.fs.os.fsync") as mock_fsync:
+            self._write(lattice_dir)
+            sync_paths([lattice_dir / "events.jsonl"], [lattice_dir])
+        mock_fsync.assert_not_called()
+        assert (lattice_dir / "snap.json").read_text() == "{}\n"
+        assert (lattice_dir / "events.jsonl").read_text() == '{"n":1}\n'
+
+    def test_batched_defers_until_flush(
+        self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "batched")
+        monkeypatch.setattr(fs, "BATCHED_SYNC_INTERVAL", 3600)
+        flush_deferred_syncs()
+        with patch("lattice.storage.fs.os.fsync") as mock_fsync:
+            self._write(lattice_dir)
+            self._write(lattice_dir)
+            # Snapshot contents are synced before each rename; the rest waits
+            assert mock_fsync.call_count == 2
+            assert fs._deferred_sync.pending() == 2  # the log + the directory
+            flush_deferred_syncs()
+        assert mock_fsync.call_count == 4
+        assert fs._deferred_sync.pending() == 0
+
+    def test_batched_flushes_on_interval(
+        self, lattice_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv(DURABILITY_ENV, "batched")
+        monkeypatch.setattr(fs, "BATCHED_SYNC_INTERVAL", 0.05)
+        flush_deferred_syncs()
+        self._write(lattice_dir)
+        for _ in range(100):
+            if fs._deferred_sync.pending() == 0:
+                break
+            threading.Event().wait(0.02)
+        assert fs._deferred_sync.pending() == 0
+
+
+class TestLatticeGitignore:
+    def test_appends_missing_entries_and_keeps_user_lines(self, tmp_path: Path) -> None:
+        (tmp_path / ".gitignore").write_text("scratch/")
+        ensure_lattice_gitignore(tmp_path)
+        assert (tmp_path / ".gitignore").read_text() == "scratch/\nindex/\n"
+        ensure_lattice_gitignore(tmp_path)
+        assert (tmp_path / ".gitignore").read_text() == "scratch/\nindex/\n"
+
+    def test_creating_the_index_upgrades_an_existing_project(self, tmp_path: Path) -> None:
+        lattice_dir = tmp_path / ".lattice"
+        lattice_dir.mkdir()
+        ensure_index_dir(lattice_dir / "index")
+        assert (lattice_dir / "index").is_dir()
+        assert "index/" in (lattice_dir / ".gitignore").read_text().splitlines()
@@ -4,12 +4,21 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from lattice.core.config import default_config, serialize_config
 from lattice.core.events import create_event
 from lattice.core.tasks import apply_event_to_snapshot
-from lattice.storage.fs import atomic_write, ensure_lattice_dirs
-from lattice.storage.operations import write_task_event
+from lattice.storage.fs import (
+    atomic_write,
+    ensure_lattice_dirs,
+    jsonl_append_many,
+)
+from lattice.storage.operations import write_new_tasks, write_task_event
+from lattice.storage.short_ids import load_id_index
+from lattice.storage.snapshot_store import SnapshotStore
 
 
 def _setup_lattice(tmp_path: Path) -> Path:
@@ -150,3 +159,146 @@ class TestWriteTaskEvent:
         event_path = ld / "events" / f"{task_id}.jsonl"
         lines = event_path.read_text().strip().split("\n")
         assert len(lines) == 3  # create + 2 field updates
+
+
+def _new_task(task_id: str, title: str) -> tuple[str, list[dict], dict]:
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": title, "status": "backlog", "priority": "medium", "type": "task"},
+    )
+    return task_id, [event], apply_event_to_snapshot(None, event)
+
+
+class TestWriteNewTasks:
+    """Verify the bulk create path, write_new_tasks."""
+
+    def test_writes_logs_and_snapshots(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        tasks = [_new_task(f"task_01{c * 24}", f"Task {c}") for c in "ABC"]
+
+        write_new_tasks(ld, tasks)
+
+        for task_id, events, snapshot in tasks:
+            assert json.loads((ld / "tasks" / f"{task_id}.json").read_text()) == snapshot
+            logged = (ld / "events" / f"{task_id}.jsonl").read_text().splitlines()
+            assert [json.loads(line)["id"] for line in logged] == [events[0]["id"]]
+        lifecycle = (ld / "events" / "_lifecycle.jsonl").read_text().splitlines()
+        assert [json.loads(line)["task_id"] for line in lifecycle] == [t[0] for t in tasks]
+        feed = [json.loads(line) for line in (ld / "changes.jsonl").read_text().splitlines()]
+        assert [record["seq"] for record in feed] == [1, 2, 3]
+        with SnapshotStore(ld) as store:
+            assert [snap["title"] for snap in store.load_all()] == ["Task A", "Task B", "Task C"]
+
+    def test_one_lifecycle_write_and_one_sync_pass(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        tasks = [_new_task(f"task_01{c * 24}", c) for c in "ABCD"]
+
+        with (
+            patch(
+                "lattice.storage.operations.jsonl_append_many", wraps=jsonl_append_many
+            ) as appends,
+            patch("lattice.storage.operations.sync_paths") as mock_sync,
+        ):
+            write_new_tasks(ld, tasks)
+
+        lifecycle_calls = [
+            call for call in appends.call_args_list if call.args[0].name == "_lifecycle.jsonl"
+        ]
+        assert len(lifecycle_calls) == 1
+        assert all(call.kwargs["sync"] is False for call in appends.call_args_list)
+        mock_sync.assert_called_once()
+        files, dirs = mock_sync.call_args.args
+        assert ld / "events" / f"{tasks[0][0]}.jsonl" in files
+        # Snapshot contents are synced before their rename; only the directory waits
+        assert ld / "tasks" / f"{tasks[0][0]}.json" not in files
+        assert ld / "tasks" in dirs
+
+    def test_refuses_existing_or_repeated_ids(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        existing = _new_task("task_01AAAAAAAAAAAAAAAAAAAAAAAA", "Existing")
+        write_task_event(ld, existing[0], existing[1], existing[2])
+        fresh = _new_task("task_01BBBBBBBBBBBBBBBBBBBBBBBB", "Fresh")
+
+        with pytest.raises(FileExistsError):
+            write_new_tasks(ld, [fresh, _new_task(existing[0], "Again")])
+        with pytest.raises(FileExistsError):
+            write_new_tasks(ld, [fresh, fresh])
+        assert not (ld / "events" / f"{fresh[0]}.jsonl").exists()
+        assert len((ld / "events" / "_lifecycle.jsonl").read_text().splitlines()) == 1
+
+    def test_reserves_short_ids(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        tasks = [_new_task(f"task_01{c * 24}", c) for c in "AB"]
+
+        assert write_new_tasks(ld, tasks, short_id_prefix="LAT") == ["LAT-1", "LAT-2"]
+        assert write_new_tasks(ld, [_new_task("task_01" + "C" * 24, "C")]) == [None]
+
+        assert load_id_index(ld)["map"] == {"LAT-1": tasks[0][0], "LAT-2": tasks[1][0]}
+        assert tasks[1][1][0]["data"]["short_id"] == tasks[1][2]["short_id"] == "LAT-2"
+        snapshot = json.loads((ld / "tasks" / f"{tasks[1][0]}.json").read_text())
+        assert snapshot["short_id"] == "LAT-2"
+        logged = json.loads((ld / "events" / f"{tasks[1][0]}.jsonl").read_text())
+        assert logged["data"]["short_id"] == "LAT-2"
+
+    def test_existing_id_reserves_no_short_ids(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        existing = _new_task("task_01AAAAAAAAAAAAAAAAAAAAAAAA", "Existing")
+        write_new_tasks(ld, [existing], short_id_prefix="LAT")
+        before = (ld / "ids.json").read_text()
+
+        with pytest.raises(FileExistsError):
+            write_new_tasks(
+                ld,
+                [_new_task("task_01BBBBBBBBBBBBBBBBBBBBBBBB", "Fresh"), existing],
+                short_id_prefix="LAT",
+            )
+        assert (ld / "ids.json").read_text() == before
+
+    def test_failed_write_releases_short_ids(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        tasks = [_new_task(f"task_01{c * 24}", c) for c in "AB"]
+
+        with (
+            patch("lattice.storage.operations.append_changes", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            write_new_tasks(ld, tasks, short_id_prefix="LAT")
+
+        index = load_id_index(ld)
+        assert index["map"] == {}
+        assert index["next_seqs"]["LAT"] == 1
+        for _task_id, events, snapshot in tasks:
+            assert "short_id" not in events[0]["data"]
+            assert "short_id" not in snapshot
+
+    def test_failed_snapshot_write_removes_partial_tasks(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        first = _new_task("task_01" + "Z" * 24, "Earlier")
+        write_new_tasks(ld, [first])
+        lifecycle_before = (ld / "events" / "_lifecycle.jsonl").read_bytes()
+        tasks = [_new_task(f"task_01{c * 24}", c) for c in "ABC"]
+        calls = 0
+
+        def failing_write(path, content, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise OSError("disk full")
+            atomic_write(path, content, **kwargs)
+
+        with (
+            patch("lattice.storage.operations.atomic_write", side_effect=failing_write),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            write_new_tasks(ld, tasks, short_id_prefix="TST")
+
+        for task_id, _events, _snapshot in tasks:
+            assert not (ld / "tasks" / f"{task_id}.json").exists()
+            assert not (ld / "events" / f"{task_id}.jsonl").exists()
+        assert (ld / "events" / "_lifecycle.jsonl").read_bytes() == lifecycle_before
+        assert load_id_index(ld)["next_seqs"]["TST"] == 1
+
+        # The released range is reused without clashing with anything on disk
+        assert write_new_tasks(ld, tasks[:1], short_id_prefix="TST") == ["TST-1"]
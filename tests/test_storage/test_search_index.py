@@ -0,0 +1,182 @@
+"""Tests for lattice.storage.search_index — the full-text search index."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.changefeed import changefeed_path
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs, jsonl_append
+from lattice.storage.operations import write_task_archive, write_task_event
+from lattice.storage.search_index import SearchIndex, drop_search_index, search_index_path
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+TASK_B = "task_01BBBBBBBBBBBBBBBBBBBBBBBBBB"
+TASK_C = "task_01CCCCCCCCCCCCCCCCCCCCCCCCCC"
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _write(ld: Path, task_id: str, snapshot: dict | None, etype: str, data: dict) -> dict:
+    event = create_event(type=etype, task_id=task_id, actor="human:test", data=data)
+    snapshot = apply_event_to_snapshot(snapshot, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _create(ld: Path, task_id: str, title: str, description: str | None = None) -> dict:
+    data = {"title": title, "status": "backlog", "priority": "medium", "type": "task"}
+    if description:
+        data["description"] = description
+    return _write(ld, task_id, None, "task_created", data)
+
+
+def _search(ld: Path, query: str, **kwargs) -> list[tuple[str, str]]:
+    with SearchIndex(ld) as index:
+        return [(h["kind"], h["task_id"]) for h in index.search(query, **kwargs)]
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Backdate *path* so the index treats its mtime as stable."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class TestSearchIndex:
+    def test_catches_up_from_the_changefeed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "Payment webhook retries")
+        assert _search(ld, "webhook") == [("task", TASK_A)]
+        assert search_index_path(ld).exists()
+
+        _write(
+            ld, TASK_A, snap, "field_updated", {"field": "title", "from": None, "to": "Renamed"}
+        )
+        _create(ld, TASK_B, "Another webhook")
+        with SearchIndex(ld) as index:
+            assert index.refresh() == 2  # only the two new feed records
+            assert index.refresh() == 0
+        assert _search(ld, "webhook") == [("task", TASK_B)]
+        assert _search(ld, "renamed") == [("task", TASK_A)]
+
+    def test_prefix_and_phrase_matching(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "Authentication tokens expire early", "Seen on café Wi-Fi")
+
+        assert _search(ld, "auth") == [("task", TASK_A)]
+        assert _search(ld, "AUTH EXPIRE") == [("task", TASK_A)]
+        assert _search(ld, "cafe") == [("task", TASK_A)]  # diacritics folded
+        assert _search(ld, "wi-fi") == [("task", TASK_A)]
+        assert _search(ld, "auth missing") == []
+        assert _search(ld, '" - *') == []
+
+    def test_ranks_title_hits_above_body_hits(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "Cleanup", "Remove the legacy exporter")
+        _create(ld, TASK_B, "Legacy exporter crashes")
+
+        with SearchIndex(ld) as index:
+            hits = index.search("legacy exporter")
+        assert [h["task_id"] for h in hits] == [TASK_B, TASK_A]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert hits[0]["snippet"] == "[Legacy] [exporter] crashes"
+
+    def test_notes_and_plans_follow_the_files(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "Task")
+        notes = ld / "notes" / f"{TASK_A}.md"
+        notes.write_text("# Notes\n\nflaky integration suite\n")
+        assert _search(ld, "flaky") == [("note", TASK_A)]
+
+        # Edited in place with the same size: caught because the mtime is racy
+        notes.write_text("# Notes\n\nslowly integration suite\n")
+        assert _search(ld, "flaky") == []
+        _age(notes)
+        assert _search(ld, "slowly") == [("note", TASK_A)]
+
+        # Archiving moves the file; the document follows it
+        event = create_event(type="task_archived", task_id=TASK_A, actor="human:test", data={})
+        write_task_archive(ld, TASK_A, event, apply_event_to_snapshot(snap, event))
+        assert _search(ld, "slowly") == []
+        assert _search(ld, "slowly", include_archived=True) == [("note", TASK_A)]
+
+        (ld / "archive" / "notes" / f"{TASK_A}.md").unlink()
+        assert _search(ld, "slowly", include_archived=True) == []
+
+    def test_initial_scan_covers_logs_missing_from_the_feed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "Before the feed existed")
+        changefeed_path(ld).unlink()
+
+        assert _search(ld, "feed") == [("task", TASK_A)]
+        _create(ld, TASK_B, "After the feed")
+        assert sorted(_search(ld, "feed")) == [("task", TASK_A), ("task", TASK_B)]
+
+    def test_feed_reset_triggers_rescan(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+        assert _search(ld, "second") == [("task", TASK_B)]
+
+        # The feed restarts below the indexed sequence number; an event
+        # written only to the log is found by the rescan
+        changefeed_path(ld).unlink()
+        event = create_event(
+            type="field_updated",
+            task_id=TASK_B,
+            actor="human:test",
+            data={"field": "title", "from": "Second", "to": "Replaced"},
+        )
+        jsonl_append(ld / "events" / f"{TASK_B}.jsonl", json.dumps(event))
+        _create(ld, TASK_C, "Third")
+        assert _search(ld, "replaced") == [("task", TASK_B)]
+
+    def test_matching_event_ids(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "Task")
+        snap = _write(ld, TASK_A, snap, "comment_added", {"body": "needs a dependency audit"})
+        _write(ld, TASK_A, snap, "status_changed", {"from": "backlog", "to": "in_progress"})
+        events = [
+            line for line in (ld / "events" / f"{TASK_A}.jsonl").read_text().splitlines() if line
+        ]
+        comment_id = json.loads(events[1])["id"]
+        status_id = json.loads(events[2])["id"]
+
+        with SearchIndex(ld) as index:
+            assert index.matching_event_ids("dependency audit") == {comment_id}
+            assert index.matching_event_ids("in_progress") == {status_id}
+            assert index.matching_event_ids("status_changed human") == {status_id}
+            # Event documents are not returned by default
+            assert [h["kind"] for h in index.search("in_progress")] == []
+
+    def test_up_to_date_search_takes_no_write_lock(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "Login timeout")
+        assert _search(ld, "login") == [("task", TASK_A)]
+
+        writer = sqlite3.connect(str(search_index_path(ld)), isolation_level=None)
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            with SearchIndex(ld) as index:
+                index._conn.execute("PRAGMA busy_timeout = 50")
+                assert index.refresh() == 0  # would raise "database is locked"
+        finally:
+            writer.close()
+
+    def test_drop_search_index(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "Indexed")
+        assert _search(ld, "indexed")
+        drop_search_index(ld)
+        assert not search_index_path(ld).exists()
+        assert _search(ld, "indexed") == [("task", TASK_A)]
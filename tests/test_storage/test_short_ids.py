@@ -11,6 +11,8 @@ from lattice.storage.short_ids import (
     allocate_short_id,
     load_id_index,
     register_short_id,
+    release_short_ids,
+    reserve_short_ids,
     resolve_short_id,
     save_id_index,
 )
@@ -154,6 +156,46 @@ class TestAllocateShortId:
         assert sid3 == "AUT-2"
 
 
+class TestReserveShortIds:
+    def test_reserves_contiguous_range(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        save_id_index(lattice_dir, _default_index())
+        allocate_short_id(lattice_dir, "LAT")
+
+        sids = reserve_short_ids(lattice_dir, "LAT", ["task_a", "task_b", "task_c"])
+        assert sids == ["LAT-2", "LAT-3", "LAT-4"]
+
+        loaded = load_id_index(lattice_dir)
+        assert loaded["next_seqs"]["LAT"] == 5
+        assert loaded["map"]["LAT-3"] == "task_b"
+        assert allocate_short_id(lattice_dir, "LAT")[0] == "LAT-5"
+
+    def test_empty_is_noop(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        assert reserve_short_ids(lattice_dir, "LAT", []) == []
+        assert not (lattice_dir / "ids.json").exists()
+
+    def test_release_rewinds_counter(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_a")
+        sids = reserve_short_ids(lattice_dir, "LAT", ["task_b", "task_c"])
+
+        release_short_ids(lattice_dir, "LAT", sids)
+        loaded = load_id_index(lattice_dir)
+        assert loaded["map"] == {"LAT-1": "task_a"}
+        assert loaded["next_seqs"]["LAT"] == 2
+
+    def test_release_after_later_allocation_keeps_counter(self, tmp_path: Path) -> None:
+        lattice_dir = _make_lattice_dir(tmp_path)
+        sids = reserve_short_ids(lattice_dir, "LAT", ["task_a", "task_b"])
+        allocate_short_id(lattice_dir, "LAT", task_ulid="task_c")
+
+        release_short_ids(lattice_dir, "LAT", sids)
+        loaded = load_id_index(lattice_dir)
+        assert loaded["map"] == {"LAT-3": "task_c"}
+        assert loaded["next_seqs"]["LAT"] == 4
+
+
 class TestResolveShortId:
     def test_found(self, tmp_path: Path) -> None:
         lattice_dir = _make_lattice_dir(tmp_path)
@@ -0,0 +1,386 @@
+"""Tests for lattice.storage.snapshot_store — the persistent snapshot index."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.tasks import apply_event_to_snapshot, serialize_snapshot
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.operations import (
+    write_task_archive,
+    write_task_event,
+    write_task_unarchive,
+)
+from lattice.storage.snapshot_store import SnapshotStore, index_path
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+TASK_B = "task_01BBBBBBBBBBBBBBBBBBBBBBBBBB"
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+def _create(ld: Path, task_id: str, title: str) -> dict:
+    event = create_event(
+        type="task_created",
+        task_id=task_id,
+        actor="human:test",
+        data={"title": title, "status": "backlog", "priority": "medium", "type": "task"},
+    )
+    snapshot = apply_event_to_snapshot(None, event)
+    write_task_event(ld, task_id, [event], snapshot)
+    return snapshot
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Backdate *path* so the store treats its mtime as stable."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def _age_dirs(ld: Path, seconds: int = 60) -> None:
+    """Backdate both snapshot directories so their stat key is stable."""
+    for path in (ld / "tasks", ld / "archive" / "tasks"):
+        _age(path, seconds)
+
+
+class TestSnapshotStore:
+    def test_reads_pick_up_new_writes(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_B, "Second")
+        _create(ld, TASK_A, "First")
+
+        # Writers leave the index alone; the first read builds it
+        assert not index_path(ld).exists()
+        with SnapshotStore(ld) as store:
+            titles = [s["title"] for s in store.load_all()]
+        assert titles == ["First", "Second"]
+        assert index_path(ld).exists()
+
+    def test_unchanged_files_are_not_reread(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        _age(ld / "tasks" / f"{TASK_A}.json")
+
+        with SnapshotStore(ld) as store:
+            assert store.refresh() == 1
+            assert store.refresh() == 0
+
+    def test_refresh_only_rechecks_tasks_in_the_feed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+        for task_id in (TASK_A, TASK_B):
+            _age(ld / "tasks" / f"{task_id}.json")
+        _age_dirs(ld)
+        with SnapshotStore(ld) as store:
+            assert store.refresh() == 2
+
+        event = create_event(
+            type="field_updated",
+            task_id=TASK_A,
+            actor="human:test",
+            data={"field": "title", "from": "First", "to": "Renamed"},
+        )
+        write_task_event(ld, TASK_A, [event], apply_event_to_snapshot(a, event))
+        _age_dirs(ld)
+
+        with SnapshotStore(ld) as store:
+            assert store.refresh() == 1
+            assert store.refresh() == 0
+            assert [s["title"] for s in store.load_all()] == ["Renamed", "Second"]
+
+    def test_out_of_band_changes_are_picked_up(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "Before")
+        with SnapshotStore(ld) as store:
+            store.load_all()
+        _age_dirs(ld)
+        with SnapshotStore(ld) as store:
+            store.load_all()
+
+        # An atomic save (as git and most editors do) plus a copied-in task
+        snap["title"] = "After"
+        snap["status"] = "done"
+        tmp = ld / "tasks" / "edit.tmp"
+        tmp.write_text(serialize_snapshot(snap))
+        os.replace(tmp, ld / "tasks" / f"{TASK_A}.json")
+        other = dict(snap, id=TASK_B, title="Copied", status="backlog")
+        (ld / "tasks" / f"{TASK_B}.json").write_text(serialize_snapshot(other))
+        for path in (ld / "tasks" / f"{TASK_A}.json", ld / "tasks" / f"{TASK_B}.json"):
+            _age(path, 30)
+        _age_dirs(ld, 30)
+
+        with SnapshotStore(ld) as store:
+            assert [(s["title"], s["status"]) for s in store.load_all()] == [
+                ("After", "done"),
+                ("Copied", "backlog"),
+            ]
+            assert store.refresh() == 0
+
+    def test_own_writes_do_not_trigger_a_sweep(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _create(ld, TASK_A, "First")
+        b = _create(ld, TASK_B, "Second")
+        _age_dirs(ld)
+        with SnapshotStore(ld) as store:
+            store.load_all()
+
+        sweeps = []
+        original = SnapshotStore._sweep
+
+        def counting_sweep(self: SnapshotStore, *args: object) -> int:
+            sweeps.append(args)
+            return original(self, *args)
+
+        monkeypatch.setattr(SnapshotStore, "_sweep", counting_sweep)
+        for title in ("Renamed", "Renamed again"):
+            event = create_event(
+                type="field_updated",
+                task_id=TASK_A,
+                actor="human:test",
+                data={"field": "title", "from": a["title"], "to": title},
+            )
+            a = apply_event_to_snapshot(a, event)
+            write_task_event(ld, TASK_A, [event], a)
+            with SnapshotStore(ld) as store:
+                assert [s["title"] for s in store.load_all()] == [title, "Second"]
+        event = create_event(type="task_archived", task_id=TASK_B, actor="human:test", data={})
+        write_task_archive(ld, TASK_B, event, apply_event_to_snapshot(b, event))
+        with SnapshotStore(ld) as store:
+            assert [s["title"] for s in store.load_all()] == ["Renamed again"]
+        assert sweeps == []
+
+    def test_outside_change_before_a_write_triggers_a_sweep(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _create(ld, TASK_A, "First")
+        _age_dirs(ld)
+        with SnapshotStore(ld) as store:
+            store.load_all()
+
+        # A task arrives through git, then lattice writes another one: the
+        # feed accounts for the second directory change but not the first
+        (ld / "tasks" / f"{TASK_B}.json").write_text(
+            serialize_snapshot(dict(a, id=TASK_B, title="Pulled"))
+        )
+        event = create_event(
+            type="field_updated",
+            task_id=TASK_A,
+            actor="human:test",
+            data={"field": "title", "from": "First", "to": "Renamed"},
+        )
+        write_task_event(ld, TASK_A, [event], apply_event_to_snapshot(a, event))
+
+        with SnapshotStore(ld) as store:
+            assert [s["title"] for s in store.load_all()] == ["Renamed", "Pulled"]
+
+    def test_in_place_rewrite_is_picked_up_by_sweep(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "Before")
+        _age_dirs(ld)
+        with SnapshotStore(ld) as store:
+            store.load_all()
+
+        snap["title"] = "After"
+        path = ld / "tasks" / f"{TASK_A}.json"
+        path.write_text(serialize_snapshot(snap))
+
+        with SnapshotStore(ld) as store:
+            # Same directory entry and not in the changefeed: only a sweep sees it
+            assert store.load_all()[0]["title"] == "Before"
+            assert store.sweep() == 1
+            assert store.load_all()[0]["title"] == "After"
+
+    def test_regenerated_feed_triggers_a_sweep(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        with SnapshotStore(ld) as store:
+            store.load_all()
+
+        (ld / "changes.jsonl").write_text("")
+        _create(ld, TASK_B, "Second")
+
+        with SnapshotStore(ld) as store:
+            assert [s["title"] for s in store.load_all()] == ["First", "Second"]
+
+    def test_deleted_and_corrupt_files_are_dropped(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+
+        (ld / "tasks" / f"{TASK_A}.json").unlink()
+        (ld / "tasks" / f"{TASK_B}.json").write_text("{not json")
+
+        with SnapshotStore(ld) as store:
+            assert store.load_all() == []
+
+    def test_archive_and_unarchive_move_rows(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "First")
+
+        event = create_event(type="task_archived", task_id=TASK_A, actor="human:test", data={})
+        snap = apply_event_to_snapshot(snap, event)
+        write_task_archive(ld, TASK_A, event, snap)
+        with SnapshotStore(ld) as store:
+            assert store.load_all() == []
+            assert [s["id"] for s in store.load_all(archived=True)] == [TASK_A]
+
+        event = create_event(type="task_unarchived", task_id=TASK_A, actor="human:test", data={})
+        snap = apply_event_to_snapshot(snap, event)
+        write_task_unarchive(ld, TASK_A, event, snap)
+        with SnapshotStore(ld) as store:
+            assert [s["id"] for s in store.load_all()] == [TASK_A]
+            assert store.load_all(archived=True) == []
+
+    def test_corrupt_index_is_recreated(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        index_path(ld).parent.mkdir(exist_ok=True)
+        index_path(ld).write_bytes(b"this is not a sqlite database" * 10)
+        for suffix in ("-wal", "-shm"):
+            Path(f"{index_path(ld)}{suffix}").unlink(missing_ok=True)
+
+        with SnapshotStore(ld) as store:
+            assert [s["title"] for s in store.load_all()] == ["First"]
+
+    def test_rebuild_counts_rows(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+
+        with SnapshotStore(ld) as store:
+            assert store.rebuild() == 2
+
+    def test_snapshot_content_round_trips(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+
+        on_disk = json.loads((ld / "tasks" / f"{TASK_A}.json").read_text())
+        with SnapshotStore(ld) as store:
+            assert store.load_all() == [on_disk]
+
+
+class TestSecondaryIndexes:
+    def _seed(self, ld: Path) -> None:
+        a = _create(ld, TASK_A, "First")
+        b = _create(ld, TASK_B, "Second")
+        for task_id, snap, data in (
+            (TASK_A, a, {"field": "tags", "from": None, "to": ["api", "ui"]}),
+            (TASK_B, b, {"field": "tags", "from": None, "to": ["api"]}),
+        ):
+            event = create_event(
+                type="field_updated", task_id=task_id, actor="human:test", data=data
+            )
+            snap = apply_event_to_snapshot(snap, event)
+            if task_id == TASK_B:
+                event = create_event(
+                    type="assignment_changed",
+                    task_id=task_id,
+                    actor="human:test",
+                    data={"from": None, "to": {"name": "Argus-3", "model": "claude"}},
+                )
+                snap = apply_event_to_snapshot(snap, event)
+                event = create_event(
+                    type="status_changed",
+                    task_id=task_id,
+                    actor="human:test",
+                    data={"from": "backlog", "to": "in_progress"},
+                )
+                snap = apply_event_to_snapshot(snap, event)
+            write_task_event(ld, task_id, [event], snap)
+
+    def test_query_by_indexed_fields(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        self._seed(ld)
+
+        with SnapshotStore(ld) as store:
+            assert [s["id"] for s in store.query(status="in_progress")] == [TASK_B]
+            assert [s["id"] for s in store.query(assigned="Argus-3")] == [TASK_B]
+            assert [s["id"] for s in store.query(tag="api")] == [TASK_A, TASK_B]
+            assert [s["id"] for s in store.query(tag="ui", priority="medium")] == [TASK_A]
+            assert store.query(tag="ui", status="in_progress") == []
+            assert store.query(task_type="bug") == []
+
+    def test_indexes_follow_out_of_band_edits(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        snap = _create(ld, TASK_A, "First")
+        with SnapshotStore(ld) as store:
+            assert [s["id"] for s in store.query(status="backlog")] == [TASK_A]
+
+        snap["status"] = "done"
+        snap["tags"] = ["late"]
+        (ld / "tasks" / f"{TASK_A}.json").write_text(serialize_snapshot(snap))
+
+        with SnapshotStore(ld) as store:
+            store.sweep()
+            assert store.query(status="backlog") == []
+            assert [s["id"] for s in store.query(tag="late")] == [TASK_A]
+
+    def test_summaries(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _create(ld, TASK_A, "First")
+
+        with SnapshotStore(ld) as store:
+            assert store.summaries([TASK_A, TASK_B]) == {
+                TASK_A: {"short_id": None, "title": "First"}
+            }
+
+
+class TestReverseRelationshipIndex:
+    def _link(self, ld: Path, snap: dict, target_id: str, rel_type: str = "blocks") -> dict:
+        event = create_event(
+            type="relationship_added",
+            task_id=snap["id"],
+            actor="human:test",
+            data={"type": rel_type, "target_task_id": target_id},
+        )
+        snap = apply_event_to_snapshot(snap, event)
+        write_task_event(ld, snap["id"], [event], snap)
+        return snap
+
+    def test_incoming_edges_follow_link_and_unlink(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+
+        a = self._link(ld, a, TASK_B)
+        with SnapshotStore(ld) as store:
+            assert store.incoming(TASK_B) == [
+                {"source_task_id": TASK_A, "source_title": "First", "type": "blocks", "note": None}
+            ]
+            assert store.incoming(TASK_A) == []
+
+        event = create_event(
+            type="relationship_removed",
+            task_id=TASK_A,
+            actor="human:test",
+            data={"type": "blocks", "target_task_id": TASK_B},
+        )
+        a = apply_event_to_snapshot(a, event)
+        write_task_event(ld, TASK_A, [event], a)
+        with SnapshotStore(ld) as store:
+            assert store.incoming(TASK_B) == []
+
+    def test_incoming_edges_include_archived_sources(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        a = _create(ld, TASK_A, "First")
+        _create(ld, TASK_B, "Second")
+        a = self._link(ld, a, TASK_B, "related_to")
+
+        event = create_event(type="task_archived", task_id=TASK_A, actor="human:test", data={})
+        write_task_archive(ld, TASK_A, event, apply_event_to_snapshot(a, event))
+
+        with SnapshotStore(ld) as store:
+            assert [r["source_task_id"] for r in store.incoming(TASK_B)] == [TASK_A]
@@ -0,0 +1,171 @@
+"""Tests for lattice.storage.stats_aggregates — rolling stats aggregates."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from lattice.core.config import default_config, serialize_config
+from lattice.core.events import create_event
+from lattice.core.stats import build_stats
+from lattice.core.tasks import apply_event_to_snapshot
+from lattice.storage.changefeed import changefeed_path
+from lattice.storage.fs import atomic_write, ensure_lattice_dirs
+from lattice.storage.operations import (
+    write_task_archive,
+    write_task_event,
+    write_task_unarchive,
+)
+from lattice.storage.stats_aggregates import (
+    aggregates_path,
+    refresh_aggregates,
+    save_aggregates,
+    scan_aggregates,
+    verify_aggregates,
+)
+
+TASK_A = "task_01AAAAAAAAAAAAAAAAAAAAAAAAAA"
+TASK_B = "task_01BBBBBBBBBBBBBBBBBBBBBBBBBB"
+
+_T0 = datetime(2026, 3, 2, 9, 0, tzinfo=UTC)
+
+
+def _setup_lattice(tmp_path: Path) -> Path:
+    ensure_lattice_dirs(tmp_path)
+    ld = tmp_path / ".lattice"
+    atomic_write(ld / "config.json", serialize_config(default_config()))
+    return ld
+
+
+class _Writer:
+    """Writes task events with explicit timestamps, hours after a fixed start."""
+
+    def __init__(self, ld: Path) -> None:
+        self.ld = ld
+        self.snapshots: dict[str, dict] = {}
+
+    def _event(self, task_id: str, etype: str, hours: float, data: dict) -> dict:
+        event = create_event(type=etype, task_id=task_id, actor="human:test", data=data)
+        event["ts"] = (_T0 + timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.snapshots[task_id] = apply_event_to_snapshot(self.snapshots.get(task_id), event)
+        return event
+
+    def create(self, task_id: str, hours: float) -> None:
+        data = {"title": "Task", "status": "backlog", "priority": "medium", "type": "task"}
+        event = self._event(task_id, "task_created", hours, data)
+        write_task_event(self.ld, task_id, [event], self.snapshots[task_id])
+
+    def status(self, task_id: str, hours: float, to: str) -> None:
+        data = {"from": self.snapshots[task_id]["status"], "to": to}
+        event = self._event(task_id, "status_changed", hours, data)
+        write_task_event(self.ld, task_id, [event], self.snapshots[task_id])
+
+    def archive(self, task_id: str, hours: float) -> None:
+        event = self._event(task_id, "task_archived", hours, {})
+        write_task_archive(self.ld, task_id, event, self.snapshots[task_id])
+
+    def unarchive(self, task_id: str, hours: float) -> None:
+        event = self._event(task_id, "task_unarchived", hours, {})
+        write_task_unarchive(self.ld, task_id, event, self.snapshots[task_id])
+
+
+def _without_seq(aggregates: dict) -> dict:
+    return {k: v for k, v in aggregates.items() if k != "feed_seq"}
+
+
+class TestStatsAggregates:
+    def test_incremental_totals_match_a_full_scan(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        w = _Writer(ld)
+        w.create(TASK_A, 0)
+        refresh_aggregates(ld)  # persisted from here on; later calls only catch up
+
+        w.status(TASK_A, 2, "blocked")
+        w.status(TASK_A, 5, "in_progress")
+        w.create(TASK_B, 6)
+        refresh_aggregates(ld)
+        w.status(TASK_A, 9, "done")
+        w.status(TASK_B, 10, "blocked")
+
+        aggregates = refresh_aggregates(ld)
+        assert _without_seq(aggregates) == _without_seq(scan_aggregates(ld))
+        assert aggregates["status_us"]["backlog"] == [(2 + 4) * 3_600_000_000, 2]
+        assert aggregates["blocked"] == [1, 3 * 3_600_000_000]
+        assert aggregates["done_weeks"] == {"2026-W10": 1}
+        blocked_at = "2026-03-02T19:00:00Z"
+        assert aggregates["tasks"][TASK_B] == ["blocked", blocked_at, blocked_at]
+
+    def test_catch_up_reads_only_the_feed(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        w = _Writer(ld)
+        w.create(TASK_A, 0)
+        refresh_aggregates(ld)
+
+        # Logs are not read again: a log rewritten behind the index's back
+        # does not change the totals until a recompute
+        (ld / "events" / f"{TASK_A}.jsonl").write_text("")
+        w.status(TASK_A, 1, "in_progress")
+        aggregates = refresh_aggregates(ld)
+        assert aggregates["status_us"] == {"backlog": [3_600_000_000, 1]}
+        assert verify_aggregates(ld) == ["actors", "status_us"]
+        assert refresh_aggregates(ld)["status_us"] == {}
+
+    def test_verify_without_stored_aggregates_saves_them(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        _Writer(ld).create(TASK_A, 0)
+
+        assert verify_aggregates(ld) is None
+        assert verify_aggregates(ld) == []
+
+    def test_archive_and_unarchive_move_a_task_out_and_back(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        w = _Writer(ld)
+        w.create(TASK_A, 0)
+        w.status(TASK_A, 1, "done")
+        w.create(TASK_B, 2)
+        refresh_aggregates(ld)
+
+        w.archive(TASK_A, 3)
+        aggregates = refresh_aggregates(ld)
+        assert set(aggregates["tasks"]) == {TASK_B}
+        assert aggregates["done_weeks"] == {}
+        assert aggregates["status_us"] == {}
+        assert aggregates["actors"] == {"human:test": 1}
+
+        w.unarchive(TASK_A, 4)
+        aggregates = refresh_aggregates(ld)
+        assert _without_seq(aggregates) == _without_seq(scan_aggregates(ld))
+        assert aggregates["done_weeks"] == {"2026-W10": 1}
+
+    def test_feed_reset_and_bad_file_trigger_a_scan(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        w = _Writer(ld)
+        w.create(TASK_A, 0)
+        w.status(TASK_A, 1, "in_progress")
+        aggregates = refresh_aggregates(ld)
+        expected = _without_seq(aggregates)
+
+        save_aggregates(ld, {**aggregates, "feed_seq": 10_000})
+        assert _without_seq(refresh_aggregates(ld)) == expected
+
+        aggregates_path(ld).write_text("{not json")
+        assert _without_seq(refresh_aggregates(ld)) == expected
+
+        changefeed_path(ld).unlink()
+        assert _without_seq(refresh_aggregates(ld)) == expected
+
+    def test_build_stats_uses_the_aggregates(self, tmp_path: Path) -> None:
+        ld = _setup_lattice(tmp_path)
+        w = _Writer(ld)
+        w.create(TASK_A, 0)
+        w.status(TASK_A, 2, "blocked")
+        w.status(TASK_A, 6, "done")
+
+        stats = build_stats(ld, default_config())
+        assert aggregates_path(ld).exists()
+        assert stats["blocked"]["total_blocked_episodes"] == 1
+        assert stats["blocked"]["avg_blocked_hours"] == 4.0
+        by_status = {row["status"]: row for row in stats["time_in_status"]}
+        assert by_status["backlog"]["avg_hours"] == 2.0
+        assert by_status["done"]["sample_count"] == 1
+        assert stats["agent_activity"] == [{"actor": "human:test", "event_count": 3}]
@@ -3,19 +3,94 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
 from unittest.mock import patch
 
+import pytest
+
 from lattice.update_check import (
     _CACHE_TTL,
+    _RETRY_INTERVAL,
+    _install_key,
+    _load_cache,
     _parse_version,
-    _read_cache,
     _write_cache,
     maybe_print_update_notice,
+    refresh,
 )
 
 
+@pytest.fixture()
+def version_endpoint():
+    """A local stand-in for the PyPI JSON endpoint.
+
+    Yields a dict: set ``"version"`` to change the answer, ``"delay"`` to
+    slow responses down; ``"hits"`` counts requests.
+    """
+    state = {"version": "9.9.9", "delay": 0.0, "hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            time.sleep(state["delay"])
+            body = json.dumps({"info": {"version": state["version"]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_address[1]}/pypi/lattice-tracker/json"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "version_check.json"
+    monkeypatch.setattr("lattice.update_check._CACHE_FILE", path)
+    monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
+    monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
+    return path
+
+
+def _tty_stderr():
+    """Return a StringIO that claims to be a TTY."""
+    s = StringIO()
+    s.isatty = lambda: True  # type: ignore[attr-defined]
+    return s
+
+
+def _notice() -> str:
+    fake_stderr = _tty_stderr()
+    with patch("sys.stderr", fake_stderr):
+        maybe_print_update_notice()
+    return fake_stderr.getvalue()
+
+
+def _cache(path, *, version="0.3.0", current="0.2.0", age=0.0, install=None, **extra):
+    data = {
+        "version": version,
+        "current": current,
+        "ts": time.time() - age,
+        "install": install or _install_key(),
+        **extra,
+    }
+    path.write_text(json.dumps(data))
+
+
 class TestParseVersion:
     def test_simple(self):
         assert _parse_version("1.2.3") == (1, 2, 3)
@@ -30,172 +105,118 @@ class TestParseVersion:
 
 
 class TestCache:
-    def test_write_and_read(self, tmp_path, monkeypatch):
-        cache_file = tmp_path / "version_check.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        _write_cache("1.2.3")
-        assert _read_cache() == "1.2.3"
-
-    def test_stale_cache_returns_none(self, tmp_path, monkeypatch):
-        cache_file = tmp_path / "version_check.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        # Write a cache entry that's older than TTL
-        cache_file.write_text(
-            json.dumps({"version": "1.2.3", "ts": time.time() - _CACHE_TTL - 1})
-        )
-        assert _read_cache() is None
-
-    def test_missing_cache_returns_none(self, tmp_path, monkeypatch):
-        cache_file = tmp_path / "nonexistent.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        assert _read_cache() is None
-
-    def test_corrupt_cache_returns_none(self, tmp_path, monkeypatch):
-        cache_file = tmp_path / "version_check.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
+    def test_write_and_read(self, cache_file):
+        _write_cache("1.2.3", "1.2.0")
+        data = _load_cache()
+        assert data["version"] == "1.2.3"
+        assert data["current"] == "1.2.0"
+        assert data["install"] == _install_key()
+
+    def test_missing_cache_is_empty(self, cache_file):
+        assert _load_cache() == {}
+
+    def test_corrupt_cache_is_empty(self, cache_file):
         cache_file.write_text("not json")
-        assert _read_cache() is None
+        assert _load_cache() == {}
+
+
+class TestRefresh:
+    def test_refresh_stores_latest_and_installed_version(self, cache_file, version_endpoint):
+        with patch("lattice.update_check._installed_version", return_value="0.2.0"):
+            refresh(version_endpoint["url"], cache_file)
+        data = _load_cache()
+        assert (data["version"], data["current"]) == ("9.9.9", "0.2.0")
+        assert version_endpoint["hits"] == 1
+
+    def test_unreachable_endpoint_leaves_cache(self, cache_file):
+        _cache(cache_file, version="0.3.0", age=_CACHE_TTL + 1)
+        before = cache_file.read_text()
+        refresh("http://127.0.0.1:9/unreachable", cache_file)
+        assert cache_file.read_text() == before
 
 
 class TestMaybePrintUpdateNotice:
     """Tests for the main entry point."""
 
-    def _tty_stderr(self):
-        """Return a StringIO that claims to be a TTY."""
-        s = StringIO()
-        s.isatty = lambda: True  # type: ignore[attr-defined]
-        return s
-
-    def test_skip_when_env_var_set(self, monkeypatch):
+    def test_skip_when_env_var_set(self, cache_file, monkeypatch):
         monkeypatch.setenv("LATTICE_NO_UPDATE_CHECK", "1")
-        fake_stderr = self._tty_stderr()
-        with patch("sys.stderr", fake_stderr):
-            maybe_print_update_notice()
-        assert fake_stderr.getvalue() == ""
+        _cache(cache_file)
+        assert _notice() == ""
 
-    def test_skip_when_not_tty(self, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
+    def test_skip_when_not_tty(self, cache_file):
+        _cache(cache_file)
         # Plain StringIO.isatty() returns False
         fake_stderr = StringIO()
-        with patch("sys.stderr", fake_stderr):
-            maybe_print_update_notice()
-        assert fake_stderr.getvalue() == ""
-
-    def test_notice_when_behind(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", tmp_path / "vc.json")
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        fake_stderr = self._tty_stderr()
         with (
             patch("sys.stderr", fake_stderr),
-            patch(
-                "lattice.update_check.pkg_version",
-                return_value="0.1.0",
-                create=True,
-            ),
-            patch("lattice.update_check._fetch_latest", return_value="0.3.0"),
-            patch(
-                "importlib.metadata.version", return_value="0.1.0"
-            ),
+            patch("lattice.update_check._start_refresh") as mock_refresh,
         ):
             maybe_print_update_notice()
+        assert fake_stderr.getvalue() == ""
+        mock_refresh.assert_not_called()
 
-        output = fake_stderr.getvalue()
+    def test_notice_when_behind(self, cache_file):
+        _cache(cache_file, version="0.3.0", current="0.1.0")
+        with patch("lattice.update_check._start_refresh") as mock_refresh:
+            output = _notice()
+        assert "0.1.0" in output
         assert "0.3.0" in output
         assert "uv tool upgrade lattice-tracker" in output
+        mock_refresh.assert_not_called()
 
-    def test_no_notice_when_current(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", tmp_path / "vc.json")
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
+    def test_no_notice_when_current(self, cache_file):
+        _cache(cache_file, version="0.2.0", current="0.2.0")
+        assert _notice() == ""
 
-        fake_stderr = self._tty_stderr()
+    def test_never_fetches_or_reads_metadata_in_process(self, cache_file):
+        _cache(cache_file, age=_CACHE_TTL + 1)
         with (
-            patch("sys.stderr", fake_stderr),
-            patch("lattice.update_check._fetch_latest", return_value="0.2.0"),
-            patch("importlib.metadata.version", return_value="0.2.0"),
-        ):
-            maybe_print_update_notice()
-
-        assert fake_stderr.getvalue() == ""
-
-    def test_cache_hit_avoids_network(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        cache_file = tmp_path / "vc.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        # Pre-populate fresh cache
-        cache_file.write_text(
-            json.dumps({"version": "0.2.0", "ts": time.time()})
-        )
-
-        fake_stderr = self._tty_stderr()
-        with (
-            patch("sys.stderr", fake_stderr),
-            patch("importlib.metadata.version", return_value="0.2.0"),
             patch("lattice.update_check._fetch_latest") as mock_fetch,
+            patch("importlib.metadata.version") as mock_version,
+            patch("lattice.update_check._start_refresh") as mock_refresh,
         ):
-            maybe_print_update_notice()
-
+            assert "0.3.0" in _notice()  # stale results are still shown
         mock_fetch.assert_not_called()
-        assert fake_stderr.getvalue() == ""
-
-    def test_stale_cache_triggers_fetch(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        cache_file = tmp_path / "vc.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        # Write stale cache
-        cache_file.write_text(
-            json.dumps({"version": "0.1.0", "ts": time.time() - _CACHE_TTL - 1})
-        )
-
-        fake_stderr = self._tty_stderr()
-        with (
-            patch("sys.stderr", fake_stderr),
-            patch("importlib.metadata.version", return_value="0.2.0"),
-            patch("lattice.update_check._fetch_latest", return_value="0.2.0") as mock_fetch,
-        ):
-            maybe_print_update_notice()
-
-        mock_fetch.assert_called_once()
-
-    def test_network_failure_is_silent(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", tmp_path / "vc.json")
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        fake_stderr = self._tty_stderr()
-        with (
-            patch("sys.stderr", fake_stderr),
-            patch("importlib.metadata.version", return_value="0.2.0"),
-            patch("lattice.update_check._fetch_latest", return_value=None),
-        ):
-            maybe_print_update_notice()
-
-        assert fake_stderr.getvalue() == ""
-
-    def test_cache_written_after_fetch(self, tmp_path, monkeypatch):
-        monkeypatch.delenv("LATTICE_NO_UPDATE_CHECK", raising=False)
-        cache_file = tmp_path / "vc.json"
-        monkeypatch.setattr("lattice.update_check._CACHE_FILE", cache_file)
-        monkeypatch.setattr("lattice.update_check._CACHE_DIR", tmp_path)
-
-        fake_stderr = self._tty_stderr()
-        with (
-            patch("sys.stderr", fake_stderr),
-            patch("importlib.metadata.version", return_value="0.2.0"),
-            patch("lattice.update_check._fetch_latest", return_value="0.3.0"),
-        ):
-            maybe_print_update_notice()
-
-        # Cache should now contain the fetched version
-        data = json.loads(cache_file.read_text())
-        assert data["version"] == "0.3.0"
+        mock_version.assert_not_called()
+        mock_refresh.assert_called_once()
+
+    def test_refresh_attempts_are_spaced_out(self, cache_file):
+        _cache(cache_file, age=_CACHE_TTL + 1, attempt=time.time() - 60)
+        with patch("lattice.update_check._start_refresh") as mock_refresh:
+            _notice()
+        mock_refresh.assert_not_called()
+
+        _cache(cache_file, age=_CACHE_TTL + 1, attempt=time.time() - _RETRY_INTERVAL - 1)
+        with patch("lattice.update_check._start_refresh") as mock_refresh:
+            _notice()
+        mock_refresh.assert_called_once()
+
+    def test_stale_pre_release_cache_is_still_refreshed(self, cache_file):
+        _cache(cache_file, version="0.3.0rc1", current="0.2.0", age=10 * 86400)
+        with patch("lattice.update_check._start_refresh") as mock_refresh:
+            assert _notice() == ""
+        mock_refresh.assert_called_once()
+
+    def test_cache_from_another_install_is_ignored(self, cache_file):
+        _cache(cache_file, version="0.3.0", current="0.1.0", install="0:0")
+        with patch("lattice.update_check._start_refresh") as mock_refresh:
+            assert _notice() == ""
+        mock_refresh.assert_called_once()
+
+    def test_background_refresh_shows_on_next_run(self, cache_file, version_endpoint, monkeypatch):
+        monkeypatch.setattr("lattice.update_check._PYPI_URL", version_endpoint["url"])
+        version_endpoint["delay"] = 1.0
+
+        started = time.monotonic()
+        assert _notice() == ""
+        assert time.monotonic() - started < 0.5  # did not wait for the endpoint
+        assert "attempt" in _load_cache()
+
+        deadline = time.monotonic() + 10
+        while _load_cache().get("version") != "9.9.9" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert version_endpoint["hits"] == 1
+
+        output = _notice()
+        assert "9.9.9" in output
+        assert "uv tool upgrade lattice-tracker" in output